@@ -27,6 +27,7 @@ for seismology.
     GNU Lesser General Public License, Version 3
     (https://www.gnu.org/copyleft/lesser.html)
 """
+import importlib
 import sys
 import warnings
 
@@ -45,16 +46,38 @@ with warnings.catch_warnings(record=True) as w:
 from obspy.core.util import _get_version_string
 __version__ = _get_version_string(abbrev=10)
 from obspy.core.trace import Trace  # NOQA
-from obspy.core.stream import Stream, read
-from obspy.core.event import read_events, Catalog
-from obspy.core.inventory import read_inventory, Inventory  # NOQA
+from obspy.core.stream import Stream, read, iter_read
 from obspy.core.util.obspy_types import (  # NOQA
     ObsPyException, ObsPyReadingError)
 
 
 __all__ = ["UTCDateTime", "Trace", "__version__", "Stream", "read",
-           "read_events", "Catalog", "read_inventory", "ObsPyException",
-           "ObsPyReadingError"]
+           "iter_read", "read_events", "Catalog", "read_inventory",
+           "ObsPyException", "ObsPyReadingError"]
+
+# event and inventory handling is only imported on first access to keep
+# "import obspy" fast
+_LAZY_IMPORTS = {
+    "read_events": "obspy.core.event",
+    "Catalog": "obspy.core.event",
+    "read_inventory": "obspy.core.inventory",
+    "Inventory": "obspy.core.inventory",
+}
+
+
+def __getattr__(name):
+    try:
+        module_name = _LAZY_IMPORTS[name]
+    except KeyError:
+        msg = "module 'obspy' has no attribute '%s'" % name
+        raise AttributeError(msg) from None
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
 
 
 # insert supported read/write format plugin lists dynamically in docstrings
@@ -62,11 +85,7 @@ from obspy.core.util.base import _add_format_plugin_table
 
 
 _add_format_plugin_table(read, "waveform", "read", numspaces=4)
-_add_format_plugin_table(read_events, "event", "read", numspaces=4)
-_add_format_plugin_table(read_inventory, "inventory", "read", numspaces=4)
 _add_format_plugin_table(Stream.write, "waveform", "write", numspaces=8)
-_add_format_plugin_table(Catalog.write, "event", "write", numspaces=8)
-_add_format_plugin_table(Inventory.write, "inventory", "write", numspaces=8)
 
 
 if __name__ == '__main__':
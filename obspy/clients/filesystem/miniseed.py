@@ -4,16 +4,15 @@ Data extraction and transfer from miniSEED files
 """
 import abc
 import bisect
-import ctypes
 import logging
 import os
 import re
 from collections import namedtuple
 from io import BytesIO
 
-from obspy import read, Stream, UTCDateTime
-from obspy.clients.filesystem.msriterator import _MSRIterator
+from obspy import read, UTCDateTime
 from obspy.core.util.decorator import deprecated_keywords
+from obspy.io.mseed.util import get_record_headers
 
 
 logger = logging.getLogger('obspy.clients.filesystem.miniseed')
@@ -58,96 +57,33 @@ class _ExtractedDataSegment(metaclass=abc.ABCMeta):
         raise NotImplementedError()
 
 
-class _MSRIDataSegment(_ExtractedDataSegment):
+class _BufferDataSegment(_ExtractedDataSegment):
     """
-    Segment of data from a _MSRIterator
+    Segment of data that was read from a data file into memory
     """
-    @deprecated_keywords({"loglevel": None})
-    def __init__(self, msri, sample_rate, start_time, end_time, src_name,
-                 loglevel=None):
+    def __init__(self, data, src_name, start_time=None, end_time=None):
         """
-        :param msri: A `_MSRIterator`
-        :param sample_rate: Sample rate of the data
-        :param start_time: A `UTCDateTime` giving the start of the
-                           requested data
-        :param end_time: A `UTCDateTime` giving the end of the requested data
+        :param data: Raw miniSEED records
         :param src_name: Name of the data source for logging
+        :param start_time: A `UTCDateTime` giving the start of the
+                           requested data, if the record has to be trimmed
+        :param end_time: A `UTCDateTime` giving the end of the requested data,
+                         if the record has to be trimmed
         """
-        self.msri = msri
-        self.sample_rate = sample_rate
+        self.data = data
+        self.src_name = src_name
         self.start_time = start_time
         self.end_time = end_time
-        self.src_name = src_name
 
     def read_stream(self):
-        msrstart = self.msri.get_startepoch()
-        msrend = self.msri.get_endepoch()
-        reclen = self.msri.msr.contents.reclen
-
-        sepoch = self.start_time.timestamp
-        eepoch = self.end_time.timestamp
-
-        st = Stream()
-        # Process records that intersect with request time window
-        if msrstart < eepoch and msrend > sepoch:
-
-            # Trim record if coverage and partial overlap with request
-            if self.sample_rate > 0 and (msrstart < self.start_time or
-                                         msrend > self.end_time):
-                logger.debug("Trimming record %s @ %s" %
-                             (self.src_name, self.msri.get_starttime()))
-                tr = \
-                    read(BytesIO(ctypes.string_at(
-                                    self.msri.msr.contents.record,
-                                    reclen)),
-                         format="MSEED")[0]
+        st = read(BytesIO(self.data), format="MSEED")
+        if self.start_time is not None:
+            for tr in st:
                 tr.trim(self.start_time, self.end_time)
-                st.traces.append(tr)
-                return st
-            # Otherwise, write un-trimmed record
-            else:
-                # Construct to avoid copying the data, supposedly
-                logger.debug("Writing full record %s @ %s" %
-                             (self.src_name, self.msri.get_starttime()))
-                out = (ctypes.c_char * reclen).from_address(
-                    ctypes.addressof(self.msri.msr.contents.record.contents))
-                data = BytesIO(out.raw)
-                st = read(data, format="MSEED")
         return st
 
     def get_num_bytes(self):
-        return self.msri.msr.contents.reclen
-
-    def get_src_name(self):
-        return self.src_name
-
-
-class _FileDataSegment(_ExtractedDataSegment):
-    """
-    Segment of data that comes directly from a data file
-    """
-    def __init__(self, filename, start_byte, num_bytes, src_name):
-        """
-        :param filename: Name of data file
-        :param start_byte: Return data starting from this offset
-        :param num_bytes: Length of data to return
-        :param src_name: Name of the data source for logging
-        """
-        self.filename = filename
-        self.start_byte = start_byte
-        self.num_bytes = num_bytes
-        self.src_name = src_name
-
-    def read_stream(self):
-        st = Stream()
-        with open(self.filename, "rb") as f:
-            f.seek(self.start_byte)
-            raw_data = BytesIO(f.read(self.num_bytes))
-            st = read(raw_data, format="MSEED")
-        return st
-
-    def get_num_bytes(self):
-        return self.num_bytes
+        return len(self.data)
 
     def get_src_name(self):
         return self.src_name
@@ -268,41 +204,71 @@ class _MiniseedDataExtractor(object):
         if total_bytes == 0:
             raise NoDataError()
 
-        # Get & return the actual data
+        # Get & return the actual data, reading all sections needed from a
+        # file with a single open
+        files = {}
         for nrow in request_rows:
-            logger.debug("Extracting %s (%s - %s) from %s" % (nrow.srcname,
-                                                              nrow.starttime,
-                                                              nrow.endtime,
-                                                              nrow.filename))
-
-            # Iterate through records in section
-            # if only part of the section is needed
-            if nrow.triminfo[0][2] or nrow.triminfo[1][2]:
-
-                for msri in _MSRIterator(filename=nrow.filename,
-                                         startoffset=nrow.triminfo[0][1],
-                                         dataflag=False):
-                    offset = msri.get_offset()
-
-                    # Done if we are beyond end offset
-                    if offset >= nrow.triminfo[1][1]:
-                        break
-
-                    yield _MSRIDataSegment(msri,
-                                           nrow.samplerate,
-                                           nrow.starttime,
-                                           nrow.endtime,
-                                           nrow.srcname)
-
-                    # Check for passing end offset
-                    if (offset + msri.msr.contents.reclen) >= \
-                            nrow.triminfo[1][1]:
-                        break
-
-            # Otherwise, return the entire section
+            files.setdefault(nrow.filename, []).append(nrow)
+        for filename, nrows in files.items():
+            segments = []
+            with open(filename, "rb") as fh:
+                for nrow in nrows:
+                    logger.debug("Extracting %s (%s - %s) from %s" % (
+                        nrow.srcname, nrow.starttime, nrow.endtime,
+                        nrow.filename))
+                    (_, off_start, trim_start), (_, off_end, trim_end) = \
+                        nrow.triminfo
+                    fh.seek(off_start)
+                    data = fh.read(off_end - off_start)
+                    # Check the records of the section if only part of it is
+                    # needed
+                    if trim_start or trim_end:
+                        segments.extend(self._get_record_segments(data, nrow))
+                    # Otherwise, return the entire section
+                    else:
+                        segments.append(_BufferDataSegment(data,
+                                                           nrow.srcname))
+            for segment in segments:
+                yield segment
+
+    def _get_record_segments(self, data, nrow):
+        """
+        Split the records of a partially requested section into segments.
+
+        Records outside of the requested time window are skipped, every other
+        record is returned as a segment of its own and trimmed if it only
+        partially covers the requested time window.
+
+        :param data: Raw miniSEED records of the section
+        :param nrow: Processed request row
+        :returns: list of `_ExtractedDataSegment`s
+        """
+        headers = get_record_headers(BytesIO(data))
+        start_ns = nrow.starttime._ns
+        end_ns = nrow.endtime._ns
+        segments = []
+        for header in headers:
+            offset = int(header['offset'])
+            record = data[offset:offset + int(header['record_length'])]
+            # Process records that intersect with request time window
+            if not (header['starttime'] < end_ns and
+                    header['endtime'] > start_ns):
+                continue
+            # Trim record if coverage and partial overlap with request
+            if nrow.samplerate > 0 and (header['starttime'] < start_ns or
+                                        header['endtime'] > end_ns):
+                logger.debug("Trimming record %s @ %s" %
+                             (nrow.srcname,
+                              UTCDateTime(ns=int(header['starttime']))))
+                segments.append(_BufferDataSegment(
+                    record, nrow.srcname, nrow.starttime, nrow.endtime))
+            # Otherwise, return the un-trimmed record
             else:
-                yield _FileDataSegment(nrow.filename, nrow.triminfo[0][1],
-                                       nrow.bytes, nrow.srcname)
+                logger.debug("Writing full record %s @ %s" %
+                             (nrow.srcname,
+                              UTCDateTime(ns=int(header['starttime']))))
+                segments.append(_BufferDataSegment(record, nrow.srcname))
+        return segments
 
 
 if __name__ == '__main__':
@@ -35,24 +35,33 @@ See https://www.seiscomp3.org/wiki/doc/applications/slarchive/SDS.
     GNU Lesser General Public License, Version 3
     (https://www.gnu.org/copyleft/lesser.html)
 """
+import fnmatch
 import glob
+import json
 import os
 import re
+import time
 import warnings
 from datetime import timedelta
 
 import numpy as np
 
-from obspy import Stream, read, UTCDateTime
-from obspy.core.stream import _headonly_warning_msg
-from obspy.core.util.misc import BAND_CODE
+from obspy import Stream, Trace, read, UTCDateTime
+from obspy.core.stream import _find_gaps_ns, _headonly_warning_msg
+from obspy.core.util.base import _map_pathnames
+from obspy.core.util.misc import BAND_CODE, _atomic_write
 from obspy.io.mseed import ObsPyMSEEDFilesizeTooSmallError
+from obspy.io.mseed.index import INDEX_SUFFIX as MSEED_INDEX_SUFFIX
+from obspy.io.mseed.util import get_record_headers
 
 
 SDS_FMTSTR = os.path.join(
     "{year}", "{network}", "{station}", "{channel}.{sds_type}",
     "{network}.{station}.{location}.{channel}.{sds_type}.{year}.{doy:03d}")
 FORMAT_STR_PLACEHOLDER_REGEX = r"{(\w+?)?([!:].*?)?}"
+# number of records at the end of the latest file checked first for the
+# latest data in Client.get_latency()
+_LATENCY_TAIL_RECORDS = 16
 
 
 class Client(object):
@@ -65,7 +74,8 @@ class Client(object):
     FMTSTR = SDS_FMTSTR
 
     def __init__(self, sds_root, sds_type="D", format="MSEED",
-                 fileborder_seconds=30, fileborder_samples=5000):
+                 fileborder_seconds=30, fileborder_samples=5000,
+                 catalog=None):
         """
         Initialize a SDS local filesystem client.
 
@@ -102,6 +112,15 @@ class Client(object):
             code of the requested channel to sampling frequency. The maximum of
             both ``fileborder_seconds`` and ``fileborder_samples`` is used when
             determining if previous/next day should be checked for data.
+        :type catalog: bool, str or
+            :class:`~obspy.clients.filesystem.sds.SDSCatalog`
+        :param catalog: Answer all lookups of files in the archive from a
+            cached listing of its directories (see
+            :class:`~obspy.clients.filesystem.sds.SDSCatalog`) instead of
+            globbing the file system on every call. Either ``True`` for a
+            catalog kept in memory, the filename of a catalog persisted on
+            disk or an existing catalog of ``sds_root``. Defaults to
+            ``None`` (no catalog).
         """
         if not os.path.isdir(sds_root):
             msg = ("SDS root is not a local directory: " + sds_root)
@@ -111,6 +130,13 @@ class Client(object):
         self.format = format and format.upper()
         self.fileborder_seconds = fileborder_seconds
         self.fileborder_samples = fileborder_samples
+        if catalog is None or catalog is False:
+            catalog = None
+        elif catalog is True:
+            catalog = SDSCatalog(sds_root)
+        elif not isinstance(catalog, SDSCatalog):
+            catalog = SDSCatalog(sds_root, filename=catalog)
+        self.catalog = catalog
 
     def get_waveforms(self, network, station, location, channel, starttime,
                       endtime, merge=-1, sds_type=None, **kwargs):
@@ -166,35 +192,20 @@ class Client(object):
             network=network, station=station, location=location,
             channel=channel, starttime=starttime, endtime=endtime,
             sds_type=sds_type)
-        for full_path in full_paths:
-            try:
-                st += read(full_path, format=self.format, starttime=starttime,
-                           endtime=endtime, sourcename=seed_pattern, **kwargs)
-            except ObsPyMSEEDFilesizeTooSmallError:
-                # just ignore small MSEED files, in use cases working with
-                # near-realtime data these are usually just being created right
-                # at request time, e.g. when fetching current data right after
-                # midnight
-                continue
-
-        # make sure we only have the desired data, just in case the file
-        # contents do not match the expected SEED id
-        st = st.select(network=network, station=station, location=location,
-                       channel=channel)
+        for full_path in sorted(full_paths):
+            st += self._read_file(full_path, starttime, endtime,
+                                  seed_pattern, **kwargs)
 
         # avoid trim/merge operations when we do a headonly read for
         # `_get_availability_percentage()`
         if kwargs.get("_no_trim_or_merge", False):
-            return st
+            return st.select(network=network, station=station,
+                             location=location, channel=channel)
 
-        st.trim(starttime, endtime)
-        if merge is None or merge is False:
-            pass
-        else:
-            st.merge(merge)
-        return st
+        return _select_trim_merge(st, network, station, location, channel,
+                                  starttime, endtime, merge)
 
-    def get_waveforms_bulk(self, bulk):
+    def get_waveforms_bulk(self, bulk, workers=None):
         """
         Reads bulk data from a local SeisComP Data Structure (SDS) directory
         tree.
@@ -203,13 +214,105 @@ class Client(object):
         directory.
 
         :type bulk: list[tuple]
-        :param bulk: Information about the requested data.
+        :param bulk: Information about the requested data. Each item holds the
+            arguments of
+            :meth:`~obspy.clients.filesystem.sds.Client.get_waveforms`, i.e.
+            ``(network, station, location, channel, starttime, endtime)``
+            optionally followed by ``merge`` and ``sds_type``.
+        :type workers: int
+        :param workers: Number of files read concurrently. Defaults to
+            ``None``, which processes the requests one after another. If
+            larger than one, all files needed by any of the requests are
+            collected first, files needed by several requests (e.g. adjacent
+            day files in requests for consecutive days) are read only once
+            and the files are read in a pool of ``workers`` threads. Trimming
+            and merging is done per request afterwards, the traces of the
+            returned stream are in the order of the requests in both cases.
+            Only the recorded processing information can differ, as it shows
+            the time window read from a file for all requests.
+        :rtype: :class:`~obspy.core.stream.Stream`
         """
+        if not workers or workers <= 1:
+            st = Stream()
+            for bulk_string in bulk:
+                st += self.get_waveforms(*bulk_string)
+            return st
+
+        requests = [_parse_bulk_line(*bulk_string) for bulk_string in bulk]
+        # files needed by each request and the time window and SEED ids to
+        # read from each file, covering all requests that need it
+        request_paths = []
+        windows = {}
+        for (network, station, location, channel, starttime, endtime,
+                merge, sds_type) in requests:
+            full_paths = sorted(self._get_filenames(
+                network=network, station=station, location=location,
+                channel=channel, starttime=starttime, endtime=endtime,
+                sds_type=sds_type or self.sds_type))
+            request_paths.append(full_paths)
+            seed_pattern = ".".join((network, station, location, channel))
+            for full_path in full_paths:
+                t1, t2, pattern = windows.get(
+                    full_path, (starttime, endtime, seed_pattern))
+                if pattern != seed_pattern:
+                    pattern = None
+                windows[full_path] = (
+                    min(t1, starttime), max(t2, endtime), pattern)
+
+        full_paths = sorted(windows)
+        streams = _map_pathnames(
+            lambda full_path: self._read_file(full_path, *windows[full_path]),
+            full_paths, workers=workers)
+        streams = dict(zip(full_paths, streams))
+        remaining_uses = {}
+        for paths in request_paths:
+            for full_path in paths:
+                remaining_uses[full_path] = \
+                    remaining_uses.get(full_path, 0) + 1
+
         st = Stream()
-        for bulk_string in bulk:
-            st += self.get_waveforms(*bulk_string)
+        for (network, station, location, channel, starttime, endtime, merge,
+                _), paths in zip(requests, request_paths):
+            st_ = Stream()
+            shared = []
+            for full_path in paths:
+                remaining_uses[full_path] -= 1
+                if not remaining_uses[full_path]:
+                    st_ += streams.pop(full_path)
+                    continue
+                # other requests still need the traces of this file, so only
+                # work on new trace objects sharing the data
+                for tr in streams[full_path]:
+                    shared.append(tr.data)
+                    st_.append(Trace(data=tr.data, header=tr.stats.copy()))
+            st_ = _select_trim_merge(st_, network, station, location,
+                                     channel, starttime, endtime, merge)
+            # make sure the returned traces of different requests never share
+            # any data
+            for tr in st_:
+                if any(np.may_share_memory(tr.data, data) for data in shared):
+                    tr.data = tr.data.copy()
+            st += st_
         return st
 
+    def _read_file(self, full_path, starttime, endtime, seed_pattern,
+                   **kwargs):
+        """
+        Read the data of a single SDS file in the given time window.
+
+        Returns an empty stream for MiniSEED files that are too small to hold
+        a single record.
+        """
+        try:
+            return read(full_path, format=self.format, starttime=starttime,
+                        endtime=endtime, sourcename=seed_pattern, **kwargs)
+        except ObsPyMSEEDFilesizeTooSmallError:
+            # just ignore small MSEED files, in use cases working with
+            # near-realtime data these are usually just being created right
+            # at request time, e.g. when fetching current data right after
+            # midnight
+            return Stream()
+
     def _get_filenames(self, network, station, location, channel, starttime,
                        endtime, sds_type=None):
         """
@@ -258,7 +361,7 @@ class Client(object):
                 network=network, station=station, location=location,
                 channel=channel, year=year, doy=doy, sds_type=sds_type)
             full_path = os.path.join(self.sds_root, filename)
-            full_paths = full_paths.union(glob.glob(full_path))
+            full_paths = full_paths.union(self._glob_data_files(full_path))
 
         return full_paths
 
@@ -317,6 +420,63 @@ class Client(object):
             msg = ("'endtime' must be after 'starttime'.")
             raise ValueError(msg)
         sds_type = sds_type or self.sds_type
+        nslc, start_ns, end_ns, sampling_rate = self._get_segments(
+            network, station, location, channel, starttime, endtime,
+            sds_type=sds_type)
+        keep = ~((end_ns < starttime._ns) | (start_ns > endtime._ns))
+        if not keep.any():
+            return (0, 1)
+        nslc = [nslc_ for nslc_, keep_ in zip(nslc, keep) if keep_]
+        start_ns, end_ns = start_ns[keep], end_ns[keep]
+        sampling_rate = sampling_rate[keep]
+
+        total_duration = endtime - starttime
+        # sum up gaps in the middle
+        delta = np.zeros_like(sampling_rate)
+        np.divide(1.0, sampling_rate, out=delta, where=sampling_rate != 0)
+        _, gaps = _find_gaps_ns(nslc, start_ns, end_ns, delta, sampling_rate)
+        gap_sum = sum(gap[3] for gap in gaps)
+        gap_count = len(gaps)
+        # check if we have a gap at start or end
+        earliest = UTCDateTime(ns=int(start_ns.min()))
+        latest = UTCDateTime(ns=int(end_ns.max()))
+        if earliest > starttime:
+            gap_sum += earliest - starttime
+            gap_count += 1
+        if latest < endtime:
+            gap_sum += endtime - latest
+            gap_count += 1
+
+        return (1 - (gap_sum / total_duration), gap_count)
+
+    def _get_segments(self, network, station, location, channel, starttime,
+                      endtime, sds_type=None):
+        """
+        Get start and end times of all contiguous segments of data in the
+        given time span, i.e. of the traces a headonly read would return.
+
+        For MiniSEED archives only the record headers are scanned (see
+        :func:`~obspy.io.mseed.util.get_record_headers`) without creating
+        any traces, other formats are read with ``headonly=True``.
+
+        :rtype: tuple
+        :returns: List of ``(network, station, location, channel)`` tuples
+            and arrays of start and end times in nanoseconds and of sampling
+            rates of all segments.
+        """
+        sds_type = sds_type or self.sds_type
+        if self.format == "MSEED":
+            segments = []
+            for full_path in sorted(self._get_filenames(
+                    network=network, station=station, location=location,
+                    channel=channel, starttime=starttime, endtime=endtime,
+                    sds_type=sds_type)):
+                segments.append(_get_record_segments(
+                    get_record_headers(full_path), network, station,
+                    location, channel, starttime=starttime,
+                    endtime=endtime))
+            return _concatenate_segments(segments)
+
         with warnings.catch_warnings():
             warnings.filterwarnings(
                 "ignore", _headonly_warning_msg, UserWarning,
@@ -340,30 +500,15 @@ class Client(object):
             for key in list(stream_warningregistry.keys()):
                 if key[0] == _headonly_warning_msg:
                     stream_warningregistry.pop(key)
-        st.sort(keys=['starttime', 'endtime'])
-        st.traces = [tr for tr in st
-                     if not (tr.stats.endtime < starttime or
-                             tr.stats.starttime > endtime)]
-
-        if not st:
-            return (0, 1)
-
-        total_duration = endtime - starttime
-        # sum up gaps in the middle
-        gaps = [gap[6] for gap in st.get_gaps()]
-        gap_sum = np.sum(gaps)
-        gap_count = len(gaps)
-        # check if we have a gap at start or end
-        earliest = min([tr.stats.starttime for tr in st])
-        latest = max([tr.stats.endtime for tr in st])
-        if earliest > starttime:
-            gap_sum += earliest - starttime
-            gap_count += 1
-        if latest < endtime:
-            gap_sum += endtime - latest
-            gap_count += 1
-
-        return (1 - (gap_sum / total_duration), gap_count)
+        nslc = [(tr.stats.network, tr.stats.station, tr.stats.location,
+                 tr.stats.channel) for tr in st]
+        start_ns = np.array([tr.stats.starttime._ns for tr in st],
+                            dtype=np.int64)
+        end_ns = np.array([tr.stats.endtime._ns for tr in st],
+                          dtype=np.int64)
+        sampling_rate = np.array([tr.stats.sampling_rate for tr in st],
+                                 dtype=np.float64)
+        return nslc, start_ns, end_ns, sampling_rate
 
     def _get_current_endtime(self, network, station, location, channel,
                              sds_type=None, stop_time=None,
@@ -416,7 +561,16 @@ class Client(object):
             filename = self._get_filename(
                 network=network, station=station, location=location,
                 channel=channel, time=time, sds_type=sds_type)
-            if os.path.isfile(filename):
+            if self._isfile(filename) and self.format == "MSEED":
+                # data is appended to the files, so the latest data is
+                # usually found in the last records
+                for tail in (_LATENCY_TAIL_RECORDS, None):
+                    _, _, end_ns, _ = _get_record_segments(
+                        get_record_headers(filename, tail=tail), network,
+                        station, location, channel)
+                    if len(end_ns):
+                        return UTCDateTime(ns=int(end_ns.max()))
+            elif self._isfile(filename):
                 try:
                     st = read(filename, format=self.format, headonly=True,
                               sourcename=seed_pattern)
@@ -509,7 +663,7 @@ class Client(object):
             network=network, station=station, location=location,
             channel=channel, sds_type=sds_type)
         pattern = os.path.join(self.sds_root, pattern)
-        if glob.glob(pattern):
+        if self._glob_data_files(pattern):
             return True
         else:
             return False
@@ -520,7 +674,9 @@ class Client(object):
 
         Note that this can be very slow on network file systems because every
         single file has to be touched (because available location codes can not
-        be discovered from folder structure alone).
+        be discovered from folder structure alone), unless the client uses a
+        persistent ``catalog`` (see
+        :meth:`~obspy.clients.filesystem.sds.Client.__init__`).
 
         :type sds_type: str
         :param sds_type: Override SDS data type identifier that was specified
@@ -545,7 +701,8 @@ class Client(object):
             pattern = os.path.join(self.sds_root, pattern)
         else:
             pattern = self._get_filename("*", "*", "*", "*", datetime)
-        all_files = glob.glob(pattern)
+        all_files = self._glob_data_files(pattern)
+        self._save_catalog()
         # set up inverse regex to extract kwargs/values from full paths
         pattern_ = os.path.join(self.sds_root, self.FMTSTR)
         group_map = {i: groups[0] for i, groups in
@@ -590,7 +747,8 @@ class Client(object):
             _wildcarded_except(["sds_type"]),
             fmtstr).format(sds_type=sds_type)
         pattern = os.path.join(self.sds_root, pattern)
-        all_files = glob.glob(pattern)
+        all_files = self._glob(pattern)
+        self._save_catalog()
         # set up inverse regex to extract kwargs/values from full paths
         pattern_ = os.path.join(self.sds_root, fmtstr)
         group_map = {i: groups[0] for i, groups in
@@ -612,6 +770,347 @@ class Client(object):
             result.add((network, station))
         return sorted(result)
 
+    def _glob(self, pattern):
+        """
+        Like :func:`glob.glob`, answered from the catalog if there is one.
+        """
+        if self.catalog is None:
+            return glob.glob(pattern)
+        return self.catalog.glob(pattern)
+
+    def _glob_data_files(self, pattern):
+        """
+        Like :meth:`_glob` but skips Mini-SEED index files (see
+        :func:`~obspy.io.mseed.index.build_index`) stored next to the data
+        files.
+        """
+        return [path for path in self._glob(pattern)
+                if not path.endswith(MSEED_INDEX_SUFFIX)]
+
+    def _isfile(self, path):
+        """
+        Like :func:`os.path.isfile`, answered from the catalog if there is
+        one.
+        """
+        if self.catalog is None:
+            return os.path.isfile(path)
+        return self.catalog.isfile(path)
+
+    def _save_catalog(self):
+        """
+        Persist the catalog after lookups that walk the whole archive.
+        """
+        if self.catalog is not None and self.catalog.filename:
+            self.catalog.save()
+
+
+class SDSCatalog(object):
+    """
+    Cached listing of all directories of an SDS archive.
+
+    The catalog keeps the names of the subdirectories and files of every
+    directory of the archive that was looked at, together with the
+    modification time of the directory. A directory only gets listed again
+    once its modification time changes, i.e. when files or subdirectories
+    were added, removed or renamed, so lookups only cause one ``stat`` per
+    directory involved instead of listing all of them. Listings of
+    directories modified within :attr:`RACY_SECONDS` before they were listed
+    are not trusted and are renewed on the next lookup, in case files were
+    added within the resolution of the file system timestamps.
+
+    The catalog can optionally be persisted to a JSON file, so that later
+    sessions start from the stored listing, e.g.:
+
+    >>> from obspy.clients.filesystem.sds import Client, SDSCatalog
+    >>> catalog = SDSCatalog("/my/SDS/archive/root",
+    ...                      filename="/my/SDS/catalog.json")  # doctest: +SKIP
+    >>> catalog.refresh()  # doctest: +SKIP
+    >>> client = Client("/my/SDS/archive/root",
+    ...                 catalog=catalog)  # doctest: +SKIP
+
+    :type sds_root: str
+    :param sds_root: Root directory of SDS archive.
+    :type filename: str
+    :param filename: Filename of a JSON file to load the catalog from (if
+        it exists) and to store it to in :meth:`save`.
+    """
+    RACY_SECONDS = 2
+    _VERSION = 1
+
+    def __init__(self, sds_root, filename=None):
+        self.sds_root = sds_root
+        self.filename = filename
+        # relative path of each directory mapped to its modification time,
+        # the time of listing it (both in nanoseconds) and the lists of
+        # names of subdirectories and files in it
+        self._directories = {}
+        self._changed = False
+        if filename is not None:
+            self._load()
+
+    def _load(self):
+        try:
+            with open(self.filename, 'r') as fh:
+                catalog = json.load(fh)
+            if catalog['version'] == self._VERSION and \
+                    catalog['sds_root'] == os.path.abspath(self.sds_root):
+                self._directories = catalog['directories']
+        except Exception:
+            pass
+
+    def save(self):
+        """
+        Store the catalog to its file (if there were any changes).
+
+        Failing to write the file is silently ignored.
+        """
+        if self.filename is None or not self._changed:
+            return
+        catalog = {'version': self._VERSION,
+                   'sds_root': os.path.abspath(self.sds_root),
+                   'directories': self._directories}
+        try:
+            with _atomic_write(self.filename) as fh:
+                json.dump(catalog, fh)
+        except Exception:
+            return
+        self._changed = False
+
+    def refresh(self):
+        """
+        Update the listings of all directories of the archive that changed
+        and store the catalog to its file (if any).
+        """
+        visited = set()
+        todo = [""]
+        while todo:
+            relpath = todo.pop()
+            listing = self._list_directory(relpath)
+            if listing is None:
+                continue
+            visited.add(relpath)
+            todo.extend(os.path.join(relpath, name) for name in listing[2])
+        for relpath in set(self._directories) - visited:
+            del self._directories[relpath]
+            self._changed = True
+        self.save()
+
+    def glob(self, pattern):
+        """
+        Like :func:`glob.glob` for an absolute pattern within the archive.
+
+        Patterns outside of the archive root are passed to :func:`glob.glob`.
+
+        :rtype: list[str]
+        """
+        prefix = os.path.join(self.sds_root, "")
+        if not pattern.startswith(prefix):
+            return glob.glob(pattern)
+        parts = pattern[len(prefix):].split(os.sep)
+        # literal leading directories do not need to be listed
+        i = 0
+        while i < len(parts) - 1 and not glob.has_magic(parts[i]):
+            i += 1
+        results = []
+        todo = [(os.path.join(*parts[:i]) if i else "", i)]
+        while todo:
+            relpath, i = todo.pop()
+            listing = self._list_directory(relpath)
+            if listing is None:
+                continue
+            part = parts[i]
+            last = i == len(parts) - 1
+            names = listing[2] + listing[3] if last else listing[2]
+            if not glob.has_magic(part):
+                names = [part] if part in names else []
+            else:
+                names = fnmatch.filter(names, part)
+                if not part.startswith('.'):
+                    names = [name for name in names
+                             if not name.startswith('.')]
+            for name in names:
+                if last:
+                    results.append(os.path.join(self.sds_root, relpath, name))
+                else:
+                    todo.append((os.path.join(relpath, name), i + 1))
+        return sorted(results)
+
+    def isfile(self, path):
+        """
+        Like :func:`os.path.isfile` for a path within the archive.
+
+        :rtype: bool
+        """
+        prefix = os.path.join(self.sds_root, "")
+        if not path.startswith(prefix):
+            return os.path.isfile(path)
+        relpath, name = os.path.split(path[len(prefix):])
+        listing = self._list_directory(relpath)
+        return listing is not None and name in listing[3]
+
+    def _list_directory(self, relpath):
+        """
+        Returns the (possibly cached) listing of a directory or ``None`` if
+        it does not exist.
+        """
+        path = os.path.join(self.sds_root, relpath)
+        listing = self._directories.get(relpath)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+            if listing is not None and listing[0] == mtime and \
+                    mtime < listing[1] - self.RACY_SECONDS * 10 ** 9:
+                return listing
+            listed = time.time_ns()
+            dirs = []
+            files = []
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        dirs.append(entry.name)
+                    else:
+                        files.append(entry.name)
+        except OSError:
+            if listing is not None:
+                del self._directories[relpath]
+                self._changed = True
+            return None
+        listing = [mtime, listed, sorted(dirs), sorted(files)]
+        self._directories[relpath] = listing
+        self._changed = True
+        return listing
+
+
+def _get_record_segments(headers, network, station, location, channel,
+                         starttime=None, endtime=None):
+    """
+    Group the data records of a MiniSEED file into contiguous segments of
+    data.
+
+    Only records matching the given (possibly wildcarded) SEED codes and
+    overlapping the given time span are used. Records are joined in the same
+    way as by the MiniSEED reader, i.e. each segment corresponds to one trace
+    read with ``headonly=True``.
+
+    :type headers: :class:`numpy.ndarray`
+    :param headers: Record headers as returned by
+        :func:`~obspy.io.mseed.util.get_record_headers`.
+    :rtype: tuple
+    :returns: List of ``(network, station, location, channel)`` tuples and
+        arrays of start and end times in nanoseconds and of sampling rates
+        of all segments.
+    """
+    keep = np.ones(len(headers), dtype=bool)
+    if starttime is not None:
+        keep &= headers['endtime'] >= starttime._ns
+    if endtime is not None:
+        keep &= headers['starttime'] <= endtime._ns
+    # same matching of SEED codes as Stream.select(), matching each distinct
+    # code only once
+    ids = np.zeros(len(headers), dtype=np.int64)
+    for key, pattern in (("network", network), ("station", station),
+                         ("location", location), ("channel", channel),
+                         ("dataquality", None)):
+        codes, inverse = _factorize(headers[key])
+        if pattern is not None:
+            matches = np.array([
+                fnmatch.fnmatch(code.upper(), pattern.upper())
+                for code in codes], dtype=bool)
+            keep &= matches[inverse]
+        ids = ids * len(codes) + inverse
+    headers = headers[keep]
+    ids = ids[keep]
+    if not len(headers):
+        return [], np.empty(0, np.int64), np.empty(0, np.int64), \
+            np.empty(0, np.float64)
+
+    # records are appended to the latest segment of their SEED id and
+    # quality (keeping the order of the records in the file) if they follow
+    # it within half a sample
+    order = np.argsort(ids, kind="stable")
+    headers = headers[order]
+    ids = ids[order]
+    rate = headers["samp_rate"]
+    npts = headers["npts"]
+    # sample period in microseconds like libmseed's high precision time
+    with np.errstate(divide="ignore", invalid="ignore"):
+        hpdelta = np.where(rate > 0, 1e6 / rate, 0).astype(np.int64) * 1000
+        rate_tolerable = np.abs(1.0 - rate[:-1] / rate[1:]) < 0.0001
+    tolerance = (hpdelta[:-1] // 2000) * 1000
+    lastgap = headers["starttime"][1:] - headers["endtime"][:-1] - \
+        hpdelta[:-1]
+    joined = ((ids[1:] == ids[:-1]) & (npts[1:] > 0) & (npts[:-1] > 0) &
+              rate_tolerable & (lastgap <= tolerance) &
+              (lastgap >= -tolerance))
+    first = np.concatenate([[0], np.nonzero(~joined)[0] + 1])
+    start_ns = headers["starttime"][first]
+    sampling_rate = headers["samp_rate"][first]
+    npts = np.add.reduceat(npts, first)
+    # end time as computed by Stats from number of samples and sampling rate
+    delta = np.zeros_like(sampling_rate)
+    np.divide(1.0, sampling_rate, out=delta, where=sampling_rate != 0)
+    end_ns = start_ns + np.round(
+        np.maximum(npts - 1, 0) * delta * 1e9).astype(np.int64)
+    nslc = list(zip(*[headers[key][first].tolist() for key in (
+        "network", "station", "location", "channel")]))
+    return nslc, start_ns, end_ns, sampling_rate
+
+
+def _factorize(values):
+    """
+    Return the distinct values of an array and the indices into them that
+    reconstruct the array, like :func:`numpy.unique` with
+    ``return_inverse=True``.
+
+    Avoids sorting in the common case of all values being the same, e.g.
+    the SEED codes of all records of one file of an SDS archive.
+    """
+    if len(values) and (values == values[0]).all():
+        return values[:1], np.zeros(len(values), dtype=np.int64)
+    codes, inverse = np.unique(values, return_inverse=True)
+    return codes, inverse.ravel().astype(np.int64)
+
+
+def _concatenate_segments(segments):
+    """
+    Concatenate the outputs of several :func:`_get_record_segments` calls.
+    """
+    nslc = [nslc_ for segment in segments for nslc_ in segment[0]]
+    arrays = [np.concatenate([segment[i] for segment in segments] or
+                             [np.empty(0, dtype)])
+              for i, dtype in ((1, np.int64), (2, np.int64),
+                               (3, np.float64))]
+    return [nslc] + arrays
+
+
+def _parse_bulk_line(network, station, location, channel, starttime,
+                     endtime, merge=-1, sds_type=None):
+    """
+    Unpack and check a single line of a bulk request, see
+    :meth:`Client.get_waveforms_bulk`.
+    """
+    if starttime >= endtime:
+        msg = ("'endtime' must be after 'starttime'.")
+        raise ValueError(msg)
+    return (network, station, location, channel, starttime, endtime, merge,
+            sds_type)
+
+
+def _select_trim_merge(st, network, station, location, channel, starttime,
+                       endtime, merge):
+    """
+    Final processing of the data read for a single waveform request.
+    """
+    # make sure we only have the desired data, just in case the file
+    # contents do not match the expected SEED id
+    st = st.select(network=network, station=station, location=location,
+                   channel=channel)
+    st.trim(starttime, endtime)
+    if merge is None or merge is False:
+        pass
+    else:
+        st.merge(merge)
+    return st
+
 
 def _wildcarded_except(exclude=[]):
     """
@@ -1,14 +1,18 @@
 # -*- coding: utf-8 -*-
+import glob
 import os
 import re
 import shutil
 import tempfile
+from unittest import mock
 
 import numpy as np
+import pytest
 
 from obspy import UTCDateTime, Trace, Stream
 from obspy.core.util.misc import TemporaryWorkingDirectory
-from obspy.clients.filesystem.sds import SDS_FMTSTR, Client
+from obspy.clients.filesystem.sds import SDS_FMTSTR, Client, SDSCatalog
+from obspy.io.mseed import build_index
 from obspy.scripts.sds_html_report import main as sds_report
 
 
@@ -127,6 +131,27 @@ class TestSDS():
                 st = client.get_waveforms(net, sta, loc, cha, t - 200, t + 200)
                 assert len(st) == 1
 
+    def test_read_from_sds_with_mseed_index(self):
+        """
+        Test reading from SDS with MiniSEED index files next to the data
+        files.
+        """
+        t = UTCDateTime("2015-123T00:00:00")
+        with TemporarySDSDirectory(year=None, doy=None, time=t) as temp_sds:
+            client = Client(temp_sds.tempdir)
+            st = client.get_waveforms("*", "*", "*", "HH?", t - 20, t + 20)
+            nslc = client.get_all_nslc()
+            for tr in temp_sds.stream:
+                t_ = tr.stats.starttime
+                build_index(os.path.join(
+                    temp_sds.tempdir, SDS_FMTSTR.format(
+                        year=t_.year, doy=t_.julday, sds_type="D",
+                        **tr.stats)))
+            st2 = client.get_waveforms("*", "*", "*", "HH?", t - 20, t + 20)
+            assert len(st) == 24
+            assert st == st2
+            assert client.get_all_nslc() == nslc
+
     def test_read_from_sds_with_wildcarded_seed_ids(self):
         """
         Test reading data with wildcarded SEED IDs.
@@ -250,6 +275,44 @@ class TestSDS():
             assert st[4].stats.channel == "BHN"
             assert st[5].stats.channel == "BHE"
 
+    def test_get_waveforms_bulk_concurrent(self):
+        """
+        Concurrent bulk requests give the same result as serial ones.
+        """
+        year = 2015
+        doy = 247
+        t = UTCDateTime("%d-%03dT00:00:00" % (year, doy))
+        with TemporarySDSDirectory(year=year, doy=doy) as temp_sds:
+            chunks = [
+                ["CD", "ZZZ3", "00", "BHZ", t - 200, t + 80],
+                ["AB", "XYZ", "", "HHZ", t, t + 20],
+                ["AB", "XYZ", "", "HH?", t - 100, t + 40, None],
+                # same file as above, overlapping windows
+                ["AB", "XYZ", "", "HHZ", t - 50, t + 30],
+                ["AB", "*", "00", "BHE", t + 40, t + 60, -1, "D"],
+                # no data
+                ["AB", "XYZ", "", "HHZ", t + 1000, t + 2000],
+                ["XX", "XYZ", "", "HHZ", t, t + 20],
+            ]
+            client = Client(temp_sds.tempdir)
+            expected = client.get_waveforms_bulk(chunks)
+            st = client.get_waveforms_bulk(chunks, workers=4)
+            assert len(st) == len(expected) == 8
+            for tr, tr2 in zip(st, expected):
+                # processing information differs in the time window that
+                # was read from the files
+                tr.stats.pop('processing', None)
+                tr2.stats.pop('processing', None)
+                assert tr.stats == tr2.stats
+                np.testing.assert_array_equal(tr.data, tr2.data)
+            # traces of different requests do not share data
+            for i, tr in enumerate(st):
+                for tr2 in st[i + 1:]:
+                    assert not np.shares_memory(tr.data, tr2.data)
+            with pytest.raises(ValueError, match='must be after'):
+                client.get_waveforms_bulk(
+                    [["AB", "XYZ", "", "HHZ", t + 20, t]], workers=4)
+
     def test_get_all_stations_and_nslc(self):
         """
         Test `get_all_stations` and `get_all_nslc` methods
@@ -279,3 +342,113 @@ class TestSDS():
             assert [] == got_nslc
             got_nslc = client.get_all_nslc(datetime=t - 2 * 24 * 3600)
             assert [] == got_nslc
+
+    def test_catalog(self, tmp_path):
+        """
+        Test answering lookups from a cached listing of the archive.
+        """
+        t = UTCDateTime()
+        with TemporarySDSDirectory(year=None, doy=None, time=t) as temp_sds:
+            client = Client(temp_sds.tempdir)
+            filename = str(tmp_path / 'catalog.json')
+            client2 = Client(temp_sds.tempdir, catalog=filename)
+            client2.catalog.RACY_SECONDS = 0
+            for client_ in (client, client2, Client(temp_sds.tempdir,
+                                                    catalog=True)):
+                assert client_.get_all_stations() == \
+                    client.get_all_stations()
+                assert client_.get_all_nslc() == client.get_all_nslc()
+                assert client_.get_all_nslc(datetime=t) == \
+                    client.get_all_nslc(datetime=t)
+                assert client_.has_data("AB", "XYZ", "", "HHZ")
+                assert not client_.has_data("AB", "XYZ", "", "LHZ")
+                assert client_.get_latency("AB", "XYZ", "", "HHZ") is not None
+                assert client_.get_waveforms("*", "*", "*", "HH?", t - 20,
+                                             t + 20) == \
+                    client.get_waveforms("*", "*", "*", "HH?", t - 20, t + 20)
+            # the catalog was persisted and unchanged directories are not
+            # listed again
+            assert os.path.isfile(filename)
+            catalog = SDSCatalog(temp_sds.tempdir, filename=filename)
+            catalog.RACY_SECONDS = 0
+            client3 = Client(temp_sds.tempdir, catalog=catalog)
+            expected = client.get_all_nslc()
+            with mock.patch('os.scandir', wraps=os.scandir) as scandir:
+                assert client3.get_all_nslc() == expected
+                assert scandir.call_count == 0
+            # new and removed files are picked up
+            dirname = os.path.join(temp_sds.tempdir, str(t.year), "AB", "XYZ",
+                                   "HHZ.D")
+            new_file = os.path.join(dirname, "AB.XYZ.99.HHZ.D.%d.%03d" % (
+                t.year, t.julday))
+            shutil.copy(client._get_filename("AB", "XYZ", "", "HHZ", t),
+                        new_file)
+            with mock.patch('os.scandir', wraps=os.scandir) as scandir:
+                nslc = client3.get_all_nslc()
+                assert scandir.call_count == 1
+            assert ("AB", "XYZ", "99", "HHZ") in nslc
+            assert nslc == client.get_all_nslc()
+            shutil.rmtree(os.path.join(temp_sds.tempdir, str(t.year), "CD"))
+            assert client3.get_all_stations() == client.get_all_stations()
+            assert client3.get_all_nslc() == client.get_all_nslc()
+            # refresh drops listings of removed directories
+            catalog.refresh()
+            assert not any(relpath.startswith(os.path.join(str(t.year), "CD"))
+                           for relpath in catalog._directories)
+            catalog = SDSCatalog(temp_sds.tempdir, filename=filename)
+            assert catalog.glob(os.path.join(temp_sds.tempdir, "*", "*")) == \
+                sorted(glob.glob(os.path.join(temp_sds.tempdir, "*", "*")))
+            # failing to store the catalog leaves no temporary file behind
+            catalog._changed = True
+            with mock.patch('json.dump', side_effect=OSError):
+                catalog.save()
+            assert catalog._changed
+            assert os.listdir(str(tmp_path)) == ['catalog.json']
+
+    def test_availability_and_latency_from_record_headers(self, tmp_path):
+        """
+        Test computing availability and latency of MiniSEED archives from
+        the record headers matches reading the files with ``headonly=True``.
+        """
+        t = UTCDateTime(2020, 1, 1)
+        st = Stream()
+        for loc, sampling_rate in (("", 100.0), ("00", 20.0)):
+            tr = Trace(data=np.arange(20000, dtype=np.int32), header=dict(
+                network="AB", station="XYZ", location=loc, channel="HHZ",
+                sampling_rate=sampling_rate, starttime=t + 10))
+            # one gap and one overlap
+            st += tr.slice(endtime=t + 60)
+            st += tr.slice(starttime=t + 65, endtime=t + 80)
+            st += tr.slice(starttime=t + 70)
+        for tr in st:
+            full_path = os.path.join(str(tmp_path), SDS_FMTSTR.format(
+                year=t.year, doy=t.julday, sds_type="D", **tr.stats))
+            os.makedirs(os.path.dirname(full_path), exist_ok=True)
+            with open(full_path, "ab") as fh:
+                tr.write(fh, format="MSEED", reclen=512)
+        client = Client(str(tmp_path))
+        # file format autodetection reads the files with headonly=True
+        client_headonly = Client(str(tmp_path), format=None)
+        for args in ((t, t + 3600), (t + 20, t + 75), (t + 100, t + 3600),
+                     (t + 61, t + 64.5), (t - 100, t - 10)):
+            for loc in ("", "00", "*", "1?"):
+                expected = client_headonly.get_availability_percentage(
+                    "AB", "XYZ", loc, "HHZ", *args)
+                got = client.get_availability_percentage(
+                    "AB", "XYZ", loc, "HHZ", *args)
+                assert got[1] == expected[1]
+                assert got[0] == pytest.approx(expected[0], abs=1e-9)
+        # one gap and one overlap per channel plus the missing start
+        assert client.get_availability_percentage(
+            "AB", "XYZ", "*", "HHZ", t, t + 100)[1] == 5
+        for loc in ("", "00"):
+            expected = client_headonly._get_current_endtime(
+                "AB", "XYZ", loc, "HHZ", stop_time=t - 86400)
+            assert expected is not None
+            with mock.patch("obspy.clients.filesystem.sds.read") as read:
+                got = client._get_current_endtime(
+                    "AB", "XYZ", loc, "HHZ", stop_time=t - 86400)
+                assert read.call_count == 0
+            assert got == expected
+        assert client._get_current_endtime(
+            "AB", "XYZ", "10", "HHZ", stop_time=t - 86400) is None
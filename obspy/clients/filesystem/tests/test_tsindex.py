@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 import os
 import re
+import shutil
 import tempfile
 import uuid
 from collections import namedtuple
@@ -162,6 +163,59 @@ class TestClient():
                                   endtime=UTCDateTime(2018, 1, 1, 0, 0, 3, 1))
         assert returned_stream.traces == []
 
+    def test_get_waveforms_bulk_single_open(self, filepath, client):
+        """
+        Test that all requested sections of a file are read with a single
+        open and that only the requested data is returned.
+        """
+        t = UTCDateTime(2018, 1, 1)
+        bulk_request = [("IU", "ANMO", "10", "BHZ", t + i, t + i + 3)
+                        for i in (2, 20, 40)]
+        bulk_request.append(("CU", "TGUH", "00", "BHZ", t + 2, t + 5))
+        with mock.patch('obspy.clients.filesystem.miniseed.open',
+                        wraps=open, create=True) as open_:
+            st = client.get_waveforms_bulk(list(bulk_request), merge=None)
+        assert sorted(os.path.basename(call[0][0])
+                      for call in open_.call_args_list) == [
+            'CU.TGUH.00.BHZ.2018.001_first_minute.mseed',
+            'IU.ANMO.10.BHZ.2018.001_first_minute.mseed']
+        st.merge(-1)
+        assert len(st) == 4
+        for net, sta, loc, cha, starttime, endtime in bulk_request:
+            expected = read(
+                filepath / '{0}/2018/001/{0}.{1}.{2}.{3}.2018.001_first_'
+                           'minute.mseed'.format(net, sta, loc, cha),
+                starttime=starttime, endtime=endtime)
+            got = st.select(station=sta).slice(starttime - 1, endtime + 1)
+            assert len(got) == 1
+            assert got[0].stats.starttime == expected[0].stats.starttime
+            assert list(got[0].data) == list(expected[0].data)
+
+    def test_get_waveforms_bulk_overlapping_requests(self, filepath,
+                                                     client):
+        """
+        Data matched by several identical request rows is only returned once,
+        overlapping request windows still return the data of each window.
+        """
+        t = UTCDateTime(2018, 1, 1)
+        expected = read(filepath / 'CU/2018/001/'
+                        'CU.TGUH.00.BHZ.2018.001_first_minute.mseed')
+        for bulk_request in (
+                [("CU", "TGUH", "00", "BHZ", t, t + 60)] * 2,
+                [("CU", "TGUH", "00", "BHZ", t, t + 60),
+                 ("CU", "TGUH", "00", "BH?", t, t + 60)]):
+            st = client.get_waveforms_bulk(bulk_request, merge=None)
+            assert len(st) == 1
+            assert list(st[0].data) == list(expected[0].data)
+        bulk_request = [("IU", "ANMO", "10", "BHZ", t + 2, t + 20),
+                        ("IU", "ANMO", "10", "BH*", t + 10, t + 30)]
+        st = client.get_waveforms_bulk(list(bulk_request), merge=None)
+        filename = (filepath / 'IU/2018/001/'
+                    'IU.ANMO.10.BHZ.2018.001_first_minute.mseed')
+        assert sum(tr.stats.npts for tr in st) == sum(
+            read(filename, starttime=starttime, endtime=endtime)[0].stats.npts
+            for _, _, _, _, starttime, endtime in bulk_request)
+
     def test_get_nslc(self, client):
         # test using actual sqlite3 test database
         expected_nslc = [(u'CU', u'TGUH', u'00', u'BHZ')]
@@ -692,57 +746,110 @@ class TestIndexer():
                               parallel=2)
             if indexer._is_index_cmd_installed():
                 indexer.run(relative_paths=True)
-                keys = ['network', 'station', 'location', 'channel',
-                        'quality', 'starttime', 'endtime', 'samplerate',
-                        'filename', 'byteoffset', 'bytes', 'hash',
-                        'timeindex', 'timespans', 'timerates', 'format']
-                NamedRow = namedtuple('NamedRow',
-                                      keys)
-
-                expected_tsindex_data = \
-                    [
-                     NamedRow(
-                        "CU", "TGUH", "00", "BHZ", None,
-                        "2018-01-01T00:00:00",
-                        "2018-01-01T00:01:00", 40.0,
-                        "CU/2018/001/"
-                        "CU.TGUH.00.BHZ.2018.001_first_minute.mseed",
-                        0, 4096, "aaaac5315f84cdd174fd8360002a1e3a",
-                        "1514764800.000000=>0,latest=>1",
-                        "[1514764800.000000:1514764860.000000]", None, None),
-                     NamedRow(
-                        "IU", "ANMO", "10", "BHZ", None,
-                        "2018-01-01T00:00:00.019500",
-                        "2018-01-01T00:00:59.994536", 40.0,
-                        "IU/2018/001/"
-                        "IU.ANMO.10.BHZ.2018.001_first_minute.mseed",
-                        0, 2560, "36a771ca1dc648c505873c164d8b26f2",
-                        "1514764800.019500=>0,latest=>1",
-                        "[1514764800.019500:1514764859.994536]", None, None),
-                     NamedRow(
-                        "IU", "COLA", "10", "BHZ", None,
-                        "2018-01-01T00:00:00.019500",
-                        "2018-01-01T00:00:59.994538", 40.0,
-                        "IU/2018/001/"
-                        "IU.COLA.10.BHZ.2018.001_first_minute.mseed",
-                        0, 5120, "4ccbb97573ca00ef8c2c4f9c01d27ddf",
-                        "1514764800.019500=>0,latest=>1",
-                        "[1514764800.019500:1514764859.994538]", None, None)]
-                db_handler = TSIndexDatabaseHandler(database=database)
-                tsindex_data = db_handler._fetch_index_rows([("I*,C*", "*",
-                                                              "0?,1?", "*",
-                                                              "2018-01-01",
-                                                              "2018-02-01")])
-
-                for i in range(0, len(expected_tsindex_data)):
-                    for j in range(0, len(keys)):
-                        assert getattr(
-                            expected_tsindex_data[i], keys[j]) == \
-                            getattr(tsindex_data[i], keys[j])
-                assert len(tsindex_data) == len(expected_tsindex_data)
+                self._check_tsindex_data(database)
         finally:
             purge(filepath, '^{}.*$'.format(fname))
 
+    def test_run_builtin(self, filepath, tmp_path):
+        """
+        Test indexing with the built-in indexer, which writes the same rows
+        as mseedindex, and re-indexing of modified files.
+        """
+        root = tmp_path / 'data'
+        shutil.copytree(filepath, root,
+                        ignore=shutil.ignore_patterns('*.sqlite'))
+        database = str(tmp_path / 'timeseries.sqlite')
+        indexer = Indexer(str(root), database=database,
+                          filename_pattern="*.mseed", parallel=2,
+                          index_cmd=None)
+        indexer.run(relative_paths=True)
+        self._check_tsindex_data(database)
+        db_handler = TSIndexDatabaseHandler(database=database)
+        assert db_handler.has_tsindex_summary()
+        client = Client(database, datapath_replace=("^", str(root) + '/'))
+        t = UTCDateTime("2018-01-01T00:00:10")
+        st = client.get_waveforms("*", "*", "*", "BHZ", t, t + 5)
+        assert len(st) == 3
+        # nothing to do for unchanged files
+        with pytest.raises(OSError, match="^No unindexed files"):
+            indexer.build_file_list(reindex=False, relative_paths=True)
+        # append data with a gap to one of the files
+        filename = os.path.normpath(
+            'IU/2018/001/IU.ANMO.10.BHZ.2018.001_first_minute.mseed')
+        tr = read(str(root / filename))[0]
+        tr.stats.starttime += 120
+        with open(str(root / filename), 'ab') as fh:
+            tr.write(fh, format='MSEED', reclen=512)
+        assert indexer.build_file_list(reindex=False,
+                                       relative_paths=True) == [filename]
+        indexer.run(relative_paths=True)
+        rows = db_handler._fetch_index_rows([(
+            "IU", "ANMO", "10", "BHZ", "2018-01-01", "2018-02-01")])
+        assert len(rows) == 1
+        assert rows[0].bytes == os.path.getsize(str(root / filename))
+        assert rows[0].endtime == str(tr.stats.endtime)[:-1]
+        assert rows[0].timespans == (
+            "[1514764800.019500:1514764859.994536],"
+            "[{:.6f}:{:.6f}]".format(tr.stats.starttime.timestamp,
+                                     tr.stats.endtime.timestamp))
+        assert len(db_handler._fetch_index_rows()) == 3
+        st = client.get_waveforms("IU", "ANMO", "10", "BHZ", t + 120, t + 125)
+        assert len(st) == 1
+        assert abs(st[0].stats.starttime - (t + 120)) <= st[0].stats.delta
+
+    def _check_tsindex_data(self, database):
+        """
+        Check the rows of a database created for the test data.
+        """
+        keys = ['network', 'station', 'location', 'channel',
+                'quality', 'starttime', 'endtime', 'samplerate',
+                'filename', 'byteoffset', 'bytes', 'hash',
+                'timeindex', 'timespans', 'timerates', 'format']
+        NamedRow = namedtuple('NamedRow',
+                              keys)
+
+        expected_tsindex_data = \
+            [
+             NamedRow(
+                "CU", "TGUH", "00", "BHZ", None,
+                "2018-01-01T00:00:00",
+                "2018-01-01T00:01:00", 40.0,
+                "CU/2018/001/"
+                "CU.TGUH.00.BHZ.2018.001_first_minute.mseed",
+                0, 4096, "aaaac5315f84cdd174fd8360002a1e3a",
+                "1514764800.000000=>0,latest=>1",
+                "[1514764800.000000:1514764860.000000]", None, None),
+             NamedRow(
+                "IU", "ANMO", "10", "BHZ", None,
+                "2018-01-01T00:00:00.019500",
+                "2018-01-01T00:00:59.994536", 40.0,
+                "IU/2018/001/"
+                "IU.ANMO.10.BHZ.2018.001_first_minute.mseed",
+                0, 2560, "36a771ca1dc648c505873c164d8b26f2",
+                "1514764800.019500=>0,latest=>1",
+                "[1514764800.019500:1514764859.994536]", None, None),
+             NamedRow(
+                "IU", "COLA", "10", "BHZ", None,
+                "2018-01-01T00:00:00.019500",
+                "2018-01-01T00:00:59.994538", 40.0,
+                "IU/2018/001/"
+                "IU.COLA.10.BHZ.2018.001_first_minute.mseed",
+                0, 5120, "4ccbb97573ca00ef8c2c4f9c01d27ddf",
+                "1514764800.019500=>0,latest=>1",
+                "[1514764800.019500:1514764859.994538]", None, None)]
+        db_handler = TSIndexDatabaseHandler(database=database)
+        tsindex_data = db_handler._fetch_index_rows([("I*,C*", "*",
+                                                      "0?,1?", "*",
+                                                      "2018-01-01",
+                                                      "2018-02-01")])
+
+        for i in range(0, len(expected_tsindex_data)):
+            for j in range(0, len(keys)):
+                assert getattr(
+                    expected_tsindex_data[i], keys[j]) == \
+                    getattr(tsindex_data[i], keys[j])
+        assert len(tsindex_data) == len(expected_tsindex_data)
+
 
 class TestTSIndexDatabaseHandler():
 
@@ -796,6 +903,37 @@ class TestTSIndexDatabaseHandler():
               "2018-12-31T00:00:00.000000")])
         assert ts_summary_data == []
 
+    def test__fetch_index_rows_sqlite(self, filepath):
+        """
+        Test the SQLite query path returns the same rows as the generic
+        query path.
+        """
+        db_path = os.path.join(filepath, 'timeseries.sqlite')
+        request_handler = TSIndexDatabaseHandler(db_path)
+        assert request_handler.sqlite
+        t = UTCDateTime(2018, 1, 1)
+        for query_rows in (
+                None,
+                [("IU", "ANMO", "10", "BHZ", t, t + 10)],
+                [("I*,C*", "*", "0?,1?", "*", "2018-01-01", "2018-02-01")],
+                [("IU", "ANMO", "10", "BHZ", t, t + 10),
+                 ("IU", "*", "*", "BHZ", t + 20, t + 30),
+                 ("CU", "TGUH", "00", "BHZ", None, None)],
+                [("IU", "ANMO", "10", "BHZ", t, t + 10)] * 2,
+                [("IU", "ANMO", "10", "BHZ", t, t + 10),
+                 ("IU", "ANMO", "10", "BH?", t, t + 10),
+                 ("IU", "ANMO", "10", "BH*", t + 5, t + 20)],
+                [("XX", "ANMO", "10", "BHZ", t, t + 10)]):
+            request_handler.sqlite = True
+            rows = request_handler._fetch_index_rows(
+                query_rows and list(query_rows))
+            request_handler.sqlite = False
+            expected = request_handler._fetch_index_rows(
+                query_rows and list(query_rows))
+            assert rows == expected
+        assert len(rows) == 0
+        assert len(expected) == 0
+
     def test_get_tsindex_summary_cte(self, filepath):
         # test with actual sqlite3 database that is missing a summary table
         # a tsindex summary CTE gets created using the tsindex at runtime
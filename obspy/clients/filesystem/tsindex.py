@@ -120,7 +120,9 @@ Indexer Usage
 
 The :class:`~Indexer` provides a high level
 API for indexing a directory tree of miniSEED files using the EarthScope
-`mseedindex <https://github.com/EarthScope/mseedindex/>`_ software.
+`mseedindex <https://github.com/EarthScope/mseedindex/>`_ software. If
+``mseedindex`` is not available, ``index_cmd=None`` selects a built-in
+indexer that writes the same database rows.
 
 An important feature of this module is the ability to index data files
 in parallel, making it convenient for indexing large data sets of many
@@ -151,13 +153,18 @@ directory. The name of the index database can be changed by supplying the
 
 import copyreg
 import datetime
+import hashlib
+import io
+import json
 import logging
+import numpy as np
 import os
 import sqlalchemy as sa
 import subprocess
 import types
 
 from collections import namedtuple
+from functools import partial
 from glob import glob
 from multiprocessing import Pool
 from os.path import relpath
@@ -172,9 +179,27 @@ from obspy.clients.filesystem.db import _get_tsindex_table, \
     _get_tsindex_summary_table
 from obspy.core.stream import Stream
 from obspy.core.util.decorator import deprecated_keywords
+from obspy.io.mseed.util import get_record_headers
 
 logger = logging.getLogger('obspy.clients.filesystem.tsindex')
 
+# number of files whose rows are written in one transaction by the built-in
+# indexer
+_INDEX_BATCH_SIZE = 100
+# publication versions of miniSEED 2 data quality codes, as set by mseedindex
+_PUBLICATION_VERSIONS = {'R': 1, 'D': 2, 'Q': 3, 'M': 4}
+# columns of the tsindex table
+_TSINDEX_COLUMNS = ['network', 'station', 'location', 'channel', 'quality',
+                    'version', 'starttime', 'endtime', 'samplerate',
+                    'filename', 'byteoffset', 'bytes', 'hash', 'timeindex',
+                    'timespans', 'timerates', 'format', 'filemodtime',
+                    'updated', 'scanned']
+# rows returned by TSIndexDatabaseHandler._fetch_index_rows()
+_IndexRow = namedtuple('NamedRow',
+                       _TSINDEX_COLUMNS + ['requeststart', 'requestend'])
+# SQL statements used by TSIndexDatabaseHandler._fetch_index_rows_sqlite()
+_INDEX_ROWS_STATEMENTS = {}
+
 
 def _pickle_method(m):
     """
@@ -894,6 +919,9 @@ class Indexer(object):
     from ``root_path`` and run ``index_cmd`` for each target file found that
     is not already in the index. After all new files are indexed a summary
     table is generated with the extents of each timeseries.
+
+    With ``index_cmd=None`` the files are indexed by ObsPy itself instead,
+    writing the same rows as mseedindex.
     """
     @deprecated_keywords({"leap_seconds_file": None})
     @deprecated_keywords({"loglevel": None})
@@ -913,14 +941,19 @@ class Indexer(object):
             if one does not already exists at the specified path.
         :type index_cmd: str
         :param index_cmd: Command to be run for each target file found that
-            is not already in the index
+            is not already in the index. If ``None``, the files are scanned
+            by a built-in indexer that does not need mseedindex to be
+            installed. It writes the rows of all files to the database in
+            batches, each in a single transaction.
         :type bulk_params: dict
         :param bulk_params: Dictionary of options to pass to ``index_cmd``.
+            Not used by the built-in indexer.
         :type filename_pattern: str
         :param filename_pattern: Glob pattern to determine what files to index.
         :type parallel: int
-        :param parallel: Max number of ``index_cmd`` instances to run in
-            parallel. By default a max of 5 parallel process are run.
+        :param parallel: Max number of ``index_cmd`` instances (or processes
+            scanning files with the built-in indexer) to run in parallel. By
+            default a max of 5 parallel process are run.
         :param loglevel: DEPRECATED and without effect
         :param leap_seconds_file: DEPRECATED and without effect
         """
@@ -962,10 +995,12 @@ class Indexer(object):
             the index and have not been modified.  The ``reindex`` option can
             be set to ``True`` to force a re-indexing of all files regardless.
         """
-        if self._is_index_cmd_installed() is False:
+        if self.index_cmd is not None and \
+                self._is_index_cmd_installed() is False:
             raise OSError(
                     "Required program '{}' is not installed. Hint: Install "
-                    "mseedindex at https://github.com/EarthScope/mseedindex/."
+                    "mseedindex at https://github.com/EarthScope/mseedindex/ "
+                    "or use the built-in indexer with index_cmd=None."
                     .format(self.index_cmd))
         if self.request_handler.sqlite:
             self.request_handler._set_sqlite_pragma()
@@ -976,6 +1011,12 @@ class Indexer(object):
             print(error)
             return
 
+        if self.index_cmd is None:
+            self._run_builtin_index(file_paths)
+            if build_summary is True:
+                self.request_handler.build_tsindex_summary()
+            return
+
         # always keep the original file paths as specified. absolute and
         # relative paths are determined in the build_file_list method
         self.bulk_params["-kp"] = None
@@ -1031,7 +1072,9 @@ class Indexer(object):
             file paths will be relative to the ``root_path``.
         :type reindex: bool
         :param reindex: If ``reindex`` is ``True``, then already indexed
-            files will be reindexed.
+            files will be reindexed. Otherwise only files that are not in the
+            index yet or whose size no longer matches the indexed data (e.g.
+            because data was appended to them) are returned.
         :rtype: list(str)
         :returns: A list of files under the ``root_path`` matching
             ``filename_pattern``.
@@ -1047,13 +1090,28 @@ class Indexer(object):
             unindexed_abs = []
             unindexed_rel = []
             tsindex = self.request_handler._fetch_index_rows()
-            tsindex_filenames = [os.path.normpath(row.filename)
-                                 for row in tsindex]
+            # end of the indexed data of each file
+            tsindex_extents = {}
+            for row in tsindex:
+                filename = os.path.normpath(row.filename)
+                tsindex_extents[filename] = max(
+                    tsindex_extents.get(filename, 0),
+                    row.byteoffset + row.bytes)
             for abs_fn, rel_fn in zip(file_list, file_list_relative):
-                if abs_fn not in tsindex_filenames and \
-                   rel_fn not in tsindex_filenames:
-                    unindexed_abs.append(abs_fn)
-                    unindexed_rel.append(rel_fn)
+                extent = tsindex_extents.get(
+                    abs_fn, tsindex_extents.get(rel_fn))
+                if extent is not None:
+                    try:
+                        size = os.path.getsize(
+                            os.path.join(self.root_path, abs_fn))
+                    except OSError:
+                        continue
+                    if size == extent:
+                        continue
+                    logger.debug("File '{}' was modified since it was "
+                                 "indexed.".format(abs_fn))
+                unindexed_abs.append(abs_fn)
+                unindexed_rel.append(rel_fn)
             if relative_paths is True:
                 result = unindexed_rel
             else:
@@ -1101,6 +1159,72 @@ class Indexer(object):
         else:
             return True
 
+    def _run_builtin_index(self, file_paths):
+        """
+        Index files with the built-in indexer, replacing any rows of the
+        files already in the index.
+
+        Files are scanned in parallel and their rows are written to the
+        database in batches of ``_INDEX_BATCH_SIZE`` files.
+
+        :type file_paths: list(str)
+        :param file_paths: Files to index, relative to ``root_path`` or
+            absolute.
+        """
+        self.request_handler._create_tsindex_table()
+        batch_files = []
+        batch_rows = []
+        pool = Pool(processes=self.parallel)
+        try:
+            results = pool.imap(partial(Indexer._index_file, self.root_path),
+                                file_paths)
+            for file_name, rows, error in results:
+                if error is not None:
+                    logger.warning("FAIL indexing '{}': {}"
+                                   .format(file_name, error))
+                    continue
+                logger.debug("Indexed file '{}'.".format(file_name))
+                batch_files.append(file_name)
+                batch_rows.extend(rows)
+                if len(batch_files) >= _INDEX_BATCH_SIZE:
+                    self.request_handler._replace_index_rows(batch_files,
+                                                             batch_rows)
+                    batch_files = []
+                    batch_rows = []
+            if batch_files:
+                self.request_handler._replace_index_rows(batch_files,
+                                                         batch_rows)
+            pool.close()
+        finally:
+            pool.terminate()
+            pool.join()
+
+    @classmethod
+    def _index_file(cls, root_path, file_name):
+        """
+        Scan a miniSEED file and create its tsindex rows the way mseedindex
+        does.
+
+        Records of the same time series stored back to back in the file
+        form one row. Contiguous records within a row form a time span, a
+        time index entry is created for the first record of a row and for
+        every record starting in a new hour.
+
+        :type root_path: str
+        :param root_path: Root path of the indexed directory structure.
+        :type file_name: str
+        :param file_name: Name of file to index, as stored in the index.
+        :rtype: tuple
+        :returns: The file name, a list of dictionaries with the values of
+            the rows and an error message or ``None``.
+        """
+        try:
+            rows = _get_tsindex_rows(os.path.join(root_path, file_name),
+                                     file_name)
+        except Exception as err:
+            return file_name, None, str(err)
+        return file_name, rows, None
+
     @classmethod
     def _run_index_command(cls, index_cmd, root_path, file_name, bulk_params):
         """
@@ -1340,15 +1464,16 @@ class TSIndexDatabaseHandler(object):
             timespans, timerates, format, filemodtime, updated, scanned,
             requeststart, requestend).
         '''
-
-        session = self.session()
-
         if query_rows is None:
             query_rows = []
         if bulk_params is None:
             bulk_params = {}
 
         query_rows = self._clean_query_rows(query_rows)
+        if self.sqlite:
+            return self._fetch_index_rows_sqlite(query_rows)
+
+        session = self.session()
         request_cte_name = "raw_request_cte"
 
         result = []
@@ -1477,17 +1602,8 @@ class TSIndexDatabaseHandler(object):
         try:
             for rt in result:
                 # convert to a named tuple
-                NamedRow = namedtuple('NamedRow',
-                                      ['network', 'station', 'location',
-                                       'channel', 'quality', 'version',
-                                       'starttime', 'endtime', 'samplerate',
-                                       'filename', 'byteoffset', 'bytes',
-                                       'hash', 'timeindex', 'timespans',
-                                       'timerates', 'format', 'filemodtime',
-                                       'updated', 'scanned', 'requeststart',
-                                       'requestend'])
                 row, requeststart, requestend = rt
-                nrow = NamedRow(
+                nrow = _IndexRow(
                         row.network, row.station, row.location,
                         row.channel, row.quality, row.version,
                         row.starttime, row.endtime, row.samplerate,
@@ -1500,9 +1616,81 @@ class TSIndexDatabaseHandler(object):
                 index_rows.append(nrow)
         except ResourceClosedError:
             pass  # query returned no results
+        finally:
+            session.close()
         logger.debug("Fetched %d index rows" % len(index_rows))
         return index_rows
 
+    def _fetch_index_rows_sqlite(self, query_rows):
+        """
+        Fetch index rows from a SQLite database for cleaned query rows, see
+        :meth:`_fetch_index_rows`.
+
+        All query rows are bound as two JSON parameters to a single fixed
+        statement, one for exact SEED codes that can use the table index and
+        one for wildcarded codes. This way SQLite can reuse the prepared
+        statement of the pooled connections and no query has to be
+        constructed per request. Index rows matched by more than one query
+        row with the same time window are only returned once.
+        """
+        requests = {False: [], True: []}
+        for network, station, location, channel, start, end in query_rows:
+            wildcards = any('*' in code or '?' in code
+                            for code in (network, station, location, channel))
+            requests[wildcards].append((
+                network, station, location, channel,
+                '0000-00-00T00:00:00' if start == '*' else start,
+                '5000-00-00T00:00:00' if end == '*' else end))
+
+        connection = self.engine.raw_connection()
+        try:
+            cursor = connection.cursor()
+            cursor.execute(self._get_index_rows_statement(),
+                           (json.dumps(requests[False]),
+                            json.dumps(requests[True])))
+            index_rows = [_IndexRow(*row) for row in cursor]
+            cursor.close()
+        except Exception as err:
+            raise ValueError(str(err))
+        finally:
+            connection.close()
+        logger.debug("Fetched %d index rows" % len(index_rows))
+        return index_rows
+
+    def _get_index_rows_statement(self):
+        """
+        Return the SQL statement used by :meth:`_fetch_index_rows_sqlite`.
+        """
+        statement = _INDEX_ROWS_STATEMENTS.get(self.tsindex_table)
+        if statement is None:
+            select = (
+                "SELECT t.rowid AS row_id, {columns}, "
+                "json_extract(r.value, '$[4]') AS requeststart, "
+                "json_extract(r.value, '$[5]') AS requestend "
+                "FROM json_each(?) AS r CROSS JOIN {table} AS t "
+                "WHERE t.network {op} json_extract(r.value, '$[0]') "
+                "AND t.station {op} json_extract(r.value, '$[1]') "
+                "AND t.location {op} json_extract(r.value, '$[2]') "
+                "AND t.channel {op} json_extract(r.value, '$[3]') "
+                "AND t.starttime <= json_extract(r.value, '$[5]') "
+                "AND t.endtime >= json_extract(r.value, '$[4]')")
+            columns = ", ".join("t.{0} AS {0}".format(column)
+                                for column in _TSINDEX_COLUMNS)
+            # UNION removes rows matched by several requests
+            statement = (
+                "SELECT {columns}, requeststart, requestend FROM ({exact} "
+                "UNION {wildcards}) "
+                "ORDER BY network, station, location, channel, starttime, "
+                "endtime").format(
+                    columns=", ".join(_TSINDEX_COLUMNS),
+                    exact=select.format(columns=columns,
+                                        table=self.tsindex_table, op="="),
+                    wildcards=select.format(columns=columns,
+                                            table=self.tsindex_table,
+                                            op="GLOB"))
+            _INDEX_ROWS_STATEMENTS[self.tsindex_table] = statement
+        return statement
+
     def _fetch_summary_rows(self, query_rows):
         '''
         Fetch summary rows matching specified request. A temporary tsindex
@@ -1594,6 +1782,8 @@ class TSIndexDatabaseHandler(object):
                 summary_rows.append(NamedRow(*row))
         except ResourceClosedError:
             pass  # query returned no results
+        finally:
+            session.close()
         logger.debug("Fetched %d summary rows" % len(summary_rows))
         return summary_rows
 
@@ -1685,6 +1875,56 @@ class TSIndexDatabaseHandler(object):
                                 flat_query_rows.append(qr)
         return flat_query_rows
 
+    def _create_tsindex_table(self):
+        """
+        Create the tsindex table with the schema and indexes used by
+        mseedindex, if it does not exist yet.
+        """
+        session = self.session()
+        session.execute(sa.text(
+            "CREATE TABLE IF NOT EXISTS {0} "
+            "(network TEXT,station TEXT,location TEXT,channel TEXT,"
+            "quality TEXT,version INTEGER,starttime TEXT,endtime TEXT,"
+            "samplerate REAL,filename TEXT,byteoffset INTEGER,bytes INTEGER,"
+            "hash TEXT,timeindex TEXT,timespans TEXT,timerates TEXT,"
+            "format TEXT,filemodtime TEXT,updated TEXT,scanned TEXT)"
+            .format(self.tsindex_table)))
+        for name, columns in (
+                ("nslcse", "network,station,location,channel,starttime,"
+                           "endtime"),
+                ("filename", "filename"),
+                ("updated", "updated")):
+            session.execute(sa.text(
+                "CREATE INDEX IF NOT EXISTS {0}_{1}_idx ON {0} ({2})"
+                .format(self.tsindex_table, name, columns)))
+        session.commit()
+
+    def _replace_index_rows(self, filenames, rows):
+        """
+        Replace all rows of the given files by new rows in a single
+        transaction.
+
+        :type filenames: list(str)
+        :param filenames: Names of the files whose rows are replaced.
+        :type rows: list(dict)
+        :param rows: Values of the new rows.
+        """
+        table = self.TSIndexTable.__table__
+        updated = _format_tsindex_time(UTCDateTime())
+        session = self.session()
+        try:
+            session.execute(table.delete().where(
+                table.c.filename.in_(filenames)))
+            if rows:
+                session.execute(table.insert(),
+                                [dict(row, updated=updated) for row in rows])
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
     def _set_sqlite_pragma(self):
         """
         Setup a SQLite database for indexing.
@@ -1704,6 +1944,107 @@ class TSIndexDatabaseHandler(object):
             raise OSError("Failed to setup SQLite database for indexing.")
 
 
+def _format_tsindex_time(time):
+    """
+    Format a time like mseedindex does, with fractional seconds only if not
+    zero.
+
+    :type time: :class:`~obspy.core.utcdatetime.UTCDateTime`
+    """
+    if time.microsecond:
+        return time.strftime("%Y-%m-%dT%H:%M:%S.%f")
+    return time.strftime("%Y-%m-%dT%H:%M:%S")
+
+
+def _get_tsindex_rows(path, file_name):
+    """
+    Scan the record headers of a miniSEED file and return the values of its
+    tsindex rows, see :meth:`Indexer._index_file`.
+    """
+    with open(path, 'rb') as fh:
+        data = fh.read()
+    filemodtime = _format_tsindex_time(
+        UTCDateTime(int(os.path.getmtime(path))))
+    scanned = _format_tsindex_time(UTCDateTime(int(UTCDateTime().timestamp)))
+    headers = get_record_headers(io.BytesIO(data))
+    if not len(headers):
+        return []
+
+    offset = headers['offset']
+    starttime = headers['starttime']
+    endtime = headers['endtime']
+    rate = headers['samp_rate']
+    with np.errstate(divide='ignore'):
+        period = np.where(rate > 0, 1e9 / rate, 0.0)
+    # a new row starts when the time series changes or the records are not
+    # stored back to back
+    new_row = np.ones(len(headers), dtype=bool)
+    for key in ('network', 'station', 'location', 'channel', 'dataquality'):
+        new_row[1:] &= headers[key][1:] == headers[key][:-1]
+    new_row[1:] = ~new_row[1:]
+    new_row[1:] |= offset[1:] != offset[:-1] + headers['record_length'][:-1]
+    # a new time span starts at gaps, overlaps or changes of the sampling
+    # rate of more than half a sample
+    gap = starttime[1:] - (endtime[:-1] + period[:-1])
+    new_span = new_row.copy()
+    new_span[1:] |= np.abs(gap) > period[:-1] / 2
+    with np.errstate(divide='ignore', invalid='ignore'):
+        new_span[1:] |= ~(np.abs(1.0 - rate[:-1] / rate[1:]) < 0.0001)
+    hour = starttime // (3600 * 10 ** 9)
+    new_timeindex = new_row.copy()
+    new_timeindex[1:] |= hour[1:] != hour[:-1]
+
+    def _timestamp(ns):
+        return "{:.6f}".format(ns / 1e9)
+
+    rows = []
+    row_starts = np.flatnonzero(new_row)
+    row_ends = np.append(row_starts[1:], len(headers))
+    for first, last in zip(row_starts, row_ends):
+        span_starts = first + np.flatnonzero(new_span[first:last])
+        span_ends = np.maximum.reduceat(endtime[first:last],
+                                        span_starts - first)
+        timespans = ",".join(
+            "[{}:{}]".format(_timestamp(starttime[i]), _timestamp(end))
+            for i, end in zip(span_starts, span_ends))
+        span_rates = rate[span_starts]
+        timerates = None
+        if len(np.unique(span_rates)) > 1:
+            timerates = ",".join("{:g}".format(r) for r in span_rates)
+        timeindex = ",".join(
+            "{}=>{}".format(_timestamp(starttime[i]), offset[i])
+            for i in first + np.flatnonzero(new_timeindex[first:last]))
+        byteoffset = int(offset[first])
+        nbytes = int(offset[last - 1] + headers['record_length'][last - 1] -
+                     byteoffset)
+        record = headers[first]
+        rows.append({
+            'network': str(record['network']),
+            'station': str(record['station']),
+            'location': str(record['location']),
+            'channel': str(record['channel']),
+            'quality': None,
+            'version': _PUBLICATION_VERSIONS.get(record['dataquality'], 0),
+            'starttime': _format_tsindex_time(
+                UTCDateTime(ns=int(starttime[first:last].min()))),
+            'endtime': _format_tsindex_time(
+                UTCDateTime(ns=int(endtime[first:last].max()))),
+            'samplerate': float(record['samp_rate']),
+            'filename': file_name,
+            'byteoffset': byteoffset,
+            'bytes': nbytes,
+            'hash': hashlib.md5(
+                data[byteoffset:byteoffset + nbytes]).hexdigest(),
+            'timeindex': timeindex + ",latest=>1",
+            'timespans': timespans,
+            'timerates': timerates,
+            'format': None,
+            'filemodtime': filemodtime,
+            'scanned': scanned,
+        })
+    return rows
+
+
 if __name__ == '__main__':
     import doctest
     doctest.testmod(exclude_empty=True)
@@ -22,9 +22,10 @@ import warnings
 
 import numpy as np
 
-from obspy.core.utcdatetime import UTCDateTime
+from obspy.core.utcdatetime import UTCDateTime, UTCDateTimeArray
 from obspy.core.util import _read_from_plugin
-from obspy.core.util.base import ENTRY_POINTS, _generic_reader
+from obspy.core.util.base import (ENTRY_POINTS, _add_format_plugin_table,
+                                  _generic_reader)
 from obspy.core.util.decorator import map_example_filename, uncompress_file
 from obspy.core.util.misc import buffered_load_entry_point
 
@@ -454,6 +455,33 @@ class Catalog(object):
             msg = 'Extend only supports a list of Event objects as argument.'
             raise TypeError(msg)
 
+    def get_origin_times(self):
+        """
+        Returns the origin times of all events.
+
+        The time of the preferred origin is used, or of the first origin if
+        no origin is flagged as preferred. Events without any origin time are
+        ``NaT`` in the returned array.
+
+        :rtype: :class:`~obspy.core.utcdatetime.UTCDateTimeArray`
+
+        .. rubric:: Example
+
+        >>> from obspy.core.event import read_events
+        >>> cat = read_events()
+        >>> times = cat.get_origin_times()
+        >>> times.year
+        array([2012, 2012, 2012])
+        >>> print(times.min())
+        2012-04-04T14:08:46.000000Z
+        """
+        times = []
+        for event in self.events:
+            origin = event.preferred_origin() or \
+                (event.origins[0] if event.origins else None)
+            times.append(origin.time if origin is not None else None)
+        return UTCDateTimeArray(times)
+
     def write(self, filename, format, **kwargs):
         """
         Saves catalog into a file.
@@ -829,6 +857,11 @@ def _create_example_catalog():
     return read_events('/path/to/neries_events.xml')
 
 
+# insert supported read/write format plugin lists dynamically in docstrings
+_add_format_plugin_table(read_events, "event", "read", numspaces=4)
+_add_format_plugin_table(Catalog.write, "event", "write", numspaces=8)
+
+
 if __name__ == '__main__':
     import doctest
     doctest.testmod(exclude_empty=True)
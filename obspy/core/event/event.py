@@ -15,7 +15,6 @@ from obspy.core.event.header import (
     EventType, EventTypeCertainty, EventDescriptionType)
 from obspy.core.event.resourceid import ResourceIdentifier
 from obspy.core.util.misc import _yield_resource_id_parent_attr
-from obspy.imaging.source import plot_radiation_pattern, _setup_figure_and_axes
 
 
 from .base import _event_type_class_factory, CreationInfo
@@ -234,6 +233,8 @@ class Event(__Event):
             event.plot(kind=[['global'], ['p_sphere', 'p_quiver']])
         """
         import matplotlib.pyplot as plt
+        from obspy.imaging.source import (plot_radiation_pattern,
+                                          _setup_figure_and_axes)
         from .catalog import Catalog
         try:
             fm = self.preferred_focal_mechanism() or self.focal_mechanisms[0]
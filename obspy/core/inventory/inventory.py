@@ -15,8 +15,10 @@ import textwrap
 import warnings
 
 import obspy
+from obspy.core.utcdatetime import UTCDateTimeArray
 from obspy.core.util.base import (ENTRY_POINTS, ComparingObject,
-                                  _read_from_plugin, _generic_reader)
+                                  _add_format_plugin_table, _read_from_plugin,
+                                  _generic_reader)
 from obspy.core.util.decorator import map_example_filename, uncompress_file
 from obspy.core.util.misc import buffered_load_entry_point
 from obspy.core.util.obspy_types import ObsPyException, ZeroSamplingRate
@@ -271,6 +273,59 @@ class Inventory(ComparingObject):
         content_dict['networks'].sort()
         return content_dict
 
+    def get_epochs(self, level="channel"):
+        """
+        Returns the codes and the start and end dates of all epochs on a
+        given level of the inventory.
+
+        Open ended epochs (and epochs without a start date) are ``NaT`` in the
+        returned arrays of dates.
+
+        :type level: str
+        :param level: One of ``"network"``, ``"station"`` or ``"channel"``.
+        :rtype: tuple
+        :returns: List of codes (``"NET"``, ``"NET.STA"`` or
+            ``"NET.STA.LOC.CHA"``) and start and end dates as
+            :class:`~obspy.core.utcdatetime.UTCDateTimeArray` objects, all
+            in the order of the inventory.
+
+        .. rubric:: Example
+
+        >>> from obspy import read_inventory
+        >>> inv = read_inventory()
+        >>> codes, starts, ends = inv.get_epochs("station")
+        >>> codes
+        ['GR.FUR', 'GR.WET', 'BW.RJOB', 'BW.RJOB', 'BW.RJOB']
+        >>> starts.year
+        array([2006, 2007, 2001, 2006, 2007])
+        >>> ends.isnat()
+        array([ True,  True, False, False,  True], dtype=bool)
+        """
+        if level not in ("network", "station", "channel"):
+            msg = "Invalid level: '%s'" % level
+            raise ValueError(msg)
+        codes = []
+        starts = []
+        ends = []
+        for net in self.networks:
+            if level == "network":
+                codes.append(net.code)
+                starts.append(net.start_date)
+                ends.append(net.end_date)
+                continue
+            for sta in net.stations:
+                if level == "station":
+                    codes.append("%s.%s" % (net.code, sta.code))
+                    starts.append(sta.start_date)
+                    ends.append(sta.end_date)
+                    continue
+                for cha in sta.channels:
+                    codes.append("%s.%s.%s.%s" % (
+                        net.code, sta.code, cha.location_code, cha.code))
+                    starts.append(cha.start_date)
+                    ends.append(cha.end_date)
+        return codes, UTCDateTimeArray(starts), UTCDateTimeArray(ends)
+
     def __str__(self):
         ret_str = "Inventory created at %s\n" % str(self.created)
         if self.module:
@@ -1161,6 +1216,11 @@ class Inventory(ComparingObject):
         return fig
 
 
+# insert supported read/write format plugin lists dynamically in docstrings
+_add_format_plugin_table(read_inventory, "inventory", "read", numspaces=4)
+_add_format_plugin_table(Inventory.write, "inventory", "write", numspaces=8)
+
+
 if __name__ == '__main__':
     import doctest
     doctest.testmod(exclude_empty=True)
@@ -37,6 +37,10 @@ class ResponseStage(ComparingObject):
         This complex type represents channel response and covers SEED
         blockettes 53 to 56.
     """
+    # lists of coefficients that are pickled as plain arrays with pickle
+    # protocol 5, see __reduce_ex__()
+    _coefficient_attributes = ()
+
     def __init__(self, stage_sequence_number, stage_gain,
                  stage_gain_frequency, input_units, output_units,
                  resource_id=None, resource_id2=None, name=None,
@@ -137,6 +141,37 @@ class ResponseStage(ComparingObject):
             FloatWithUncertaintiesAndUnit(decimation_correction) \
             if decimation_correction is not None else None
 
+    def __reduce_ex__(self, protocol):
+        """
+        With pickle protocol 5 or higher, lists of coefficients that only
+        differ in their values are pickled as a single array each. This is a
+        lot faster for long FIR filters and allows handing over the
+        coefficients as out-of-band buffers.
+        """
+        reduced = super(ResponseStage, self).__reduce_ex__(protocol)
+        if protocol < 5 or not self._coefficient_attributes:
+            return reduced
+        state = dict(reduced[2])
+        packed = {}
+        for key in self._coefficient_attributes:
+            coefficients = _pack_coefficients(state.get(key))
+            if coefficients is not None:
+                packed[key] = coefficients
+                del state[key]
+        if not packed:
+            return reduced
+        state['_packed_coefficients'] = packed
+        return reduced[:2] + (state,) + reduced[3:]
+
+    def __setstate__(self, state):
+        packed = state.get('_packed_coefficients')
+        if packed:
+            state = state.copy()
+            del state['_packed_coefficients']
+            for key, (cls, attributes, values) in packed.items():
+                state[key] = _unpack_coefficients(cls, attributes, values)
+        self.__dict__.update(state)
+
     def __str__(self):
         ret = (
             "Response type: {response_type}, Stage Sequence Number: "
@@ -206,6 +241,8 @@ class PolesZerosResponseStage(ResponseStage):
     :type normalization_factor: float, optional
     :param normalization_factor:
     """
+    _coefficient_attributes = ('_zeros', '_poles')
+
     def __init__(self, stage_sequence_number, stage_gain,
                  stage_gain_frequency, input_units, output_units,
                  pz_transfer_function_type,
@@ -375,6 +412,8 @@ class CoefficientsTypeResponseStage(ResponseStage):
         :class:`~obspy.core.inventory.response.CoefficientWithUncertainties`
     :param denominator: Denominator of the coefficient response stage.
     """
+    _coefficient_attributes = ('_numerator', '_denominator')
+
     def __init__(self, stage_sequence_number, stage_gain,
                  stage_gain_frequency, input_units, output_units,
                  cf_transfer_function_type, resource_id=None,
@@ -595,6 +634,8 @@ class FIRResponseStage(ResponseStage):
     :type coefficients: list[float]
     :param coefficients: List of FIR coefficients.
     """
+    _coefficient_attributes = ('_coefficients',)
+
     def __init__(self, stage_sequence_number, stage_gain,
                  stage_gain_frequency, input_units, output_units,
                  symmetry="NONE", resource_id=None, resource_id2=None,
@@ -677,6 +718,8 @@ class PolynomialResponseStage(ResponseStage):
     :type coefficients: list[float]
     :param coefficients: List of polynomial coefficients.
     """
+    _coefficient_attributes = ('_coefficients',)
+
     def __init__(self, stage_sequence_number, stage_gain,
                  stage_gain_frequency, input_units, output_units,
                  frequency_lower_bound,
@@ -2310,6 +2353,46 @@ class CoefficientWithUncertainties(FloatWithUncertainties):
         self._number = value
 
 
+def _pack_coefficients(coefficients):
+    """
+    Packs a list of coefficients into a tuple of their type, their common
+    attributes and an array of their values.
+
+    Returns ``None`` if the coefficients are not all of the same type or if
+    they differ in anything but their values (e.g. uncertainties).
+    """
+    if not coefficients:
+        return None
+    cls = type(coefficients[0])
+    if issubclass(cls, FloatWithUncertainties):
+        dtype = np.float64
+    elif issubclass(cls, ComplexWithUncertainties):
+        dtype = np.complex128
+    else:
+        return None
+    attributes = coefficients[0].__dict__
+    for coefficient in coefficients:
+        if type(coefficient) is not cls or \
+                coefficient.__dict__ != attributes:
+            return None
+    return cls, attributes, np.array(coefficients, dtype=dtype)
+
+
+def _unpack_coefficients(cls, attributes, values):
+    """
+    Inverse of :func:`_pack_coefficients`.
+    """
+    # values were validated when creating the original coefficients, so
+    # bypass the (slow) constructors
+    base = float if issubclass(cls, float) else complex
+    coefficients = []
+    for value in values.tolist():
+        coefficient = base.__new__(cls, value)
+        coefficient.__dict__.update(attributes)
+        coefficients.append(coefficient)
+    return coefficients
+
+
 def _adjust_bode_plot_figure(fig, plot_degrees=False, grid=True, show=True):
     """
     Helper function to do final adjustments to Bode plot figure.
@@ -15,17 +15,20 @@ import math
 import pickle
 import re
 import warnings
+import weakref
 from pathlib import Path
 from glob import glob, has_magic
 
 import numpy as np
 
 from obspy.core import compatibility
-from obspy.core.trace import Trace
-from obspy.core.utcdatetime import UTCDateTime
+from obspy.core.trace import (DeferredData, Trace, TraceView,
+                              _get_merge_chunks)
+from obspy.core.utcdatetime import UTCDateTime, UTCDateTimeArray, _round_ns
 from obspy.core.util.attribdict import AttribDict
 from obspy.core.util.base import (ENTRY_POINTS, _get_function_from_entry_point,
-                                  _read_from_plugin, _generic_reader)
+                                  _get_format_entry_point, _read_from_plugin,
+                                  _generic_reader)
 from obspy.core.util.decorator import (map_example_filename,
                                        raise_if_masked, uncompress_file)
 from obspy.core.util.misc import (
@@ -40,7 +43,7 @@ _headonly_warning_msg = (
 @map_example_filename("pathname_or_url")
 def read(pathname_or_url=None, format=None, headonly=False, starttime=None,
          endtime=None, nearest_sample=True, dtype=None, apply_calib=False,
-         check_compression=True, **kwargs):
+         check_compression=True, workers=None, executor="thread", **kwargs):
     """
     Read waveform files into an ObsPy :class:`~obspy.core.stream.Stream`
     object.
@@ -86,6 +89,16 @@ def read(pathname_or_url=None, format=None, headonly=False, starttime=None,
     :param check_compression: Check for compression on file and decompress
         if needed. This may be disabled for a moderate speed up.
     :type check_compression: bool, optional
+    :type workers: int, optional
+    :param workers: Number of files read concurrently if
+        ``pathname_or_url`` matches multiple files. Defaults to ``None``,
+        which reads the files one after another. The traces of the returned
+        stream are always in the same order as for the serial case.
+    :type executor: str, optional
+    :param executor: Pool type used if ``workers`` is larger than one,
+        either ``"thread"`` (default) or ``"process"``. Thread pools work
+        best for I/O bound reading, process pools for readers doing a lot of
+        decoding in Python code.
     :param kwargs: Additional keyword arguments passed to the underlying
         waveform reader method.
     :return: An ObsPy :class:`~obspy.core.stream.Stream` object.
@@ -206,7 +219,8 @@ def read(pathname_or_url=None, format=None, headonly=False, starttime=None,
         # if no pathname or URL specified, return example stream
         st = _create_example_stream(headonly=headonly)
     else:
-        st = _generic_reader(pathname_or_url, _read, **kwargs)
+        st = _generic_reader(pathname_or_url, _read, workers=workers,
+                             executor=executor, **kwargs)
 
     if len(st) == 0:
         if isinstance(pathname_or_url, Path):
@@ -259,6 +273,133 @@ def _read(filename, format=None, headonly=False, **kwargs):
     return stream
 
 
+@map_example_filename("pathname")
+def iter_read(pathname, format=None, chunk=1000, chunk_length=None,
+              starttime=None, endtime=None, nearest_sample=True,
+              headonly=False, **kwargs):
+    """
+    Read waveform files chunk by chunk and yield ObsPy
+    :class:`~obspy.core.stream.Stream` objects of bounded size.
+
+    In contrast to :func:`~obspy.core.stream.read`, the files are never held
+    in memory as a whole, which allows processing arbitrarily large files with
+    constant memory usage. Formats with streaming support (currently
+    ``MSEED``, ``SEGY`` and ``SU``) only read the part of the file needed for
+    the current chunk, all other formats are read completely and the resulting
+    traces are handed out in chunks.
+
+    :type pathname: str or :class:`pathlib.Path` or file-like object
+    :param pathname: File name, glob pattern or open file-like object. Files
+        matching a glob pattern are read one after the other.
+    :type format: str, optional
+    :param format: Format of the file(s), detected automatically if not
+        given. See :func:`~obspy.core.stream.read` for supported formats.
+    :type chunk: int, optional
+    :param chunk: Maximum number of records (MiniSEED) or traces (all other
+        formats) per yielded Stream.
+    :type chunk_length: float, optional
+    :param chunk_length: Maximum time span in seconds covered by the records
+        or traces of a single yielded Stream, measured between the start times
+        of the first and of the last record or trace.
+    :type starttime: :class:`~obspy.core.utcdatetime.UTCDateTime`, optional
+    :param starttime: Only yield data after or at the start time.
+    :type endtime: :class:`~obspy.core.utcdatetime.UTCDateTime`, optional
+    :param endtime: Only yield data before or at the end time.
+    :type nearest_sample: bool, optional
+    :param nearest_sample: See :func:`~obspy.core.stream.read`.
+    :type headonly: bool, optional
+    :param headonly: If set to ``True``, read only the headers. Traces are
+        not trimmed to ``starttime`` and ``endtime`` then.
+    :param kwargs: Additional keyword arguments passed to the underlying
+        waveform reader method.
+
+    Traces that span multiple chunks are split at chunk boundaries, merging
+    all yielded streams gives the same result as
+    :func:`~obspy.core.stream.read`.
+
+    .. rubric:: Example
+
+    >>> from obspy import iter_read
+    >>> for st in iter_read("/path/to/test.mseed", chunk=1):
+    ...     print(st)  # doctest: +ELLIPSIS
+    1 Trace(s) in Stream:
+    NL.HGN.00.BHZ | 2003-05-29T02:13:22.043400Z - ... | 40.0 Hz, 5980 samples
+    1 Trace(s) in Stream:
+    NL.HGN.00.BHZ | 2003-05-29T02:15:51.543400Z - ... | 40.0 Hz, 5967 samples
+    """
+    if chunk < 1:
+        msg = "chunk must be a positive integer."
+        raise ValueError(msg)
+    if isinstance(pathname, Path):
+        pathname = str(pathname)
+    if isinstance(pathname, str) and has_magic(pathname):
+        filenames = sorted(glob(pathname))
+        if not filenames:
+            raise Exception("No file matching file pattern: %s" % pathname)
+    else:
+        filenames = [pathname]
+    for filename in filenames:
+        for st in _iter_read(filename, format=format, chunk=chunk,
+                             chunk_length=chunk_length, starttime=starttime,
+                             endtime=endtime, headonly=headonly, **kwargs):
+            if not headonly:
+                if starttime:
+                    st._ltrim(starttime, nearest_sample=nearest_sample)
+                if endtime:
+                    st._rtrim(endtime, nearest_sample=nearest_sample)
+            if len(st):
+                yield st
+
+
+def _iter_read(filename, format=None, headonly=False, chunk=1000,
+               chunk_length=None, **kwargs):
+    """
+    Read a single file chunk by chunk.
+
+    Uses the iterReadFormat function of the format plug-in if there is one,
+    otherwise the file is read completely and handed out in chunks.
+    """
+    format_ep = _get_format_entry_point('waveform', filename, format=format)
+    iter_read_format = None
+    if isinstance(filename, str):
+        try:
+            iter_read_format = buffered_load_entry_point(
+                format_ep.dist.name,
+                'obspy.plugin.waveform.%s' % format_ep.name,
+                'iterReadFormat')
+        except ImportError:
+            pass
+    if iter_read_format is None:
+        stream = _read(filename, format=format_ep.name, headonly=headonly,
+                       **kwargs)
+        chunks = _iter_trace_chunks(stream, chunk, chunk_length)
+    else:
+        chunks = iter_read_format(filename, headonly=headonly, chunk=chunk,
+                                  chunk_length=chunk_length, **kwargs)
+    for st in chunks:
+        for trace in st:
+            trace.stats._format = format_ep.name
+        yield st
+
+
+def _iter_trace_chunks(traces, chunk, chunk_length=None):
+    """
+    Group traces into Streams of at most ``chunk`` traces whose start times
+    lie within ``chunk_length`` seconds.
+    """
+    current = []
+    for tr in traces:
+        if current and (len(current) >= chunk or (
+                chunk_length is not None and
+                tr.stats.starttime - current[0].stats.starttime >=
+                chunk_length)):
+            yield Stream(traces=current)
+            current = []
+        current.append(tr)
+    if current:
+        yield Stream(traces=current)
+
+
 def _create_example_stream(headonly=False):
     """
     Create an example stream.
@@ -345,6 +486,15 @@ class Stream(object):
         if traces:
             self.traces.extend(traces)
 
+    def __getstate__(self):
+        """
+        Do not pickle or copy the cached SEED id index of
+        :meth:`Stream.select`.
+        """
+        state = self.__dict__.copy()
+        state.pop('_select_index', None)
+        return state
+
     def __add__(self, other):
         """
         Add two streams or a stream with a single trace.
@@ -634,6 +784,7 @@ class Stream(object):
         """
         __setitem__ method of obspy.Stream objects.
         """
+        self._clear_select_index()
         self.traces.__setitem__(index, trace)
 
     def __getitem__(self, index):
@@ -651,6 +802,7 @@ class Stream(object):
         """
         Passes on the __delitem__ method to the underlying list of traces.
         """
+        self._clear_select_index()
         return self.traces.__delitem__(index)
 
     def __getslice__(self, i, j, k=1):
@@ -688,6 +840,7 @@ class Stream(object):
         else:
             msg = 'Append only supports a single Trace object as an argument.'
             raise TypeError(msg)
+        self._clear_select_index()
         return self
 
     def extend(self, trace_list):
@@ -727,9 +880,45 @@ class Stream(object):
         else:
             msg = 'Extend only supports a list of Trace objects as argument.'
             raise TypeError(msg)
+        self._clear_select_index()
         return self
 
-    def get_gaps(self, min_gap=None, max_gap=None):
+    def get_starttimes(self):
+        """
+        Return the start times of all traces of the Stream object.
+
+        :rtype: :class:`~obspy.core.utcdatetime.UTCDateTimeArray`
+
+        .. rubric:: Example
+
+        >>> from obspy import read
+        >>> st = read()
+        >>> st[1].stats.starttime += 1.5
+        >>> st.get_starttimes()  # doctest: +NORMALIZE_WHITESPACE
+        UTCDateTimeArray(['2009-08-24T00:20:03.000000Z',
+                          '2009-08-24T00:20:04.500000Z',
+                          '2009-08-24T00:20:03.000000Z'])
+        """
+        return UTCDateTimeArray(
+            ns=[tr.stats.starttime.ns for tr in self.traces])
+
+    def get_endtimes(self):
+        """
+        Return the end times of all traces of the Stream object.
+
+        :rtype: :class:`~obspy.core.utcdatetime.UTCDateTimeArray`
+
+        .. rubric:: Example
+
+        >>> from obspy import read
+        >>> st = read()
+        >>> st.get_endtimes().max()
+        UTCDateTime(2009, 8, 24, 0, 20, 32, 990000)
+        """
+        return UTCDateTimeArray(
+            ns=[tr.stats.endtime.ns for tr in self.traces])
+
+    def get_gaps(self, min_gap=None, max_gap=None, as_array=False):
         """
         Determine all trace gaps/overlaps of the Stream object.
 
@@ -737,6 +926,13 @@ class Stream(object):
             value is assumed to be in seconds. Defaults to None.
         :param max_gap: All gaps larger than this value will be omitted. The
             value is assumed to be in seconds. Defaults to None.
+        :type as_array: bool, optional
+        :param as_array: If set to ``True``, a structured
+            :class:`numpy.ndarray` with fields ``network``, ``station``,
+            ``location``, ``channel``, ``starttime``, ``endtime`` (both as
+            integer nanoseconds, see :attr:`UTCDateTime.ns
+            <obspy.core.utcdatetime.UTCDateTime.ns>`), ``duration`` and
+            ``nsamples`` is returned instead of a list.
 
         The returned list contains one item in the following form for each gap/
         overlap: [network, station, location, channel, starttime of the gap,
@@ -778,6 +974,31 @@ class Stream(object):
         Source            Last Sample                 ...
         BW.RJOB..EHZ      2009-08-24T00:20:13.000000Z ...
         Total: 1 gap(s) and 0 overlap(s)
+        >>> gaps = st.get_gaps(as_array=True)
+        >>> print(gaps['channel'], gaps['nsamples'])
+        ['EHZ'] [99]
+        """
+        precisions = set()
+        for trace in self.traces:
+            precisions.add(trace.stats.starttime.precision)
+            precisions.add(trace.stats.endtime.precision)
+        if len(precisions) > 1:
+            # comparisons of times with different precision are not
+            # well defined, stick to comparing UTCDateTime objects
+            gap_list = self._get_gaps_utcdatetime(min_gap, max_gap)
+        else:
+            gap_list = _find_gaps(self.traces, min_gap=min_gap,
+                                  max_gap=max_gap,
+                                  precision=precisions.pop() if precisions
+                                  else UTCDateTime.DEFAULT_PRECISION)
+        if as_array:
+            return _gaps_to_array(gap_list)
+        return gap_list
+
+    def _get_gaps_utcdatetime(self, min_gap=None, max_gap=None):
+        """
+        Determine all trace gaps/overlaps of the Stream object comparing
+        UTCDateTime objects, see :meth:`Stream.get_gaps`.
         """
         # Create shallow copy of the traces to be able to sort them later on.
         copied_traces = copy.copy(self.traces)
@@ -872,6 +1093,7 @@ class Stream(object):
         else:
             msg = 'Only accepts a Trace object or a list of Trace objects.'
             raise TypeError(msg)
+        self._clear_select_index()
         return self
 
     def plot(self, *args, **kwargs):
@@ -1212,6 +1434,7 @@ class Stream(object):
         >>> print(tr)  # doctest: +ELLIPSIS
         BW.RJOB..EHE | 2009-08-24T00:20:03.000000Z ... | 100.0 Hz, 3000 samples
         """
+        self._clear_select_index()
         return self.traces.pop(index)
 
     def print_gaps(self, min_gap=None, max_gap=None):
@@ -1313,6 +1536,7 @@ class Stream(object):
         BW.RJOB..EHZ | 2009-08-24T00:20:03.000000Z ... | 100.0 Hz, 3000 samples
         BW.RJOB..EHN | 2009-08-24T00:20:03.000000Z ... | 100.0 Hz, 3000 samples
         """
+        self._clear_select_index()
         self.traces.remove(trace)
         return self
 
@@ -1338,6 +1562,7 @@ class Stream(object):
         BW.RJOB..EHZ | 2009-08-24T00:20:03.000000Z ... | 100.0 Hz, 3000 samples
         """
         self.traces.reverse()
+        self._clear_select_index()
         return self
 
     def sort(self, keys=['network', 'station', 'location', 'channel',
@@ -1387,6 +1612,7 @@ class Stream(object):
         # Loop over all keys in reversed order.
         for _i in keys[::-1]:
             self.traces.sort(key=lambda x: x.stats[_i], reverse=reverse)
+        self._clear_select_index()
         return self
 
     def write(self, filename, format=None, **kwargs):
@@ -1607,7 +1833,7 @@ class Stream(object):
         return self
 
     def slice(self, starttime=None, endtime=None, keep_empty_traces=False,
-              nearest_sample=True):
+              nearest_sample=True, view=False):
         """
         Return new Stream object cut to the given start and end time.
 
@@ -1633,6 +1859,12 @@ class Stream(object):
             ``nearest_sample=True`` will select samples 2-5,
             ``nearest_sample=False`` will select samples 3-4 only.
 
+        :type view: bool, optional
+        :param view: If set to ``True``, the returned stream consists of
+            light-weight :class:`~obspy.core.trace.TraceView` objects which
+            share the data with the original traces and copy it before any
+            processing method modifies it. No processing information is
+            recorded for slicing in this case. Defaults to ``False``.
         :return: :class:`~obspy.core.stream.Stream`
 
         .. note::
@@ -1658,6 +1890,19 @@ class Stream(object):
         BW.RJOB..EHN | 2009-08-24T00:20:20.000000Z ... | 100.0 Hz, 501 samples
         BW.RJOB..EHE | 2009-08-24T00:20:20.000000Z ... | 100.0 Hz, 501 samples
         """
+        return self._slice(starttime=starttime, endtime=endtime,
+                           keep_empty_traces=keep_empty_traces,
+                           nearest_sample=nearest_sample, view=view)
+
+    def _slice(self, starttime=None, endtime=None, keep_empty_traces=False,
+               nearest_sample=True, view=False, headers=None):
+        """
+        See :meth:`Stream.slice`.
+
+        :type headers: dict, optional
+        :param headers: Copies of the headers of traces shared by the views
+            of several windows as returned by :meth:`_get_view_headers`.
+        """
         if not self:
             return copy.copy(self)
         # select start/end time fitting to a sample point of the first trace
@@ -1682,15 +1927,24 @@ class Stream(object):
         tmp.traces = []
         new = tmp.copy()
         for trace in self:
-            sliced_trace = trace.slice(starttime=starttime, endtime=endtime,
-                                       nearest_sample=nearest_sample)
-            if keep_empty_traces is False and not sliced_trace.stats.npts:
+            trace_, header = (headers or {}).get(id(trace), (None, None))
+            if view and trace_ is trace:
+                sliced_trace = TraceView._from_trace(
+                    trace, starttime=starttime, endtime=endtime,
+                    nearest_sample=nearest_sample, header=header)
+            else:
+                sliced_trace = trace.slice(starttime=starttime,
+                                           endtime=endtime,
+                                           nearest_sample=nearest_sample,
+                                           view=view)
+            if keep_empty_traces is False and not len(sliced_trace):
                 continue
             new.append(sliced_trace)
         return new
 
     def slide(self, window_length, step, offset=0,
-              include_partial_windows=False, nearest_sample=True):
+              include_partial_windows=False, nearest_sample=True,
+              view=False):
         """
         Generator yielding equal length sliding windows of the Stream.
 
@@ -1699,6 +1953,8 @@ class Stream(object):
         you don't want this you have to create a copy of the yielded
         windows. Also be aware that if you modify the original data and you
         have overlapping windows, all following windows are affected as well.
+        With ``view=True`` the processing methods of the yielded windows
+        copy the data before modifying it.
 
         Not all yielded windows must have the same number of traces. The
         algorithm will determine the maximal temporal extents by analysing
@@ -1747,6 +2003,13 @@ class Stream(object):
             ``nearest_sample=True`` will select samples 2-5,
             ``nearest_sample=False`` will select samples 3-4 only.
         :type nearest_sample: bool, optional
+        :param view: If set to ``True``, the yielded streams consist of
+            light-weight :class:`~obspy.core.trace.TraceView` objects, see
+            :meth:`~obspy.core.stream.Stream.slice`. The windows of a trace
+            share a single copy of its header taken when the iteration
+            starts, each window only copies it again on first access of its
+            ``stats``.
+        :type view: bool, optional
         """
         starttime = min(tr.stats.starttime for tr in self)
         endtime = max(tr.stats.endtime for tr in self)
@@ -1761,18 +2024,28 @@ class Stream(object):
         if len(windows) < 1:
             return
 
+        # the views of all windows share a single copy of each header
+        headers = self._get_view_headers() if view else None
         for start, stop in windows:
-            temp = self.slice(start, stop,
-                              nearest_sample=nearest_sample)
+            temp = self._slice(start, stop, nearest_sample=nearest_sample,
+                               view=view, headers=headers)
             # It might happen that there is a time frame where there are no
             # windows, e.g. two traces separated by a large gap.
             if not temp:
                 continue
             yield temp
 
+    def _get_view_headers(self):
+        """
+        Return copies of the headers of all traces to be shared by the views
+        of several windows, see :meth:`Stream._slice`.
+        """
+        # keep the traces to tell them apart from new ones reusing their ids
+        return {id(tr): (tr, copy.deepcopy(tr.stats)) for tr in self}
+
     def select(self, network=None, station=None, location=None, channel=None,
                sampling_rate=None, npts=None, component=None, id=None,
-               inventory=None):
+               inventory=None, use_index=False):
         """
         Return new Stream object only with these traces that match the given
         stats criteria (e.g. all traces with ``channel="EHZ"``).
@@ -1844,9 +2117,24 @@ class Stream(object):
 
         All other selection criteria that accept strings (network, station,
         location) may also contain Unix style wildcards (``*``, ``?``, ...).
+
+        If ``use_index=True`` is given, an index of the SEED id components of
+        all traces is built on the first call and reused by subsequent calls,
+        which makes repeated selections by ``network``, ``station``,
+        ``location``, ``channel`` and/or ``id`` on large streams much faster.
+        The index is rebuilt automatically whenever traces are added, removed
+        or reordered by Stream methods, but changes to the SEED ids of traces
+        already contained in the stream and replacing items of
+        ``Stream.traces`` directly are not detected (use ``use_index=False``
+        after such changes). The index is not used for selections with
+        ``inventory``.
         """
         if inventory is None:
             traces = self.traces
+            if use_index:
+                traces = self._select_candidates_from_index(
+                    network=network, station=station, location=location,
+                    channel=channel, id=id)
         else:
             trace_ids = []
             start_dates = []
@@ -1942,6 +2230,40 @@ class Stream(object):
             traces.append(trace)
         return self.__class__(traces=traces)
 
+    def _clear_select_index(self):
+        """
+        Drop the SEED id index of :meth:`Stream.select`, called by all methods
+        modifying the list of traces in place.
+        """
+        self.__dict__.pop('_select_index', None)
+
+    def _select_candidates_from_index(self, **kwargs):
+        """
+        Return all traces that possibly match the given SEED id criteria
+        using the (cached) index, see :meth:`Stream.select`.
+        """
+        criteria = [(key, value) for key, value in kwargs.items()
+                    if value is not None]
+        # select() ignores empty id strings
+        criteria = [(key, value) for key, value in criteria
+                    if key != 'id' or value]
+        if not criteria:
+            return self.traces
+        index = getattr(self, '_select_index', None)
+        if index is None or not index.is_valid(self.traces):
+            index = _SEEDIdIndex(self.traces)
+            self._select_index = index
+        positions = None
+        for key, pattern in criteria:
+            matches = index.lookup(key, pattern)
+            if positions is None:
+                positions = set(matches)
+            else:
+                positions.intersection_update(matches)
+            if not positions:
+                return []
+        return [self.traces[i] for i in sorted(positions)]
+
     def verify(self):
         """
         Verify all traces of current Stream against available meta data.
@@ -2034,9 +2356,14 @@ class Stream(object):
             Helper method for keeping trace's ordering
             """
             try:
-                return order.index(current)
-            except ValueError:
+                index, ref = order[id(current)]
+            except KeyError:
+                return -1
+            # the id of a discarded original trace might have been reused by
+            # a newly created trace
+            if ref() is not current:
                 return -1
+            return index
 
         self._cleanup(**kwargs)
         if method == -1:
@@ -2044,22 +2371,25 @@ class Stream(object):
         # check sampling rates and dtypes
         self._merge_checks()
         # remember order of traces
-        order = [id(i) for i in self.traces]
+        order = {id(tr): (i, weakref.ref(tr))
+                 for i, tr in enumerate(self.traces)}
         # order matters!
         self.sort(keys=['network', 'station', 'location', 'channel',
                         'starttime', 'endtime'])
         # build up dictionary with with lists of traces with same ids
         traces_dict = {}
-        # using pop() and try-except saves memory
+        # using pop() and try-except saves memory, popping from the end of
+        # the reversed list avoids shifting the whole list on each pop
+        self.traces.reverse()
         try:
             while True:
-                trace = self.traces.pop(0)
+                trace = self.traces.pop()
                 # skip empty traces
                 if len(trace) == 0:
                     continue
                 _id = trace.get_id()
                 if _id not in traces_dict:
-                    traces_dict[_id] = [trace]
+                    traces_dict[_id] = collections.deque([trace])
                 else:
                     traces_dict[_id].append(trace)
         except IndexError:
@@ -2068,19 +2398,17 @@ class Stream(object):
         self.traces = []
         # loop through ids
         for _id in traces_dict.keys():
-            cur_trace = traces_dict[_id].pop(0)
-            # loop through traces of same id
-            for _i in range(len(traces_dict[_id])):
-                trace = traces_dict[_id].pop(0)
-                # disable sanity checks because there are already done
-                cur_trace = cur_trace.__add__(
-                    trace, method, fill_value=fill_value, sanity_checks=False,
-                    interpolation_samples=interpolation_samples)
-            self.traces.append(cur_trace)
+            merged = _MergeAccumulator(traces_dict[_id].popleft())
+            # loop through traces of same id, sanity checks are already done
+            while traces_dict[_id]:
+                merged.add(traces_dict[_id].popleft(), method,
+                           fill_value=fill_value,
+                           interpolation_samples=interpolation_samples)
+            self.traces.append(merged.get_trace())
 
         # trying to restore order, newly created traces are placed at
         # start
-        self.traces.sort(key=lambda x: listsort(order, id(x)))
+        self.traces.sort(key=lambda x: listsort(order, x))
         return self
 
     def simulate(self, paz_remove=None, paz_simulate=None,
@@ -2963,6 +3291,7 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
         >>> st.traces
         []
         """
+        self._clear_select_index()
         self.traces = []
         return self
 
@@ -3063,12 +3392,15 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
                         'starttime', 'endtime'])
         # build up dictionary with lists of traces with same ids
         traces_dict = {}
-        # using pop() and try-except saves memory
+        # using pop() and try-except saves memory, popping from the end of
+        # the reversed list avoids shifting the whole list on each pop
+        self.traces.reverse()
         try:
             while True:
-                trace = self.traces.pop(0)
+                trace = self.traces.pop()
                 # add trace to respective list or create that list
-                traces_dict.setdefault(trace.id, []).append(trace)
+                traces_dict.setdefault(
+                    trace.id, collections.deque()).append(trace)
         except IndexError:
             pass
         # clear traces of current stream
@@ -3076,17 +3408,21 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
         # loop through ids
         for id_ in traces_dict.keys():
             trace_list = traces_dict[id_]
-            cur_trace = trace_list.pop(0)
+            # directly adjacent traces are collected and only concatenated
+            # once the merged trace is needed
+            merged = _MergeAccumulator(trace_list.popleft())
+            cur_trace = merged.trace
             delta = cur_trace.stats.delta
             allowed_micro_shift = misalignment_threshold * delta
             # work through all traces of same id
             while trace_list:
-                trace = trace_list.pop(0)
+                trace = trace_list.popleft()
                 # `gap` is the deviation (in seconds) of the actual start
                 # time of the second trace from the expected start time
                 # (for the ideal case of directly adjacent and perfectly
                 # aligned traces).
-                gap = trace.stats.starttime - (cur_trace.stats.endtime + delta)
+                expected_starttime = merged.endtime + delta
+                gap = trace.stats.starttime - expected_starttime
                 # if `gap` is larger than the designated allowed shift,
                 # we treat it as a real gap and leave as is.
                 if misalignment_threshold > 0 and gap <= allowed_micro_shift:
@@ -3135,29 +3471,29 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
                     cur_trace.stats.starttime.timestamp) % delta / delta
                 subsample_shift_percentage = min(
                     subsample_shift_percentage, 1 - subsample_shift_percentage)
-                if (trace.stats.starttime <= cur_trace.stats.endtime and
+                if (trace.stats.starttime <= merged.endtime and
                         subsample_shift_percentage < misalignment_threshold):
                     # check if common time slice [t1 --> t2] is equal:
                     t1 = trace.stats.starttime
-                    t2 = min(cur_trace.stats.endtime, trace.stats.endtime)
+                    t2 = min(merged.endtime, trace.stats.endtime)
                     # if consistent: add them together
-                    if np.array_equal(cur_trace.slice(t1, t2).data,
+                    if np.array_equal(merged.slice_data(t1, t2),
                                       trace.slice(t1, t2).data):
-                        cur_trace += trace
+                        merged.add(trace, sanity_checks=True)
                     # if not consistent: leave them alone
                     else:
-                        self.traces.append(cur_trace)
-                        cur_trace = trace
+                        self.traces.append(merged.get_trace())
+                        merged = _MergeAccumulator(trace)
                 # traces are perfectly adjacent: add them together
-                elif trace.stats.starttime == cur_trace.stats.endtime + \
-                        cur_trace.stats.delta:
-                    cur_trace += trace
+                elif trace.stats.starttime == expected_starttime:
+                    merged.append(trace.data)
                 # no common parts (gap):
                 # leave traces alone and add current to list
                 else:
-                    self.traces.append(cur_trace)
-                    cur_trace = trace
-            self.traces.append(cur_trace)
+                    self.traces.append(merged.get_trace())
+                    merged = _MergeAccumulator(trace)
+                cur_trace = merged.trace
+            self.traces.append(merged.get_trace())
         self.traces = [tr for tr in self.traces if tr.stats.npts]
         return self
 
@@ -3645,6 +3981,37 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
             self.traces += traces
         return self
 
+    def to_array_block(self):
+        """
+        Return the traces of the Stream as a columnar
+        :class:`~obspy.core.traceblock.TraceBlock`.
+
+        All traces are required to have the same number of samples, the same
+        sampling rate and the same data type (e.g. event aligned windows).
+        The data of all traces is copied into a single two-dimensional array,
+        so that processing methods like
+        :meth:`~obspy.core.traceblock.TraceBlock.filter`,
+        :meth:`~obspy.core.traceblock.TraceBlock.detrend`,
+        :meth:`~obspy.core.traceblock.TraceBlock.taper` and
+        :meth:`~obspy.core.traceblock.TraceBlock.normalize` can be applied to
+        all traces in a single call. Use
+        :meth:`~obspy.core.traceblock.TraceBlock.to_stream` to convert the
+        block back into a Stream.
+
+        :rtype: :class:`~obspy.core.traceblock.TraceBlock`
+
+        .. rubric:: Example
+
+        >>> st = read()
+        >>> block = st.to_array_block()
+        >>> block.data.shape
+        (3, 3000)
+        >>> block.to_stream() == st
+        True
+        """
+        from obspy.core.traceblock import TraceBlock
+        return TraceBlock.from_stream(self)
+
     def newbyteorder(self, byteorder='native'):
         """
         Change byteorder of the data
@@ -3657,6 +4024,397 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
         return self
 
 
+def _round_away(numbers):
+    """
+    Vectorized version of :func:`obspy.core.compatibility.round_away`.
+    """
+    floor = np.floor(numbers)
+    ceil = np.ceil(numbers)
+    rounded = np.round(numbers)
+    halfway = (floor != ceil) & (np.abs(numbers - floor) ==
+                                 np.abs(ceil - numbers))
+    rounded[halfway] = np.trunc(numbers[halfway]) + np.sign(numbers[halfway])
+    return rounded.astype(np.int64)
+
+
+def _find_gaps(traces, min_gap=None, max_gap=None, precision=6):
+    """
+    Determine gaps/overlaps between the given traces, see
+    :meth:`Stream.get_gaps`.
+
+    Start and end times are handled as integer nanoseconds and all gaps and
+    overlaps of traces with the same SEED id are determined in a vectorized
+    way.
+    """
+    stats = [tr.stats for tr in traces]
+    nslc = [(st.network, st.station, st.location, st.channel)
+            for st in stats]
+    start_ns = np.array([st.starttime._ns for st in stats], dtype=np.int64)
+    end_ns = np.array([st.endtime._ns for st in stats], dtype=np.int64)
+    delta = np.array([st.delta for st in stats], dtype=np.float64)
+    sampling_rate = np.array([st.sampling_rate for st in stats],
+                             dtype=np.float64)
+    order, found = _find_gaps_ns(nslc, start_ns, end_ns, delta,
+                                 sampling_rate, min_gap=min_gap,
+                                 max_gap=max_gap, precision=precision)
+    traces = [traces[i] for i in order]
+
+    # list of (position of trace in sorted order, gap)
+    gaps = []
+    for i, trace in enumerate(traces):
+        # if the trace is masked, break it up and determine gaps of the
+        # resulting stream
+        if isinstance(trace._data_or_deferred, np.ma.masked_array):
+            gaps.extend((i, gap) for gap in trace.split().get_gaps())
+    for i, k, j, gap, nsamples in found:
+        gaps.append((i, list(nslc[order[i]]) + [
+            traces[k].stats['endtime'], traces[j].stats['starttime'],
+            gap, nsamples]))
+    gaps.sort(key=lambda x: x[0])
+    return [gap for _, gap in gaps]
+
+
+def _find_gaps_ns(nslc, start_ns, end_ns, delta, sampling_rate,
+                  min_gap=None, max_gap=None, precision=6):
+    """
+    Vectorized core of :func:`_find_gaps` working on plain start and end
+    times in nanoseconds, sample spacings and sampling rates of traces (or
+    any other contiguous segments of data) with the given
+    ``(network, station, location, channel)`` tuples.
+
+    Returns the order that sorts the segments like :meth:`Stream.sort` and a
+    list of ``(i, k, j, duration, nsamples)`` tuples, one per gap/overlap
+    between the ``i``-th and the ``j``-th segment in that order, starting at
+    the end of the ``k``-th segment.
+    """
+    start_r = _round_ns(start_ns, precision)
+    end_r = _round_ns(end_ns, precision)
+    # same order as Stream.sort()
+    keys = list(zip(nslc, start_r.tolist(), end_r.tolist()))
+    order = np.array(sorted(range(len(nslc)), key=keys.__getitem__),
+                     dtype=np.int64)
+    nslc = [nslc[i] for i in order]
+    start_ns, end_ns = start_ns[order], end_ns[order]
+    start_r, end_r = start_r[order], end_r[order]
+    delta = delta[order]
+    sampling_rate = sampling_rate[order]
+
+    gaps = []
+    boundaries = [i for i in range(1, len(nslc)) if nslc[i] != nslc[i - 1]]
+    for first, last in zip([0] + boundaries, boundaries + [len(nslc)]):
+        if last - first < 2:
+            continue
+        i = np.arange(first, last - 1)
+        j = i + 1
+        # end of earlier trace, or of the later one if it is contained
+        later_ends_first = end_r[j] < end_r[i]
+        stime = np.where(later_ends_first, j, i)
+        stime_ns = end_ns[stime]
+        stime_r = end_r[stime]
+        etime_ns = start_ns[j]
+        etime_r = start_r[j]
+        # last sample of earlier trace represents data up to time of last
+        # sample (stats.endtime) plus one delta
+        gap = etime_ns / 1e9 - (stime_ns / 1e9 + delta[i])
+        # check that any overlap is not larger than the trace coverage
+        coverage = end_ns[j] / 1e9 - etime_ns / 1e9
+        gap = np.where((gap < 0) & (-gap > coverage), -coverage, gap)
+        keep = np.ones(len(i), dtype=bool)
+        if min_gap:
+            keep &= ~(gap < min_gap)
+        if max_gap:
+            keep &= ~(gap > max_gap)
+        nsamples = _round_away(np.abs(gap) * sampling_rate[i])
+        nsamples = np.where(gap < 0, -nsamples, nsamples)
+        # skip if gap is equal to delta (1 / sampling rate)
+        keep &= ~((delta[i] == delta[j]) & (nsamples == 0))
+        # skip gaps that are covered by an earlier trace, starts are sorted
+        # so only the earlier traces starting before the gap can cover it
+        max_end = np.maximum.accumulate(end_r[first:last])
+        earlier = np.minimum(
+            i - first, np.searchsorted(start_r[first:last], stime_r, 'left'))
+        covered = ((earlier > 0) & (stime_r < etime_r) &
+                   (max_end[np.maximum(earlier - 1, 0)] > etime_r))
+        keep &= ~covered
+        for k in np.nonzero(keep)[0]:
+            gaps.append((int(i[k]), int(stime[k]), int(j[k]),
+                         float(gap[k]), int(nsamples[k])))
+    return order, gaps
+
+
+def _gaps_to_array(gap_list):
+    """
+    Convert a list of gaps as returned by :meth:`Stream.get_gaps` to a
+    structured array.
+    """
+    dtype = []
+    for i, key in enumerate(('network', 'station', 'location', 'channel')):
+        width = max([len(gap[i]) for gap in gap_list] + [1])
+        dtype.append((key, 'U%d' % width))
+    dtype += [('starttime', np.int64), ('endtime', np.int64),
+              ('duration', np.float64), ('nsamples', np.int64)]
+    return np.array([tuple(gap[:4]) + (gap[4].ns, gap[5].ns) + tuple(gap[6:])
+                     for gap in gap_list], dtype=dtype)
+
+
+class _SEEDIdIndex(object):
+    """
+    Positions of traces in a list of traces by (upper case) network,
+    station, location and channel code and SEED id, see
+    :meth:`Stream.select`.
+    """
+    keys = ('network', 'station', 'location', 'channel')
+
+    def __init__(self, traces):
+        # the indexed list itself, Stream methods modifying it drop the index
+        self.traces = traces
+        self.length = len(traces)
+        self.positions = {key: collections.defaultdict(list)
+                          for key in self.keys + ('id', )}
+        for i, trace in enumerate(traces):
+            codes = [trace.stats[key].upper() for key in self.keys]
+            for key, code in zip(self.keys, codes):
+                self.positions[key][code].append(i)
+            self.positions['id']['.'.join(codes)].append(i)
+
+    def is_valid(self, traces):
+        """
+        Check if the index was built for the given list of traces, which has
+        not been replaced or changed in length since.
+        """
+        return traces is self.traces and len(traces) == self.length
+
+    def lookup(self, key, pattern):
+        """
+        Return the positions of all traces matching the given pattern.
+        """
+        pattern = pattern.upper()
+        positions = self.positions[key]
+        if not any(char in pattern for char in '*?['):
+            return positions.get(pattern, [])
+        return [i for code, positions_ in positions.items()
+                if fnmatch.fnmatch(code, pattern) for i in positions_]
+
+
+class _MergeAccumulator(object):
+    """
+    Helper collecting the data of consecutive traces of one SEED id that get
+    merged together.
+
+    Adding traces only stores references to their data chunks, overlapping
+    traces only modify the chunks at the end of the merged data. The merged
+    data array is allocated and filled once when the resulting trace is
+    requested. This avoids reallocating and copying the growing data array
+    for each merged trace.
+
+    :type trace: :class:`~obspy.core.trace.Trace`
+    :param trace: First trace of the merged sequence. Its header is used for
+        the merged trace.
+    """
+    def __init__(self, trace):
+        self.trace = trace
+        self.chunks = [trace.data]
+        self.npts = trace.stats.npts
+        self.modified = False
+        self._endtime = trace.stats.endtime
+        # number of masked samples in each chunk and in total
+        self._nmasked = [_count_masked(trace.data)]
+        self._nmasked_total = self._nmasked[0]
+
+    @property
+    def endtime(self):
+        """
+        End time of the merged trace, computed the same way as
+        :class:`~obspy.core.trace.Stats` does for ``endtime``.
+        """
+        if self._endtime is None:
+            stats = self.trace.stats
+            if self.npts == 0:
+                self._endtime = stats.starttime
+            else:
+                self._endtime = (stats.starttime +
+                                 float(self.npts - 1) * stats.delta)
+        return self._endtime
+
+    def _is_masked(self):
+        """
+        Whether the merged data would be a masked array, which is the case
+        for the data of the first trace as is and otherwise only if any
+        samples are masked, see :meth:`~obspy.core.trace.Trace.__add__`.
+        """
+        if not self.modified:
+            return isinstance(self.trace.data, np.ma.MaskedArray)
+        return self._nmasked_total > 0
+
+    def append(self, data):
+        """
+        Append a data chunk to the end of the merged trace.
+        """
+        self.modified = True
+        if not len(data):
+            return
+        self.chunks.append(data)
+        self._nmasked.append(_count_masked(data))
+        self._nmasked_total += self._nmasked[-1]
+        self.npts += len(data)
+        self._endtime = None
+
+    def truncate(self, npts):
+        """
+        Remove the given number of samples from the end of the merged trace.
+        """
+        self.modified = True
+        npts = min(npts, self.npts)
+        self.npts -= npts
+        self._endtime = None
+        while npts > 0:
+            chunk = self.chunks.pop()
+            self._nmasked_total -= self._nmasked.pop()
+            if len(chunk) > npts:
+                chunk = chunk[:len(chunk) - npts]
+                self.chunks.append(chunk)
+                self._nmasked.append(_count_masked(chunk))
+                self._nmasked_total += self._nmasked[-1]
+                break
+            npts -= len(chunk)
+
+    def get_data(self, start, stop):
+        """
+        Return a copy of the samples ``start`` to ``stop`` (exclusive) of the
+        merged data, the same as slicing the data of the merged trace.
+
+        Only the chunks overlapping with the requested samples are visited,
+        starting from the end of the merged data.
+        """
+        start, stop, _ = slice(start, stop).indices(self.npts)
+        pieces = []
+        end = self.npts
+        for chunk in reversed(self.chunks):
+            if end <= start:
+                break
+            begin = end - len(chunk)
+            if begin < stop:
+                pieces.append(chunk[max(start - begin, 0):
+                                    min(stop, end) - begin])
+            end = begin
+        pieces.reverse()
+        dtype = self.trace.data.dtype
+        if self._is_masked():
+            if not pieces:
+                return np.ma.masked_array(np.empty(0, dtype=dtype))
+            return np.ma.concatenate(pieces)
+        if not pieces:
+            return np.empty(0, dtype=dtype)
+        return np.concatenate([np.ma.getdata(piece) for piece in pieces])
+
+    def slice_data(self, starttime, endtime):
+        """
+        Return the merged samples between the given start and end time, the
+        same as :meth:`Trace.slice() <obspy.core.trace.Trace.slice>` of the
+        merged trace returns.
+        """
+        stats = self.trace.stats
+        # trim a minimal trace that only loads the samples inside the window
+        tmp = Trace(data=_MergedData(self), header={
+            'sampling_rate': stats.sampling_rate,
+            'starttime': stats.starttime})
+        if starttime > endtime:
+            raise ValueError("startime is larger than endtime")
+        tmp._ltrim(starttime)
+        tmp._rtrim(endtime)
+        return tmp.data
+
+    def add(self, trace, method=0, fill_value=None, interpolation_samples=0,
+            sanity_checks=False):
+        """
+        Add a trace starting at or after the start of the merged trace.
+
+        The result is the same as for
+        :meth:`Trace.__add__() <obspy.core.trace.Trace.__add__>` of the merged
+        trace and the given trace, see there for the meaning of the
+        arguments. Only the data at the end of the merged trace that overlaps
+        with the given trace is accessed.
+        """
+        if sanity_checks:
+            self.trace._add_sanity_checks(trace)
+        remove, chunks = _get_merge_chunks(
+            self.get_data, self.npts, self.endtime, self.trace.data.dtype,
+            trace, self.trace.stats.sampling_rate, method=method,
+            fill_value=fill_value,
+            interpolation_samples=interpolation_samples)
+        self.truncate(remove)
+        for chunk in chunks:
+            self.append(chunk)
+        self.modified = True
+
+    def get_trace(self):
+        """
+        Return the merged trace.
+
+        If nothing was added the original trace object is returned.
+        """
+        if self.modified:
+            trace = self.trace.__class__(header=copy.deepcopy(
+                self.trace.stats))
+            trace.data = _concatenate_chunks(self.chunks,
+                                             self.trace.data.dtype)
+            self.__init__(trace)
+        return self.trace
+
+
+class _MergedData(DeferredData):
+    """
+    Data of a :class:`_MergeAccumulator`, used to determine windows of the
+    merged data exactly like :meth:`~obspy.core.trace.Trace.slice` does
+    without concatenating all of the data.
+    """
+    def __init__(self, accumulator):
+        super(_MergedData, self).__init__(accumulator.npts,
+                                          accumulator.trace.data.dtype)
+        self.accumulator = accumulator
+
+    def _load(self, start, stop):
+        return self.accumulator.get_data(start, stop)
+
+
+def _count_masked(data):
+    """
+    Return the number of masked samples of a data chunk.
+    """
+    if isinstance(data, np.ma.MaskedArray):
+        return int(np.ma.count_masked(data))
+    return 0
+
+
+def _concatenate_chunks(chunks, dtype):
+    """
+    Concatenate data chunks into a single newly allocated array.
+
+    Returns a masked array only if any of the chunks contains masked values,
+    which is the same as repeatedly concatenating with
+    :meth:`~obspy.core.trace.Trace.__add__` would produce.
+    """
+    npts = sum(len(chunk) for chunk in chunks)
+    data = np.empty(npts, dtype=dtype)
+    mask = None
+    start = 0
+    for chunk in chunks:
+        end = start + len(chunk)
+        if isinstance(chunk, np.ma.masked_array):
+            data[start:end] = chunk.data
+            chunk_mask = np.ma.getmaskarray(chunk)
+            if chunk_mask.any():
+                if mask is None:
+                    mask = np.zeros(npts, dtype=bool)
+                mask[start:end] = chunk_mask
+        else:
+            data[start:end] = chunk
+        start = end
+    if mask is not None:
+        data = np.ma.masked_array(data, mask=mask)
+    return data
+
+
 def _is_pickle(filename):  # @UnusedVariable
     """
     Check whether a file is a pickled ObsPy Stream file.
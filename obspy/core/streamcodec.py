@@ -0,0 +1,376 @@
+# -*- coding: utf-8 -*-
+"""
+Compact binary serialization of ObsPy :class:`~obspy.core.stream.Stream`
+objects for handing them over to other processes.
+
+A Stream is encoded into a small header and one raw buffer per data array
+(two for masked arrays). The header holds a flat table with one row per trace
+(SEED id, start time in nanoseconds, sampling rate, calibration factor,
+``npts``, number of samples of the data and data type) and, only if there
+are any, all other header entries of the traces (e.g. format specific
+headers or processing information) pickled in one go. Sample data is never
+pickled or converted.
+
+There are three ways to use the encoding:
+
+* :func:`encode_stream` and :func:`decode_stream` work on the header and
+  the list of buffers directly. The buffers can be passed as pickle protocol
+  5 out-of-band buffers (see :class:`pickle.PickleBuffer`) or sent over any
+  other channel without copying them.
+* :func:`stream_to_bytes` and :func:`stream_from_bytes` use a single
+  contiguous bytes object, e.g. to write it to a file or a socket.
+* :func:`stream_to_shared_memory` and :func:`stream_from_shared_memory`
+  place this contiguous representation in a
+  :class:`multiprocessing.shared_memory.SharedMemory` block. Another process
+  only needs the name of the block to access all traces without copying
+  the sample data.
+
+.. rubric:: Example
+
+>>> from obspy import read
+>>> st = read()
+>>> st2 = stream_from_bytes(stream_to_bytes(st))
+>>> st2 == st
+True
+
+:copyright:
+    The ObsPy Development Team (devs@obspy.org)
+:license:
+    GNU Lesser General Public License, Version 3
+    (https://www.gnu.org/copyleft/lesser.html)
+"""
+import json
+import pickle
+import struct
+
+import numpy as np
+
+from obspy.core.stream import Stream
+from obspy.core.trace import DERIVED_KEYS, HEADER_KEYS, Trace
+from obspy.core.utcdatetime import UTCDateTime
+
+
+_STORED_KEYS = frozenset(HEADER_KEYS + DERIVED_KEYS)
+# alignment of the data buffers in the contiguous representation
+ALIGNMENT = 64
+
+# magic bytes, format version, number of data buffers and lengths of the
+# table dtype description, the table and the pickled additional headers
+_PREFIX = struct.Struct('<8sHHIIII')
+_MAGIC = b'OBSPYBIN'
+_VERSION = 2
+
+
+def encode_stream(stream):
+    """
+    Encode a Stream into a header and a list of raw data buffers.
+
+    The data buffers are the data arrays of the traces themselves if they
+    are C-contiguous, only other arrays are copied.
+
+    :type stream: :class:`~obspy.core.stream.Stream`
+    :param stream: Stream to encode.
+    :rtype: tuple of bytes and list of :class:`numpy.ndarray`
+    :returns: Header and one-dimensional ``uint8`` views of all data
+        buffers, see :func:`decode_stream`.
+
+    .. rubric:: Example
+
+    Using pickle protocol 5 out-of-band buffers, the sample data is not
+    copied into the pickle:
+
+    >>> import pickle
+    >>> from obspy import read
+    >>> st = read()
+    >>> header, buffers = encode_stream(st)
+    >>> oob = []
+    >>> msg = pickle.dumps((header, [pickle.PickleBuffer(b) for b in buffers]),
+    ...                    protocol=5, buffer_callback=oob.append)
+    >>> print([len(buf.raw()) for buf in oob])
+    [24000, 24000, 24000]
+    >>> header, buffers = pickle.loads(msg, buffers=oob)
+    >>> decode_stream(header, buffers) == st
+    True
+    """
+    traces = list(stream)
+    dtype = []
+    for key in HEADER_KEYS[:4]:
+        width = max([len(tr.stats[key]) for tr in traces] + [1])
+        dtype.append((key, 'U%d' % width))
+    dtype += [('starttime', '<i8'), ('sampling_rate', '<f8'),
+              ('calib', '<f8'), ('npts', '<i8'), ('nsamples', '<i8'),
+              ('dtype', 'S8'), ('masked', '?')]
+    table = np.empty(len(traces), dtype=dtype)
+    extra = []
+    buffers = []
+    for row, tr in zip(table, traces):
+        data = tr.data
+        mask = None
+        if isinstance(data, np.ma.MaskedArray):
+            mask = np.ma.getmaskarray(data)
+            data = data.data
+        if data.dtype.hasobject or data.ndim != 1:
+            msg = ("Can not encode data of trace '%s' with dtype '%s' and "
+                   "%d dimension(s)." % (tr.id, data.dtype, data.ndim))
+            raise ValueError(msg)
+        # access the header values directly, derived values are skipped
+        stats = tr.stats.__dict__
+        row['network'] = stats['network']
+        row['station'] = stats['station']
+        row['location'] = stats['location']
+        row['channel'] = stats['channel']
+        row['starttime'] = stats['starttime']._ns
+        row['sampling_rate'] = stats['sampling_rate']
+        row['calib'] = stats['calib']
+        # npts differs from the number of samples for headonly traces
+        row['npts'] = stats['npts']
+        row['nsamples'] = len(data)
+        row['dtype'] = data.dtype.str
+        row['masked'] = mask is not None
+        extra.append({key: value for key, value in stats.items()
+                      if key not in _STORED_KEYS})
+        buffers.append(_as_bytes(data))
+        if mask is not None:
+            buffers.append(_as_bytes(mask))
+    descr = json.dumps(table.dtype.descr).encode()
+    if any(extra):
+        extra = pickle.dumps(extra, protocol=pickle.HIGHEST_PROTOCOL)
+    else:
+        extra = b''
+    header = b''.join([
+        _PREFIX.pack(_MAGIC, _VERSION, 0, len(buffers), len(descr),
+                     table.nbytes, len(extra)),
+        descr, table.tobytes(), extra])
+    return header, buffers
+
+
+def decode_stream(header, buffers, copy=False):
+    """
+    Decode a Stream from a header and a list of data buffers.
+
+    :type header: bytes-like
+    :param header: Header as returned by :func:`encode_stream`.
+    :type buffers: list of bytes-like objects
+    :param buffers: Data buffers as returned by :func:`encode_stream`, e.g.
+        :class:`bytes`, :class:`memoryview`, :class:`numpy.ndarray` or
+        :class:`pickle.PickleBuffer` objects.
+    :type copy: bool
+    :param copy: If ``False`` (the default) the data arrays of the traces
+        are views on the given buffers (read-only if the buffers are
+        read-only), otherwise they are copied.
+    :rtype: :class:`~obspy.core.stream.Stream`
+    """
+    table, extra, nbuffers = _read_header(header)
+    if len(buffers) != nbuffers:
+        msg = "Expected %d data buffers, got %d." % (nbuffers, len(buffers))
+        raise ValueError(msg)
+    return _build_stream(table, extra, iter(buffers), copy)
+
+
+def stream_to_bytes(stream):
+    """
+    Encode a Stream into a single contiguous bytes object.
+
+    :type stream: :class:`~obspy.core.stream.Stream`
+    :param stream: Stream to encode.
+    :rtype: bytes
+    """
+    header, buffers = encode_stream(stream)
+    parts = [header]
+    size = len(header)
+    for buf in buffers:
+        padding = -size % ALIGNMENT
+        parts += [b'\x00' * padding, buf]
+        size += padding + len(buf)
+    return b''.join(parts)
+
+
+def stream_from_bytes(data, copy=False):
+    """
+    Decode a Stream from a single contiguous bytes-like object.
+
+    :type data: bytes-like
+    :param data: Encoded Stream as returned by :func:`stream_to_bytes`.
+        Trailing bytes are ignored.
+    :type copy: bool
+    :param copy: If ``False`` (the default) the data arrays of the traces
+        are views on ``data`` (read-only if ``data`` is read-only, e.g. a
+        :class:`bytes` object), otherwise they are copied.
+    :rtype: :class:`~obspy.core.stream.Stream`
+    """
+    data = memoryview(data).cast('B')
+    table, extra, nbuffers = _read_header(data)
+    offsets = _get_buffer_offsets(data, table)
+    buffers = (data[start:end] for start, end in offsets)
+    return _build_stream(table, extra, buffers, copy)
+
+
+def stream_to_shared_memory(stream, name=None):
+    """
+    Encode a Stream into a new shared memory block.
+
+    The caller is responsible for closing and eventually unlinking the
+    shared memory block (see
+    :class:`~multiprocessing.shared_memory.SharedMemory`) once no process
+    needs it anymore.
+
+    :type stream: :class:`~obspy.core.stream.Stream`
+    :param stream: Stream to encode.
+    :type name: str, optional
+    :param name: Name of the shared memory block, defaults to a random name.
+    :rtype: :class:`multiprocessing.shared_memory.SharedMemory`
+    :returns: Shared memory block holding the encoded Stream. Its
+        :attr:`~multiprocessing.shared_memory.SharedMemory.name` is all
+        another process needs to decode the Stream with
+        :func:`stream_from_shared_memory`.
+    """
+    from multiprocessing.shared_memory import SharedMemory
+    header, buffers = encode_stream(stream)
+    size = len(header)
+    offsets = []
+    for buf in buffers:
+        size += -size % ALIGNMENT
+        offsets.append(size)
+        size += len(buf)
+    shm = SharedMemory(name=name, create=True, size=max(size, 1))
+    shm.buf[:len(header)] = header
+    for offset, buf in zip(offsets, buffers):
+        shm.buf[offset:offset + len(buf)] = buf
+    return shm
+
+
+def stream_from_shared_memory(shm, copy=False):
+    """
+    Decode a Stream from a shared memory block.
+
+    :type shm: :class:`multiprocessing.shared_memory.SharedMemory` or str
+    :param shm: Shared memory block as returned by
+        :func:`stream_to_shared_memory` or its name. If only the name is
+        given, the block is opened and closed again and the data is always
+        copied.
+    :type copy: bool
+    :param copy: If ``False`` (the default) the data arrays of the traces
+        are views on the shared memory. The block then has to be kept open
+        (and can not be closed) as long as the traces are used. If ``True``
+        the data is copied.
+    :rtype: :class:`~obspy.core.stream.Stream`
+
+    .. rubric:: Example
+
+    >>> from obspy import read
+    >>> shm = stream_to_shared_memory(read())
+    >>> # e.g. in another process that only knows the name of the block
+    >>> st = stream_from_shared_memory(shm.name)
+    >>> print(st)  # doctest: +ELLIPSIS
+    3 Trace(s) in Stream:
+    BW.RJOB..EHZ | 2009-08-24T00:20:03.000000Z - ... | 100.0 Hz, 3000 samples
+    BW.RJOB..EHN | 2009-08-24T00:20:03.000000Z - ... | 100.0 Hz, 3000 samples
+    BW.RJOB..EHE | 2009-08-24T00:20:03.000000Z - ... | 100.0 Hz, 3000 samples
+    >>> shm.close()
+    >>> shm.unlink()
+    """
+    if isinstance(shm, str):
+        from multiprocessing.shared_memory import SharedMemory
+        shm = SharedMemory(name=shm)
+        try:
+            return stream_from_bytes(shm.buf, copy=True)
+        finally:
+            shm.close()
+    return stream_from_bytes(shm.buf, copy=copy)
+
+
+def _as_bytes(data):
+    """
+    Return a C-contiguous one-dimensional uint8 view of an array.
+    """
+    return np.ascontiguousarray(data).reshape(-1).view(np.uint8)
+
+
+def _read_header(header):
+    """
+    Parse a header written by :func:`encode_stream`.
+
+    Returns the header table, the list of additional headers of the traces
+    and the number of data buffers.
+    """
+    header = memoryview(header).cast('B')
+    if len(header) < _PREFIX.size:
+        msg = "Not an encoded ObsPy Stream (header too short)."
+        raise ValueError(msg)
+    magic, version, _, nbuffers, descr_size, table_size, extra_size = \
+        _PREFIX.unpack(header[:_PREFIX.size])
+    if magic != _MAGIC:
+        msg = "Not an encoded ObsPy Stream."
+        raise ValueError(msg)
+    if version != _VERSION:
+        msg = "Unsupported version of encoded ObsPy Stream: %d" % version
+        raise ValueError(msg)
+    start = _PREFIX.size
+    end = start + descr_size + table_size + extra_size
+    if len(header) < end:
+        msg = "Encoded ObsPy Stream is truncated."
+        raise ValueError(msg)
+    descr = json.loads(bytes(header[start:start + descr_size]))
+    dtype = np.dtype([tuple(field) for field in descr])
+    start += descr_size
+    table = np.frombuffer(header[start:start + table_size], dtype=dtype)
+    start += table_size
+    if extra_size:
+        extra = pickle.loads(header[start:end])
+    else:
+        extra = [{}] * len(table)
+    return table, extra, nbuffers
+
+
+def _get_buffer_offsets(data, table):
+    """
+    Return the start and end offsets of all data buffers in the contiguous
+    representation written by :func:`stream_to_bytes`.
+    """
+    prefix = _PREFIX.unpack(data[:_PREFIX.size])
+    position = _PREFIX.size + sum(prefix[4:])
+    offsets = []
+    for row in table:
+        nsamples = int(row['nsamples'])
+        sizes = [nsamples * np.dtype(row['dtype'].decode()).itemsize]
+        if row['masked']:
+            sizes.append(nsamples)
+        for size in sizes:
+            position += -position % ALIGNMENT
+            offsets.append((position, position + size))
+            position += size
+    if position > len(data):
+        msg = "Encoded ObsPy Stream is truncated."
+        raise ValueError(msg)
+    return offsets
+
+
+def _build_stream(table, extra, buffers, copy):
+    """
+    Create the traces of a decoded Stream.
+    """
+    traces = []
+    for row, header in zip(table, extra):
+        nsamples = int(row['nsamples'])
+        data = np.frombuffer(next(buffers), dtype=row['dtype'].decode(),
+                             count=nsamples)
+        if row['masked']:
+            mask = np.frombuffer(next(buffers), dtype=bool, count=nsamples)
+            data = np.ma.masked_array(data, mask=mask, copy=copy)
+        elif copy:
+            data = data.copy()
+        tr = Trace(data=data)
+        tr.stats.update(header)
+        tr.stats.update({
+            'network': str(row['network']), 'station': str(row['station']),
+            'location': str(row['location']), 'channel': str(row['channel']),
+            'starttime': UTCDateTime(ns=int(row['starttime'])),
+            'sampling_rate': float(row['sampling_rate']),
+            'calib': float(row['calib']), 'npts': int(row['npts'])})
+        traces.append(tr)
+    return Stream(traces=traces)
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod(exclude_empty=True)
@@ -453,6 +453,19 @@ class TestCatalog:
                 '%s >= %s' % (attr_filter, value), inverse=True)
             assert all(event in cat_smaller for event in cat_bigger_inverse)
 
+    def test_get_origin_times(self):
+        """
+        Tests getting the origin times of all events as UTCDateTimeArray.
+        """
+        cat = read_events()
+        cat[1].preferred_origin_id = cat[1].origins[0].resource_id
+        cat.append(Event())
+        times = cat.get_origin_times()
+        assert len(times) == 4
+        assert times.tolist() == [ev.origins[0].time for ev in cat[:3]] + \
+            [None]
+        assert len(Catalog().get_origin_times()) == 0
+
     def test_catalog_resource_id(self, testdata):
         """
         See #662
@@ -171,6 +171,25 @@ class TestInventory:
         with pytest.raises(Exception):
             inv.get_orientation('BW.RJOB..XXX')
 
+    def test_get_epochs(self):
+        """
+        Tests getting codes and epochs on the different levels.
+        """
+        inv = read_inventory()
+        codes, starts, ends = inv.get_epochs()
+        channels = [(net, sta, cha) for net in inv for sta in net
+                    for cha in sta]
+        assert codes == ["%s.%s.%s.%s" % (net.code, sta.code,
+                                          cha.location_code, cha.code)
+                         for net, sta, cha in channels]
+        assert starts.tolist() == [cha.start_date for _, _, cha in channels]
+        assert ends.tolist() == [cha.end_date for _, _, cha in channels]
+        codes, starts, ends = inv.get_epochs("network")
+        assert codes == ["GR", "BW"]
+        assert starts.isnat().all()
+        with pytest.raises(ValueError):
+            inv.get_epochs("response")
+
     def test_response_plot(self, image_path):
         """
         Tests the response plot.
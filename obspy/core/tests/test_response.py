@@ -9,6 +9,7 @@ Test suite for the response handling.
     GNU Lesser General Public License, Version 3
     (https://www.gnu.org/copyleft/lesser.html)
 """
+import pickle
 import warnings
 from copy import deepcopy
 from math import pi
@@ -642,3 +643,30 @@ class TestResponse:
         assert np.isclose(
             resp.instrument_sensitivity.value, 133579131859239.3, atol=0,
             rtol=1e-5)
+
+    def test_pickle_protocol_5(self, testdata):
+        """
+        With pickle protocol 5 coefficient lists are pickled as arrays.
+        """
+        inv = read_inventory(testdata['IRIS_single_channel_with_response.xml'])
+        resp = inv[0][0][0].response
+        stage = resp.response_stages[2]
+        assert len(stage.numerator) == 39
+        buffers = []
+        msg = pickle.dumps(resp, protocol=5, buffer_callback=buffers.append)
+        resp2 = pickle.loads(msg, buffers=buffers)
+        assert resp2 == resp
+        for protocol in (2, 5):
+            assert pickle.loads(pickle.dumps(resp, protocol=protocol)) == resp
+        stage2 = resp2.response_stages[2]
+        assert isinstance(stage2.numerator, list)
+        assert type(stage2.numerator[0]) is type(stage.numerator[0])
+        assert stage2.numerator == stage.numerator
+        assert stage2.numerator[0].__dict__ == stage.numerator[0].__dict__
+        assert resp2.response_stages[0].poles == resp.response_stages[0].poles
+        # coefficients with individual uncertainties are pickled as they are
+        stage.numerator[5].lower_uncertainty = 0.1
+        stage2 = pickle.loads(pickle.dumps(stage, protocol=5))
+        assert stage2 == stage
+        assert stage2.numerator[5].lower_uncertainty == 0.1
+        assert stage2.numerator[6].lower_uncertainty is None
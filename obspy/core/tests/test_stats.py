@@ -347,3 +347,30 @@ class TestStats:
         with pytest.raises(ValueError):
             stats.component = 'ZZ'
         assert stats.channel == 'HHZ'
+
+    def test_update_derived_values(self):
+        """
+        Derived values are correct after bulk updates and lazily computed
+        end times show up in all representations of the Stats object.
+        """
+        stats = Stats()
+        stats.update({'npts': 11, 'delta': 0.5, 'station': 'ABC',
+                      'starttime': UTCDateTime(2000, 1, 1), 'endtime': 'x'})
+        assert stats.sampling_rate == 2.0
+        assert stats.delta == 0.5
+        assert stats.endtime == UTCDateTime(2000, 1, 1, 0, 0, 5)
+        assert stats['endtime'] == UTCDateTime(2000, 1, 1, 0, 0, 5)
+        # later entries win, as for setting values one by one
+        stats.update({'delta': 0.5, 'sampling_rate': 4.0})
+        assert stats.delta == 0.25
+        stats.npts = 5
+        assert 'endtime' in stats
+        assert dict(stats)['endtime'] == UTCDateTime(2000, 1, 1, 0, 0, 1)
+        assert 'UTCDateTime(2000, 1, 1, 0, 0, 1)' in repr(stats)
+        assert '2000-01-01T00:00:01.000000Z' in str(stats)
+        assert stats == Stats(stats)
+        stats2 = pickle.loads(pickle.dumps(stats))
+        assert stats2.endtime == UTCDateTime(2000, 1, 1, 0, 0, 1)
+        assert stats2 == stats
+        with pytest.raises(AttributeError):
+            stats.endtime = UTCDateTime()
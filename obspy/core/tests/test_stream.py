@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 import io
+import itertools
 import pickle
 import platform
 import re
@@ -10,7 +11,8 @@ from unittest import mock
 import numpy as np
 import pytest
 
-from obspy import Stream, Trace, UTCDateTime, read, read_inventory
+from obspy import (Stream, Trace, UTCDateTime, iter_read, read,
+                   read_inventory)
 from obspy.core.inventory import Channel, Inventory, Network, Station
 from obspy.core.stream import _is_pickle, _read_pickle, _write_pickle
 from obspy.core.util.attribdict import AttribDict
@@ -707,6 +709,66 @@ class TestStream:
         assert len(stream2) == 1
         assert stream[4] in stream2
 
+    def test_select_use_index(self):
+        """
+        Selecting with the SEED id index gives the same result as without it,
+        also after the stream was modified.
+        """
+        st = Stream()
+        for net, sta, loc, cha in itertools.product(
+                ('AA', 'bb'), ('X1', 'X2', 'Y1'), ('', '00'),
+                ('BHZ', 'BHN', 'EHZ')):
+            st.append(Trace(header=dict(network=net, station=sta,
+                                        location=loc, channel=cha)))
+        st.append(st[3])
+        queries = [
+            dict(network='AA'), dict(station='x*', channel='?HZ'),
+            dict(id='BB.X2.00.EHZ'), dict(id='aa.*.bhn'),
+            dict(location='', component='N'), dict(station='Z1'),
+            dict(network='b?', npts=0, sampling_rate=1.0),
+            dict(station='[XY]1', location='00'), dict()]
+
+        def check():
+            for kwargs in queries:
+                expected = st.select(**kwargs)
+                got = st.select(use_index=True, **kwargs)
+                assert [id(tr) for tr in got] == [id(tr) for tr in expected]
+
+        check()
+        assert st._select_index is not None
+        st.pop(0)
+        check()
+        st.reverse()
+        check()
+        st.traces.insert(5, Trace(header={'network': 'AA'}))
+        check()
+        st[2] = Trace(header={'station': 'X1'})
+        check()
+        st.append(Trace(header={'station': 'X2'}))
+        check()
+        st.extend([Trace(header={'location': '00'})])
+        check()
+        st += Trace(header={'channel': 'BHZ'})
+        check()
+        st.sort()
+        check()
+        st.select(station='X2', use_index=True)
+        st.pop(0)
+        st.insert(0, Trace(header={'station': 'XX'}))
+        check()
+        assert len(st.select(station='XX', use_index=True)) == 1
+        # the index is only rebuilt after the stream was modified
+        index = st._select_index
+        st.select(station='X2', use_index=True)
+        assert st._select_index is index
+        st.traces = st.traces[::-1]
+        check()
+        assert st._select_index is not index
+        # index is neither copied nor pickled
+        st.select(station='X2', use_index=True)
+        assert not hasattr(st.copy(), '_select_index')
+        assert not hasattr(pickle.loads(pickle.dumps(st)), '_select_index')
+
     def test_select_on_single_letter_channels(self):
         st = read()
         st[0].stats.channel = "Z"
@@ -1049,6 +1111,83 @@ class TestStream:
         assert isinstance(st[0].data, np.ndarray)
         assert st[0].data.tolist() == [1, 1, 1, 1, 1, 2, 3, 3, 4, 5, 5, 5]
 
+    def test_merge_many_traces_matches_pairwise_add(self):
+        """
+        Merging many adjacent, gapped and overlapping traces at once gives
+        the same result as adding them up one by one.
+        """
+        data = np.arange(1000, dtype=np.int32)
+        traces = []
+        for i, start in enumerate(range(0, 900, 10)):
+            # every 7th record is missing, every 11th record overlaps
+            if i % 7 == 6:
+                continue
+            end = start + 10 + (3 if i % 11 == 10 else 0)
+            traces.append(Trace(data=data[start:end].copy(),
+                                header={'starttime': UTCDateTime(start)}))
+        for kwargs in [{}, {'fill_value': 0}, {'fill_value': 'latest'},
+                       {'fill_value': 'interpolate'},
+                       {'method': 1, 'interpolation_samples': 2}]:
+            st = Stream([tr.copy() for tr in traces])
+            st.merge(**kwargs)
+            fill_value = kwargs.get('fill_value')
+            expected = traces[0]
+            for tr in traces[1:]:
+                expected = expected.__add__(
+                    tr, method=kwargs.get('method', 0),
+                    fill_value=fill_value,
+                    interpolation_samples=kwargs.get(
+                        'interpolation_samples', 0))
+            assert len(st) == 1
+            assert st[0].stats == expected.stats
+            assert isinstance(st[0].data, np.ma.masked_array) == \
+                isinstance(expected.data, np.ma.masked_array)
+            np.testing.assert_array_equal(st[0].data, expected.data)
+            np.testing.assert_array_equal(np.ma.getmaskarray(st[0].data),
+                                          np.ma.getmaskarray(expected.data))
+
+    def test_merge_many_overlapping_traces_matches_pairwise_add(self):
+        """
+        Merging many traces with conflicting overlaps, contained traces and
+        masked samples at once gives the same result as adding them up one
+        by one.
+        """
+        data = np.arange(1000, dtype=np.float64)
+        traces = []
+        for i, start in enumerate(range(0, 900, 10)):
+            tr_data = data[start:start + 14].copy()
+            if i % 3 == 1:
+                # overlap with different data
+                tr_data[:4] += 0.5
+            if i % 5 == 2:
+                tr_data = np.ma.masked_array(tr_data)
+                tr_data[6:8] = np.ma.masked
+            traces.append(Trace(data=tr_data,
+                                header={'starttime': UTCDateTime(start)}))
+            if i % 4 == 3:
+                # contained trace, partly with different data
+                tr_data = data[start + 5:start + 8].copy()
+                tr_data[i % 8 == 3] = -1
+                traces.append(Trace(data=tr_data, header={
+                    'starttime': UTCDateTime(start + 5)}))
+        for kwargs in [{}, {'fill_value': 0}, {'fill_value': 'latest'},
+                       {'fill_value': 'interpolate'},
+                       {'method': 1, 'interpolation_samples': 2},
+                       {'method': 1, 'interpolation_samples': -1}]:
+            st = Stream([tr.copy() for tr in traces])
+            st.merge(**kwargs)
+            expected = traces[0]
+            for tr in traces[1:]:
+                expected = expected.__add__(tr, **kwargs)
+            assert len(st) == 1
+            assert st[0].stats == expected.stats
+            assert isinstance(st[0].data, np.ma.masked_array) == \
+                isinstance(expected.data, np.ma.masked_array)
+            np.testing.assert_array_equal(np.ma.getdata(st[0].data),
+                                          np.ma.getdata(expected.data))
+            np.testing.assert_array_equal(np.ma.getmaskarray(st[0].data),
+                                          np.ma.getmaskarray(expected.data))
+
     def test_split(self, mseed_stream):
         """
         Testing splitting of streams containing masked arrays.
@@ -1560,6 +1699,53 @@ class TestStream:
         # min_gap=1 is used to only show the gaps
         assert len(st.get_gaps(min_gap=1)) == 0
 
+    def test_get_gaps_as_array(self):
+        """
+        Gaps can be returned as structured array and match the comparison of
+        UTCDateTime objects, also for traces with different precision.
+        """
+        st = Stream()
+        t = UTCDateTime(2020, 1, 1)
+        for sta, offset, npts in (('A', 0, 10), ('B', 0, 10), ('A', 12, 5),
+                                  ('A', 15, 10), ('B', 9.5, 3),
+                                  ('A', 1, 2), ('A', 30, 2)):
+            st.append(Trace(data=np.zeros(npts), header=dict(
+                station=sta, starttime=t + offset)))
+        st.append(Trace(data=np.ma.masked_equal([1, 2, 0, 0, 5, 6], 0),
+                        header=dict(station='C', starttime=t)))
+        expected = st._get_gaps_utcdatetime()
+        gaps = st.get_gaps()
+        assert gaps == expected
+        assert len(gaps) == 6
+        gaps_array = st.get_gaps(as_array=True)
+        assert len(gaps_array) == len(gaps)
+        for gap, row in zip(gaps, gaps_array):
+            assert tuple(gap[:4]) == tuple(row)[:4]
+            assert gap[4].ns == row['starttime']
+            assert gap[5].ns == row['endtime']
+            assert gap[6] == row['duration']
+            assert gap[7] == row['nsamples']
+        assert st.get_gaps(min_gap=2, max_gap=5) == \
+            st._get_gaps_utcdatetime(min_gap=2, max_gap=5)
+        # different precisions fall back to comparing UTCDateTime objects
+        st[0].stats.starttime = UTCDateTime(t, precision=3)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            assert st.get_gaps() == expected
+        assert len(Stream().get_gaps(as_array=True)) == 0
+
+    def test_get_starttimes_endtimes(self):
+        """
+        Tests getting start and end times of all traces as UTCDateTimeArray.
+        """
+        st = read()
+        st[1].stats.starttime = UTCDateTime(ns=1234567890123456789)
+        st[2].stats.npts = 10
+        assert st.get_starttimes().tolist() == \
+            [tr.stats.starttime for tr in st]
+        assert st.get_endtimes().tolist() == [tr.stats.endtime for tr in st]
+        assert len(Stream().get_starttimes()) == 0
+
     def test_comparisons(self):
         """
         Tests all rich comparison operators (==, !=, <, <=, >, >=)
@@ -1930,6 +2116,15 @@ class TestStream:
         filename = ascii_path / 'slist.*'
         st = read(filename)
         assert len(st) == 2
+        # reading concurrently gives the same traces in the same order
+        filename = ascii_path / '*float*.ascii'
+        for executor in ('thread', 'process'):
+            st2 = read(filename, workers=2, executor=executor)
+            assert st2 == read(filename)
+            st2 = read(filename, workers=3, executor=executor, headonly=True)
+            assert st2 == read(filename, headonly=True)
+        with pytest.raises(ValueError):
+            read(filename, workers=2, executor='cluster')
         # exception if no file matches file pattern
         filename = ascii_path / 'NOTEXISTING.*'
         with pytest.raises(Exception):
@@ -1971,6 +2166,40 @@ class TestStream:
         st = read(data_path)
         assert isinstance(st, Stream)
 
+    def test_iter_read(self, tmp_path):
+        """
+        Test chunk wise reading with iter_read() of formats without
+        streaming support and of multiple files.
+        """
+        st = read()
+        st[1].stats.starttime += 100
+        st[2].stats.starttime += 200
+        for i, tr in enumerate(st):
+            tr.data = tr.data[:100 * (i + 1)].astype(np.int32)
+            tr.write(tmp_path / ('%d.gse2' % i), format='GSE2')
+        st.write(tmp_path / 'all.gse2', format='GSE2')
+        expected = read(tmp_path / 'all.gse2')
+        chunks = list(iter_read(tmp_path / 'all.gse2', chunk=2))
+        assert [len(chunk) for chunk in chunks] == [2, 1]
+        assert Stream([tr for chunk in chunks for tr in chunk]) == expected
+        chunks = list(iter_read(tmp_path / 'all.gse2', chunk_length=150))
+        assert [len(chunk) for chunk in chunks] == [2, 1]
+        # glob patterns
+        chunks = list(iter_read(str(tmp_path / '?.gse2')))
+        assert [len(chunk) for chunk in chunks] == [1, 1, 1]
+        assert Stream([chunk[0] for chunk in chunks]) == expected
+        # start and end time
+        t = st[0].stats.starttime
+        chunks = list(iter_read(tmp_path / 'all.gse2', starttime=t + 0.5,
+                                endtime=t + 100.5))
+        assert len(chunks) == 1
+        assert chunks[0] == read(tmp_path / 'all.gse2', starttime=t + 0.5,
+                                 endtime=t + 100.5)
+        with pytest.raises(Exception, match='No file matching'):
+            next(iter_read(str(tmp_path / '*.mseed')))
+        with pytest.raises(ValueError):
+            next(iter_read(tmp_path / 'all.gse2', chunk=0))
+
     def test_copy(self):
         """
         Testing the copy method of the Stream object.
@@ -2513,6 +2742,40 @@ class TestStream:
                     assert should_change == _gets_merged(
                         trx, to_be_fixed_misalignmnt_ratio)
 
+    def test_slide_view(self):
+        """
+        Sliding with view=True yields the same windows as without, processing
+        the windows does not modify the original stream.
+        """
+        st = read()
+        for tr in st:
+            tr.data = tr.data.astype(np.float64)
+        original = st.copy()
+        kwargs = dict(window_length=4.0, step=3.0, offset=1.0,
+                      include_partial_windows=True)
+        windows = list(st.slide(**kwargs))
+        views = list(st.slide(view=True, **kwargs))
+        assert len(windows) == len(views)
+        for win, view in zip(windows, views):
+            assert len(win) == len(view)
+            for tr_win, tr_view in zip(win, view):
+                np.testing.assert_array_equal(tr_win.data, tr_view.data)
+                tr_win.stats.pop("processing")
+                assert tr_win.stats == tr_view.stats
+            view.detrend().filter('lowpass', freq=5.0)
+        assert st == original
+        # header changes and traces added after the iteration started
+        views = st.slide(view=True, **kwargs)
+        first = next(views)
+        st[0].stats.network = 'XX'
+        tr = st[1].copy()
+        tr.stats.station = 'NEW'
+        st.append(tr)
+        second = next(views)
+        assert first[0].stats.network == 'BW'
+        assert second[0].stats.network == 'BW'
+        assert [tr.stats.station for tr in second] == ['RJOB'] * 3 + ['NEW']
+
     def test_slide(self):
         """
         Tests for sliding a window across a stream object.
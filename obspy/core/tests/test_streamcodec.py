@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+import pickle
+
+import numpy as np
+import pytest
+
+from obspy import Stream, Trace, UTCDateTime, read
+from obspy.core.streamcodec import (
+    decode_stream, encode_stream, stream_from_bytes,
+    stream_from_shared_memory, stream_to_bytes, stream_to_shared_memory)
+
+
+class TestStreamCodec:
+    """
+    Test suite for obspy.core.streamcodec.
+    """
+    def _stream(self):
+        st = read()
+        st[1].stats.network = 'XYZ'
+        st[1].stats.starttime += 12.345678912
+        st[2].stats.calib = 2.5
+        st[2].stats.processing = ['something']
+        st[2].stats.mseed = {'dataquality': 'D'}
+        for dtype in (np.int16, np.int32, np.int64, np.float32,
+                      np.complex128, '>i4', '>f8'):
+            st.append(Trace(data=np.arange(10, dtype=dtype),
+                            header={'station': str(dtype)}))
+        # masked data
+        data = np.ma.masked_array(np.arange(20.0))
+        data[5:8] = np.ma.masked
+        st.append(Trace(data=data, header={'sampling_rate': 12.5}))
+        # non-contiguous data and no data
+        st.append(Trace(data=np.arange(40)[::2]))
+        st.append(Trace(header={'starttime': UTCDateTime(2020, 1, 1)}))
+        # headonly trace with npts differing from the number of samples
+        st.append(Trace(header={'npts': 500, 'sampling_rate': 20.0}))
+        return st
+
+    def _assert_equal(self, st, st2):
+        assert len(st) == len(st2)
+        for tr, tr2 in zip(st, st2):
+            assert tr.stats == tr2.stats
+            assert tr.data.dtype == tr2.data.dtype
+            np.testing.assert_array_equal(tr.data, tr2.data)
+            assert isinstance(tr2.data, np.ma.MaskedArray) == \
+                isinstance(tr.data, np.ma.MaskedArray)
+            if isinstance(tr.data, np.ma.MaskedArray):
+                np.testing.assert_array_equal(tr.data.mask, tr2.data.mask)
+
+    def test_encode_decode(self):
+        """
+        Encoding and decoding must be lossless.
+        """
+        st = self._stream()
+        header, buffers = encode_stream(st)
+        # the data of contiguous arrays is not copied
+        assert np.shares_memory(buffers[0], st[0].data)
+        self._assert_equal(st, decode_stream(header, buffers))
+        st2 = decode_stream(bytes(header), [bytes(b) for b in buffers])
+        self._assert_equal(st, st2)
+        # data of read-only buffers is read-only unless copied
+        assert not st2[0].data.flags.writeable
+        st2 = decode_stream(header, [bytes(b) for b in buffers], copy=True)
+        assert st2[0].data.flags.writeable
+        self._assert_equal(st, st2)
+        # empty stream
+        header, buffers = encode_stream(Stream())
+        assert buffers == []
+        assert decode_stream(header, buffers) == Stream()
+
+    def test_pickle_out_of_band_buffers(self):
+        """
+        Test handing over the buffers as pickle protocol 5 out-of-band
+        buffers without copying the sample data.
+        """
+        st = self._stream()
+        header, buffers = encode_stream(st)
+        oob = []
+        msg = pickle.dumps(
+            (header, [pickle.PickleBuffer(b) for b in buffers]), protocol=5,
+            buffer_callback=oob.append)
+        assert len(msg) < len(header) + 1000
+        header, buffers = pickle.loads(msg, buffers=oob)
+        st2 = decode_stream(header, buffers)
+        self._assert_equal(st, st2)
+        assert np.shares_memory(st2[0].data, st[0].data)
+
+    def test_bytes(self):
+        """
+        Test the contiguous representation.
+        """
+        st = self._stream()
+        data = stream_to_bytes(st)
+        assert isinstance(data, bytes)
+        self._assert_equal(st, stream_from_bytes(data))
+        # views on writable buffers, trailing bytes are ignored
+        data = bytearray(data + b'\x00' * 10)
+        st2 = stream_from_bytes(data)
+        self._assert_equal(st, st2)
+        raw = np.frombuffer(data, dtype=np.uint8)
+        assert st2[0].data.flags.writeable
+        for tr in st2:
+            assert np.shares_memory(tr.data, raw) == (len(tr) > 0)
+            # data buffers are aligned
+            offset = tr.data.__array_interface__['data'][0] - \
+                raw.__array_interface__['data'][0]
+            assert offset % 64 == 0
+        st2 = stream_from_bytes(data, copy=True)
+        assert not np.shares_memory(st2[0].data, raw)
+        self._assert_equal(st, st2)
+
+    def test_shared_memory(self):
+        """
+        Test encoding into shared memory.
+        """
+        st = self._stream()
+        shm = stream_to_shared_memory(st)
+        try:
+            self._assert_equal(st, stream_from_shared_memory(shm.name))
+            st2 = stream_from_shared_memory(shm)
+            self._assert_equal(st, st2)
+            st2[0].data[0] = 12345
+            assert stream_from_shared_memory(shm.name)[0].data[0] == 12345
+            del st2
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def test_errors(self):
+        """
+        Test errors on invalid input.
+        """
+        st = read()
+        header, buffers = encode_stream(st)
+        with pytest.raises(ValueError, match='Expected 3 data buffers'):
+            decode_stream(header, buffers[:2])
+        with pytest.raises(ValueError, match='Not an encoded ObsPy Stream'):
+            decode_stream(b'XXXXXXXX' + header[8:], buffers)
+        with pytest.raises(ValueError, match='truncated'):
+            decode_stream(header[:-1], buffers)
+        with pytest.raises(ValueError, match='truncated'):
+            stream_from_bytes(stream_to_bytes(st)[:-1])
+        st[0].data = np.array(['a', 1], dtype=object)
+        with pytest.raises(ValueError, match="with dtype 'object'"):
+            encode_stream(st)
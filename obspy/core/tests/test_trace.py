@@ -1,4 +1,5 @@
 # -*- coding: utf-8 -*-
+import concurrent.futures
 import math
 import pickle
 import warnings
@@ -12,6 +13,8 @@ import numpy.ma as ma
 from obspy import Stream, Trace, __version__, read, read_inventory
 from obspy import UTCDateTime as UTC
 from obspy.core import Stats
+from obspy.core.trace import (DeferredData, ProcessingInfo, TraceView,
+                              processing_info, set_processing_info)
 from obspy.core.util.base import _get_entry_points
 from obspy.io.xseed import Parser
 import pytest
@@ -603,6 +606,112 @@ class TestTrace:
         assert "processing" in tr2.stats
         assert "trim" in tr2.stats.processing[0]
 
+    def test_deferred_data(self):
+        """
+        Deferred data is only loaded on access, trimming before only narrows
+        down the loaded window.
+        """
+        class ArangeData(DeferredData):
+            loaded = []
+
+            def _load(self, start, stop):
+                self.loaded.append((start, stop))
+                return np.arange(start, stop, dtype=np.int32)
+
+        tr = Trace(data=ArangeData(100, np.int32))
+        assert tr.stats.npts == 100
+        assert len(tr) == 100
+        assert str(tr).endswith('100 samples')
+        tr2 = tr.slice(tr.stats.starttime + 10, tr.stats.starttime + 19.5)
+        tr2.trim(endtime=tr2.stats.endtime - 2)
+        assert tr2.stats.npts == 9
+        assert ArangeData.loaded == []
+        np.testing.assert_array_equal(tr2.data, np.arange(10, 19))
+        assert ArangeData.loaded == [(10, 19)]
+        assert tr2.data.dtype == np.int32
+        # the original trace is untouched
+        np.testing.assert_array_equal(tr.data, np.arange(100))
+        assert ArangeData.loaded == [(10, 19), (0, 100)]
+        # setting real data replaces the deferred data
+        tr = Trace(data=ArangeData(100, np.int32))
+        tr.data = np.ones(5)
+        assert '_deferred_data' not in tr.__dict__
+        assert tr.stats.npts == 5
+
+    def test_slice_view(self):
+        """
+        Tests slicing with view=True, data has to be shared with the original
+        trace until a processing method is applied.
+        """
+        tr = Trace(data=np.arange(100, dtype=np.float64))
+        tr.stats.sampling_rate = 10.0
+        tr.stats.network = 'BW'
+        t = tr.stats.starttime
+        for starttime, endtime, nearest_sample in (
+                (t + 1.03, t + 5.06, True), (t + 1.03, t + 5.06, False),
+                (None, t + 2, True), (t + 2, None, True),
+                (t - 5, t + 20, True), (t + 20, t + 30, True)):
+            view = tr.slice(starttime, endtime, nearest_sample=nearest_sample,
+                            view=True)
+            sliced = tr.slice(starttime, endtime,
+                              nearest_sample=nearest_sample)
+            assert isinstance(view, TraceView)
+            assert len(view) == len(sliced)
+            np.testing.assert_array_equal(view.data, sliced.data)
+            sliced.stats.pop("processing")
+            assert view.stats == sliced.stats
+        view = tr.slice(t + 1, t + 5, view=True)
+        assert np.shares_memory(view.data, tr.data)
+        # processing copies the data first
+        view.detrend('constant')
+        view.taper(0.05)
+        assert not np.shares_memory(view.data, tr.data)
+        np.testing.assert_array_equal(tr.data, np.arange(100))
+        assert len(view.stats.processing) == 2
+        assert 'processing' not in tr.stats
+        # header of the view is independent of the original trace
+        view.stats.network = 'XX'
+        assert tr.stats.network == 'BW'
+        # header is copied when the view is created
+        view = tr.slice(t + 1, t + 5, view=True)
+        tr.stats.network = 'YY'
+        tr.stats.sampling_rate = 20.0
+        assert view.stats.network == 'BW'
+        assert view.stats.sampling_rate == 10.0
+        assert view.stats.starttime == t + 1
+        assert view.stats.npts == 41
+        # slicing with starttime after endtime fails like trimming
+        with pytest.raises(ValueError):
+            tr.slice(t + 5, t + 1, view=True)
+
+    def test_slide_view(self):
+        """
+        The views yielded by slide() share a single copy of the header which
+        is only copied again on first access of their header, changes of the
+        header of the original trace do not show up in the views.
+        """
+        tr = Trace(data=np.arange(100, dtype=np.float64))
+        tr.stats.sampling_rate = 10.0
+        tr.stats.network = 'BW'
+        t = tr.stats.starttime
+        with mock.patch('obspy.core.trace.deepcopy',
+                        wraps=deepcopy) as deepcopy_:
+            views = list(tr.slide(2.0, 2.0, view=True))
+            assert deepcopy_.call_count == 1
+        tr.stats.network = 'YY'
+        tr.stats.sampling_rate = 20.0
+        assert len(views) == 4
+        for i, view in enumerate(views):
+            assert view.stats.network == 'BW'
+            assert view.stats.sampling_rate == 10.0
+            assert view.stats.starttime == t + 2 * i
+            assert view.stats.npts == 21
+        # headers of the views are independent of each other
+        views[0].stats.network = 'XX'
+        assert views[1].stats.network == 'BW'
+        assert views[0].stats.starttime != views[1].stats.starttime
+        assert tr.stats.network == 'YY'
+
     def test_slice_no_starttime_or_endtime(self):
         """
         Tests the slicing of trace objects with no start time or end time
@@ -1462,6 +1571,21 @@ class TestTrace:
                 730120.00000231480225920677])
         np.testing.assert_allclose(got[:5], expected, rtol=1e-17)
 
+    def test_times_utcdatetimearray(self):
+        """
+        Sample times as UTCDateTimeArray match the UTCDateTime objects and
+        masked samples are NaT.
+        """
+        tr = Trace(data=np.ma.ones(100))
+        tr.stats.sampling_rate = 3
+        tr.stats.starttime = UTC(2000, 1, 1, 0, 0, 0, 123456)
+        tr.data[30:40] = np.ma.masked
+        got = tr.times("utcdatetimearray")
+        expected = tr.times("utcdatetime")
+        assert len(got) == 100
+        np.testing.assert_array_equal(got.isnat(), expected.mask)
+        assert got[~got.isnat()].tolist() == expected.compressed().tolist()
+
     def test_modulo_operation(self):
         """
         Method for testing the modulo operation. Mainly tests part not covered
@@ -1890,6 +2014,98 @@ class TestTrace:
             tr.decimate(7, strict_length=True)
         assert tr.stats.processing == [info]
 
+    def test_processing_info_settings(self):
+        """
+        Recording of processing information can be disabled, sampled or
+        switched to structured entries.
+        """
+        tr = Trace(data=np.arange(20, dtype=np.float64))
+        with processing_info(enabled=False):
+            tr.detrend().taper(0.05)
+        assert "processing" not in tr.stats
+        np.testing.assert_allclose(tr.data, 0, atol=1e-12)
+        # only every third call is recorded
+        with processing_info(every=3):
+            for _ in range(9):
+                tr.normalize(1.0)
+        assert len(tr.stats.processing) == 3
+        # settings are restored after leaving the context
+        tr.detrend()
+        assert len(tr.stats.processing) == 4
+        # structured entries render to the same strings
+        tr1 = Trace(data=np.arange(20, dtype=np.float64))
+        tr2 = tr1.copy()
+        tr1.filter('lowpass', 0.2, corners=2).taper(0.1, side='left')
+        with processing_info(structured=True):
+            tr2.filter('lowpass', 0.2, corners=2).taper(0.1, side='left')
+        assert isinstance(tr2.stats.processing[0], ProcessingInfo)
+        assert tr2.stats.processing[0].function == 'filter'
+        assert tr1.stats.processing == tr2.stats.processing
+        assert [str(i) for i in tr2.stats.processing] == \
+            tr1.stats.processing
+        assert str(tr2.stats.processing) == str(tr1.stats.processing)
+        assert tr1 == tr2
+        tr3 = pickle.loads(pickle.dumps(tr2))
+        assert tr3.stats.processing == tr1.stats.processing
+        # global switch
+        previous = set_processing_info(enabled=False)
+        try:
+            tr1.detrend()
+        finally:
+            set_processing_info(**previous)
+        assert len(tr1.stats.processing) == 2
+        with pytest.raises(ValueError):
+            set_processing_info(every=0)
+        # structured entries do not keep references to the arguments
+        tr1 = Trace(data=np.arange(20, dtype=np.float64))
+        tr2 = tr1.copy()
+        t = tr1.stats.starttime + 2
+        tr1.trim(starttime=t)
+        with processing_info(structured=True):
+            tr2.trim(starttime=t)
+        arguments = dict(tr2.stats.processing[0].arguments)
+        assert arguments['starttime'] is not t
+        assert arguments['starttime'] == repr(t)
+        assert arguments['pad'] is False
+        assert tr2.stats.processing == tr1.stats.processing
+        assert pickle.loads(pickle.dumps(tr2)).stats.processing == \
+            tr1.stats.processing
+
+    def test_processing_info_settings_threads(self):
+        """
+        set_processing_info() applies to all threads, processing_info() only
+        to the current thread.
+        """
+        def process():
+            tr = Trace(data=np.arange(20, dtype=np.float64))
+            for _ in range(4):
+                tr.normalize(1.0)
+            return len(tr.stats.get('processing', []))
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
+            previous = set_processing_info(enabled=False)
+            try:
+                assert process() == 0
+                assert pool.submit(process).result() == 0
+                # scoped override of the global settings
+                with processing_info(every=2):
+                    assert process() == 2
+                    assert pool.submit(process).result() == 0
+            finally:
+                set_processing_info(**previous)
+            with processing_info(enabled=False):
+                assert process() == 0
+                assert pool.submit(process).result() == 4
+            assert process() == 4
+            # settings changed in a worker thread apply everywhere
+            previous = pool.submit(set_processing_info, every=2).result()
+            try:
+                assert process() == 2
+                assert pool.submit(process).result() == 2
+            finally:
+                set_processing_info(**previous)
+            assert pool.submit(process).result() == 4
+
     def test_meta(self):
         """
         Tests Trace.meta an alternative to Trace.stats
@@ -2705,6 +2921,33 @@ class TestTrace:
         assert sr1 == 1e5
         assert sr2 == sr1
 
+    def test_pickle_protocol_5_masked_data(self):
+        """
+        With pickle protocol 5 data and mask of masked arrays are handed
+        over as out-of-band buffers.
+        """
+        data = np.ma.masked_array(np.arange(1000.0), fill_value=-1.0)
+        data[10:20] = np.ma.masked
+        tr = Trace(data=data)
+        buffers = []
+        msg = pickle.dumps(tr, protocol=5, buffer_callback=buffers.append)
+        assert len(msg) < 1000
+        tr2 = pickle.loads(msg, buffers=buffers)
+        assert tr2 == tr
+        assert np.shares_memory(tr2.data.data, tr.data.data)
+        np.testing.assert_array_equal(tr2.data.mask, data.mask)
+        assert tr2.data.fill_value == -1.0
+        # in-band and with older protocols
+        for protocol in (2, 5):
+            tr2 = pickle.loads(pickle.dumps(tr, protocol=protocol))
+            assert tr2 == tr
+            np.testing.assert_array_equal(tr2.data.mask, data.mask)
+        # no mask at all
+        tr.data = np.ma.masked_array(np.arange(10))
+        tr2 = pickle.loads(pickle.dumps(tr, protocol=5))
+        assert tr2 == tr
+        assert not np.ma.is_masked(tr2.data)
+
     def test_resample_short_traces(self):
         """
         Tests that resampling of short traces leaves at least one sample
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+import warnings
+
+import numpy as np
+import pytest
+
+from obspy import Stream, Trace, UTCDateTime, read
+from obspy.core.traceblock import TraceBlock
+
+
+class TestTraceBlock:
+    """
+    Test suite for obspy.core.traceblock.TraceBlock.
+    """
+    def _stream(self):
+        st = read()
+        st += read()
+        st[3].stats.network = 'XYZ'
+        st[4].stats.starttime += 12.345
+        st[5].stats.calib = 2.5
+        st[5].stats.processing = ['something']
+        return st
+
+    def test_round_trip(self):
+        """
+        Converting to a TraceBlock and back must be lossless.
+        """
+        st = self._stream()
+        block = st.to_array_block()
+        assert isinstance(block, TraceBlock)
+        assert len(block) == 6
+        assert block.data.shape == (6, 3000)
+        assert block.npts == 3000
+        assert block.sampling_rate == 100.0
+        assert block.header['network'][3] == 'XYZ'
+        assert block.header['starttime'][4] == st[4].stats.starttime.ns
+        st2 = block.to_stream()
+        assert st2 == st
+        for tr, tr2 in zip(st, st2):
+            assert tr.stats == tr2.stats
+            assert tr.data.dtype == tr2.data.dtype
+        # headers are copied
+        st2[0].stats.response.instrument_sensitivity.value = 1.0
+        st2[5].stats.processing.append('else')
+        assert st[0].stats.response.instrument_sensitivity.value != 1.0
+        assert st[5].stats.processing == ['something']
+
+    @pytest.mark.parametrize('method, args, kwargs', [
+        ('filter', ('bandpass',), dict(freqmin=1.0, freqmax=10.0)),
+        ('filter', ('lowpass', 5.0), dict(zerophase=True)),
+        ('filter', ('lowpass_cheby_2',), dict(freq=5.0)),
+        ('detrend', (), {}),
+        ('detrend', ('linear',), {}),
+        ('detrend', ('demean',), {}),
+        ('detrend', ('polynomial',), dict(order=2)),
+        ('taper', (0.05,), {}),
+        ('taper', (0.1,), dict(type='cosine', side='left')),
+        ('taper', (None,), dict(max_length=2.0, type='hamming')),
+        ('normalize', (), {}),
+        ('normalize', (), dict(norm=200.0)),
+    ])
+    def test_processing_matches_trace_processing(self, method, args, kwargs):
+        """
+        Processing a TraceBlock gives the same result as processing each
+        trace on its own, including processing information.
+        """
+        st = self._stream()
+        block = st.to_array_block()
+        assert getattr(block, method)(*args, **kwargs) is block
+        for tr in st:
+            getattr(tr, method)(*args, **kwargs)
+        st2 = block.to_stream()
+        for tr, tr2 in zip(st, st2):
+            assert tr.stats == tr2.stats
+            assert tr.data.dtype == tr2.data.dtype
+            np.testing.assert_allclose(tr.data, tr2.data, rtol=1e-10,
+                                       atol=1e-10 * np.abs(tr.data).max())
+
+    def test_normalize_zero_trace(self):
+        """
+        Traces without any signal are not changed by normalize().
+        """
+        st = Stream([Trace(data=np.zeros(10)),
+                     Trace(data=np.arange(10, dtype=np.float64))])
+        block = st.to_array_block()
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter('always')
+            block.normalize()
+        assert len(w) == 1
+        np.testing.assert_array_equal(block.data[0], np.zeros(10))
+        np.testing.assert_array_equal(block.data[1], np.arange(10) / 9.0)
+
+    def test_inhomogeneous_stream(self):
+        """
+        Streams that can not be stored in a TraceBlock raise a ValueError.
+        """
+        with pytest.raises(ValueError):
+            Stream().to_array_block()
+        st = Stream([Trace(data=np.zeros(10)), Trace(data=np.zeros(11))])
+        with pytest.raises(ValueError, match='number of samples'):
+            st.to_array_block()
+        st = Stream([Trace(data=np.zeros(10)), Trace(data=np.zeros(10))])
+        st[1].stats.sampling_rate = 2.0
+        with pytest.raises(ValueError, match='sampling rate'):
+            st.to_array_block()
+        st = Stream([Trace(data=np.zeros(10)),
+                     Trace(data=np.ma.masked_equal(np.zeros(10), 0))])
+        with pytest.raises(ValueError, match='masked'):
+            st.to_array_block()
+        # data types are not promoted
+        st = Stream([Trace(data=np.zeros(10, dtype=np.int32)),
+                     Trace(data=np.zeros(10, dtype=np.float64))])
+        with pytest.raises(ValueError, match='data type'):
+            st.to_array_block()
+
+    def test_starttime_precision(self):
+        """
+        Start times are kept with nanosecond precision.
+        """
+        tr = Trace(data=np.zeros(10))
+        tr.stats.starttime = UTCDateTime(ns=1234567890123456789)
+        st = Stream([tr]).to_array_block().to_stream()
+        assert st[0].stats.starttime.ns == 1234567890123456789
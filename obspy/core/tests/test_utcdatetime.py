@@ -10,6 +10,7 @@ from packaging.version import parse as parse_version
 import numpy as np
 
 from obspy import UTCDateTime as UTC
+from obspy.core.utcdatetime import UTCDateTimeArray
 from obspy.core.util.deprecation_helpers import ObsPyDeprecationWarning
 import pytest
 
@@ -1521,3 +1522,254 @@ class TestUTCDateTime:
         # skip ISO8601 mode
         assert UTC('2019-01-01T02-02:33', iso8601=False) == \
                UTC(2019, 1, 1, 2, 2, 33)
+
+    def test_from_iso8601(self):
+        """
+        UTCDateTime.from_iso8601() gives the same results as the regular
+        constructor, also for strings not handled by its fast path.
+        """
+        strings = [
+            '2009-08-24', '2009-08-24T00', '2009-08-24 00:20',
+            '2009-08-24T00:20:03', '2009-08-24T00:20:03Z',
+            '2009-08-24T00:20:03.5', '2009-08-24T00:20:03.123456Z',
+            ' 2009-08-24T00:20:03.123456 ', '1930-12-31T23:59:59.999999',
+            '0001-01-01T00:00:00', '9999-12-31T23:59:59.999999',
+            '2008-02-29T12:00:00',
+            # more than six digits are rounded to microseconds
+            '2009-08-24T00:20:03.1234565', '2009-08-24T00:20:03.9999996',
+            '2009-12-31T23:59:59.99999999Z',
+            # handled by the regular constructor
+            '2009-236T00:20:03', '20090824T002003', '2009-W35-1',
+            '2009-08-24T00:20:03+01:30']
+        for string in strings:
+            got = UTC.from_iso8601(string)
+            expected = UTC(string)
+            assert isinstance(got, UTC)
+            assert got.ns == expected.ns, string
+            assert got.precision == 6
+            assert got.__dict__ == expected.__dict__
+        got = UTC.from_iso8601('2009-08-24T00:20:03.123456789', precision=9)
+        assert got.precision == 9
+        assert got == UTC('2009-08-24T00:20:03.123456789', precision=9)
+        # object is initialized as usual
+        with pytest.warns(ObsPyDeprecationWarning):
+            got.foo = 1
+        for string in ('2009-02-29', '2009-13-01', '2009-08-24T24:00:00',
+                       '2009-08-24T00:60', '2009-08-24T00:00:60',
+                       '2009-08-24T00:20:03,5'):
+            with pytest.raises(ValueError):
+                UTC(string)
+            with pytest.raises(ValueError):
+                UTC.from_iso8601(string)
+        # rounding past the end of year 9999
+        for string in ('9999-12-31T23:59:59.9999999',
+                       '9999-12-31T23:59:59.9999999Z'):
+            with pytest.raises(OverflowError):
+                UTC(string)
+            with pytest.raises(OverflowError):
+                UTC.from_iso8601(string)
+
+    def test_from_iso8601_default_precision(self):
+        """
+        UTCDateTime.from_iso8601() uses the current default precision.
+        """
+        default = UTC.DEFAULT_PRECISION
+        try:
+            UTC.DEFAULT_PRECISION = 3
+            assert UTC.from_iso8601('2009-08-24').precision == 3
+            assert UTCDateTimeArray(['2009-08-24']).precision == 3
+        finally:
+            UTC.DEFAULT_PRECISION = default
+        assert UTC.from_iso8601('2009-08-24').precision == default
+
+
+class TestUTCDateTimeArray:
+    """
+    Test suite for obspy.core.utcdatetime.UTCDateTimeArray.
+    """
+    def _times(self):
+        rng = np.random.default_rng(42)
+        ns = rng.integers(-2 * 10**18, 4 * 10**18, 1000)
+        # include values that round up to the next second/day
+        ns[:3] = [86399999999999, 999999500, -500]
+        return [UTC(ns=int(_i)) for _i in ns]
+
+    def test_init(self):
+        """
+        Tests the different ways to create a UTCDateTimeArray.
+        """
+        times = self._times()
+        expected = [t.ns for t in times]
+        strings = [str(t) for t in times]
+        for value in (times, strings, UTCDateTimeArray(times),
+                      np.array(expected, dtype='datetime64[ns]')):
+            got = UTCDateTimeArray(value)
+            assert got.ns.dtype == np.int64
+            if value is strings:
+                expected_ = [UTC(s).ns for s in strings]
+            else:
+                expected_ = expected
+            np.testing.assert_array_equal(got.ns, expected_)
+        np.testing.assert_array_equal(
+            UTCDateTimeArray(ns=expected).ns, expected)
+        # timestamps
+        got = UTCDateTimeArray([1.5, 1234567890.123456789])
+        assert got.ns.tolist() == [UTC(1.5).ns, UTC(1234567890.123456789).ns]
+        assert UTCDateTimeArray([12]).ns.tolist() == [12 * 10**9]
+        # strings that are not plain ISO8601 are parsed by UTCDateTime
+        strings = ['2010-123T00:00:01', '20100102T000000Z',
+                   '2019-01-01T02-02:33', '2009-08-24T00:20:03.1234567']
+        np.testing.assert_array_equal(UTCDateTimeArray(strings).ns,
+                                      [UTC(s).ns for s in strings])
+        with pytest.raises(ValueError):
+            UTCDateTimeArray(['2009-02-30'])
+        assert len(UTCDateTimeArray()) == 0
+        assert len(UTCDateTimeArray([])) == 0
+
+    def test_fields_and_formatting(self):
+        """
+        Date fields and ISO8601 strings match those of UTCDateTime objects,
+        also for other precisions.
+        """
+        times = self._times()
+        for precision in (0, 3, 6, 9):
+            times_ = [UTC(ns=t.ns, precision=precision) for t in times]
+            array = UTCDateTimeArray(times, precision=precision)
+            for key in ('year', 'month', 'day', 'julday', 'weekday', 'hour',
+                        'minute', 'second', 'microsecond'):
+                np.testing.assert_array_equal(
+                    getattr(array, key), [getattr(t, key) for t in times_],
+                    err_msg=key)
+            assert array.format_iso8601().tolist() == \
+                [str(t) for t in times_]
+            assert array.tolist() == times_
+            assert list(array) == times_
+        assert UTCDateTimeArray(times).timestamp.tolist() == \
+            [t.timestamp for t in times]
+
+    def test_arithmetic(self):
+        """
+        Adding and subtracting seconds and subtracting times work like for
+        UTCDateTime objects.
+        """
+        times = self._times()
+        array = UTCDateTimeArray(times)
+        seconds = np.random.default_rng(1).uniform(-1e6, 1e6, len(times))
+        assert (array + seconds).ns.tolist() == \
+            [(t + float(s)).ns for t, s in zip(times, seconds)]
+        assert (seconds + array).ns.tolist() == \
+            [(t + float(s)).ns for t, s in zip(times, seconds)]
+        assert (array - 1.25).ns.tolist() == [(t - 1.25).ns for t in times]
+        delta = datetime.timedelta(days=1, microseconds=3)
+        assert (array + delta).ns.tolist() == [(t + delta).ns for t in times]
+        assert (array + np.timedelta64(5, 'ns')).ns.tolist() == \
+            [t.ns + 5 for t in times]
+        # relative times are rounded to the precision exactly like they are
+        # for UTCDateTime objects
+        t = times[10]
+        assert (array - t).tolist() == [t_ - t for t_ in times]
+        assert (t - array).tolist() == [t - t_ for t_ in times]
+        assert (array - array[::-1]).tolist() == \
+            [a - b for a, b in zip(times, times[::-1])]
+        with pytest.raises(TypeError):
+            array + t
+        with pytest.raises(TypeError):
+            array + array
+
+    @pytest.mark.parametrize('precision', [0, 3, 6, 9])
+    def test_relative_times_precision(self, precision):
+        """
+        Relative times are equal to the subtraction of UTCDateTime objects
+        element-wise for all precisions, also close to rounding ties.
+        """
+        rng = np.random.default_rng(precision)
+        ns = np.concatenate([
+            rng.integers(-2 * 10**18, 4 * 10**18, 1000),
+            rng.integers(-10**12, 10**12, 1000),
+            rng.integers(-10**6, 10**6, 1000) * 10**(9 - precision) +
+            5 * 10**(9 - precision) // 10])
+        times = [UTC(ns=int(n), precision=precision) for n in ns]
+        array = UTCDateTimeArray(times, precision=precision)
+        t = UTC(ns=int(rng.integers(0, 10**18)), precision=precision)
+        assert (array - t).tolist() == [t_ - t for t_ in times]
+        assert (t - array).tolist() == [t - t_ for t_ in times]
+        assert (array - array[::-1]).tolist() == \
+            [a - b for a, b in zip(times, times[::-1])]
+
+    def test_comparisons(self):
+        """
+        Comparisons round to the precision like UTCDateTime does.
+        """
+        times = self._times()
+        array = UTCDateTimeArray(times)
+        for other in (times[5], times[:3]):
+            for op in (eq, ne, lt, le, gt, ge):
+                if isinstance(other, list):
+                    expected = [op(a, b) for a, b in zip(times, other)]
+                    got = op(array[:3], UTCDateTimeArray(other))
+                else:
+                    expected = [op(t, other) for t in times]
+                    got = op(array, other)
+                    # reflected operation
+                    np.testing.assert_array_equal(
+                        op(other, array), [op(other, t) for t in times])
+                np.testing.assert_array_equal(got, expected)
+        t1 = UTCDateTimeArray([123.000000012])
+        assert (t1 == UTC(123.000000099)).all()
+        t1.precision = 9
+        assert not (t1 == UTC(123.000000099, precision=9)).any()
+        # strings and numpy datetimes are converted
+        assert (array[:1] == str(times[0])).all()
+        assert (array == array.datetime64).all()
+        with pytest.warns(ObsPyDeprecationWarning,
+                          match='different precision'):
+            t1 == UTC(123)
+
+    def test_nat(self):
+        """
+        Missing times are kept as NaT.
+        """
+        array = UTCDateTimeArray([UTC(10), None, '1970-01-01T00:00:30'])
+        np.testing.assert_array_equal(array.isnat(), [False, True, False])
+        assert array[1] is None
+        assert array.tolist()[1] is None
+        assert np.isnat(array.datetime64[1])
+        assert UTCDateTimeArray(array.datetime64).isnat()[1]
+        assert array.format_iso8601()[1] == 'NaT'
+        assert np.isnan(array.timestamp[1])
+        assert (array + 1).isnat()[1]
+        assert np.isnan((array - UTC(0))[1])
+        np.testing.assert_array_equal(array == array, [True, False, True])
+        np.testing.assert_array_equal(array != array, [False, True, False])
+        assert array.min() == UTC(10)
+        assert array.max() == UTC(30)
+        with pytest.raises(ValueError):
+            UTCDateTimeArray([None]).min()
+
+    def test_item_access(self):
+        """
+        Tests indexing, setting items and sorting.
+        """
+        array = UTCDateTimeArray([UTC(30), UTC(10), UTC(20)], precision=3)
+        item = array[0]
+        assert isinstance(item, UTC)
+        assert item.ns == 30 * 10**9
+        assert item.precision == 3
+        sub = array[1:]
+        assert isinstance(sub, UTCDateTimeArray)
+        assert sub.precision == 3
+        assert sub.ns.tolist() == [10 * 10**9, 20 * 10**9]
+        array[0] = UTC(40)
+        array[1:] = ['1970-01-01T00:00:50', '1970-01-01T00:00:05']
+        assert array.ns.tolist() == [40 * 10**9, 50 * 10**9, 5 * 10**9]
+        array[2] = None
+        assert array.isnat()[2]
+        assert array.argsort().tolist() == [2, 0, 1]
+        array.sort()
+        assert array.isnat()[0]
+        copied = array.copy()
+        copied[1] = UTC(0)
+        assert array[1].ns == 40 * 10**9
+        assert np.asarray(array).dtype == np.dtype('datetime64[ns]')
+        assert repr(UTCDateTimeArray([UTC(0)])) == \
+            "UTCDateTimeArray(['1970-01-01T00:00:00.000000Z'])"
@@ -7,9 +7,13 @@ import numpy as np
 import pytest
 from requests import HTTPError
 
+import obspy.core.util.base
+from obspy import read
 from obspy.core.util.base import (NamedTemporaryFile, get_dependency_version,
                                   download_to_file, sanitize_filename,
-                                  create_empty_data_chunk, ComparingObject)
+                                  create_empty_data_chunk, ComparingObject,
+                                  _FORMAT_CACHE, _get_format_entry_point,
+                                  _sniff_format)
 
 
 class TestUtilBase:
@@ -113,3 +117,89 @@ class TestUtilBase:
         assert co == deep_copy
         deep_copy.at = 0
         assert co != deep_copy
+
+    def test_sniff_format(self, root):
+        """
+        Tests recognizing formats by the signature of their first bytes.
+        """
+        io_path = root / 'io'
+        files = [
+            ('waveform', 'mseed/tests/data/test.mseed', 'MSEED'),
+            ('waveform', 'gse2/tests/data/loc_RJOB20050831023349.z', 'GSE2'),
+            ('waveform', 'ascii/tests/data/slist.ascii', 'SLIST'),
+            ('waveform', 'ascii/tests/data/tspair.ascii', 'TSPAIR'),
+            ('waveform', 'sac/tests/data/test.sac', None),
+            ('event', 'quakeml/tests/data/iris_events.xml', 'QUAKEML'),
+            ('inventory', 'stationxml/tests/data/F1_423_small.xml',
+             'STATIONXML'),
+            ('inventory', 'mseed/tests/data/test.mseed', None),
+        ]
+        for plugin_type, filename, format in files:
+            filename = io_path / filename
+            assert _sniff_format(plugin_type, filename) == format
+            # file-like objects are not moved
+            with open(filename, 'rb') as fh:
+                fh.seek(10)
+                assert _sniff_format(plugin_type, fh) in (format, None)
+                assert fh.tell() == 10
+            if format is not None:
+                assert _get_format_entry_point(
+                    plugin_type, str(filename)).name == format
+
+    def test_format_detection_cache(self, tmp_path):
+        """
+        The detected format is cached per directory and file extension and
+        checked first for further files, files of other formats are still
+        detected correctly.
+        """
+        _FORMAT_CACHE.clear()
+        st = read()
+        for i, tr in enumerate(st):
+            tr.write(str(tmp_path / ('%d.dat' % i)), format='SAC')
+        st.write(str(tmp_path / '3.dat'), format='MSEED')
+        key = ('waveform', str(tmp_path), '.dat')
+        with mock.patch('obspy.core.util.base._is_format',
+                        wraps=obspy.core.util.base._is_format) as is_format:
+            assert _get_format_entry_point(
+                'waveform', str(tmp_path / '0.dat')).name == 'SAC'
+            assert _FORMAT_CACHE[key] == 'SAC'
+            is_format.reset_mock()
+            for i in (1, 2):
+                assert _get_format_entry_point(
+                    'waveform', str(tmp_path / ('%d.dat' % i))).name == 'SAC'
+            # only the cached format is checked
+            assert is_format.call_count == 2
+            # cached format is not used without confirming it
+            assert _get_format_entry_point(
+                'waveform', str(tmp_path / '3.dat')).name == 'MSEED'
+        assert _FORMAT_CACHE[key] == 'MSEED'
+        # formats with a weak isFormat check yield to the formats listed for
+        # them earlier in the sort order
+        _FORMAT_CACHE[key] = 'WIN'
+        with mock.patch('obspy.core.util.base._is_format',
+                        side_effect=lambda plugin_type, format_ep, filename:
+                        format_ep.name in ('SAC', 'WIN')):
+            assert _get_format_entry_point(
+                'waveform', str(tmp_path / '0.dat')).name == 'SAC'
+        assert _FORMAT_CACHE[key] == 'SAC'
+        _FORMAT_CACHE.clear()
+
+    def test_format_detection_cache_segy(self, root):
+        """
+        A warm cache skips checking the formats preceding the cached format
+        in the sort order.
+        """
+        _FORMAT_CACHE.clear()
+        filename = str(root / 'io' / 'segy' / 'tests' / 'data' /
+                       '00001034.sgy_first_trace')
+        with mock.patch('obspy.core.util.base._is_format',
+                        wraps=obspy.core.util.base._is_format) as is_format:
+            assert _get_format_entry_point('waveform', filename).name == \
+                'SEGY'
+            cold = is_format.call_count
+            is_format.reset_mock()
+            assert _get_format_entry_point('waveform', filename).name == \
+                'SEGY'
+            assert is_format.call_count == 1
+        assert cold > 1
+        _FORMAT_CACHE.clear()
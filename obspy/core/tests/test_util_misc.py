@@ -1,4 +1,7 @@
 # -*- coding: utf-8 -*-
+import json
+import os
+import subprocess
 import sys
 import tempfile
 import warnings
@@ -9,7 +12,10 @@ import pytest
 from obspy import UTCDateTime, read
 from obspy.core.event import ResourceIdentifier as ResId
 from obspy.core.util.misc import CatchOutput, get_window_times, \
-    _ENTRY_POINT_CACHE, _yield_obj_parent_attr
+    _ENTRY_POINT_CACHE, _ENTRY_POINT_REGISTRY, _get_entry_point_cache_file, \
+    _get_entry_point_cache_key, _get_entry_point_registry, \
+    _atomic_write, _yield_obj_parent_attr
+from obspy.io.mseed.core import _read_mseed
 from obspy.core.util.base import CatchAndAssertWarnings
 
 
@@ -251,29 +257,122 @@ class TestUtilMisc:
             include_partial_windows=False),
         assert window == expected
 
-    def test_entry_point_buffer(self):
+    def test_entry_point_buffer(self, tmp_path):
         """
         Ensure the entry point buffer caches results from load_entry_point
         """
         with mock.patch.dict(_ENTRY_POINT_CACHE, clear=True):
-            with mock.patch('importlib.metadata.entry_points') as p:
-                class _Distribution(object):
-                    name = 'obspy'
-
-                class _EntryPoint(mock.MagicMock):
-                    dist = _Distribution()
-
-                p.return_value = [_EntryPoint()]
+            with mock.patch(
+                    'obspy.core.util.misc._get_entry_point_registry',
+                    wraps=_get_entry_point_registry) as p:
                 # raises UserWarning: No matching response information found.
                 with warnings.catch_warnings(record=True):
                     warnings.simplefilter('ignore', UserWarning)
                     st = read()
-                    st.write('temp.mseed', 'mseed')
+                    st.write(tmp_path / 'temp.mseed', 'mseed')
+                    st.write(tmp_path / 'temp.mseed', 'mseed')
             assert len(_ENTRY_POINT_CACHE) == 3
-            if sys.version_info.minor >= 10:
-                # Skipping for py 3.8 and 3.9, it fails but it's not really
-                # a problem.
-                assert p.call_count == 3
+            assert p.call_count == 3
+
+    def test_entry_point_registry(self, tmp_path):
+        """
+        The entry point registry is stored on disk on the first plugin lookup
+        and reused as long as the installed distributions do not change.
+        """
+        filename = tmp_path / 'entry_points.json'
+        with mock.patch.dict(os.environ, {'OBSPY_CACHE_DIR': str(tmp_path)}):
+            with mock.patch.dict(_ENTRY_POINT_REGISTRY, clear=True):
+                registry = _get_entry_point_registry()
+                assert not filename.exists()
+                assert _get_entry_point_registry(save=True) is registry
+                assert filename.exists()
+                eps = registry['obspy.plugin.waveform.MSEED']
+                assert [ep.name for ep in eps if ep.name == 'readFormat']
+                assert [ep.dist.name for ep in eps] == ['obspy'] * len(eps)
+                ep = [ep for ep in eps if ep.name == 'readFormat'][0]
+                assert ep.module == 'obspy.io.mseed.core'
+                assert ep.load() is _read_mseed
+            # the stored registry is used without scanning again
+            with mock.patch.dict(_ENTRY_POINT_REGISTRY, clear=True):
+                with mock.patch('obspy.core.util.misc._scan_entry_points') \
+                        as p:
+                    assert _get_entry_point_registry() == registry
+                assert p.call_count == 0
+            # a changed set of distributions leads to a new scan
+            with mock.patch.dict(_ENTRY_POINT_REGISTRY, clear=True):
+                with mock.patch(
+                        'obspy.core.util.misc._get_entry_point_cache_key',
+                        return_value='something else'):
+                    with mock.patch(
+                            'obspy.core.util.misc._scan_entry_points',
+                            return_value=[]) as p:
+                        assert _get_entry_point_registry(save=True) == {}
+                    assert p.call_count == 1
+            assert json.loads(filename.read_text())['key'] == \
+                'something else'
+        # changed entry points of a distribution change the key
+        dist_info = tmp_path / 'site' / 'foo-1.0.dist-info'
+        dist_info.mkdir(parents=True)
+        entry_points_txt = dist_info / 'entry_points.txt'
+        entry_points_txt.write_text('[obspy.plugin.waveform]\n')
+        with mock.patch.object(sys, 'path', [str(tmp_path / 'site')]):
+            key = _get_entry_point_cache_key()
+            entry_points_txt.write_text('[obspy.plugin.waveform]\nFOO = x\n')
+            os.utime(dist_info, ns=(0, 0))
+            assert _get_entry_point_cache_key() != key
+        # the on-disk registry can be disabled
+        with mock.patch.dict(os.environ, {'OBSPY_CACHE_DIR': ''}):
+            assert _get_entry_point_cache_file() is None
+
+    def test_atomic_write(self, tmp_path):
+        """
+        The file is only replaced if writing succeeds, the temporary file is
+        removed in any case.
+        """
+        filename = tmp_path / 'file.json'
+        with _atomic_write(str(filename)) as fh:
+            fh.write('abc')
+        assert filename.read_text() == 'abc'
+        with pytest.raises(ValueError):
+            with _atomic_write(str(filename)) as fh:
+                fh.write('def')
+                raise ValueError()
+        assert filename.read_text() == 'abc'
+        with _atomic_write(str(filename), mode='wb') as fh:
+            fh.write(b'def')
+        assert filename.read_text() == 'def'
+        assert os.listdir(tmp_path) == ['file.json']
+
+    def test_import_obspy_does_not_write_cache(self, tmp_path):
+        """
+        Importing obspy does not write the on-disk entry point registry, the
+        first plugin lookup does.
+        """
+        env = dict(os.environ, OBSPY_CACHE_DIR=str(tmp_path))
+        subprocess.run([sys.executable, '-c', 'import obspy'], env=env,
+                       check=True)
+        assert not list(tmp_path.iterdir())
+        subprocess.run([sys.executable, '-c', 'import obspy; obspy.read()'],
+                       env=env, check=True)
+        assert (tmp_path / 'entry_points.json').exists()
+
+    def test_import_obspy_lazily(self):
+        """
+        Importing obspy and accessing read() must not import event and
+        inventory handling or other heavy dependencies.
+        """
+        code = 'import obspy; obspy.read'
+        output = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', code],
+            capture_output=True, text=True, check=True).stderr
+        modules = set(line.split('|')[-1].strip()
+                      for line in output.splitlines()
+                      if line.startswith('import time:'))
+        assert 'obspy.core.stream' in modules
+        for module in ('obspy.core.event', 'obspy.core.inventory',
+                       'obspy.imaging', 'obspy.io.mseed', 'matplotlib',
+                       'scipy'):
+            assert module not in modules
 
     def test_yield_obj_parent_attr(self):
         """
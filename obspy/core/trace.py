@@ -9,16 +9,20 @@ Module for handling ObsPy :class:`~obspy.core.trace.Trace` and
     GNU Lesser General Public License, Version 3
     (https://www.gnu.org/copyleft/lesser.html)
 """
+import contextvars
 import inspect
+import itertools
 import math
 import warnings
+from collections import namedtuple
+from contextlib import contextmanager
 from copy import copy, deepcopy
 
 import numpy as np
 from decorator import decorator
 
 from obspy.core import compatibility
-from obspy.core.utcdatetime import UTCDateTime
+from obspy.core.utcdatetime import UTCDateTime, UTCDateTimeArray, _NAT
 from obspy.core.util import AttribDict, create_empty_data_chunk, NUMPY_VERSION
 from obspy.core.util.base import _get_function_from_entry_point
 from obspy.core.util.decorator import raise_if_masked, skip_if_no_data
@@ -26,6 +30,16 @@ from obspy.core.util.misc import (flat_not_masked_contiguous, get_window_times,
                                   limit_numpy_fft_cache)
 
 
+# marker for derived values that need to be recomputed on access
+_STALE = object()
+# keys of the basic header values that are stored in a table by columnar
+# representations of traces (TraceBlock, binary Stream codec)
+HEADER_KEYS = ('network', 'station', 'location', 'channel', 'starttime',
+               'sampling_rate', 'calib')
+# keys of Stats that are derived from other keys or the data
+DERIVED_KEYS = ('delta', 'endtime', 'npts')
+
+
 class Stats(AttribDict):
     """
     A container for additional header information of a ObsPy
@@ -175,34 +189,9 @@ class Stats(AttribDict):
         """
         """
         if key in self._refresh_keys:
-            # ensure correct data type
-            if key == 'delta':
-                key = 'sampling_rate'
-                try:
-                    value = 1.0 / float(value)
-                except ZeroDivisionError:
-                    value = 0.0
-            elif key == 'sampling_rate':
-                value = float(value)
-            elif key == 'starttime':
-                value = UTCDateTime(value)
-            elif key == 'npts':
-                if not isinstance(value, int):
-                    value = int(value)
-            # set current key
-            super(Stats, self).__setitem__(key, value)
-            # set derived value: delta
-            try:
-                delta = 1.0 / float(self.sampling_rate)
-            except ZeroDivisionError:
-                delta = 0
-            self.__dict__['delta'] = delta
-            # set derived value: endtime
-            if self.npts == 0:
-                timediff = 0
-            else:
-                timediff = float(self.npts - 1) * delta
-            self.__dict__['endtime'] = self.starttime + timediff
+            key, value = self._cast_refresh_value(key, value)
+            self.__dict__[key] = value
+            self._refresh_derived_values()
             return
         if key == 'component':
             key = 'channel'
@@ -228,9 +217,90 @@ class Stats(AttribDict):
         """
         if key == 'component':
             return super(Stats, self).__getitem__('channel', default)[-1:]
+        elif key == 'endtime' and self.__dict__.get(key) is _STALE:
+            return self._get_endtime()
         else:
             return super(Stats, self).__getitem__(key, default)
 
+    def __repr__(self):
+        self._get_endtime()
+        return super(Stats, self).__repr__()
+
+    def update(self, adict={}):
+        """
+        Update multiple header values at once.
+
+        Derived values (``delta`` and ``endtime``) are only recomputed once
+        after all values have been set.
+        """
+        refresh = False
+        for key, value in adict.items():
+            if key in self.readonly:
+                continue
+            if key in self._refresh_keys:
+                key, value = self._cast_refresh_value(key, value)
+                self.__dict__[key] = value
+                refresh = True
+            else:
+                self.__setitem__(key, value)
+        if refresh:
+            self._refresh_derived_values()
+
+    @staticmethod
+    def _cast_refresh_value(key, value):
+        """
+        Ensure correct data type of values which need to refresh derived
+        values, ``delta`` is stored as ``sampling_rate``.
+        """
+        if key == 'delta':
+            key = 'sampling_rate'
+            try:
+                value = 1.0 / float(value)
+            except ZeroDivisionError:
+                value = 0.0
+        elif key == 'sampling_rate':
+            value = float(value)
+        elif key == 'starttime':
+            if isinstance(value, UTCDateTime):
+                # avoid the generic argument parsing of UTCDateTime
+                value = UTCDateTime(ns=value._ns)
+            else:
+                value = UTCDateTime(value)
+        elif key == 'npts':
+            if not isinstance(value, int):
+                value = int(value)
+        return key, value
+
+    def _refresh_derived_values(self):
+        """
+        Set derived value ``delta``, ``endtime`` is only computed when it is
+        accessed.
+        """
+        try:
+            delta = 1.0 / float(self.__dict__['sampling_rate'])
+        except ZeroDivisionError:
+            delta = 0
+        self.__dict__['delta'] = delta
+        self.__dict__['endtime'] = _STALE
+
+    @property
+    def endtime(self):
+        return self._get_endtime()
+
+    def _get_endtime(self):
+        """
+        Compute derived value ``endtime`` if needed.
+        """
+        endtime = self.__dict__.get('endtime')
+        if endtime is _STALE:
+            if self.npts == 0:
+                timediff = 0
+            else:
+                timediff = float(self.npts - 1) * self.delta
+            endtime = self.starttime + timediff
+            self.__dict__['endtime'] = endtime
+        return endtime
+
     def __str__(self):
         """
         Return better readable string representation of Stats object.
@@ -238,6 +308,7 @@ class Stats(AttribDict):
         priorized_keys = ['network', 'station', 'location', 'channel',
                           'starttime', 'endtime', 'sampling_rate', 'delta',
                           'npts', 'calib']
+        self._get_endtime()
         return self._pretty_str(priorized_keys)
 
     def _repr_pretty_(self, p, cycle):
@@ -256,29 +327,214 @@ class Stats(AttribDict):
         self.__setitem__('sampling_rate', state['sampling_rate'])
 
 
+# settings for recording processing information, see set_processing_info(),
+# the dictionaries are never modified but replaced
+_PROCESSING_INFO_SETTINGS = {'enabled': True, 'every': 1, 'structured': False}
+# settings overriding the global ones in the current thread or context, see
+# processing_info()
+_processing_info_override = contextvars.ContextVar(
+    'obspy_processing_info_override', default=None)
+# types of processing arguments that are stored as they are in
+# ProcessingInfo, only the representation of all others is stored
+_PROCESSING_INFO_PLAIN_TYPES = (bool, int, float, complex, str, bytes,
+                                type(None))
+
+
+def _get_processing_info_settings():
+    """
+    Returns the processing information settings in effect in the current
+    thread or context.
+    """
+    return _processing_info_override.get() or _PROCESSING_INFO_SETTINGS
+
+
+def _update_processing_info_settings(settings, enabled=None, every=None,
+                                     structured=None):
+    """
+    Returns a copy of the given processing information settings updated with
+    the given values, see :func:`~obspy.core.trace.set_processing_info`.
+    """
+    settings = dict(settings)
+    if every is not None:
+        every = int(every)
+        if every < 1:
+            msg = "'every' must be a positive integer."
+            raise ValueError(msg)
+        settings['every'] = every
+        # counter of processing calls for recording only every n-th call
+        settings['counter'] = itertools.count()
+    if enabled is not None:
+        settings['enabled'] = bool(enabled)
+    if structured is not None:
+        settings['structured'] = bool(structured)
+    return settings
+
+
+def set_processing_info(enabled=None, every=None, structured=None):
+    """
+    Configure how information on processing steps is recorded in
+    ``stats.processing`` of all processed traces.
+
+    Formatting the arguments of every processing call and storing them in
+    ``stats.processing`` is measurable overhead in long running or high
+    throughput processing pipelines. Settings that are not specified are left
+    unchanged. The settings apply to all threads, use
+    :func:`~obspy.core.trace.processing_info` to change them only
+    temporarily for the current thread.
+
+    :type enabled: bool, optional
+    :param enabled: Whether processing information is recorded at all
+        (recorded by default).
+    :type every: int, optional
+    :param every: Only record every n-th processing call (all calls are
+        recorded by default).
+    :type structured: bool, optional
+    :param structured: If set to ``True``, processing information is stored
+        as :class:`~obspy.core.trace.ProcessingInfo` tuples which are only
+        formatted as string when they are printed or compared.
+    :rtype: dict
+    :return: Previous settings, can be passed to this function as keyword
+        arguments to restore them.
+
+    .. rubric:: Example
+
+    >>> from obspy import read
+    >>> from obspy.core.trace import set_processing_info
+    >>> previous = set_processing_info(enabled=False)
+    >>> tr = read()[0].detrend()
+    >>> 'processing' in tr.stats
+    False
+    >>> _ = set_processing_info(**previous)
+    """
+    global _PROCESSING_INFO_SETTINGS
+    previous = _PROCESSING_INFO_SETTINGS
+    _PROCESSING_INFO_SETTINGS = _update_processing_info_settings(
+        previous, enabled=enabled, every=every, structured=structured)
+    return {key: previous[key] for key in ('enabled', 'every', 'structured')}
+
+
+@contextmanager
+def processing_info(enabled=True, every=1, structured=False):
+    """
+    Context manager to temporarily change how information on processing steps
+    is recorded, see :func:`~obspy.core.trace.set_processing_info`.
+
+    In contrast to :func:`~obspy.core.trace.set_processing_info`, the
+    settings only apply to the current thread (or asyncio task), other
+    threads keep using the settings of
+    :func:`~obspy.core.trace.set_processing_info`.
+
+    .. rubric:: Example
+
+    >>> from obspy import read
+    >>> from obspy.core.trace import processing_info
+    >>> tr = read()[0]
+    >>> with processing_info(enabled=False):
+    ...     tr = tr.detrend().taper(0.05)
+    >>> 'processing' in tr.stats
+    False
+    >>> with processing_info(structured=True):
+    ...     tr = tr.filter('lowpass', freq=2.0)
+    >>> print(tr.stats.processing)  # doctest: +ELLIPSIS
+    ["ObsPy ...: filter(args=()::options={'freq': 2.0}::type='lowpass')"]
+    """
+    token = _processing_info_override.set(_update_processing_info_settings(
+        _get_processing_info_settings(), enabled=enabled, every=every,
+        structured=structured))
+    try:
+        yield
+    finally:
+        _processing_info_override.reset(token)
+
+
+class _ArgumentRepr(str):
+    """
+    Representation of a processing argument stored in
+    :class:`~obspy.core.trace.ProcessingInfo` instead of the argument itself.
+    """
+    __slots__ = ()
+
+    def __repr__(self):
+        return str(self)
+
+
+def _format_processing_info(version, function, arguments):
+    arguments = sorted(
+        "%s=%s" % (k, repr(v))
+        if not isinstance(v, str) or isinstance(v, _ArgumentRepr) else
+        "%s='%s'" % (k, v) for k, v in arguments)
+    return "ObsPy {version}: {function}({arguments})".format(
+        version=version, function=function, arguments="::".join(arguments))
+
+
+class ProcessingInfo(
+        namedtuple('ProcessingInfo', ['version', 'function', 'arguments'])):
+    """
+    Information on a processing step as stored in ``stats.processing`` if
+    structured recording of processing information is enabled (see
+    :func:`~obspy.core.trace.set_processing_info`).
+
+    The string representation is the same as for the strings that are stored
+    by default, comparisons are done on the string representation as well.
+    Arguments of other types than numbers, strings and ``None`` are stored by
+    their representation, so that no references to e.g. large arrays or
+    inventories are kept.
+    """
+    __slots__ = ()
+
+    def __str__(self):
+        return _format_processing_info(*self)
+
+    def __repr__(self):
+        return repr(str(self))
+
+    def __eq__(self, other):
+        if isinstance(other, (str, ProcessingInfo)):
+            return str(self) == str(other)
+        return NotImplemented
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        if result is NotImplemented:
+            return result
+        return not result
+
+    def __hash__(self):
+        return hash(str(self))
+
+
 @decorator
 def _add_processing_info(func, *args, **kwargs):
     """
     This is a decorator that attaches information about a processing call as a
     string to the Trace.stats.processing list.
     """
+    self = args[0]
+    # processing methods might modify the data in place, objects sharing
+    # their data with others copy it first
+    copy_on_write = getattr(self, '_copy_on_write', None)
+    settings = _get_processing_info_settings()
+    if not settings['enabled'] or (
+            settings['every'] > 1 and
+            next(settings['counter']) % settings['every']):
+        if copy_on_write is not None:
+            copy_on_write()
+        return func(*args, **kwargs)
     callargs = inspect.getcallargs(func, *args, **kwargs)
     callargs.pop("self")
     kwargs_ = callargs.pop("kwargs", {})
     from obspy import __version__
-    info = "ObsPy {version}: {function}(%s)".format(
-        version=__version__,
-        function=func.__name__)
-    arguments = []
-    arguments += \
-        ["%s=%s" % (k, repr(v)) if not isinstance(v, str) else
-         "%s='%s'" % (k, v) for k, v in callargs.items()]
-    arguments += \
-        ["%s=%s" % (k, repr(v)) if not isinstance(v, str) else
-         "%s='%s'" % (k, v) for k, v in kwargs_.items()]
-    arguments.sort()
-    info = info % "::".join(arguments)
-    self = args[0]
+    arguments = tuple(callargs.items()) + tuple(kwargs_.items())
+    if settings['structured']:
+        arguments = tuple(
+            (key, value) if isinstance(value, _PROCESSING_INFO_PLAIN_TYPES)
+            else (key, _ArgumentRepr(repr(value)))
+            for key, value in arguments)
+        info = ProcessingInfo(__version__, func.__name__, arguments)
+    else:
+        info = _format_processing_info(__version__, func.__name__, arguments)
+    if copy_on_write is not None:
+        copy_on_write()
     result = func(*args, **kwargs)
     # Attach after executing the function to avoid having it attached
     # while the operation failed.
@@ -286,6 +542,63 @@ def _add_processing_info(func, *args, **kwargs):
     return result
 
 
+class DeferredData(object):
+    """
+    Base class for trace data that is only loaded on first access.
+
+    Waveform readers supporting a lazy reading mode assign an instance of a
+    subclass as ``Trace.data``. The trace then only knows the number of
+    samples and the data type, the samples themselves are read when
+    ``Trace.data`` is accessed for the first time. Trimming and slicing the
+    trace before that only narrows down the requested window, so that later
+    only the samples inside the window need to be read and decoded.
+
+    Subclasses have to implement :meth:`_load`.
+
+    :type npts: int
+    :param npts: Number of samples of the full data.
+    :type dtype: :class:`numpy.dtype`
+    :param dtype: Data type of the loaded samples.
+    """
+    def __init__(self, npts, dtype):
+        self.npts = npts
+        self.dtype = np.dtype(dtype)
+        self.start = 0
+        self.stop = npts
+
+    def __len__(self):
+        return self.stop - self.start
+
+    def __getitem__(self, index):
+        """
+        Slicing with a step of one returns a new instance restricted to the
+        given window without loading any data, anything else loads the data.
+        """
+        if not isinstance(index, slice) or index.step not in (None, 1):
+            return self.load()[index]
+        start, stop, _ = index.indices(len(self))
+        new = copy(self)
+        new.start = self.start + start
+        new.stop = self.start + max(start, stop)
+        return new
+
+    def load(self):
+        """
+        Load the data of the current window.
+
+        :rtype: :class:`numpy.ndarray`
+        """
+        if len(self) == 0:
+            return np.empty(0, dtype=self.dtype)
+        return self._load(self.start, self.stop)
+
+    def _load(self, start, stop):
+        """
+        Return samples ``start`` to ``stop`` (exclusive) of the full data.
+        """
+        raise NotImplementedError
+
+
 class Trace(object):
     """
     An object containing data of a continuous series, such as a seismic trace.
@@ -301,6 +614,14 @@ class Trace(object):
     :var data: Data samples in a :class:`~numpy.ndarray` or
         :class:`~numpy.ma.MaskedArray`
 
+    .. note::
+
+        Some waveform readers support a ``lazy`` reading mode (see e.g.
+        :func:`obspy.io.mseed.core._read_mseed`), in which ``.data`` is
+        initially a :class:`DeferredData` object. The samples are only read
+        on first access of ``.data``, trimming or slicing the trace before
+        that only reads the samples of the remaining window.
+
     .. note::
 
         The ``.data`` attribute containing the time series samples as a
@@ -331,13 +652,17 @@ class Trace(object):
     def __init__(self, data=np.array([]), header=None):
         # make sure Trace gets initialized with suitable ndarray as self.data
         # otherwise we could end up with e.g. a list object in self.data
-        _data_sanity_checks(data)
+        if not isinstance(data, DeferredData):
+            _data_sanity_checks(data)
         # set some defaults if not set yet
         if header is None:
             header = {}
         header = deepcopy(header)
         header.setdefault('npts', len(data))
         self.stats = Stats(header)
+        if isinstance(data, DeferredData):
+            self.data = data
+            return
         # set data without changing npts in stats object (for headonly option)
         super(Trace, self).__setattr__('data', data)
 
@@ -403,7 +728,7 @@ class Trace(object):
         """
         No data means no trace.
         """
-        return bool(len(self.data))
+        return bool(len(self._data_or_deferred))
 
     def __str__(self, id_length=None):
         """
@@ -446,8 +771,9 @@ class Trace(object):
                 out = out + ' | '\
                     "%(starttime)s - %(endtime)s | " + \
                     "%(sampling_rate).1f Hz, %(npts)d samples"
-        # check for masked array
-        if np.ma.count_masked(self.data):
+        # check for masked array (deferred data is never masked)
+        if '_deferred_data' not in self.__dict__ and \
+                np.ma.count_masked(self.data):
             out += ' (masked)'
         return trace_id + out % (self.stats)
 
@@ -469,7 +795,7 @@ class Trace(object):
         >>> len(trace)
         4
         """
-        return len(self.data)
+        return len(self._data_or_deferred)
 
     count = __len__
 
@@ -479,12 +805,64 @@ class Trace(object):
         """
         # any change in Trace.data will dynamically set Trace.stats.npts
         if key == 'data':
+            if isinstance(value, DeferredData):
+                self.__dict__.pop('data', None)
+                self.stats.npts = len(value)
+                return super(Trace, self).__setattr__('_deferred_data', value)
+            self.__dict__.pop('_deferred_data', None)
             _data_sanity_checks(value)
             if self._always_contiguous:
                 value = np.require(value, requirements=['C_CONTIGUOUS'])
             self.stats.npts = len(value)
         return super(Trace, self).__setattr__(key, value)
 
+    def __getattr__(self, key):
+        """
+        Load deferred data on first access of ``Trace.data``.
+        """
+        if key == 'data':
+            deferred = self.__dict__.get('_deferred_data')
+            if deferred is not None:
+                self.data = deferred.load()
+                return self.__dict__['data']
+        raise AttributeError("'%s' object has no attribute '%s'" % (
+            self.__class__.__name__, key))
+
+    def __reduce_ex__(self, protocol):
+        """
+        With pickle protocol 5 or higher, masked data is pickled as its plain
+        data and mask arrays, so that both can be handed over as out-of-band
+        buffers like unmasked data (NumPy pickles masked arrays as a copy of
+        their raw data).
+        """
+        reduced = super(Trace, self).__reduce_ex__(protocol)
+        data = self.__dict__.get('data')
+        if protocol < 5 or not isinstance(data, np.ma.MaskedArray):
+            return reduced
+        state = dict(reduced[2])
+        state['data'] = data.data
+        state['_data_mask'] = (data.mask, data._fill_value)
+        return reduced[:2] + (state,) + reduced[3:]
+
+    def __setstate__(self, state):
+        if '_data_mask' in state:
+            state = state.copy()
+            mask, fill_value = state.pop('_data_mask')
+            state['data'] = np.ma.masked_array(
+                state['data'], mask=mask, fill_value=fill_value)
+        self.__dict__.update(state)
+
+    @property
+    def _data_or_deferred(self):
+        """
+        Trace data or, if not loaded yet, the
+        :class:`~obspy.core.trace.DeferredData` object.
+        """
+        deferred = self.__dict__.get('_deferred_data')
+        if deferred is not None:
+            return deferred
+        return self.data
+
     def __getitem__(self, index):
         """
         __getitem__ method of Trace object.
@@ -727,25 +1105,7 @@ class Trace(object):
             1 + 2  : AAAABCDEFFFF
         """
         if sanity_checks:
-            if not isinstance(trace, Trace):
-                raise TypeError
-            #  check id
-            if self.get_id() != trace.get_id():
-                raise TypeError("Trace ID differs: %s vs %s" %
-                                (self.get_id(), trace.get_id()))
-            #  check sample rate
-            if self.stats.sampling_rate != trace.stats.sampling_rate:
-                raise TypeError("Sampling rate differs: %s vs %s" %
-                                (self.stats.sampling_rate,
-                                 trace.stats.sampling_rate))
-            #  check calibration factor
-            if self.stats.calib != trace.stats.calib:
-                raise TypeError("Calibration factor differs: %s vs %s" %
-                                (self.stats.calib, trace.stats.calib))
-            # check data type
-            if self.data.dtype != trace.data.dtype:
-                raise TypeError("Data type differs: %s vs %s" %
-                                (self.data.dtype, trace.data.dtype))
+            self._add_sanity_checks(trace)
         # check times
         if self.stats.starttime <= trace.stats.starttime:
             lt = self
@@ -753,93 +1113,15 @@ class Trace(object):
         else:
             rt = self
             lt = trace
-        # check whether to use the latest value to fill a gap
-        if fill_value == "latest":
-            fill_value = lt.data[-1]
-        elif fill_value == "interpolate":
-            fill_value = (lt.data[-1], rt.data[0])
-        sr = self.stats.sampling_rate
-        delta = (rt.stats.starttime - lt.stats.endtime) * sr
-        delta = int(compatibility.round_away(delta)) - 1
-        delta_endtime = lt.stats.endtime - rt.stats.endtime
         # create the returned trace
         out = self.__class__(header=deepcopy(lt.stats))
-        # check if overlap or gap
-        if delta < 0 and delta_endtime < 0:
-            # overlap
-            delta = abs(delta)
-            if np.all(np.equal(lt.data[-delta:], rt.data[:delta])):
-                # check if data are the same
-                data = [lt.data[:-delta], rt.data]
-            elif method == 0:
-                overlap = create_empty_data_chunk(delta, lt.data.dtype,
-                                                  fill_value)
-                data = [lt.data[:-delta], overlap, rt.data[delta:]]
-            elif method == 1 and interpolation_samples >= -1:
-                try:
-                    ls = lt.data[-delta - 1]
-                except Exception:
-                    ls = lt.data[0]
-                if interpolation_samples == -1:
-                    interpolation_samples = delta
-                elif interpolation_samples > delta:
-                    interpolation_samples = delta
-                try:
-                    rs = rt.data[interpolation_samples]
-                except IndexError:
-                    # contained trace
-                    data = [lt.data]
-                else:
-                    # include left and right sample (delta + 2)
-                    interpolation = np.linspace(ls, rs,
-                                                interpolation_samples + 2)
-                    # cut ls and rs and ensure correct data type
-                    interpolation = np.require(interpolation[1:-1],
-                                               lt.data.dtype)
-                    data = [lt.data[:-delta], interpolation,
-                            rt.data[interpolation_samples:]]
-            else:
-                raise NotImplementedError
-        elif delta < 0 and delta_endtime >= 0:
-            # contained trace
-            delta = abs(delta)
-            lenrt = len(rt)
-            t1 = len(lt) - delta
-            t2 = t1 + lenrt
-            # check if data are the same
-            data_equal = (lt.data[t1:t2] == rt.data)
-            # force a masked array and fill it for check of equality of valid
-            # data points
-            if np.all(np.ma.masked_array(data_equal).filled()):
-                # if all (unmasked) data are equal,
-                if isinstance(data_equal, np.ma.masked_array):
-                    x = np.ma.masked_array(lt.data[t1:t2])
-                    y = np.ma.masked_array(rt.data)
-                    data_same = np.choose(x.mask, [x, y])
-                    data = np.choose(x.mask & y.mask, [data_same, np.nan])
-                    if np.any(np.isnan(data)):
-                        data = np.ma.masked_invalid(data)
-                    # convert back to maximum dtype of original data
-                    dtype = np.max((x.dtype, y.dtype))
-                    data = data.astype(dtype)
-                    data = [lt.data[:t1], data, lt.data[t2:]]
-                else:
-                    data = [lt.data]
-            elif method == 0:
-                gap = create_empty_data_chunk(lenrt, lt.data.dtype, fill_value)
-                data = [lt.data[:t1], gap, lt.data[t2:]]
-            elif method == 1:
-                data = [lt.data]
-            else:
-                raise NotImplementedError
-        elif delta == 0:
-            # exact fit - merge both traces
-            data = [lt.data, rt.data]
-        else:
-            # gap
-            # use fixed value or interpolate in between
-            gap = create_empty_data_chunk(delta, lt.data.dtype, fill_value)
-            data = [lt.data, gap, rt.data]
+        npts = len(lt)
+        remove, chunks = _get_merge_chunks(
+            lambda start, stop: lt.data[start:stop], npts, lt.stats.endtime,
+            lt.data.dtype, rt, self.stats.sampling_rate, method=method,
+            fill_value=fill_value,
+            interpolation_samples=interpolation_samples)
+        data = [lt.data[:npts - remove]] + chunks
         # merge traces depending on NumPy array type
         if True in [isinstance(_i, np.ma.masked_array) for _i in data]:
             data = np.ma.concatenate(data)
@@ -853,6 +1135,31 @@ class Trace(object):
         out.data = data
         return out
 
+    def _add_sanity_checks(self, trace):
+        """
+        Check that the given trace can be added to the current trace, see
+        :meth:`~obspy.core.trace.Trace.__add__`.
+        """
+        if not isinstance(trace, Trace):
+            raise TypeError
+        #  check id
+        if self.get_id() != trace.get_id():
+            raise TypeError("Trace ID differs: %s vs %s" %
+                            (self.get_id(), trace.get_id()))
+        #  check sample rate
+        if self.stats.sampling_rate != trace.stats.sampling_rate:
+            raise TypeError("Sampling rate differs: %s vs %s" %
+                            (self.stats.sampling_rate,
+                             trace.stats.sampling_rate))
+        #  check calibration factor
+        if self.stats.calib != trace.stats.calib:
+            raise TypeError("Calibration factor differs: %s vs %s" %
+                            (self.stats.calib, trace.stats.calib))
+        # check data type
+        if self.data.dtype != trace.data.dtype:
+            raise TypeError("Data type differs: %s vs %s" %
+                            (self.data.dtype, trace.data.dtype))
+
     def get_id(self):
         """
         Return a SEED compatible identifier of the trace.
@@ -1013,7 +1320,8 @@ class Trace(object):
         >>> tr.stats.starttime
         UTCDateTime(1970, 1, 1, 0, 0, 8)
         """
-        org_dtype = self.data.dtype
+        data = self._data_or_deferred
+        org_dtype = data.dtype
         if isinstance(starttime, float) or isinstance(starttime, int):
             starttime = UTCDateTime(self.stats.starttime) + starttime
         elif not isinstance(starttime, UTCDateTime):
@@ -1057,7 +1365,7 @@ class Trace(object):
             return self
         elif delta > 0:
             try:
-                self.data = self.data[delta:]
+                self.data = data[delta:]
             except IndexError:
                 # a huge numbers for delta raises an IndexError
                 # here we just create empty array with same dtype
@@ -1080,7 +1388,8 @@ class Trace(object):
         >>> tr.stats.endtime
         UTCDateTime(1970, 1, 1, 0, 0, 2)
         """
-        org_dtype = self.data.dtype
+        data = self._data_or_deferred
+        org_dtype = data.dtype
         if isinstance(endtime, float) or isinstance(endtime, int):
             endtime = UTCDateTime(self.stats.endtime) - endtime
         elif not isinstance(endtime, UTCDateTime):
@@ -1118,10 +1427,10 @@ class Trace(object):
             return self
         # cut from right
         delta = abs(delta)
-        total = len(self.data) - delta
+        total = len(data) - delta
         if endtime == self.stats.starttime:
             total = 1
-        self.data = self.data[:total]
+        self.data = data[:total]
         return self
 
     @_add_processing_info
@@ -1195,7 +1504,8 @@ class Trace(object):
                 pass
         return self
 
-    def slice(self, starttime=None, endtime=None, nearest_sample=True):
+    def slice(self, starttime=None, endtime=None, nearest_sample=True,
+              view=False):
         """
         Return a new Trace object with data going from start to end time.
 
@@ -1218,6 +1528,13 @@ class Trace(object):
             ``nearest_sample=True`` will select samples 2-5,
             ``nearest_sample=False`` will select samples 3-4 only.
 
+        :type view: bool, optional
+        :param view: If set to ``True``, a light-weight
+            :class:`~obspy.core.trace.TraceView` is returned instead, which
+            shares the data with the trace and only copies it before
+            processing methods modify it. No processing information is
+            recorded for slicing in this case.
+            Defaults to ``False``.
         :return: New :class:`~obspy.core.trace.Trace` object. Does not copy
             data but just passes a reference to it.
 
@@ -1230,6 +1547,10 @@ class Trace(object):
         >>> tr2.data
         array([2, 3, 4, 5, 6, 7, 8])
         """
+        if view:
+            return TraceView._from_trace(self, starttime=starttime,
+                                         endtime=endtime,
+                                         nearest_sample=nearest_sample)
         tr = copy(self)
         tr.stats = deepcopy(self.stats)
         tr.trim(starttime=starttime, endtime=endtime,
@@ -1237,7 +1558,8 @@ class Trace(object):
         return tr
 
     def slide(self, window_length, step, offset=0,
-              include_partial_windows=False, nearest_sample=True):
+              include_partial_windows=False, nearest_sample=True,
+              view=False):
         """
         Generator yielding equal length sliding windows of the Trace.
 
@@ -1246,6 +1568,8 @@ class Trace(object):
         you don't want this you have to create a copy of the yielded
         windows. Also be aware that if you modify the original data and you
         have overlapping windows, all following windows are affected as well.
+        With ``view=True`` the processing methods of the yielded windows
+        copy the data before modifying it.
 
         .. rubric:: Example
 
@@ -1285,6 +1609,12 @@ class Trace(object):
             ``nearest_sample=True`` will select samples 2-5,
             ``nearest_sample=False`` will select samples 3-4 only.
         :type nearest_sample: bool, optional
+        :param view: If set to ``True``, light-weight
+            :class:`~obspy.core.trace.TraceView` objects are yielded, see
+            :meth:`~obspy.core.trace.Trace.slice`. All windows share a single
+            copy of the header taken when the iteration starts, each window
+            only copies it again on first access of its ``stats``.
+        :type view: bool, optional
         """
         windows = get_window_times(
             starttime=self.stats.starttime,
@@ -1297,9 +1627,18 @@ class Trace(object):
         if len(windows) < 1:
             return
 
+        if view:
+            # all windows share a single copy of the header
+            header = deepcopy(self.stats)
+            for start, stop in windows:
+                yield TraceView._from_trace(self, start, stop,
+                                            nearest_sample=nearest_sample,
+                                            header=header)
+            return
+
         for start, stop in windows:
             yield self.slice(start, stop,
-                             nearest_sample=nearest_sample)
+                             nearest_sample=nearest_sample, view=view)
 
     def verify(self):
         """
@@ -2151,48 +2490,9 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
             Discrete Prolate Spheroidal Sequences window. (uses:
             :func:`scipy.signal.windows.dpss`)
         """
-        type = type.lower()
-        side = side.lower()
-        side_valid = ['both', 'left', 'right']
-        npts = self.stats.npts
-        if side not in side_valid:
-            raise ValueError("'side' has to be one of: %s" % side_valid)
-        # retrieve function call from entry points
-        func = _get_function_from_entry_point('taper', type)
-        # store all constraints for maximum taper length
-        max_half_lenghts = []
-        if max_percentage is not None:
-            max_half_lenghts.append(int(max_percentage * npts))
-        if max_length is not None:
-            max_half_lenghts.append(int(max_length * self.stats.sampling_rate))
-        if np.all([2 * mhl > npts for mhl in max_half_lenghts]):
-            msg = "The requested taper is longer than the trace. " \
-                  "The taper will be shortened to trace length."
-            warnings.warn(msg)
-        # add full trace length to constraints
-        max_half_lenghts.append(int(npts / 2))
-        # select shortest acceptable window half-length
-        wlen = min(max_half_lenghts)
-        # obspy.signal.cosine_taper has a default value for taper percentage,
-        # we need to override is as we control percentage completely via npts
-        # of taper function and insert ones in the middle afterwards
-        if type == "cosine":
-            kwargs['p'] = 1.0
-        # tapering. tapering functions are expected to accept the number of
-        # samples as first argument and return an array of values between 0 and
-        # 1 with the same length as the data
-        if 2 * wlen == npts:
-            taper_sides = func(2 * wlen, **kwargs)
-        else:
-            taper_sides = func(2 * wlen + 1, **kwargs)
-        if side == 'left':
-            taper = np.hstack((taper_sides[:wlen], np.ones(npts - wlen)))
-        elif side == 'right':
-            taper = np.hstack((np.ones(npts - wlen),
-                               taper_sides[len(taper_sides) - wlen:]))
-        else:
-            taper = np.hstack((taper_sides[:wlen], np.ones(npts - 2 * wlen),
-                               taper_sides[len(taper_sides) - wlen:]))
+        taper = _get_taper_window(
+            self.stats.npts, self.stats.sampling_rate, max_percentage,
+            type=type, max_length=max_length, side=side, **kwargs)
 
         # Convert data if it's not a floating point type.
         if not np.issubdtype(self.data.dtype, np.floating):
@@ -2306,6 +2606,14 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
         """
         return deepcopy(self)
 
+    def _copy_on_write(self):
+        """
+        Called before any processing method is applied. Traces sharing their
+        data with other traces (see :class:`~obspy.core.trace.TraceView`)
+        copy their data here.
+        """
+        pass
+
     def _internal_add_processing_info(self, info):
         """
         Add the given informational string to the `processing` field in the
@@ -2533,6 +2841,9 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
           * absolute time as
             :class:`~obspy.core.utcdatetime.UTCDateTime` objects
             (``type="utcdatetime"``)
+          * absolute time as a single
+            :class:`~obspy.core.utcdatetime.UTCDateTimeArray`
+            (``type="utcdatetimearray"``), masked samples are ``NaT``
           * absolute time as POSIX timestamps (
             :class:`UTCDateTime.timestamp <obspy.core.utcdatetime.UTCDateTime>`
             ``type="timestamp"``)
@@ -2544,7 +2855,7 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
             The option ``type="utcdatetime"`` shouldn't be used for Traces with
             a large sample size as it will generate an array of thousands of
             :class:`UTCDateTime.timestamp <obspy.core.utcdatetime.UTCDateTime>`
-            objects.
+            objects, use ``type="utcdatetimearray"`` instead.
 
         >>> from obspy import read, UTCDateTime
         >>> tr = read()[0]
@@ -2565,6 +2876,14 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
                UTCDateTime(2009, 8, 24, 0, 20, 32, 980000),
                UTCDateTime(2009, 8, 24, 0, 20, 32, 990000)], dtype=object)
 
+        >>> tr.times("utcdatetimearray")  # doctest: +NORMALIZE_WHITESPACE
+        UTCDateTimeArray(['2009-08-24T00:20:03.000000Z',
+                          '2009-08-24T00:20:03.010000Z',
+                          '2009-08-24T00:20:03.020000Z', ...,
+                          '2009-08-24T00:20:32.970000Z',
+                          '2009-08-24T00:20:32.980000Z',
+                          '2009-08-24T00:20:32.990000Z'])
+
         >>> tr.times("timestamp")
         array([  1.25107320e+09,   1.25107320e+09,   1.25107320e+09, ...,
                  1.25107323e+09,   1.25107323e+09,   1.25107323e+09])
@@ -2580,7 +2899,8 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
         :param reftime: When using a relative timing, the time used as the
             reference for the zero point, i.e., the first sample will be at
             ``trace.stats.starttime - reftime`` (in seconds).
-        :rtype: :class:`~numpy.ndarray` or :class:`~numpy.ma.MaskedArray`
+        :rtype: :class:`~numpy.ndarray`, :class:`~numpy.ma.MaskedArray` or
+            :class:`~obspy.core.utcdatetime.UTCDateTimeArray`
         :returns: An array of time samples in an :class:`~numpy.ndarray` if
             the trace doesn't have any gaps or a :class:`~numpy.ma.MaskedArray`
             otherwise (``dtype`` of array is either ``float`` or
@@ -2598,6 +2918,13 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
             time_array = np.vectorize(
                 lambda t: self.stats.starttime + t,
                 otypes=[UTCDateTime])(time_array)
+        elif type == "utcdatetimearray":
+            ns = self.stats.starttime.ns + \
+                np.round(time_array * 1e9).astype(np.int64)
+            if isinstance(self.data, np.ma.masked_array):
+                ns[np.ma.getmaskarray(self.data)] = _NAT
+            return UTCDateTimeArray(
+                ns=ns, precision=self.stats.starttime.precision)
         elif type == "matplotlib":
             from matplotlib.dates import date2num
             time_array = (
@@ -3041,6 +3368,279 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
         return self
 
 
+def _get_taper_window(npts, sampling_rate, max_percentage, type='hann',
+                      max_length=None, side='both', **kwargs):
+    """
+    Return the taper window as applied by :meth:`Trace.taper` for a trace
+    with given number of samples and sampling rate.
+    """
+    type = type.lower()
+    side = side.lower()
+    side_valid = ['both', 'left', 'right']
+    if side not in side_valid:
+        raise ValueError("'side' has to be one of: %s" % side_valid)
+    # retrieve function call from entry points
+    func = _get_function_from_entry_point('taper', type)
+    # store all constraints for maximum taper length
+    max_half_lenghts = []
+    if max_percentage is not None:
+        max_half_lenghts.append(int(max_percentage * npts))
+    if max_length is not None:
+        max_half_lenghts.append(int(max_length * sampling_rate))
+    if np.all([2 * mhl > npts for mhl in max_half_lenghts]):
+        msg = "The requested taper is longer than the trace. " \
+              "The taper will be shortened to trace length."
+        warnings.warn(msg)
+    # add full trace length to constraints
+    max_half_lenghts.append(int(npts / 2))
+    # select shortest acceptable window half-length
+    wlen = min(max_half_lenghts)
+    # obspy.signal.cosine_taper has a default value for taper percentage,
+    # we need to override is as we control percentage completely via npts
+    # of taper function and insert ones in the middle afterwards
+    if type == "cosine":
+        kwargs['p'] = 1.0
+    # tapering. tapering functions are expected to accept the number of
+    # samples as first argument and return an array of values between 0 and
+    # 1 with the same length as the data
+    if 2 * wlen == npts:
+        taper_sides = func(2 * wlen, **kwargs)
+    else:
+        taper_sides = func(2 * wlen + 1, **kwargs)
+    if side == 'left':
+        taper = np.hstack((taper_sides[:wlen], np.ones(npts - wlen)))
+    elif side == 'right':
+        taper = np.hstack((np.ones(npts - wlen),
+                           taper_sides[len(taper_sides) - wlen:]))
+    else:
+        taper = np.hstack((taper_sides[:wlen], np.ones(npts - 2 * wlen),
+                           taper_sides[len(taper_sides) - wlen:]))
+    return taper
+
+
+class TraceView(Trace):
+    """
+    Light-weight view on a time window of a :class:`~obspy.core.trace.Trace`.
+
+    Trace views are returned by :meth:`Trace.slice`, :meth:`Trace.slide`,
+    :meth:`Stream.slice() <obspy.core.stream.Stream.slice>` and
+    :meth:`Stream.slide() <obspy.core.stream.Stream.slide>` with
+    ``view=True``. Their data is a view on the data of the parent trace. The
+    header is a copy of the header of the parent trace at the time the view
+    is created, the windows of a single ``slide()`` call share one copy of
+    the header taken when the iteration starts. Each view only copies that
+    shared header on first access of ``stats``, which makes creating many
+    windows on a trace considerably faster.
+
+    As long as the data is shared with the parent trace, all processing
+    methods (e.g. :meth:`~Trace.filter` or :meth:`~Trace.detrend`) first copy
+    the data of the view, so that the parent trace is never modified by them.
+    Direct modifications of ``data`` (e.g. ``view.data *= 2``) are still
+    applied to the parent trace.
+
+    .. rubric:: Example
+
+    >>> from obspy import read
+    >>> tr = read()[0]
+    >>> view = tr.slice(tr.stats.starttime + 10, tr.stats.starttime + 20,
+    ...                 view=True)
+    >>> print(view)  # doctest: +ELLIPSIS
+    BW.RJOB..EHZ | 2009-08-24T00:20:13.000000Z - ... | 100.0 Hz, 1001 samples
+    >>> np.shares_memory(view.data, tr.data)
+    True
+    >>> _ = view.detrend()
+    >>> np.shares_memory(view.data, tr.data)
+    False
+    """
+    @classmethod
+    def _from_trace(cls, trace, starttime=None, endtime=None,
+                    nearest_sample=True, header=None):
+        """
+        Create a view on a time window of a trace.
+
+        :type header: :class:`~obspy.core.trace.Stats`, optional
+        :param header: Copy of the header of the trace shared by several
+            views, it is copied again on first access of ``stats`` of the
+            view. If not given, the header of the trace is copied right away.
+        """
+        if (isinstance(starttime, UTCDateTime) and
+                isinstance(endtime, UTCDateTime) and starttime > endtime):
+            raise ValueError("startime is larger than endtime")
+        stats = trace.stats
+        # trim a minimal trace sharing the data, so that the window is
+        # determined exactly the same way as for Trace.slice(), the header
+        # is not deep copied as in Trace.__init__()
+        tmp = Trace.__new__(Trace)
+        tmp.stats = Stats({'sampling_rate': stats.sampling_rate,
+                           'starttime': stats.starttime,
+                           'npts': stats.npts})
+        data = trace._data_or_deferred
+        if isinstance(data, DeferredData):
+            tmp.data = data
+        else:
+            super(Trace, tmp).__setattr__('data', data)
+        if starttime:
+            tmp._ltrim(starttime, nearest_sample=nearest_sample)
+        if endtime:
+            tmp._rtrim(endtime, nearest_sample=nearest_sample)
+        view = cls.__new__(cls)
+        view.__dict__.update(
+            _parent_stats=deepcopy(stats) if header is None else header,
+            _shares_header=header is not None,
+            _starttime=tmp.stats.starttime, _npts=tmp.stats.npts,
+            _shares_data='data' in tmp.__dict__)
+        view.__dict__.update(
+            (key, value) for key, value in tmp.__dict__.items()
+            if key in ('data', '_deferred_data'))
+        return view
+
+    @property
+    def stats(self):
+        try:
+            return self.__dict__['_stats']
+        except KeyError:
+            pass
+        stats = self.__dict__.pop('_parent_stats')
+        if self.__dict__.pop('_shares_header'):
+            stats = deepcopy(stats)
+        stats.starttime = self._starttime
+        stats.npts = self._npts
+        self.__dict__['_stats'] = stats
+        return stats
+
+    @stats.setter
+    def stats(self, value):
+        self.__dict__.pop('_parent_stats', None)
+        self.__dict__.pop('_shares_header', None)
+        self.__dict__['_stats'] = value
+
+    def __setattr__(self, key, value):
+        if key == 'data' and '_stats' not in self.__dict__:
+            # do not create the header just to update the number of samples
+            if isinstance(value, DeferredData):
+                self.__dict__.pop('data', None)
+                self.__dict__['_deferred_data'] = value
+            else:
+                self.__dict__.pop('_deferred_data', None)
+                _data_sanity_checks(value)
+                if self._always_contiguous:
+                    value = np.require(value, requirements=['C_CONTIGUOUS'])
+                self.__dict__['data'] = value
+            self.__dict__['_npts'] = len(value)
+            return
+        return super(TraceView, self).__setattr__(key, value)
+
+    def _copy_on_write(self):
+        if self.__dict__.get('_shares_data') and 'data' in self.__dict__:
+            self.data = self.data.copy()
+            self.__dict__['_shares_data'] = False
+
+
+def _get_merge_chunks(get_data, npts, endtime, dtype, trace, sampling_rate,
+                      method=0, fill_value=None, interpolation_samples=0):
+    """
+    Determine how the data of a trace is merged to the end of the data of
+    another trace starting at or before it, see
+    :meth:`Trace.__add__() <obspy.core.trace.Trace.__add__>` for the meaning
+    of the arguments.
+
+    :type get_data: callable
+    :param get_data: Function returning the samples ``start`` to ``stop``
+        (exclusive) of the data of the first trace, called as
+        ``get_data(start, stop)``. Only samples at the end of the data
+        overlapping with the second trace are requested.
+    :type npts: int
+    :param npts: Number of samples of the first trace.
+    :type endtime: :class:`~obspy.core.utcdatetime.UTCDateTime`
+    :param endtime: End time of the first trace.
+    :type dtype: :class:`numpy.dtype`
+    :param dtype: Data type of the first trace.
+    :type trace: :class:`~obspy.core.trace.Trace`
+    :param trace: Trace that is merged to the end of the first trace.
+    :rtype: tuple(int, list)
+    :return: Number of samples to remove from the end of the data of the
+        first trace and list of data chunks to append after that.
+    """
+    data = trace.data
+    # check whether to use the latest value to fill a gap
+    if fill_value == "latest":
+        fill_value = get_data(npts - 1, npts)[0]
+    elif fill_value == "interpolate":
+        fill_value = (get_data(npts - 1, npts)[0], data[0])
+    delta = (trace.stats.starttime - endtime) * sampling_rate
+    delta = int(compatibility.round_away(delta)) - 1
+    delta_endtime = endtime - trace.stats.endtime
+    # check if overlap or gap
+    if delta < 0 and delta_endtime < 0:
+        # overlap
+        delta = abs(delta)
+        if np.all(np.equal(get_data(npts - delta, npts), data[:delta])):
+            # check if data are the same
+            return delta, [data]
+        elif method == 0:
+            overlap = create_empty_data_chunk(delta, dtype, fill_value)
+            return delta, [overlap, data[delta:]]
+        elif method == 1 and interpolation_samples >= -1:
+            if delta < npts:
+                ls = get_data(npts - delta - 1, npts - delta)[0]
+            else:
+                ls = get_data(0, 1)[0]
+            if interpolation_samples == -1:
+                interpolation_samples = delta
+            elif interpolation_samples > delta:
+                interpolation_samples = delta
+            try:
+                rs = data[interpolation_samples]
+            except IndexError:
+                # contained trace
+                return 0, []
+            # include left and right sample (delta + 2)
+            interpolation = np.linspace(ls, rs, interpolation_samples + 2)
+            # cut ls and rs and ensure correct data type
+            interpolation = np.require(interpolation[1:-1], dtype)
+            return delta, [interpolation, data[interpolation_samples:]]
+        else:
+            raise NotImplementedError
+    elif delta < 0 and delta_endtime >= 0:
+        # contained trace
+        delta = abs(delta)
+        t1 = npts - delta
+        t2 = t1 + len(data)
+        contained = get_data(t1, t2)
+        # check if data are the same
+        data_equal = (contained == data)
+        # force a masked array and fill it for check of equality of valid
+        # data points
+        if np.all(np.ma.masked_array(data_equal).filled()):
+            # if all (unmasked) data are equal,
+            if isinstance(data_equal, np.ma.masked_array):
+                x = np.ma.masked_array(contained)
+                y = np.ma.masked_array(data)
+                data_same = np.choose(x.mask, [x, y])
+                merged = np.choose(x.mask & y.mask, [data_same, np.nan])
+                if np.any(np.isnan(merged)):
+                    merged = np.ma.masked_invalid(merged)
+                # convert back to maximum dtype of original data
+                merged = merged.astype(np.max((x.dtype, y.dtype)))
+                return delta, [merged, get_data(t2, npts)]
+            return 0, []
+        elif method == 0:
+            gap = create_empty_data_chunk(len(data), dtype, fill_value)
+            return delta, [gap, get_data(t2, npts)]
+        elif method == 1:
+            return 0, []
+        else:
+            raise NotImplementedError
+    elif delta == 0:
+        # exact fit - merge both traces
+        return 0, [data]
+    else:
+        # gap
+        # use fixed value or interpolate in between
+        gap = create_empty_data_chunk(delta, dtype, fill_value)
+        return 0, [gap, data]
+
+
 def _data_sanity_checks(value):
     """
     Check if a given input is suitable to be used for Trace.data. Raises the
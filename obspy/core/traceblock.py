@@ -0,0 +1,319 @@
+# -*- coding: utf-8 -*-
+"""
+Module for handling ObsPy :class:`~obspy.core.traceblock.TraceBlock` objects.
+
+:copyright:
+    The ObsPy Development Team (devs@obspy.org)
+:license:
+    GNU Lesser General Public License, Version 3
+    (https://www.gnu.org/copyleft/lesser.html)
+"""
+import inspect
+import warnings
+from copy import deepcopy
+
+import numpy as np
+
+from obspy.core.trace import (DERIVED_KEYS, HEADER_KEYS, Stats, Trace,
+                              _add_processing_info, _get_taper_window)
+from obspy.core.utcdatetime import UTCDateTime
+from obspy.core.util.base import _get_function_from_entry_point
+
+
+class TraceBlock(object):
+    """
+    Columnar container for traces with equal number of samples and equal
+    sampling rate.
+
+    The data of all traces is stored in a single two-dimensional
+    :class:`numpy.ndarray` (one row per trace), the most important header
+    values in a structured array. This allows applying processing methods to
+    all traces in a single call, which is much faster than processing
+    thousands of short traces (e.g. event aligned windows) one by one.
+
+    A TraceBlock is usually created with
+    :meth:`Stream.to_array_block() <obspy.core.stream.Stream.to_array_block>`
+    and converted back with :meth:`~TraceBlock.to_stream`.
+
+    :type data: :class:`numpy.ndarray`
+    :param data: Two-dimensional data array, one row per trace.
+    :type header: :class:`numpy.ndarray`
+    :param header: Structured array with one entry per trace and fields
+        ``network``, ``station``, ``location``, ``channel``, ``starttime``
+        (in nanoseconds, see :attr:`UTCDateTime.ns
+        <obspy.core.utcdatetime.UTCDateTime.ns>`), ``sampling_rate`` and
+        ``calib``.
+    :type extra: list of dict, optional
+    :param extra: Any other header entries of each trace (e.g. format
+        specific headers or processing information).
+
+    .. rubric:: Example
+
+    >>> from obspy import read
+    >>> st = read()
+    >>> block = st.to_array_block()
+    >>> print(block)
+    3 Trace(s) in TraceBlock: 3000 samples, 100.0 Hz
+    >>> block.data.shape
+    (3, 3000)
+    >>> print(block.header['channel'])
+    ['EHZ' 'EHN' 'EHE']
+    >>> block.detrend('linear').taper(0.05).filter('highpass', freq=1.0)
+    ... # doctest: +ELLIPSIS
+    <...TraceBlock object at 0x...>
+    >>> print(block.to_stream())  # doctest: +ELLIPSIS
+    3 Trace(s) in Stream:
+    BW.RJOB..EHZ | 2009-08-24T00:20:03.000000Z - ... | 100.0 Hz, 3000 samples
+    BW.RJOB..EHN | 2009-08-24T00:20:03.000000Z - ... | 100.0 Hz, 3000 samples
+    BW.RJOB..EHE | 2009-08-24T00:20:03.000000Z - ... | 100.0 Hz, 3000 samples
+    """
+    _max_processing_info = Trace._max_processing_info
+
+    def __init__(self, data, header, extra=None):
+        data = np.asarray(data)
+        if data.ndim != 2:
+            msg = "TraceBlock data must be a two-dimensional array."
+            raise ValueError(msg)
+        if isinstance(data, np.ma.MaskedArray):
+            msg = "TraceBlock data must not be a masked array."
+            raise ValueError(msg)
+        if len(header) != len(data):
+            msg = "Number of header entries (%d) and data rows (%d) differ."
+            raise ValueError(msg % (len(header), len(data)))
+        if len(data) and not np.all(
+                header['sampling_rate'] == header['sampling_rate'][0]):
+            msg = "All traces in a TraceBlock must have equal sampling rate."
+            raise ValueError(msg)
+        if extra is None:
+            extra = [{} for _ in range(len(data))]
+        elif len(extra) != len(data):
+            msg = "Number of extra header entries (%d) and data rows (%d) " \
+                  "differ."
+            raise ValueError(msg % (len(extra), len(data)))
+        self.data = data
+        self.header = header
+        self.extra = extra
+
+    @classmethod
+    def from_stream(cls, stream):
+        """
+        Create a new TraceBlock from the traces of a Stream.
+
+        See :meth:`Stream.to_array_block()
+        <obspy.core.stream.Stream.to_array_block>`.
+        """
+        traces = list(stream)
+        if not traces:
+            msg = "Can not create a TraceBlock from an empty Stream."
+            raise ValueError(msg)
+        npts = set(len(tr) for tr in traces)
+        if len(npts) > 1:
+            msg = ("All traces must have the same number of samples to be "
+                   "combined into a TraceBlock (found: %s)." %
+                   ", ".join(str(i) for i in sorted(npts)))
+            raise ValueError(msg)
+        sampling_rates = set(tr.stats.sampling_rate for tr in traces)
+        if len(sampling_rates) > 1:
+            msg = ("All traces must have the same sampling rate to be "
+                   "combined into a TraceBlock (found: %s)." %
+                   ", ".join(str(i) for i in sorted(sampling_rates)))
+            raise ValueError(msg)
+        dtypes = set(tr.data.dtype for tr in traces)
+        if len(dtypes) > 1:
+            msg = ("All traces must have the same data type to be combined "
+                   "into a TraceBlock (found: %s)." %
+                   ", ".join(sorted(str(i) for i in dtypes)))
+            raise ValueError(msg)
+        if any(isinstance(tr.data, np.ma.MaskedArray) for tr in traces):
+            msg = ("Traces with masked arrays can not be combined into a "
+                   "TraceBlock. Use Stream.split() and/or np.ma.filled() "
+                   "first.")
+            raise ValueError(msg)
+        dtype = []
+        for key in HEADER_KEYS[:4]:
+            width = max(len(tr.stats[key]) for tr in traces)
+            dtype.append((key, 'U%d' % max(width, 1)))
+        dtype += [('starttime', np.int64), ('sampling_rate', np.float64),
+                  ('calib', np.float64)]
+        header = np.array(
+            [(tr.stats.network, tr.stats.station, tr.stats.location,
+              tr.stats.channel, tr.stats.starttime.ns,
+              tr.stats.sampling_rate, tr.stats.calib) for tr in traces],
+            dtype=dtype)
+        extra = [deepcopy({key: value for key, value in tr.stats.items()
+                           if key not in HEADER_KEYS and
+                           key not in DERIVED_KEYS})
+                 for tr in traces]
+        data = np.stack([tr.data for tr in traces])
+        return cls(data, header, extra)
+
+    def to_stream(self):
+        """
+        Convert the TraceBlock back into a Stream.
+
+        The data of the returned traces are views on the rows of
+        :attr:`~TraceBlock.data`, headers are copied.
+
+        :rtype: :class:`~obspy.core.stream.Stream`
+        """
+        from obspy.core.stream import Stream
+        traces = []
+        for data, row, extra in zip(self.data, self.header, self.extra):
+            header = deepcopy(extra)
+            header.update(
+                network=str(row['network']), station=str(row['station']),
+                location=str(row['location']), channel=str(row['channel']),
+                starttime=UTCDateTime(ns=int(row['starttime'])),
+                sampling_rate=float(row['sampling_rate']),
+                calib=float(row['calib']), npts=len(data))
+            tr = Trace(data=data)
+            tr.stats = Stats(header)
+            traces.append(tr)
+        return Stream(traces=traces)
+
+    def __len__(self):
+        """
+        Return the number of traces in the TraceBlock.
+        """
+        return len(self.data)
+
+    def __str__(self):
+        return "%d Trace(s) in TraceBlock: %d samples, %s Hz" % (
+            len(self), self.npts, self.sampling_rate)
+
+    def _repr_pretty_(self, p, cycle):
+        p.text(str(self))
+
+    @property
+    def npts(self):
+        """
+        Number of samples of each trace.
+        """
+        return self.data.shape[1]
+
+    @property
+    def sampling_rate(self):
+        """
+        Common sampling rate of all traces.
+        """
+        if not len(self):
+            return 1.0
+        return float(self.header['sampling_rate'][0])
+
+    def copy(self):
+        """
+        Return a deepcopy of the TraceBlock.
+        """
+        return deepcopy(self)
+
+    def _internal_add_processing_info(self, info):
+        """
+        Add the given informational string to the processing information of
+        all traces.
+        """
+        for extra in self.extra:
+            proc = extra.setdefault('processing', [])
+            if len(proc) == self._max_processing_info - 1:
+                msg = ('List of processing information in '
+                       'Trace.stats.processing reached maximal length of {} '
+                       'entries.')
+                warnings.warn(msg.format(self._max_processing_info))
+            if len(proc) < self._max_processing_info:
+                proc.append(info)
+
+    @_add_processing_info
+    def filter(self, type, *args, **options):
+        """
+        Filter the data of all traces.
+
+        Filters which support an ``axis`` argument (e.g.
+        :func:`~obspy.signal.filter.bandpass`) are applied to all traces in a
+        single call, all others trace by trace. See
+        :meth:`Trace.filter() <obspy.core.trace.Trace.filter>` for supported
+        filters and options.
+        """
+        type = type.lower()
+        func = _get_function_from_entry_point('filter', type)
+        df = self.sampling_rate
+        if 'axis' in inspect.signature(func).parameters:
+            self.data = func(self.data, *args, df=df, axis=-1, **options)
+        else:
+            self.data = np.array([func(row, *args, df=df, **options)
+                                  for row in self.data])
+        return self
+
+    @_add_processing_info
+    def detrend(self, type='simple', **options):
+        """
+        Remove a trend from the data of all traces.
+
+        Methods ``'simple'``, ``'linear'``, ``'constant'`` and ``'demean'``
+        are applied to all traces in a single call, all others trace by
+        trace. See :meth:`Trace.detrend() <obspy.core.trace.Trace.detrend>`
+        for supported methods and options.
+        """
+        type = type.lower()
+        func = _get_function_from_entry_point('detrend', type)
+        original_dtype = self.data.dtype
+        if func.__module__.startswith('scipy'):
+            if type == 'demean':
+                type = 'constant'
+            options['type'] = type
+            self.data = func(self.data, axis=-1, **options)
+        elif type == 'simple':
+            self.data = func(self.data, **options)
+        else:
+            self.data = np.array([func(row, **options)
+                                  for row in self.data])
+        if original_dtype == np.float32 and self.data.dtype != np.float32:
+            self.data = np.require(self.data, dtype=np.float32)
+        return self
+
+    @_add_processing_info
+    def taper(self, max_percentage, type='hann', max_length=None,
+              side='both', **kwargs):
+        """
+        Taper all traces with a common taper window.
+
+        See :meth:`Trace.taper() <obspy.core.trace.Trace.taper>` for
+        supported windows and options.
+        """
+        taper = _get_taper_window(
+            self.npts, self.sampling_rate, max_percentage, type=type,
+            max_length=max_length, side=side, **kwargs)
+        if not np.issubdtype(self.data.dtype, np.floating):
+            self.data = np.require(self.data, dtype=np.float64)
+        self.data *= taper
+        return self
+
+    @_add_processing_info
+    def normalize(self, norm=None):
+        """
+        Normalize all traces.
+
+        See :meth:`Trace.normalize() <obspy.core.trace.Trace.normalize>`,
+        traces with an absolute maximum of zero are left unchanged.
+        """
+        if norm is not None:
+            if norm < 0:
+                msg = "Normalizing with negative values is forbidden. " + \
+                      "Using absolute value."
+                warnings.warn(msg)
+            norm = np.full(len(self), abs(norm), dtype=np.float64)
+        else:
+            norm = np.abs(self.data).max(axis=1).astype(np.float64)
+        zero = norm == 0
+        if zero.any():
+            msg = ("Attempting to normalize by dividing through zero. This "
+                   "is not allowed and the data will thus not be changed.")
+            warnings.warn(msg)
+            norm[zero] = 1.0
+        if not np.issubdtype(self.data.dtype, np.floating):
+            self.data = np.require(self.data, dtype=np.float64)
+        self.data /= norm[:, np.newaxis].astype(self.data.dtype)
+        return self
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod(exclude_empty=True)
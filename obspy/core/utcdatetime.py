@@ -44,11 +44,25 @@ _ISO8601_REGEX = re.compile(r"""
 _YEAR0REGEX = re.compile(r"^(\d{1,3}[-/,])(.*)$")
 
 TIMESTAMP0 = datetime.datetime(1970, 1, 1, 0, 0)
+_ORDINAL0 = TIMESTAMP0.toordinal()
+# latest time representable as a datetime object, in nanoseconds
+_MAX_NS = (datetime.datetime.max - TIMESTAMP0) // \
+    datetime.timedelta(microseconds=1) * 1000
+# the most common ISO8601 date time strings (e.g. in QuakeML and StationXML
+# documents), parsed directly without going through datetime.strptime
+_FAST_ISO8601_REGEX = re.compile(
+    r"(\d{4})-(\d{2})-(\d{2})"
+    r"(?:[T ](\d{2}):(\d{2})(?::(\d{2})(?:\.(\d+))?)?)?Z?$")
 
 # common attributes
 YMDHMS = ('year', 'month', 'day', 'hour', 'minute', 'second')
 YJHMS = ('year', 'julday', 'hour', 'minute', 'second')
 YMDHMS_FORMAT = "%04d-%02d-%02dT%02d:%02d:%02d"
+# ISO8601 strings parsed by numpy the same way as by UTCDateTime
+_SIMPLE_ISO8601_REGEX = re.compile(
+    r"\d{4}-\d{2}-\d{2}([T ]\d{2}(:\d{2}(:\d{2}(\.\d{1,6})?)?)?)?Z?$")
+# numpy.datetime64 "not a time" as integer nanoseconds
+_NAT = np.iinfo(np.int64).min
 
 
 class UTCDateTime(object):
@@ -343,6 +357,12 @@ class UTCDateTime(object):
                 # got a string instance
                 value = value.strip()
 
+                if iso8601 is not False:
+                    ns = _fast_iso8601_to_ns(value)
+                    if ns is not None:
+                        self._ns = ns
+                        return
+
                 # Raising in the case where the leading string is less than 4
                 # chars; linked to #2167
                 if re.match(_YEAR0REGEX, value):
@@ -548,6 +568,47 @@ class UTCDateTime(object):
         """
         self._ns = int(round(value * 10**9))
 
+    @classmethod
+    def from_iso8601(cls, value, precision=None):
+        """
+        Creates a new UTCDateTime object from an ISO8601 string.
+
+        Faster alternative to ``UTCDateTime(value)`` for the most common
+        ISO8601 date time strings like ``"2009-08-24T00:20:03.123456Z"``,
+        e.g. when reading large QuakeML or StationXML files. All other
+        strings are handed to the regular constructor, so the result is
+        always the same as for ``UTCDateTime(value, precision=precision)``.
+
+        :type value: str
+        :param value: ISO8601 date time string.
+        :type precision: int, optional
+        :param precision: Precision of the new object, see
+            :attr:`UTCDateTime.precision`. Defaults to
+            :attr:`UTCDateTime.DEFAULT_PRECISION`.
+        :rtype: :class:`~obspy.core.utcdatetime.UTCDateTime`
+
+        .. rubric:: Example
+
+        >>> UTCDateTime.from_iso8601("2009-08-24T00:20:03.123456Z")
+        UTCDateTime(2009, 8, 24, 0, 20, 3, 123456)
+        >>> UTCDateTime.from_iso8601("2009-236T00:20:03")
+        UTCDateTime(2009, 8, 24, 0, 20, 3)
+        """
+        if precision is None:
+            precision = cls.DEFAULT_PRECISION
+        if isinstance(value, str) and precision <= 9:
+            ns = _fast_iso8601_to_ns(value.strip())
+            if ns is not None:
+                # skip the attribute setters of the regular constructor, the
+                # values are already known to be valid
+                new = cls.__new__(cls)
+                new.__dict__.update({
+                    '_UTCDateTime__precision': int(precision),
+                    '_UTCDateTime__ns': ns,
+                    '_initialized': True})
+                return new
+        return cls(value, precision=precision)
+
     def _from_iso8601_string(self, value):
         """
         Parses an ISO8601:2004 date time string.
@@ -995,6 +1056,8 @@ class UTCDateTime(object):
             msg = ("unsupported operand type(s) for +: 'UTCDateTime' and "
                    "'UTCDateTime'")
             raise TypeError(msg)
+        elif isinstance(value, UTCDateTimeArray):
+            return NotImplemented
         # need to make sure we don't get e.g. np.float32 singl precision input
         # or worse, because then numpy is in charge of the calculations and
         # numpy 2.0 is not automatically upcasting to avoid precision loss
@@ -1027,6 +1090,8 @@ class UTCDateTime(object):
         """
         if isinstance(value, UTCDateTime):
             return round((self._ns - value._ns) / 1e9, self.__precision)
+        elif isinstance(value, UTCDateTimeArray):
+            return NotImplemented
         elif isinstance(value, datetime.timedelta):
             # see datetime.timedelta.total_seconds
             value = (value.microseconds + (value.seconds + value.days *
@@ -1082,6 +1147,8 @@ class UTCDateTime(object):
             a = round(self._ns, ndigits)
             b = round(other._ns, ndigits)
             return op_func(a, b)
+        elif isinstance(other, UTCDateTimeArray):
+            return NotImplemented
         else:
             try:
                 return self._operate(UTCDateTime(other), op_func)
@@ -1134,6 +1201,8 @@ class UTCDateTime(object):
         >>> t1 == t2
         False
         """
+        if isinstance(other, UTCDateTimeArray):
+            return NotImplemented
         return not self.__eq__(other)
 
     def __lt__(self, other):
@@ -1682,6 +1751,572 @@ class UTCDateTime(object):
         return date2num(self.datetime)
 
 
+class UTCDateTimeArray(object):
+    """
+    An array of UTC-based points in time.
+
+    This is the vectorized counterpart of :class:`UTCDateTime`. All points in
+    time are stored as POSIX timestamps in integer nanoseconds in a single
+    :class:`numpy.ndarray` of type ``int64`` (see :attr:`ns`), so that
+    arithmetic, comparisons, formatting and the extraction of date fields are
+    done on the whole array at once instead of on many single objects.
+    Missing points in time are stored as ``NaT`` ("not a time") like in
+    :class:`numpy.datetime64` arrays.
+
+    :type times: list, :class:`numpy.ndarray` or :class:`UTCDateTimeArray`,
+        optional
+    :param times: Points in time as a sequence of :class:`UTCDateTime`
+        objects or of anything else accepted by :class:`UTCDateTime` (e.g.
+        ISO8601 strings), as an array of :class:`numpy.datetime64` or as an
+        array of POSIX timestamps in seconds. ``None`` is stored as ``NaT``.
+    :type ns: array_like of int, optional
+    :param ns: POSIX timestamps as integer nanoseconds, used instead of
+        ``times``.
+    :type precision: int, optional
+    :param precision: Number of significant digits of the seconds used by the
+        rich comparison operators and for formatting, see
+        :attr:`UTCDateTime.precision`. Defaults to
+        :attr:`UTCDateTime.DEFAULT_PRECISION`.
+
+    .. rubric:: Example
+
+    >>> times = UTCDateTimeArray(["2009-08-24T00:20:03",
+    ...                           "2010-02-27T06:34:11.5"])
+    >>> times  # doctest: +NORMALIZE_WHITESPACE
+    UTCDateTimeArray(['2009-08-24T00:20:03.000000Z',
+                      '2010-02-27T06:34:11.500000Z'])
+    >>> times[1]
+    UTCDateTime(2010, 2, 27, 6, 34, 11, 500000)
+    >>> times.julday
+    array([236,  58])
+    >>> times + 0.5 > UTCDateTime(2010, 1, 1)
+    array([False,  True], dtype=bool)
+    >>> times[1] - times
+    array([ 16179248.5,         0. ])
+    >>> times.datetime64  # doctest: +NORMALIZE_WHITESPACE
+    array(['2009-08-24T00:20:03.000000000', '2010-02-27T06:34:11.500000000'],
+          dtype='datetime64[ns]')
+    """
+    # make numpy use the reflected operators of this class instead of
+    # operating on it element-wise
+    __array_ufunc__ = None
+
+    def __init__(self, times=None, ns=None, precision=None):
+        if ns is not None:
+            ns = np.array(ns, dtype=np.int64)
+        elif times is None:
+            ns = np.empty(0, dtype=np.int64)
+        elif isinstance(times, UTCDateTimeArray):
+            ns = times._ns.copy()
+        else:
+            ns = _to_ns_array(times)
+        self._ns = ns
+        if precision is None:
+            precision = UTCDateTime.DEFAULT_PRECISION
+        self.precision = precision
+
+    @classmethod
+    def _from_ns(cls, ns, precision):
+        """
+        Creates a new instance using the given nanosecond array without
+        copying it.
+        """
+        new = cls.__new__(cls)
+        new._ns = ns
+        new.precision = precision
+        return new
+
+    def _get_ns(self):
+        """
+        Returns POSIX timestamps as integer nanoseconds.
+
+        This is the internal representation of UTCDateTimeArray objects and
+        not a copy, ``NaT`` is stored as the smallest ``int64`` value.
+
+        :rtype: :class:`numpy.ndarray`
+        """
+        return self._ns
+
+    ns = property(_get_ns)
+
+    def _get_precision(self):
+        return self._precision
+
+    def _set_precision(self, value):
+        if value > 9:
+            msg = 'UTCDateTime precision above 9 is not supported, using 9'
+            warnings.warn(msg)
+            value = 9
+        self._precision = int(value)
+
+    precision = property(_get_precision, _set_precision)
+
+    def _get_timestamp(self):
+        """
+        Returns POSIX timestamps in seconds, ``NaT`` as ``NaN``.
+
+        :rtype: :class:`numpy.ndarray`
+
+        .. rubric:: Example
+
+        >>> times = UTCDateTimeArray([UTCDateTime(2008, 10, 1, 12, 30, 35),
+        ...                           None])
+        >>> times.timestamp
+        array([  1.22286424e+09,              nan])
+        """
+        return self._mask_nat(self._ns / 1e9, np.nan)
+
+    timestamp = property(_get_timestamp)
+
+    def _get_datetime64(self):
+        """
+        Returns a :class:`numpy.datetime64` view on the nanosecond timestamps.
+
+        :rtype: :class:`numpy.ndarray`
+        """
+        return self._ns.view('datetime64[ns]')
+
+    datetime64 = property(_get_datetime64)
+
+    def isnat(self):
+        """
+        Returns a boolean array flagging missing points in time.
+
+        :rtype: :class:`numpy.ndarray`
+        """
+        return self._ns == _NAT
+
+    def _mask_nat(self, values, fill_value):
+        """
+        Sets all elements of ``values`` to ``fill_value`` where this array is
+        ``NaT``.
+        """
+        nat = self.isnat()
+        if nat.any():
+            values = np.where(nat, fill_value, values)
+        return values
+
+    def _get_rounded_ns(self):
+        return _round_ns(self._ns, self._precision)
+
+    def _get_fields(self):
+        """
+        Returns days since epoch and nanoseconds of the day of the times
+        rounded to the precision, like the :class:`UTCDateTime` date fields.
+        """
+        days, ns_of_day = np.divmod(self._get_rounded_ns(), 86400 * 10**9)
+        return days, ns_of_day
+
+    def _get_year(self):
+        """
+        Returns the years as an integer array.
+        """
+        days = self._get_fields()[0].view('datetime64[D]')
+        return days.astype('datetime64[Y]').astype(np.int64) + 1970
+
+    year = property(_get_year)
+
+    def _get_month(self):
+        """
+        Returns the months as an integer array.
+        """
+        days = self._get_fields()[0].view('datetime64[D]')
+        return days.astype('datetime64[M]').astype(np.int64) % 12 + 1
+
+    month = property(_get_month)
+
+    def _get_day(self):
+        """
+        Returns the days of the month as an integer array.
+        """
+        days = self._get_fields()[0].view('datetime64[D]')
+        months = days.astype('datetime64[M]').astype('datetime64[D]')
+        return (days - months).astype(np.int64) + 1
+
+    day = property(_get_day)
+
+    def _get_julday(self):
+        """
+        Returns the Julian days (day of the year) as an integer array.
+        """
+        days = self._get_fields()[0].view('datetime64[D]')
+        years = days.astype('datetime64[Y]').astype('datetime64[D]')
+        return (days - years).astype(np.int64) + 1
+
+    julday = property(_get_julday)
+
+    def _get_weekday(self):
+        """
+        Returns the days of the week as an integer array, Monday is 0 and
+        Sunday is 6.
+        """
+        # 1970-01-01 was a Thursday
+        return (self._get_fields()[0] + 3) % 7
+
+    weekday = property(_get_weekday)
+
+    def _get_hour(self):
+        """
+        Returns the hours as an integer array.
+        """
+        return self._get_fields()[1] // (3600 * 10**9)
+
+    hour = property(_get_hour)
+
+    def _get_minute(self):
+        """
+        Returns the minutes as an integer array.
+        """
+        return self._get_fields()[1] // (60 * 10**9) % 60
+
+    minute = property(_get_minute)
+
+    def _get_second(self):
+        """
+        Returns the seconds as an integer array.
+        """
+        return self._get_fields()[1] // 10**9 % 60
+
+    second = property(_get_second)
+
+    def _get_microsecond(self):
+        """
+        Returns the microseconds as an integer array.
+        """
+        return self._get_fields()[1] % 10**9 // 1000
+
+    microsecond = property(_get_microsecond)
+
+    def format_iso8601(self):
+        """
+        Returns ISO8601 strings like ``str()`` of :class:`UTCDateTime`.
+
+        The number of decimal digits of the seconds is given by
+        :attr:`precision`, ``NaT`` is formatted as ``'NaT'``.
+
+        :rtype: :class:`numpy.ndarray`
+
+        .. rubric:: Example
+
+        >>> times = UTCDateTimeArray([UTCDateTime(2008, 10, 1, 12, 30, 35),
+        ...                           None], precision=3)
+        >>> times.format_iso8601()  # doctest: +NORMALIZE_WHITESPACE
+        array(['2008-10-01T12:30:35.000Z', 'NaT'], dtype='<U24')
+        """
+        strings = np.datetime_as_string(
+            self._get_rounded_ns().view('datetime64[ns]'), unit='ns')
+        # 'YYYY-MM-DDThh:mm:ss' plus the decimal point and digits
+        length = 19 + self._precision + (self._precision > 0)
+        strings = np.char.add(strings.astype('U%d' % length), 'Z')
+        return self._mask_nat(strings, 'NaT')
+
+    def tolist(self):
+        """
+        Returns a list of :class:`UTCDateTime` objects, ``NaT`` as ``None``.
+        """
+        return [None if ns == _NAT else
+                UTCDateTime(ns=ns, precision=self._precision)
+                for ns in self._ns.ravel().tolist()]
+
+    def copy(self):
+        """
+        Returns a deep copy of the UTCDateTimeArray.
+        """
+        return self._from_ns(self._ns.copy(), self._precision)
+
+    def min(self):
+        """
+        Returns the earliest point in time, ignoring ``NaT``.
+
+        :rtype: :class:`UTCDateTime`
+        """
+        ns = self._ns[~self.isnat()]
+        if not ns.size:
+            msg = 'No valid points in time in UTCDateTimeArray.'
+            raise ValueError(msg)
+        return UTCDateTime(ns=ns.min(), precision=self._precision)
+
+    def max(self):
+        """
+        Returns the latest point in time, ignoring ``NaT``.
+
+        :rtype: :class:`UTCDateTime`
+        """
+        ns = self._ns[~self.isnat()]
+        if not ns.size:
+            msg = 'No valid points in time in UTCDateTimeArray.'
+            raise ValueError(msg)
+        return UTCDateTime(ns=ns.max(), precision=self._precision)
+
+    def argsort(self, kind='stable'):
+        """
+        Returns the indices that sort the array (``NaT`` first).
+        """
+        return np.argsort(self._ns, kind=kind)
+
+    def sort(self, kind='stable'):
+        """
+        Sorts the array in place (``NaT`` first).
+        """
+        self._ns.sort(kind=kind)
+
+    @property
+    def shape(self):
+        return self._ns.shape
+
+    @property
+    def size(self):
+        return self._ns.size
+
+    def __len__(self):
+        return len(self._ns)
+
+    def __iter__(self):
+        return iter(self.tolist())
+
+    def __getitem__(self, index):
+        ns = self._ns[index]
+        if isinstance(ns, np.ndarray):
+            return self._from_ns(ns, self._precision)
+        if ns == _NAT:
+            return None
+        return UTCDateTime(ns=int(ns), precision=self._precision)
+
+    def __setitem__(self, index, value):
+        if isinstance(value, UTCDateTime):
+            self._ns[index] = value._ns
+        elif value is None:
+            self._ns[index] = _NAT
+        else:
+            self._ns[index] = UTCDateTimeArray(value)._ns
+
+    def __array__(self, dtype=None, copy=None):
+        if dtype is None:
+            return self.datetime64.copy() if copy else self.datetime64
+        return self.datetime64.astype(dtype)
+
+    def __repr__(self):
+        prefix = 'UTCDateTimeArray('
+        return prefix + np.array2string(
+            self.format_iso8601(), separator=', ', prefix=prefix) + ')'
+
+    def __str__(self):
+        return str(self.format_iso8601())
+
+    def __add__(self, value):
+        """
+        Adds seconds to all points in time.
+
+        :type value: int, float, array_like or :class:`datetime.timedelta`
+        :param value: Seconds to add, either one value for all points in time
+            or an array matching the shape of this array. Arrays of
+            :class:`numpy.timedelta64` are supported as well.
+        :rtype: :class:`UTCDateTimeArray`
+        """
+        if isinstance(value, (UTCDateTime, UTCDateTimeArray)):
+            msg = ("unsupported operand type(s) for +: 'UTCDateTimeArray' and "
+                   "'%s'" % type(value).__name__)
+            raise TypeError(msg)
+        ns = self._ns + _seconds_to_ns(value)
+        return self._from_ns(self._mask_nat(ns, _NAT), self._precision)
+
+    __radd__ = __add__
+
+    def __sub__(self, value):
+        """
+        Subtracts seconds or points in time.
+
+        Subtracting seconds (see :meth:`__add__`) results in a new
+        UTCDateTimeArray, subtracting a :class:`UTCDateTime` or another
+        UTCDateTimeArray in relative time spans in seconds rounded to
+        :attr:`precision` (``NaN`` for ``NaT``).
+        """
+        if isinstance(value, np.ndarray) and value.dtype.kind == 'M':
+            value = UTCDateTimeArray(value)
+        if isinstance(value, UTCDateTime):
+            return self._mask_nat(
+                _ns_to_seconds(self._ns - value._ns, self._precision),
+                np.nan)
+        elif isinstance(value, UTCDateTimeArray):
+            diff = _ns_to_seconds(self._ns - value._ns, self._precision)
+            return value._mask_nat(self._mask_nat(diff, np.nan), np.nan)
+        ns = self._ns - _seconds_to_ns(value)
+        return self._from_ns(self._mask_nat(ns, _NAT), self._precision)
+
+    def __rsub__(self, value):
+        if isinstance(value, UTCDateTime):
+            return self._mask_nat(
+                _ns_to_seconds(value._ns - self._ns, value.precision),
+                np.nan)
+        return NotImplemented
+
+    def _operate(self, other, op_func):
+        """
+        Element-wise comparison of times rounded to the precision like
+        :class:`UTCDateTime` does it. Comparisons with ``NaT`` are ``False``
+        except for ``!=``.
+        """
+        if not isinstance(other, (UTCDateTime, UTCDateTimeArray)):
+            try:
+                other = UTCDateTimeArray(other, precision=self._precision)
+            except (TypeError, ValueError):
+                return NotImplemented
+        if self._precision != other.precision:
+            msg = ('Comparing UTCDateTime objects of different precision'
+                   ' is not defined will raise an Exception in a future'
+                   ' version of obspy')
+            warnings.warn(msg, ObsPyDeprecationWarning)
+        precision = min(self._precision, other.precision)
+        result = op_func(_round_ns(self._ns, precision),
+                         _round_ns(np.asarray(other._ns), precision))
+        nat = self.isnat() | (np.asarray(other._ns) == _NAT)
+        if nat.any():
+            result = np.where(nat, op_func is operator.ne, result)
+        return result
+
+    def __eq__(self, other):
+        return self._operate(other, operator.eq)
+
+    def __ne__(self, other):
+        return self._operate(other, operator.ne)
+
+    def __lt__(self, other):
+        return self._operate(other, operator.lt)
+
+    def __le__(self, other):
+        return self._operate(other, operator.le)
+
+    def __gt__(self, other):
+        return self._operate(other, operator.gt)
+
+    def __ge__(self, other):
+        return self._operate(other, operator.ge)
+
+    # compares element-wise, not hashable
+    __hash__ = None
+
+
+def _to_ns_array(times):
+    """
+    Converts points in time to an array of POSIX timestamps in integer
+    nanoseconds, see :class:`UTCDateTimeArray`.
+    """
+    times = np.asarray(times)
+    if times.dtype.kind == 'M':
+        return times.astype('datetime64[ns]').view(np.int64)
+    elif times.dtype.kind in 'iu':
+        return times.astype(np.int64) * 10**9
+    elif times.dtype.kind == 'f':
+        return np.round(times.astype(np.float64) * 1e9).astype(np.int64)
+    elif times.dtype.kind == 'U' and all(
+            map(_SIMPLE_ISO8601_REGEX.match, times.ravel().tolist())):
+        # fast path for plain ISO8601 strings that numpy parses the same way
+        # as UTCDateTime, anything else is parsed by UTCDateTime below
+        strings = np.char.rstrip(times, 'Z')
+        return strings.astype('datetime64[ns]').view(np.int64)
+    ns = [_NAT if t is None else
+          t._ns if isinstance(t, UTCDateTime) else UTCDateTime(t)._ns
+          for t in times.ravel().tolist()]
+    return np.array(ns, dtype=np.int64).reshape(times.shape)
+
+
+def _seconds_to_ns(value):
+    """
+    Converts (arrays of) seconds or time deltas to integer nanoseconds the
+    same way :meth:`UTCDateTime.__add__` does.
+    """
+    if isinstance(value, datetime.timedelta):
+        return (value.microseconds + (value.seconds + value.days *
+                86400) * 10**6) * 1000
+    value = np.asarray(value)
+    if value.dtype.kind == 'm':
+        return value.astype('timedelta64[ns]').view(np.int64)
+    return np.round(value.astype(np.float64) * 1e9).astype(np.int64)
+
+
+def _ns_to_seconds(ns, precision):
+    """
+    Converts integer nanoseconds to seconds rounded to given number of
+    decimal digits with the same result as subtracting two
+    :class:`~obspy.core.utcdatetime.UTCDateTime` objects element-wise, i.e.
+    ``round(ns / 1e9, precision)``.
+    """
+    seconds = np.asarray(ns) / 1e9
+    scaled = seconds * 10.0 ** precision
+    result = np.round(seconds, precision)
+    # Rounding to more digits than the float resolution does not change the
+    # value at all.
+    unchanged = 10.0 ** -precision < np.spacing(np.abs(seconds)) / 2
+    result = np.where(unchanged, seconds, result)
+    # np.round() scales the value before rounding, which can deviate from
+    # the correctly rounded result of round() close to ties and close to the
+    # float resolution. Fall back to round() for these few values.
+    fraction = np.abs(scaled - np.floor(scaled))
+    suspicious = ~unchanged & (
+        (np.abs(fraction - 0.5) <= 4 * np.spacing(np.abs(scaled))) |
+        (np.abs(scaled) >= 2.0 ** 52))
+    for i in np.flatnonzero(suspicious):
+        result.flat[i] = round(float(seconds.flat[i]), precision)
+    return result
+
+
+def _round_ns(ns, precision):
+    """
+    Round integer nanoseconds like comparisons of
+    :class:`~obspy.core.utcdatetime.UTCDateTime` objects with given precision
+    do (round half to even).
+    """
+    if precision >= 9:
+        return ns
+    factor = 10 ** (9 - precision)
+    quotient, remainder = np.divmod(ns, factor)
+    half = factor // 2
+    round_up = (remainder > half) | ((remainder == half) & (quotient % 2 == 1))
+    return (quotient + round_up) * factor
+
+
+def _fast_iso8601_to_ns(value):
+    """
+    Parses the most common ISO8601 date time strings to integer nanoseconds
+    with the same result as the regular :class:`UTCDateTime` constructor.
+
+    :type value: str
+    :param value: ISO8601 date time string without surrounding whitespace.
+    :returns: Nanoseconds as an int or ``None`` if the string is not
+        of the form ``YYYY-MM-DD[Thh:mm[:ss[.f...]]][Z]``.
+    """
+    match = _FAST_ISO8601_REGEX.match(value)
+    if match is None:
+        return None
+    year, month, day, hour, minute, second, fraction = match.groups()
+    hour = int(hour or 0)
+    minute = int(minute or 0)
+    second = int(second or 0)
+    if hour > 23 or minute > 59 or second > 59:
+        # let the regular constructor raise the usual errors
+        return None
+    try:
+        days = datetime.date(
+            int(year), int(month), int(day)).toordinal() - _ORDINAL0
+    except ValueError:
+        return None
+    ns = ((days * 24 + hour) * 60 + minute) * 60 + second
+    ns *= 10**9
+    if fraction:
+        if len(fraction) <= 6:
+            ns += int(fraction.ljust(6, '0')) * 1000
+        else:
+            # fractions of seconds are rounded to microseconds the same way
+            # as in the regular constructor
+            delta = datetime.timedelta(seconds=float('0.' + fraction))
+            ns += (delta.seconds * 10**6 + delta.microseconds) * 1000
+            if ns > _MAX_NS:
+                # rounded up past the end of year 9999, let the regular
+                # constructor raise the usual OverflowError
+                return None
+    return ns
+
+
 def _datetime_to_ns(dt):
     """
     Use Python datetime object to return equivalent nanoseconds.
@@ -8,6 +8,8 @@ Base utilities and constants for ObsPy.
     GNU Lesser General Public License, Version 3
     (https://www.gnu.org/copyleft/lesser.html)
 """
+import concurrent.futures
+import functools
 import glob
 import importlib
 import importlib.metadata
@@ -27,8 +29,8 @@ from pathlib import PurePath
 
 import numpy as np
 
-from obspy.core.util.attribdict import (AttribDict)
-from obspy.core.util.misc import to_int_or_zero, buffered_load_entry_point
+from obspy.core.util.misc import (to_int_or_zero, buffered_load_entry_point,
+                                  _get_entry_point_registry)
 
 
 # defining ObsPy modules currently used by runtests and the path function
@@ -60,6 +62,41 @@ EVENT_PREFERRED_ORDER = ['QUAKEML', 'NLLOC_HYP']
 INVENTORY_PREFERRED_ORDER = ['STATIONXML', 'SEED', 'RESP']
 # waveform plugins accepting a byteorder keyword
 WAVEFORM_ACCEPT_BYTEORDER = ['MSEED', 'Q', 'SAC', 'SEGY', 'SU']
+# signatures (regular expressions matching the start of a file) of formats
+# that can be recognized from the first bytes of a file, these formats are
+# checked first during automatic format detection
+FORMAT_SIGNATURES = {
+    'waveform': OrderedDict([
+        ('MSEED', br'[\d \x00]{6}[DRQM][ \x00]'),
+        ('GSE2', br'WID2'),
+        ('SLIST', br'TIMESERIES[^\n]*SLIST'),
+        ('TSPAIR', br'TIMESERIES[^\n]*TSPAIR'),
+        ('PICKLE', br'[\s\S]{0,83}obspy\.core\.stream'),
+        ('SEG2', br'\x55\x3a|\x3a\x55'),
+        ('WAV', br'RIFF[\s\S]{4}WAVE'),
+    ]),
+    'event': OrderedDict([
+        ('QUAKEML', br'[\s\S]*?<(?:\w+:)?quakeml\b'),
+        ('SC3ML', br'[\s\S]*?<(?:\w+:)?seiscomp\b'),
+    ]),
+    'inventory': OrderedDict([
+        ('STATIONXML', br'[\s\S]*?<(?:\w+:)?FDSNStationXML\b'),
+        ('SC3ML', br'[\s\S]*?<(?:\w+:)?seiscomp\b'),
+    ]),
+}
+# number of bytes read from the start of a file to match format signatures
+FORMAT_SIGNATURE_SIZE = 4096
+# formats with a weak isFormat check that may also accept files of other
+# formats, the listed formats earlier in the sort order are checked before a
+# cached or sniffed format is accepted
+FORMAT_PRECEDENCE = {
+    'waveform': {
+        'WIN': ['MSEED', 'SAC', 'SEGY'],
+    },
+}
+# cache of detected formats per plugin type, directory and file extension
+_FORMAT_CACHE = {}
+_FORMAT_CACHE_MAX_SIZE = 1000
 
 _sys_is_le = sys.byteorder == 'little'
 NATIVE_BYTEORDER = _sys_is_le and '<' or '>'
@@ -280,55 +317,14 @@ def _get_entry_points(group, subgroup=None):
     {...'SLIST': EntryPoint(name='SLIST', value='obspy.io.ascii.core',
                             group='obspy.plugin.waveform')...}
     """
-    if sys.version_info.minor < 10:
-        # compatibility workaround for Python 3.8 and 3.9
-        eps_all = importlib.metadata.entry_points()
-
-        try:
-            eps = eps_all[group]
-        except KeyError:
-            eps = {}
-            for key, ep in eps.items():
-                if group in key:
-                    eps[key] = ep
-
-        if subgroup:
-            features = {}
-            for ep in eps:
-                # workaround to get the dist dict populated here
-                if hasattr(ep, "dist"):
-                    if not hasattr(ep.dist, "name"):
-                        ep.dist.name = get_entry_point_dist_name(ep)
-                else:
-                    ep.dist = AttribDict({"name":
-                                          get_entry_point_dist_name(ep)})
-                for sub_ep in eps_all[f'{group}.{ep.name}']:
-                    if sub_ep.name == subgroup:
-                        features[ep.name] = ep
-                        break
-        else:
-            features = {}
-            for ep in eps:
-                # workaround to get the dist dict populated here
-                if hasattr(ep, "dist"):
-                    if not hasattr(ep.dist, "name"):
-                        ep.dist.name = get_entry_point_dist_name(ep)
-                else:
-                    ep.dist = AttribDict({"name":
-                                          get_entry_point_dist_name(ep)})
-                features[ep.name] = ep
-    else:
-        eps = importlib.metadata.entry_points(group=group)
-        if subgroup:
-            features = {}
-            for ep in eps:
-                sub_eps = tuple(importlib.metadata.entry_points(
-                    group=f'{group}.{ep.name}', name=subgroup))
-                if not sub_eps:
-                    continue
-                features[ep.name] = ep
-        else:
-            features = {ep.name: ep for ep in eps}
+    registry = _get_entry_point_registry()
+    features = {}
+    for ep in registry.get(group, []):
+        if subgroup and not any(
+                sub_ep.name == subgroup
+                for sub_ep in registry.get('%s.%s' % (group, ep.name), [])):
+            continue
+        features[ep.name] = ep
     return features
 
 
@@ -456,6 +452,29 @@ def _read_from_plugin(plugin_type, filename, format=None, **kwargs):
     """
     Reads a single file from a plug-in's readFormat function.
     """
+    format_ep = _get_format_entry_point(plugin_type, filename, format=format)
+    try:
+        # search readFormat for given entry point
+        read_format = buffered_load_entry_point(
+            format_ep.dist.name,
+            'obspy.plugin.%s.%s' % (plugin_type, format_ep.name),
+            'readFormat')
+    except ImportError:
+        eps = ENTRY_POINTS[plugin_type]
+        msg = "Format \"%s\" is not supported. Supported types: %s"
+        raise TypeError(msg % (format_ep.name, ', '.join(eps)))
+    # read
+    list_obj = read_format(filename, **kwargs)
+    return list_obj, format_ep.name
+
+
+def _get_format_entry_point(plugin_type, filename, format=None):
+    """
+    Returns the entry point of the format of a single file.
+
+    The format is either given or detected via the isFormat functions of all
+    plug-ins of the given type.
+    """
     if isinstance(filename, str):
         if not Path(filename).exists():
             msg = "[Errno 2] No such file or directory: '{}'".format(
@@ -465,28 +484,44 @@ def _read_from_plugin(plugin_type, filename, format=None, **kwargs):
     # get format entry point
     format_ep = None
     if not format:
-        # auto detect format - go through all known formats in given sort order
-        for format_ep in eps.values():
-            # search isFormat for given entry point
-            is_format = buffered_load_entry_point(
-                format_ep.dist.name,
-                'obspy.plugin.%s.%s' % (plugin_type, format_ep.name),
-                'isFormat')
-            # If it is a file-like object, store the position and restore it
-            # later to avoid that the isFormat() functions move the file
-            # pointer.
-            if hasattr(filename, "tell") and hasattr(filename, "seek"):
-                position = filename.tell()
+        # first check the format detected for other files with the same
+        # extension in the same directory and the format recognized by its
+        # signature, only fall back to checking all formats if neither of
+        # them accepts the file
+        cache_key = _get_format_cache_key(plugin_type, filename)
+        precedence = FORMAT_PRECEDENCE.get(plugin_type, {})
+        rejected = set()
+        for get_candidate in (lambda: _FORMAT_CACHE.get(cache_key),
+                              lambda: _sniff_format(plugin_type, filename)):
+            name = get_candidate()
+            if name is None or name in rejected or name not in eps:
+                continue
+            if not _is_format(plugin_type, eps[name], filename):
+                rejected.add(name)
+                continue
+            format_ep = eps[name]
+            for earlier in precedence.get(name, []):
+                if earlier in rejected or earlier not in eps:
+                    continue
+                if _is_format(plugin_type, eps[earlier], filename):
+                    format_ep = eps[earlier]
+                    break
+                rejected.add(earlier)
+            break
+        if format_ep is None:
+            # auto detect format - go through all known formats in given sort
+            # order
+            for format_ep in eps.values():
+                if format_ep.name in rejected:
+                    continue
+                if _is_format(plugin_type, format_ep, filename):
+                    break
             else:
-                position = None
-            # check format
-            is_format = is_format(filename)
-            if position is not None:
-                filename.seek(position, 0)
-            if is_format:
-                break
-        else:
-            raise TypeError('Unknown format for file %s' % filename)
+                raise TypeError('Unknown format for file %s' % filename)
+        if cache_key is not None:
+            if len(_FORMAT_CACHE) >= _FORMAT_CACHE_MAX_SIZE:
+                _FORMAT_CACHE.clear()
+            _FORMAT_CACHE[cache_key] = format_ep.name
     else:
         # format given via argument
         format = format.upper()
@@ -495,19 +530,84 @@ def _read_from_plugin(plugin_type, filename, format=None, **kwargs):
         except (KeyError, IndexError):
             msg = "Format \"%s\" is not supported. Supported types: %s"
             raise TypeError(msg % (format, ', '.join(eps)))
-    # file format should be known by now
+    return format_ep
+
+
+def _is_format(plugin_type, format_ep, filename):
+    """
+    Checks a single file with the isFormat function of a format entry point.
+    """
+    # search isFormat for given entry point
+    is_format = buffered_load_entry_point(
+        format_ep.dist.name,
+        'obspy.plugin.%s.%s' % (plugin_type, format_ep.name),
+        'isFormat')
+    # If it is a file-like object, store the position and restore it
+    # later to avoid that the isFormat() functions move the file
+    # pointer.
+    if hasattr(filename, "tell") and hasattr(filename, "seek"):
+        position = filename.tell()
+    else:
+        position = None
+    # check format
+    is_format = is_format(filename)
+    if position is not None:
+        filename.seek(position, 0)
+    return bool(is_format)
+
+
+def _get_format_cache_key(plugin_type, filename):
+    """
+    Returns the key of a file in the cache of detected formats or ``None`` for
+    file-like objects.
+    """
+    if not isinstance(filename, (str, PurePath)):
+        return None
+    dirname, basename = os.path.split(os.fspath(filename))
+    return (plugin_type, dirname, os.path.splitext(basename)[1].lower())
+
+
+@functools.lru_cache()
+def _get_format_signature_pattern(plugin_type):
+    """
+    Returns a single compiled regular expression matching the signatures of
+    all formats of a plugin type, with one named group per format.
+    """
+    signatures = FORMAT_SIGNATURES.get(plugin_type)
+    if not signatures:
+        return None
+    return re.compile(b'|'.join(
+        b'(?P<%s>%s)' % (name.encode(), signature)
+        for name, signature in signatures.items()))
+
+
+def _sniff_format(plugin_type, filename):
+    """
+    Returns the name of the format whose signature matches the first bytes of
+    a file or ``None``.
+    """
+    pattern = _get_format_signature_pattern(plugin_type)
+    if pattern is None:
+        return None
     try:
-        # search readFormat for given entry point
-        read_format = buffered_load_entry_point(
-            format_ep.dist.name,
-            'obspy.plugin.%s.%s' % (plugin_type, format_ep.name),
-            'readFormat')
-    except ImportError:
-        msg = "Format \"%s\" is not supported. Supported types: %s"
-        raise TypeError(msg % (format_ep.name, ', '.join(eps)))
-    # read
-    list_obj = read_format(filename, **kwargs)
-    return list_obj, format_ep.name
+        if isinstance(filename, (str, PurePath)):
+            with open(filename, 'rb') as fh:
+                header = fh.read(FORMAT_SIGNATURE_SIZE)
+        elif hasattr(filename, "read") and hasattr(filename, "tell") and \
+                hasattr(filename, "seek"):
+            position = filename.tell()
+            header = filename.read(FORMAT_SIGNATURE_SIZE)
+            filename.seek(position, 0)
+        else:
+            return None
+    except Exception:
+        return None
+    if not isinstance(header, bytes):
+        return None
+    match = pattern.match(header)
+    if match is None:
+        return None
+    return match.lastgroup
 
 
 def get_script_dir_name():
@@ -566,18 +666,11 @@ def make_format_plugin_table(group="waveform", method="read", numspaces=4,
     eps = _get_ordered_entry_points("obspy.plugin.%s" % group, method,
                                     WAVEFORM_PREFERRED_ORDER)
     mod_list = []
+    registry = _get_entry_point_registry()
     for name, ep in eps.items():
-        if sys.version_info.minor < 10:
-            # compatibility workaround for Python 3.8 and 3.9
-            module_short = ":mod:`%s`" % ".".join(ep.value.split(".")[:3])
-            func_str = list(
-                _ep for _ep in
-                importlib.metadata.entry_points()[f'{ep.group}.{ep.name}'] if
-                _ep.name == method)[0].value
-        else:
-            module_short = ":mod:`%s`" % ".".join(ep.module.split(".")[:3])
-            func_str = tuple(importlib.metadata.entry_points(
-                group=f'{ep.group}.{ep.name}', name=method))[0].value
+        module_short = ":mod:`%s`" % ".".join(ep.module.split(".")[:3])
+        func_str = [_ep for _ep in registry['%s.%s' % (ep.group, ep.name)]
+                    if _ep.name == method][0].value
         func_str = func_str.replace(':', '.')
         func_str = f':func:`{func_str}`'
         mod_list.append((name, module_short, func_str))
@@ -707,8 +800,41 @@ def download_to_file(url, filename_or_buffer, chunk_size=1024):
                 fh.write(chunk)
 
 
+def _map_pathnames(callback_func, pathnames, workers=None,
+                   executor="thread", **kwargs):
+    """
+    Apply ``callback_func`` to each of the given file names.
+
+    The results are returned as a list in the order of ``pathnames``. If
+    ``workers`` is larger than one the calls are distributed over a pool of
+    threads or processes (depending on ``executor``), otherwise the file names
+    are processed one after another.
+    """
+    if executor not in ("thread", "process"):
+        msg = "executor must be either 'thread' or 'process', not '%s'."
+        raise ValueError(msg % executor)
+    if not workers or workers <= 1 or len(pathnames) < 2:
+        return [callback_func(filename, **kwargs) for filename in pathnames]
+    if executor == "thread":
+        pool_class = concurrent.futures.ThreadPoolExecutor
+    else:
+        pool_class = concurrent.futures.ProcessPoolExecutor
+    with pool_class(max_workers=min(workers, len(pathnames))) as pool:
+        futures = [pool.submit(callback_func, filename, **kwargs)
+                   for filename in pathnames]
+        # collect in submission order so that the output is deterministic
+        # and the first failing file (in sorted order) raises, just like in
+        # the serial case
+        try:
+            return [future.result() for future in futures]
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+
+
 def _generic_reader(pathname_or_url=None, callback_func=None,
-                    **kwargs):
+                    workers=None, executor="thread", **kwargs):
     # convert pathlib.Path objects to str for compatibility.
     if isinstance(pathname_or_url, PurePath):
         pathname_or_url = str(pathname_or_url)
@@ -751,10 +877,11 @@ def _generic_reader(pathname_or_url=None, callback_func=None,
             elif not glob.has_magic(pathname) and not Path(pathname).is_file():
                 raise IOError(2, "No such file or directory", pathname)
 
-        generic = callback_func(pathnames[0], **kwargs)
-        if len(pathnames) > 1:
-            for filename in pathnames[1:]:
-                generic.extend(callback_func(filename, **kwargs))
+        results = _map_pathnames(callback_func, pathnames, workers=workers,
+                                 executor=executor, **kwargs)
+        generic = results[0]
+        for result in results[1:]:
+            generic.extend(result)
         return generic
 
 
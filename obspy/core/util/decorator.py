@@ -193,7 +193,10 @@ def uncompress_file(func, filename, *args, **kwargs):
             pass
     # handle results
     if obj_list:
-        # write results to temporary files
+        # write results to temporary files, these are removed right after
+        # reading so the data can not be read lazily from them
+        if kwargs.get('lazy'):
+            kwargs['lazy'] = False
         result = None
         for obj in obj_list:
             with NamedTemporaryFile() as tempfile:
@@ -9,12 +9,16 @@ Various additional utilities for ObsPy.
     (https://www.gnu.org/copyleft/lesser.html)
 """
 import contextlib
+import hashlib
+import importlib
 import importlib.metadata
 import inspect
 import io
 import itertools
+import json
 import math
 import os
+import re
 import shutil
 import sys
 import tempfile
@@ -53,6 +57,14 @@ BAND_CODE = {'F': 1000.0,
 # Dict that stores results from load entry points
 _ENTRY_POINT_CACHE = {}
 
+# Dict that stores all registered ObsPy entry points per group, see
+# _get_entry_point_registry()
+_ENTRY_POINT_REGISTRY = {}
+# scanned entry point registry that is not stored on disk yet
+_ENTRY_POINT_REGISTRY_UNSAVED = {}
+# version of the on-disk format of the entry point registry
+_ENTRY_POINT_REGISTRY_VERSION = 2
+
 # The kwargs used by load_entry_point function
 _LOAD_ENTRY_POINT_KEYS = ('dist', 'group', 'name')
 
@@ -399,6 +411,40 @@ def TemporaryWorkingDirectory():  # noqa --> this name is IMHO ok for a CM
             warnings.warn(e.__repr__())
 
 
+_UMASK = None
+
+
+@contextlib.contextmanager
+def _atomic_write(filename, mode='w'):
+    """
+    A context manager that opens a temporary file next to ``filename`` for
+    writing and moves it to ``filename`` when the block finishes without
+    errors, so that other processes never see a partially written file.
+
+    The temporary file is removed if anything goes wrong.
+
+    >>> with _atomic_write('index.json') as fh:  # doctest: +SKIP
+    ...    json.dump(index, fh)
+    """
+    global _UMASK
+    if _UMASK is None:
+        # the umask can only be read by setting it
+        _UMASK = os.umask(0o022)
+        os.umask(_UMASK)
+    dirname = os.path.dirname(os.path.abspath(filename))
+    fd, tmp_filename = tempfile.mkstemp(dir=dirname, suffix='.tmp')
+    try:
+        with os.fdopen(fd, mode) as fh:
+            yield fh
+        # mkstemp() creates files only accessible by the owner, use the
+        # permissions of a regularly created file instead
+        os.chmod(tmp_filename, 0o666 & ~_UMASK)
+        os.replace(tmp_filename, filename)
+    finally:
+        if os.path.exists(tmp_filename):
+            os.remove(tmp_filename)
+
+
 def factorize_int(x):
     """
     Calculate prime factorization of integer.
@@ -587,6 +633,217 @@ def limit_numpy_fft_cache(max_size_in_mb_per_cache=100):
             cache.clear()
 
 
+class _EntryPoint(object):
+    """
+    Light-weight entry point of the entry point registry.
+
+    Provides the parts of :class:`importlib.metadata.EntryPoint` used in
+    ObsPy, including the name of the distribution as ``dist.name``.
+    """
+    __slots__ = ('name', 'value', 'group', 'dist')
+
+    def __init__(self, name, value, group, dist):
+        self.name = name
+        self.value = value
+        self.group = group
+        self.dist = _Distribution(dist)
+
+    @property
+    def module(self):
+        return self.value.partition(':')[0].strip()
+
+    @property
+    def attr(self):
+        return self.value.partition(':')[2].strip()
+
+    def load(self):
+        """
+        Import the module of the entry point and return the referenced object.
+        """
+        obj = importlib.import_module(self.module)
+        for attr in filter(None, self.attr.split('.')):
+            obj = getattr(obj, attr)
+        return obj
+
+    def _key(self):
+        return (self.name, self.value, self.group, self.dist.name)
+
+    def __eq__(self, other):
+        return isinstance(other, _EntryPoint) and self._key() == other._key()
+
+    def __hash__(self):
+        return hash(self._key())
+
+    def __repr__(self):
+        return 'EntryPoint(name=%r, value=%r, group=%r)' % (
+            self.name, self.value, self.group)
+
+
+class _Distribution(object):
+    """
+    Name of the distribution of an entry point of the registry.
+    """
+    __slots__ = ('name',)
+
+    def __init__(self, name):
+        self.name = name
+
+
+def _get_entry_point_cache_file():
+    """
+    Returns the file name of the on-disk entry point registry or ``None``.
+
+    The file is stored in the directory given by the ``OBSPY_CACHE_DIR``
+    environment variable (an empty value disables the on-disk cache) or in
+    ``obspy`` in the user cache directory.
+    """
+    cache_dir = os.environ.get('OBSPY_CACHE_DIR')
+    if cache_dir is None:
+        cache_dir = os.environ.get('XDG_CACHE_HOME') or \
+            os.path.join(os.path.expanduser('~'), '.cache')
+        cache_dir = os.path.join(cache_dir, 'obspy')
+    if not cache_dir:
+        return None
+    return os.path.join(cache_dir, 'entry_points.json')
+
+
+def _get_entry_point_cache_key():
+    """
+    Returns a key identifying the current set of installed distributions.
+
+    The key is built from the names and modification times of the
+    distribution metadata directories on ``sys.path``, which change whenever
+    a distribution is installed, updated or removed, and the modification
+    times and sizes of their ``entry_points.txt`` files, which also catch
+    entry points changed in place (e.g. by reinstalling an editable
+    installation).
+    """
+    sha1 = hashlib.sha1(sys.version.encode())
+    for path in sys.path:
+        try:
+            entries = sorted(
+                (entry.name, entry.stat().st_mtime_ns,
+                 _get_file_stat(os.path.join(entry.path, 'entry_points.txt')))
+                for entry in os.scandir(path or os.curdir)
+                if entry.name.endswith(('.dist-info', '.egg-info')))
+        except OSError:
+            continue
+        sha1.update(repr((path, entries)).encode())
+    return sha1.hexdigest()
+
+
+def _get_file_stat(filename):
+    """
+    Returns modification time (in nanoseconds) and size of a file or ``None``
+    if it does not exist.
+    """
+    try:
+        stat = os.stat(filename)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _scan_entry_points():
+    """
+    Returns all entry points of ObsPy groups of all installed distributions
+    as a list of ``[group, name, value, distribution name]`` lists.
+    """
+    entry_points = []
+    seen = set()
+    for dist in importlib.metadata.distributions():
+        dist_name = dist.metadata['Name']
+        if dist_name is None:
+            continue
+        # only the first distribution of a name on sys.path is used
+        normalized_name = re.sub(r'[-_.]+', '-', dist_name).lower()
+        if normalized_name in seen:
+            continue
+        seen.add(normalized_name)
+        for ep in dist.entry_points:
+            if ep.group.startswith('obspy.'):
+                entry_points.append([ep.group, ep.name, ep.value, dist_name])
+    return entry_points
+
+
+def _get_entry_point_registry(save=False):
+    """
+    Returns a dictionary of all registered entry points of ObsPy groups.
+
+    Scanning the metadata of all installed distributions is slow, so the
+    result is stored on disk (see :func:`_get_entry_point_cache_file`) and
+    reused as long as no distribution was installed, updated or removed.
+
+    :type save: bool
+    :param save: Store a newly scanned registry on disk (best-effort, any
+        errors are ignored). Only done on plugin lookups, see
+        :func:`buffered_load_entry_point`, so that merely importing ObsPy
+        never writes any files.
+    :rtype: dict
+    :returns: Dictionary mapping group names to lists of entry points.
+    """
+    if not _ENTRY_POINT_REGISTRY:
+        _ENTRY_POINT_REGISTRY.update(_load_entry_point_registry())
+    if save and _ENTRY_POINT_REGISTRY_UNSAVED:
+        _save_entry_point_registry(**_ENTRY_POINT_REGISTRY_UNSAVED)
+        _ENTRY_POINT_REGISTRY_UNSAVED.clear()
+    return _ENTRY_POINT_REGISTRY
+
+
+def _load_entry_point_registry():
+    """
+    Reads the entry point registry from disk if it is up to date or scans
+    the installed distributions otherwise, see
+    :func:`_get_entry_point_registry`.
+    """
+    filename = _get_entry_point_cache_file()
+    key = _get_entry_point_cache_key()
+    entry_points = None
+    if filename is not None:
+        try:
+            with open(filename, 'r') as fh:
+                cache = json.load(fh)
+            if cache['version'] == _ENTRY_POINT_REGISTRY_VERSION and \
+                    cache['key'] == key:
+                entry_points = cache['entry_points']
+        except Exception:
+            pass
+    if entry_points is None:
+        entry_points = _scan_entry_points()
+        if filename is not None:
+            _ENTRY_POINT_REGISTRY_UNSAVED.update(
+                filename=filename, key=key, entry_points=entry_points)
+    registry = {}
+    for group, name, value, dist_name in entry_points:
+        registry.setdefault(group, []).append(
+            _EntryPoint(name, value, group, dist_name))
+    return registry
+
+
+def _save_entry_point_registry(filename, key, entry_points):
+    """
+    Stores the scanned entry point registry on disk, errors are ignored.
+    """
+    cache = {'version': _ENTRY_POINT_REGISTRY_VERSION, 'key': key,
+             'entry_points': entry_points}
+    try:
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        with _atomic_write(filename) as fh:
+            json.dump(cache, fh)
+    except Exception:
+        pass
+
+
+def _clear_entry_point_registry():
+    """
+    Forget the entry point registry, e.g. after installing plugins at runtime.
+    The on-disk copy is updated automatically.
+    """
+    _ENTRY_POINT_REGISTRY.clear()
+    _ENTRY_POINT_REGISTRY_UNSAVED.clear()
+    _ENTRY_POINT_CACHE.clear()
+
+
 def buffered_load_entry_point(dist, group, name):
     """
     Return `name` entry point of `group` for `dist` or raise ImportError
@@ -600,29 +857,9 @@ def buffered_load_entry_point(dist, group, name):
     """
     hash_str = '/'.join([dist, group, name])
     if hash_str not in _ENTRY_POINT_CACHE:
-        if sys.version_info.minor < 10:
-            # compatibility workaround for Python 3.8 and 3.9
-            # on these versions, entry points don't have their distribution
-            # information attached to them, so we have to check if any matching
-            # entry point we find is listed in that distribution's entry point
-            # list
-            dist_eps = (importlib.metadata.distribution(group.split(".")[0])
-                        .entry_points)
-
-            eps = list(
-                ep for ep in
-                dist_eps if f'{group}:{name}' == f"{ep.group}:{ep.name}"
-            )
-            if not len(eps):
-                eps = list(
-                    ep for ep in
-                    dist_eps if f'{group}.{name}' == f"{ep.group}:{ep.name}"
-                )
-        else:
-            eps = list(
-                ep for ep in importlib.metadata.entry_points(
-                    group=group, name=name)
-                if ep.dist.name == dist)
+        eps = list(
+            ep for ep in _get_entry_point_registry(save=True).get(group, [])
+            if ep.name == name and ep.dist.name == dist)
         if len(set(eps)) > 1:
             warnings.warn(f'Multiple entry points matching:\n{eps!s}')
         elif not len(eps):
@@ -196,8 +196,10 @@ def _read_network(inventory_root, net_element):
 
     # There is no further information in the attributes of <network>
     # Start and end date are included as tags
-    network.start_date = _attr2obj(net_element, 'start', obspy.UTCDateTime)
-    network.end_date = _attr2obj(net_element, 'end', obspy.UTCDateTime)
+    network.start_date = _attr2obj(
+        net_element, 'start', obspy.UTCDateTime.from_iso8601)
+    network.end_date = _attr2obj(
+        net_element, 'end', obspy.UTCDateTime.from_iso8601)
     network.description = _attr2obj(net_element, 'description', str)
 
     # get the restricted_status (boolean)
@@ -249,10 +251,14 @@ def _read_station(inventory_root, sta_element):
 
     # There is no relevant info in the base node
     # Read the start and end date (creation, termination) from tags
-    station.start_date = _attr2obj(sta_element, "start", obspy.UTCDateTime)
-    station.end_date = _attr2obj(sta_element, "end", obspy.UTCDateTime)
-    station.creation_date = _attr2obj(sta_element, "start", obspy.UTCDateTime)
-    station.termination_date = _attr2obj(sta_element, "end", obspy.UTCDateTime)
+    station.start_date = _attr2obj(
+        sta_element, "start", obspy.UTCDateTime.from_iso8601)
+    station.end_date = _attr2obj(
+        sta_element, "end", obspy.UTCDateTime.from_iso8601)
+    station.creation_date = _attr2obj(
+        sta_element, "start", obspy.UTCDateTime.from_iso8601)
+    station.termination_date = _attr2obj(
+        sta_element, "end", obspy.UTCDateTime.from_iso8601)
 
     # get the restricted_status (boolean)
     # true is evaluated to 'open'; false to 'closed'
@@ -396,8 +402,10 @@ def _read_channel(inventory_root, cha_element):
 
     # There is no further information in the attributes of <stream>
     # Start and end date are included as tags instead
-    channel.start_date = _attr2obj(cha_element, "start", obspy.UTCDateTime)
-    channel.end_date = _attr2obj(cha_element, "end", obspy.UTCDateTime)
+    channel.start_date = _attr2obj(
+        cha_element, "start", obspy.UTCDateTime.from_iso8601)
+    channel.end_date = _attr2obj(
+        cha_element, "end", obspy.UTCDateTime.from_iso8601)
 
     # Determine sample rate (given is a numerator, denominator)
     # Assuming numerator is # samples and denominator is # seconds
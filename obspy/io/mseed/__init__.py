@@ -83,8 +83,8 @@ Write data back to disc or a file like object using the
 >>> st.write('Mini-SEED-filename.mseed', format='MSEED') #doctest: +SKIP
 
 You can also specify several keyword arguments that change the resulting
-Mini-SEED file: ``reclen``, ``encoding``, ``byteorder``, ``flush``,  and
-``verbose``.
+Mini-SEED file: ``reclen``, ``encoding``, ``byteorder``, ``flush``,
+``verbose`` and ``workers``.
 They are are passed to the :meth:`~obspy.io.mseed.core._write_mseed` method so
 refer to it for details to each parameter.
 
@@ -134,6 +134,10 @@ some purposes. Refer to the documentation of each for details.
 +----------------------------------------------------------+--------------------------------------------------------------------------+
 | :func:`~obspy.io.mseed.util.get_flags`                   | Returns information about the flags and timing quality in a file.        |
 +----------------------------------------------------------+--------------------------------------------------------------------------+
+| :func:`~obspy.io.mseed.util.get_record_headers`          | Returns the fixed header information of all records as a NumPy array.    |
++----------------------------------------------------------+--------------------------------------------------------------------------+
+| :func:`~obspy.io.mseed.util.unpack_steim`                | Decodes the Steim1/Steim2 compressed data of many records at once.       |
++----------------------------------------------------------+--------------------------------------------------------------------------+
 | :func:`~obspy.io.mseed.util.shift_time_of_file`          | Shifts the time of a file preserving all blockettes and flags.           |
 +----------------------------------------------------------+--------------------------------------------------------------------------+
 | :func:`~obspy.io.mseed.util.spread_time_over_file`       | Progressively spreads a time shift over all blockettes in a file.        |
@@ -142,6 +146,8 @@ some purposes. Refer to the documentation of each for details.
 +----------------------------------------------------------+--------------------------------------------------------------------------+
 | :func:`~obspy.io.mseed.util.set_flags_in_fixed_headers`  | Updates a given miniSEED file with some fixed header flags.              |
 +----------------------------------------------------------+--------------------------------------------------------------------------+
+| :func:`~obspy.io.mseed.index.build_index`                | Writes a record index file to quickly read time windows from a file.     |
++----------------------------------------------------------+--------------------------------------------------------------------------+
 """
 from obspy import ObsPyException, ObsPyReadingError
 
@@ -174,8 +180,11 @@ class ObsPyMSEEDFilesizeTooLargeError(ObsPyMSEEDReadingError):
     pass
 
 
+from .index import build_index  # NOQA
+
+
 __all__ = ['InternalMSEEDError', 'InternalMSEEDWarning', 'ObsPyMSEEDError',
-           'ObsPyMSEEDFilesizeTooSmallError']
+           'ObsPyMSEEDFilesizeTooSmallError', 'build_index']
 
 
 if __name__ == '__main__':
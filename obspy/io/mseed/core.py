@@ -2,6 +2,7 @@
 """
 MSEED bindings to ObsPy core module.
 """
+import concurrent.futures
 import ctypes as C  # NOQA
 import io
 import os
@@ -12,10 +13,12 @@ from struct import pack
 import numpy as np
 
 from obspy import Stream, Trace, UTCDateTime
+from obspy.core.trace import DeferredData
 from obspy.core.compatibility import from_buffer
 from obspy.core.util import NATIVE_BYTEORDER
 from . import (util, InternalMSEEDError, ObsPyMSEEDFilesizeTooSmallError,
                ObsPyMSEEDFilesizeTooLargeError, ObsPyMSEEDError)
+from .index import _read_index, _select_ranges
 from .headers import (DATATYPES, ENCODINGS, HPTERROR, HPTMODULUS, SAMPLETYPE,
                       SEED_CONTROL_HEADERS, UNSUPPORTED_ENCODINGS,
                       VALID_CONTROL_HEADERS, VALID_RECORD_LENGTHS, Selections,
@@ -142,7 +145,7 @@ def __is_mseed(fp, file_size):  # NOQA
 
 def _read_mseed(mseed_object, starttime=None, endtime=None, headonly=False,
                 sourcename=None, reclen=None, details=False,
-                header_byteorder=None, verbose=None, **kwargs):
+                header_byteorder=None, verbose=None, lazy=False, **kwargs):
     """
     Reads a Mini-SEED file and returns a Stream object.
 
@@ -188,6 +191,18 @@ def _read_mseed(mseed_object, starttime=None, endtime=None, headonly=False,
         little-endian, ``1`` or ``'>'`` for MBF or big-endian. ``'='`` is the
         native byte order. Used to enforce the header byte order. Useful in
         some rare cases where the automatic byte order detection fails.
+    :type lazy: bool, optional
+    :param lazy: If ``True`` and a file name is given, only the record headers
+        are read initially and the data of each trace is read and decoded on
+        first access of ``Trace.data``. Trimming or slicing a trace before
+        that restricts decoding to the records overlapping the remaining time
+        window. Compressed files are always decoded right away. Defaults to
+        ``False``.
+
+    If a file name is given together with ``starttime``, ``endtime`` or
+    ``sourcename`` and an up to date index file created with
+    :func:`~obspy.io.mseed.index.build_index` exists next to the file, only
+    the matching records are read from the file.
 
     .. rubric:: Example
 
@@ -224,9 +239,28 @@ def _read_mseed(mseed_object, starttime=None, endtime=None, headonly=False,
 
     >>> print(len(st))
     101
+
+    Read with ``lazy=True`` to defer decoding the data until it is needed.
+
+    >>> st = read("/path/to/two_channels.mseed", lazy=True)
+    >>> tr = st[0].slice(UTCDateTime("2010-06-20T00:00:01"),
+    ...                  UTCDateTime("2010-06-20T00:00:01.1"))
+    >>> print(tr.data[:5])
+    [ -19 -185 -181  -93 -131]
     """
     if isinstance(mseed_object, Path):
         mseed_object = str(mseed_object)
+    if lazy and not headonly and isinstance(mseed_object, str):
+        st = _read_mseed(
+            mseed_object, starttime=starttime, endtime=endtime,
+            headonly=True, sourcename=sourcename, reclen=reclen,
+            details=details, header_byteorder=header_byteorder,
+            verbose=verbose)
+        for tr in st:
+            tr.data = _MSEEDDeferredData(
+                mseed_object, tr, reclen=reclen, details=details,
+                header_byteorder=header_byteorder)
+        return st
     # Parse the headonly and reclen flags.
     if headonly is True:
         unpack_data = 0
@@ -306,8 +340,24 @@ def _read_mseed(mseed_object, starttime=None, endtime=None, headonly=False,
 
     # If it's a file name just read it.
     if isinstance(mseed_object, str):
-        # Read to NumPy array which is used as a buffer.
-        bfr_np = np.fromfile(mseed_object, dtype=np.int8)
+        bfr_np = None
+        if starttime is not None or endtime is not None or \
+                sourcename is not None:
+            # Only read the records matching the selection if the file is
+            # indexed.
+            bfr_np = _read_indexed_records(mseed_object, starttime, endtime,
+                                           sourcename)
+            if bfr_np is not None and not len(bfr_np):
+                return Stream()
+        if bfr_np is not None:
+            pass
+        elif headonly or starttime is not None or endtime is not None:
+            # Only a part of the file will be decoded, so just map it into
+            # memory instead of reading it completely.
+            bfr_np = np.memmap(mseed_object, dtype=np.int8, mode='r')
+        else:
+            # Read to NumPy array which is used as a buffer.
+            bfr_np = np.fromfile(mseed_object, dtype=np.int8)
     elif hasattr(mseed_object, 'read'):
         bfr_np = from_buffer(mseed_object.read(), dtype=np.int8)
 
@@ -495,8 +545,170 @@ def _read_mseed(mseed_object, starttime=None, endtime=None, headonly=False,
     return Stream(traces=traces)
 
 
+def _read_indexed_records(filename, starttime=None, endtime=None,
+                          sourcename=None):
+    """
+    Reads the records matching a selection using the index of a file.
+
+    :rtype: :class:`numpy.ndarray` or None
+    :returns: The matching records as an int8 buffer or ``None`` if there is
+        no valid index file for ``filename`` (see
+        :func:`~obspy.io.mseed.index.build_index`).
+    """
+    if (starttime is not None and not isinstance(starttime, UTCDateTime)) \
+            or (endtime is not None and
+                not isinstance(endtime, UTCDateTime)) \
+            or (sourcename is not None and not isinstance(sourcename, str)):
+        # leave the error handling to the regular code path
+        return None
+    index = _read_index(filename)
+    if index is None:
+        return None
+    # compare in the time resolution used by libmseed
+    if starttime is not None:
+        starttime = util._convert_datetime_to_mstime(starttime) * 10**3
+    if endtime is not None:
+        endtime = util._convert_datetime_to_mstime(endtime) * 10**3
+    ranges = _select_ranges(index, starttime=starttime, endtime=endtime,
+                            sourcename=sourcename)
+    if not ranges:
+        return np.empty(0, dtype=np.int8)
+    bfr_np = np.memmap(filename, dtype=np.int8, mode='r')
+    return np.concatenate([bfr_np[offset:offset + length]
+                           for offset, length in ranges])
+
+
+def _iter_read_mseed(filename, chunk=1000, chunk_length=None, starttime=None,
+                     endtime=None, **kwargs):
+    """
+    Reads a Mini-SEED file chunk by chunk and yields Stream objects.
+
+    .. warning::
+        This function should NOT be called directly, it registers via the
+        ObsPy :func:`~obspy.core.stream.iter_read` function, call this
+        instead.
+
+    The record headers are scanned with
+    :class:`~obspy.clients.filesystem.msriterator._MSRIterator` and runs of
+    consecutive records are decoded with :func:`_read_mseed`, so only a
+    single chunk of records is held in memory at any time. Records completely
+    outside of ``starttime`` and ``endtime`` are not read at all. The file
+    wide values in ``Trace.stats.mseed`` (e.g. ``number_of_records``) refer
+    to the chunk a trace was read from.
+
+    :type filename: str
+    :param filename: Mini-SEED file to be read.
+    :type chunk: int
+    :param chunk: Maximum number of records per yielded Stream.
+    :type chunk_length: float
+    :param chunk_length: Maximum difference in seconds between the start
+        times of the first and of the last record of a yielded Stream.
+    :type starttime: :class:`~obspy.core.utcdatetime.UTCDateTime`
+    :param starttime: Skip records ending before the start time.
+    :type endtime: :class:`~obspy.core.utcdatetime.UTCDateTime`
+    :param endtime: Skip records starting after the end time.
+    :param kwargs: Passed on to :func:`_read_mseed`.
+    """
+    from obspy.clients.filesystem.msriterator import _MSRIterator
+
+    start = starttime.timestamp if starttime is not None else None
+    end = endtime.timestamp if endtime is not None else None
+
+    with open(filename, 'rb') as fh:
+        def _read_chunk(ranges):
+            buf = io.BytesIO()
+            for offset, length in ranges:
+                fh.seek(offset, 0)
+                buf.write(fh.read(length))
+            buf.seek(0, 0)
+            return _read_mseed(buf, starttime=starttime, endtime=endtime,
+                               **kwargs)
+
+        # list of (offset, length) of contiguous byte ranges of the current
+        # chunk
+        ranges = []
+        count = 0
+        chunk_start = None
+        for msri in _MSRIterator(filename=str(filename)):
+            record_start = msri.get_startepoch()
+            if (end is not None and record_start > end) or \
+                    (start is not None and msri.get_endepoch() < start):
+                continue
+            if count and (count >= chunk or (
+                    chunk_length is not None and
+                    record_start - chunk_start >= chunk_length)):
+                yield _read_chunk(ranges)
+                ranges = []
+                count = 0
+            if not count:
+                chunk_start = record_start
+            offset = msri.offset
+            reclen = msri.msr.contents.reclen
+            if ranges and sum(ranges[-1]) == offset:
+                ranges[-1] = (ranges[-1][0], ranges[-1][1] + reclen)
+            else:
+                ranges.append((offset, reclen))
+            count += 1
+        if count:
+            yield _read_chunk(ranges)
+
+
+class _MSEEDDeferredData(DeferredData):
+    """
+    Data of a Mini-SEED trace that is decoded on first access.
+
+    Only the records overlapping the requested window are decoded, by reading
+    the file with a time window and SEED id selection and cutting the
+    matching samples out of the resulting trace.
+
+    :type filename: str
+    :param filename: Mini-SEED file the trace was read from.
+    :type trace: :class:`~obspy.core.trace.Trace`
+    :param trace: Trace read with ``headonly=True``.
+    """
+    def __init__(self, filename, trace, reclen=None, details=False,
+                 header_byteorder=None):
+        encodings = {v[0]: v[2] for v in ENCODINGS.values()}
+        super(_MSEEDDeferredData, self).__init__(
+            npts=trace.stats.npts,
+            dtype=encodings[trace.stats.mseed.encoding])
+        self.filename = filename
+        self.id = trace.id
+        self.starttime = trace.stats.starttime
+        self.sampling_rate = trace.stats.sampling_rate
+        self.reclen = reclen
+        self.details = details
+        self.header_byteorder = header_byteorder
+
+    def _load(self, start, stop):
+        delta = 1.0 / self.sampling_rate
+        starttime = self.starttime + start * delta
+        endtime = self.starttime + (stop - 1) * delta
+        st = _read_mseed(self.filename, starttime=starttime, endtime=endtime,
+                         sourcename=self.id, reclen=self.reclen,
+                         details=self.details,
+                         header_byteorder=self.header_byteorder)
+        npts = stop - start
+        for tr in st:
+            if tr.stats.sampling_rate != self.sampling_rate:
+                continue
+            offset = (starttime - tr.stats.starttime) * self.sampling_rate
+            index = int(round(offset))
+            # the decoded trace has to contain the window and has to have
+            # the same sampling points
+            if index < 0 or index + npts > tr.stats.npts or \
+                    abs(offset - index) > 1e-2:
+                continue
+            return tr.data[index:index + npts]
+        msg = ("Could not read the data of %s between %s and %s from file "
+               "'%s'. Did the file change?") % (
+                   self.id, starttime, endtime, self.filename)
+        raise ObsPyMSEEDError(msg)
+
+
 def _write_mseed(stream, filename, encoding=None, reclen=None, byteorder=None,
-                 sequence_number=None, flush=True, verbose=0, **_kwargs):
+                 sequence_number=None, flush=True, verbose=0, workers=None,
+                 **_kwargs):
     """
     Write Mini-SEED file from a Stream object.
 
@@ -538,6 +750,11 @@ def _write_mseed(stream, filename, encoding=None, reclen=None, byteorder=None,
     :type verbose: int, optional
     :param verbose: Controls verbosity, a value of ``0`` will result in no
         diagnostic output.
+    :type workers: int, optional
+    :param workers: Number of threads used to pack the traces. If larger than
+        one, the traces are compressed in parallel, the output is identical
+        to the output written with a single thread. Defaults to packing the
+        traces one after another.
 
     .. note::
         The ``reclen``, ``encoding``, ``byteorder`` and ``sequence_count``
@@ -828,131 +1045,175 @@ def _write_mseed(stream, filename, encoding=None, reclen=None, byteorder=None,
     if len(byteorders) != 1:
         warnings.warn(msg % 'byteorders')
 
+    # Skip empty traces.
+    traces = []
+    for trace, data, trace_attr in zip(stream, trace_data, trace_attributes):
+        if not len(data):
+            msg = 'Skipping empty trace "%s".' % (trace)
+            warnings.warn(msg)
+            continue
+        traces.append((trace, data, trace_attr, use_blkt_1001, flush,
+                       verbose))
+
     # Open filehandler or use an existing file like object.
     if not hasattr(filename, 'write'):
         f = open(filename, 'wb')
     else:
         f = filename
 
-    # Loop over every trace and finally write it to the filehandler.
-    for trace, data, trace_attr in zip(stream, trace_data, trace_attributes):
-        if not len(data):
-            msg = 'Skipping empty trace "%s".' % (trace)
-            warnings.warn(msg)
-            continue
-        # Create C struct MSTrace.
-        mst = MST(trace, data, dataquality=trace_attr['dataquality'])
-
-        # Initialize packedsamples pointer for the mst_pack function
-        packedsamples = C.c_int()
-
-        # Callback function for mst_pack to actually write the file
-        def record_handler(record, reclen, _stream):
-            f.write(record[0:reclen])
-        # Define Python callback function for use in C function
-        rec_handler = C.CFUNCTYPE(C.c_void_p, C.POINTER(C.c_char), C.c_int,
-                                  C.c_void_p)(record_handler)
-
-        # Fill up msr record structure, this is already contained in
-        # mstg, however if blk1001 is set we need it anyway
-        msr = clibmseed.msr_init(None)
-        msr.contents.network = trace.stats.network.encode('ascii', 'strict')
-        msr.contents.station = trace.stats.station.encode('ascii', 'strict')
-        msr.contents.location = trace.stats.location.encode('ascii', 'strict')
-        msr.contents.channel = trace.stats.channel.encode('ascii', 'strict')
-        msr.contents.dataquality = trace_attr['dataquality'].\
-            encode('ascii', 'strict')
+    # Pack every trace. In serial mode the records are streamed to the
+    # filehandler as they are packed, in parallel mode the records of each
+    # trace are written in order as soon as the trace has been packed.
+    if not workers or workers <= 1 or len(traces) < 2:
+        for args in traces:
+            _pack_trace(*args, write=f.write)
+    else:
+        for records in _pack_traces_parallel(traces, workers):
+            f.write(records)
+    # Close if its a file handler.
+    if not hasattr(filename, 'write'):
+        f.close()
+
+
+def _pack_traces_parallel(traces, workers):
+    """
+    Pack traces in a pool of threads.
+
+    Yields the packed records of each trace (see :func:`_pack_trace`) in the
+    order of the traces as soon as they are available.
+    """
+    with concurrent.futures.ThreadPoolExecutor(
+            max_workers=min(workers, len(traces))) as pool:
+        for records in pool.map(lambda args: _pack_trace(*args), traces):
+            yield records
+
 
-        # Set starting sequence number
-        msr.contents.sequence_number = trace_attr['sequence_number']
-
-        # Only use Blockette 1001 if necessary.
-        if use_blkt_1001:
-            # Timing quality has been set in trace_attr
-
-            size = C.sizeof(Blkt1001S)
-            # Only timing quality matters here, other blockette attributes will
-            # be filled by libmseed.msr_normalize_header
-            blkt_value = pack("BBBB", trace_attr['timing_quality'],
-                              0, 0, 0)
-            blkt_ptr = C.create_string_buffer(blkt_value, len(blkt_value))
-
-            # Usually returns a pointer to the added blockette in the
-            # blockette link chain and a NULL pointer if it fails.
-            # NULL pointers have a false boolean value according to the
-            # ctypes manual.
-            ret_val = clibmseed.msr_addblockette(msr, blkt_ptr,
-                                                 size, 1001, 0)
-
-            if bool(ret_val) is False:
-                clibmseed.msr_free(C.pointer(msr))
-                del msr
-                raise Exception('Error in msr_addblockette')
-
-        # Only use Blockette 100 if necessary.
-        # Determine if a blockette 100 will be needed to represent the input
-        # sample rate or if the sample rate in the fixed section of the data
-        # header will suffice (see ms_genfactmult in libmseed/genutils.c)
-        use_blkt_100 = False
-
-        _factor = C.c_int16()
-        _multiplier = C.c_int16()
-        _retval = clibmseed.ms_genfactmult(
-            trace.stats.sampling_rate, C.pointer(_factor),
-            C.pointer(_multiplier))
-        # Use blockette 100 if ms_genfactmult() failed.
-        if _retval != 0:
+def _pack_trace(trace, data, trace_attr, use_blkt_1001, flush, verbose,
+                write=None):
+    """
+    Pack a single trace into Mini-SEED records, see :func:`_write_mseed`.
+
+    If ``write`` is given, every record is passed to it as soon as it has
+    been packed and nothing is returned. Otherwise all records of the trace
+    are returned in a single buffer. libmseed releases the GIL while
+    packing, so that several traces can be packed in parallel threads.
+    """
+    # Create C struct MSTrace.
+    mst = MST(trace, data, dataquality=trace_attr['dataquality'])
+
+    # Initialize packedsamples pointer for the mst_pack function
+    packedsamples = C.c_int()
+
+    # Callback function for mst_pack to write or collect the records
+    records = None
+    if write is None:
+        records = bytearray()
+        write = records.extend
+
+    def record_handler(record, reclen, _stream):
+        write(C.string_at(record, reclen))
+    # Define Python callback function for use in C function
+    rec_handler = C.CFUNCTYPE(C.c_void_p, C.POINTER(C.c_char), C.c_int,
+                              C.c_void_p)(record_handler)
+
+    # Fill up msr record structure, this is already contained in
+    # mstg, however if blk1001 is set we need it anyway
+    msr = clibmseed.msr_init(None)
+    msr.contents.network = trace.stats.network.encode('ascii', 'strict')
+    msr.contents.station = trace.stats.station.encode('ascii', 'strict')
+    msr.contents.location = trace.stats.location.encode('ascii', 'strict')
+    msr.contents.channel = trace.stats.channel.encode('ascii', 'strict')
+    msr.contents.dataquality = trace_attr['dataquality'].\
+        encode('ascii', 'strict')
+
+    # Set starting sequence number
+    msr.contents.sequence_number = trace_attr['sequence_number']
+
+    # Only use Blockette 1001 if necessary.
+    if use_blkt_1001:
+        # Timing quality has been set in trace_attr
+
+        size = C.sizeof(Blkt1001S)
+        # Only timing quality matters here, other blockette attributes will
+        # be filled by libmseed.msr_normalize_header
+        blkt_value = pack("BBBB", trace_attr['timing_quality'],
+                          0, 0, 0)
+        blkt_ptr = C.create_string_buffer(blkt_value, len(blkt_value))
+
+        # Usually returns a pointer to the added blockette in the
+        # blockette link chain and a NULL pointer if it fails.
+        # NULL pointers have a false boolean value according to the
+        # ctypes manual.
+        ret_val = clibmseed.msr_addblockette(msr, blkt_ptr,
+                                             size, 1001, 0)
+
+        if bool(ret_val) is False:
+            clibmseed.msr_free(C.pointer(msr))
+            del msr
+            raise Exception('Error in msr_addblockette')
+
+    # Only use Blockette 100 if necessary.
+    # Determine if a blockette 100 will be needed to represent the input
+    # sample rate or if the sample rate in the fixed section of the data
+    # header will suffice (see ms_genfactmult in libmseed/genutils.c)
+    use_blkt_100 = False
+
+    _factor = C.c_int16()
+    _multiplier = C.c_int16()
+    _retval = clibmseed.ms_genfactmult(
+        trace.stats.sampling_rate, C.pointer(_factor),
+        C.pointer(_multiplier))
+    # Use blockette 100 if ms_genfactmult() failed.
+    if _retval != 0:
+        use_blkt_100 = True
+    # Otherwise figure out if ms_genfactmult() found exact factors.
+    # Otherwise write blockette 100.
+    else:
+        ms_sr = clibmseed.ms_nomsamprate(_factor.value, _multiplier.value)
+
+        # It is also necessary if the libmseed calculated sampling rate
+        # would result in a loss of accuracy - the floating point
+        # comparision is on purpose here as it will always try to
+        # preserve all accuracy.
+        # Cast to float32 to not add blockette 100 for values
+        # that cannot be represented with 32bits.
+        if np.float32(ms_sr) != np.float32(trace.stats.sampling_rate):
             use_blkt_100 = True
-        # Otherwise figure out if ms_genfactmult() found exact factors.
-        # Otherwise write blockette 100.
-        else:
-            ms_sr = clibmseed.ms_nomsamprate(_factor.value, _multiplier.value)
-
-            # It is also necessary if the libmseed calculated sampling rate
-            # would result in a loss of accuracy - the floating point
-            # comparision is on purpose here as it will always try to
-            # preserve all accuracy.
-            # Cast to float32 to not add blockette 100 for values
-            # that cannot be represented with 32bits.
-            if np.float32(ms_sr) != np.float32(trace.stats.sampling_rate):
-                use_blkt_100 = True
-
-        if use_blkt_100:
-            size = C.sizeof(Blkt100S)
-            blkt100 = C.c_char(b' ')
-            C.memset(C.pointer(blkt100), 0, size)
-            ret_val = clibmseed.msr_addblockette(
-                msr, C.pointer(blkt100), size, 100, 0)  # NOQA
-            # Usually returns a pointer to the added blockette in the
-            # blockette link chain and a NULL pointer if it fails.
-            # NULL pointers have a false boolean value according to the
-            # ctypes manual.
-            if bool(ret_val) is False:
-                clibmseed.msr_free(C.pointer(msr))  # NOQA
-                del msr  # NOQA
-                raise Exception('Error in msr_addblockette')
-
-        # Pack mstg into a MSEED file using the callback record_handler as
-        # write method.
-        errcode = clibmseed.mst_pack(
-            mst.mst, rec_handler, None, trace_attr['reclen'],
-            trace_attr['encoding'], trace_attr['byteorder'],
-            C.byref(packedsamples), flush, verbose, msr)  # NOQA
-
-        if errcode == 0:
-            msg = ("Did not write any data for trace '%s' even though it "
-                   "contains data values.") % trace
-            raise ValueError(msg)
-        if errcode == -1:
+
+    if use_blkt_100:
+        size = C.sizeof(Blkt100S)
+        blkt100 = C.c_char(b' ')
+        C.memset(C.pointer(blkt100), 0, size)
+        ret_val = clibmseed.msr_addblockette(
+            msr, C.pointer(blkt100), size, 100, 0)  # NOQA
+        # Usually returns a pointer to the added blockette in the
+        # blockette link chain and a NULL pointer if it fails.
+        # NULL pointers have a false boolean value according to the
+        # ctypes manual.
+        if bool(ret_val) is False:
             clibmseed.msr_free(C.pointer(msr))  # NOQA
-            del mst, msr  # NOQA
-            raise Exception('Error in mst_pack')
-        # Deallocate any allocated memory.
+            del msr  # NOQA
+            raise Exception('Error in msr_addblockette')
+
+    # Pack mstg into a MSEED file using the callback record_handler as
+    # write method.
+    errcode = clibmseed.mst_pack(
+        mst.mst, rec_handler, None, trace_attr['reclen'],
+        trace_attr['encoding'], trace_attr['byteorder'],
+        C.byref(packedsamples), flush, verbose, msr)  # NOQA
+
+    if errcode == 0:
+        msg = ("Did not write any data for trace '%s' even though it "
+               "contains data values.") % trace
+        raise ValueError(msg)
+    if errcode == -1:
         clibmseed.msr_free(C.pointer(msr))  # NOQA
         del mst, msr  # NOQA
-    # Close if its a file handler.
-    if not hasattr(filename, 'write'):
-        f.close()
+        raise Exception('Error in mst_pack')
+    # Deallocate any allocated memory.
+    clibmseed.msr_free(C.pointer(msr))  # NOQA
+    del mst, msr  # NOQA
+    return records
 
 
 class MST(object):
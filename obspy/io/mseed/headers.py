@@ -3,6 +3,7 @@
 Defines the libmseed structures and blockettes.
 """
 import ctypes as C  # NOQA
+import threading
 import warnings
 
 import numpy as np
@@ -443,6 +444,10 @@ MSTraceGroup = MstracegroupS  # noqa
 # Default modulus of 1000000 defines tick interval as a microsecond */
 HPTMODULUS = 1000000.0
 
+# Minimum and maximum Mini-SEED record length
+MINRECLEN = 128
+MAXRECLEN = 1048576
+
 
 # Reading Mini-SEED records from files
 class MsfileparamS(C.Structure):
@@ -763,44 +768,63 @@ class _LibmseedWrapper(object):
 
     Might be a bit overengineered but it does the trick and is completely
     transparent to the user.
+
+    libmseed's logging is hooked up once to callbacks that collect the
+    messages per thread, so the library can be called from several threads
+    at the same time (ctypes releases the GIL during the calls).
     """
     def __init__(self, lib):
         self.lib = lib
         self.verbose = True
-
-    def __getattr__(self, item):
-        func = getattr(self.lib, item)
-
-        def _wrapper(*args):
-            # Collect exceptions. They cannot be raised in the callback as
-            # they could never be caught then. They are collected and raised
-            # later on.
-            _errs = []
-            _warns = []
+        self._local = threading.local()
+        self._logging_lock = threading.Lock()
+        self._logging_callbacks = None
+
+    def _setup_logging(self):
+        """
+        Hooks up libmseed's logging facilities to the Python callbacks. The
+        callbacks are kept alive for the lifetime of the wrapper.
+        """
+        with self._logging_lock:
+            if self._logging_callbacks is not None:
+                return
 
             def log_error_or_warning(msg):
                 msg = msg.decode()
+                messages = getattr(self._local, "messages", None)
+                if messages is None:
+                    return
                 if msg.startswith("ERROR: "):
-                    msg = msg[7:].strip()
-                    _errs.append(msg)
+                    messages[0].append(msg[7:].strip())
                 if msg.startswith("INFO: "):
-                    msg = msg[6:].strip()
-                    _warns.append(msg)
-
-            diag_print = \
-                C.CFUNCTYPE(None, C.c_char_p)(log_error_or_warning)
+                    messages[1].append(msg[6:].strip())
 
             def log_message(msg):
                 if self.verbose:
                     print(msg[6:].strip())
-            log_print = C.CFUNCTYPE(None, C.c_char_p)(log_message)
 
-            # Hookup libmseed's logging facilities to it's Python callbacks.
+            diag_print = C.CFUNCTYPE(None, C.c_char_p)(log_error_or_warning)
+            log_print = C.CFUNCTYPE(None, C.c_char_p)(log_message)
             self.lib.setupLogging(diag_print, log_print)
+            self._logging_callbacks = (diag_print, log_print)
+
+    def __getattr__(self, item):
+        func = getattr(self.lib, item)
 
+        def _wrapper(*args):
+            # Collect exceptions. They cannot be raised in the callback as
+            # they could never be caught then. They are collected and raised
+            # later on.
+            if self._logging_callbacks is None:
+                self._setup_logging()
+            _errs = []
+            _warns = []
+            previous = getattr(self._local, "messages", None)
+            self._local.messages = (_errs, _warns)
             try:
                 return func(*args)
             finally:
+                self._local.messages = previous
                 for _w in _warns:
                     warnings.warn(_w, InternalMSEEDWarning)
                 if _errs:
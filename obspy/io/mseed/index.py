@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+"""
+Record level index files for Mini-SEED files.
+
+An index file stores the SEED id, start and end time, byte offset and length
+of every data record of a Mini-SEED file. It is written next to the indexed
+file (with an additional ``.msidx`` suffix) by :func:`build_index`.
+:func:`~obspy.core.stream.read` (and everything that uses it, e.g. the
+:class:`SDS client <obspy.clients.filesystem.sds.Client>`) then uses the
+index when reading a time window or a SEED id selection from a file and only
+reads the matching records instead of scanning all record headers.
+
+The index stores the size and the modification time of the indexed file. As
+soon as any of them changes the index is outdated and silently ignored until
+it is built again.
+
+:copyright:
+    The ObsPy Development Team (devs@obspy.org)
+:license:
+    GNU Lesser General Public License, Version 3
+    (https://www.gnu.org/copyleft/lesser.html)
+"""
+import fnmatch
+import os
+import struct
+
+import numpy as np
+
+from obspy.core.util.misc import _atomic_write
+
+
+INDEX_SUFFIX = '.msidx'
+
+# magic bytes, format version, size and modification time (in ns) of the
+# indexed file and number of records
+_HEADER = struct.Struct('<8sIqqq')
+_MAGIC = b'OBSMSIDX'
+_VERSION = 2
+
+# start and end time of the records are given in integer nanoseconds since
+# 1970-01-01, the end time is the time of the last sample of the record
+INDEX_DTYPE = np.dtype([
+    ('id', 'S16'),
+    ('quality', 'S1'),
+    ('starttime', '<i8'),
+    ('endtime', '<i8'),
+    ('offset', '<i8'),
+    ('reclen', '<i4'),
+])
+
+
+def _get_index_filename(filename):
+    """
+    Returns the name of the index file of a Mini-SEED file.
+    """
+    return str(filename) + INDEX_SUFFIX
+
+
+def build_index(filename, index_filename=None):
+    """
+    Builds a record level index file for a Mini-SEED file.
+
+    The index file is used automatically by :func:`~obspy.core.stream.read`
+    when reading a time window (``starttime``/``endtime``) or a SEED id
+    selection (``sourcename``) from the file. It has to be rebuilt whenever
+    the file is changed, outdated index files are ignored.
+
+    :type filename: str
+    :param filename: Mini-SEED file to index.
+    :type index_filename: str, optional
+    :param index_filename: Name of the index file. Defaults to the name of
+        the Mini-SEED file with an additional ``.msidx`` suffix, which is
+        where :func:`~obspy.core.stream.read` looks for it.
+    :rtype: str
+    :returns: Name of the written index file.
+
+    .. rubric:: Example
+
+    >>> from obspy import read, UTCDateTime
+    >>> from obspy.core.util import NamedTemporaryFile
+    >>> with NamedTemporaryFile() as tf:
+    ...     read().write(tf.name, format="MSEED")
+    ...     index_filename = build_index(tf.name)
+    ...     st = read(tf.name, starttime=UTCDateTime(2009, 8, 24, 0, 20, 10),
+    ...               sourcename="*.EHZ")
+    ...     os.remove(index_filename)
+    >>> print(st)  # doctest: +ELLIPSIS
+    1 Trace(s) in Stream:
+    BW.RJOB..EHZ | 2009-08-24T00:20:10.000000Z - ... | 100.0 Hz, 2300 samples
+    """
+    from obspy.clients.filesystem.msriterator import _MSRIterator
+    from obspy.io.mseed.headers import HPTMODULUS, clibmseed
+
+    filename = str(filename)
+    if index_filename is None:
+        index_filename = _get_index_filename(filename)
+    stat = os.stat(filename)
+
+    records = []
+    to_ns = 10 ** 9 // int(HPTMODULUS)
+    for msri in _MSRIterator(filename=filename):
+        msr = msri.msr.contents
+        seed_id = b'.'.join(
+            (msr.network, msr.station, msr.location, msr.channel))
+        records.append((
+            seed_id, msr.dataquality, msr.starttime * to_ns,
+            clibmseed.msr_endtime(msri.msr) * to_ns, msri.offset,
+            msr.reclen))
+    index = np.array(records, dtype=INDEX_DTYPE)
+
+    with _atomic_write(index_filename, mode='wb') as fh:
+        fh.write(_HEADER.pack(_MAGIC, _VERSION, stat.st_size,
+                              stat.st_mtime_ns, len(index)))
+        fh.write(index.tobytes())
+    return index_filename
+
+
+def _read_index(filename, index_filename=None):
+    """
+    Reads the index of a Mini-SEED file.
+
+    :type filename: str
+    :param filename: Mini-SEED file.
+    :type index_filename: str, optional
+    :param index_filename: Name of the index file, see :func:`build_index`.
+    :rtype: :class:`numpy.ndarray` or None
+    :returns: Structured array with ``INDEX_DTYPE`` with one entry per data
+        record or ``None`` if there is no index file or if it is outdated or
+        not readable.
+    """
+    if index_filename is None:
+        index_filename = _get_index_filename(filename)
+    try:
+        with open(index_filename, 'rb') as fh:
+            header = fh.read(_HEADER.size)
+            data = fh.read()
+        stat = os.stat(filename)
+    except OSError:
+        return None
+    if len(header) != _HEADER.size:
+        return None
+    magic, version, size, mtime_ns, count = _HEADER.unpack(header)
+    if magic != _MAGIC or version != _VERSION or \
+            size != stat.st_size or mtime_ns != stat.st_mtime_ns or \
+            len(data) != count * INDEX_DTYPE.itemsize:
+        return None
+    return np.frombuffer(data, dtype=INDEX_DTYPE)
+
+
+def _select_ranges(index, starttime=None, endtime=None, sourcename=None):
+    """
+    Returns the byte ranges of all records matching a selection.
+
+    Records are selected the same way libmseed selects them when reading,
+    i.e. records overlapping the time window (including its boundaries) with
+    a SEED id matching ``sourcename``.
+
+    :type index: :class:`numpy.ndarray`
+    :param index: Index as returned by :func:`_read_index`.
+    :type starttime: int
+    :param starttime: Start of the time window in nanoseconds.
+    :type endtime: int
+    :param endtime: End of the time window in nanoseconds.
+    :type sourcename: str
+    :param sourcename: SEED id, can contain wildcards. Matched the same way
+        as libmseed does when reading without an index, i.e. also matches
+        SEED ids starting with ``sourcename``.
+    :rtype: list of tuple of int
+    :returns: List of ``(offset, length)`` tuples of runs of consecutive
+        matching records.
+    """
+    mask = np.ones(len(index), dtype=bool)
+    if starttime is not None:
+        mask &= index['endtime'] >= starttime
+    if endtime is not None:
+        mask &= index['starttime'] <= endtime
+    if sourcename is not None:
+        # libmseed matches 'NET_STA_LOC_CHA_Q' source names
+        pattern = sourcename.replace('.', '_') + '_*'
+        srcnames = np.char.add(np.char.add(
+            np.char.replace(index['id'], b'.', b'_'), b'_'), index['quality'])
+        names = [name for name in np.unique(srcnames[mask])
+                 if fnmatch.fnmatchcase(name.decode(), pattern)]
+        mask &= np.isin(srcnames, names)
+    offsets = index['offset'][mask]
+    lengths = index['reclen'][mask].astype(np.int64)
+    ranges = []
+    for offset, length in zip(offsets.tolist(), lengths.tolist()):
+        if ranges and sum(ranges[-1]) == offset:
+            ranges[-1] = (ranges[-1][0], ranges[-1][1] + length)
+        else:
+            ranges.append((offset, length))
+    return ranges
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod(exclude_empty=True)
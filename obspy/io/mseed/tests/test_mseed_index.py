@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+import os
+import shutil
+
+import numpy as np
+import pytest
+
+from obspy import Stream, Trace, UTCDateTime, read
+from obspy.io.mseed import build_index
+from obspy.io.mseed.core import _read_indexed_records, _read_mseed
+from obspy.io.mseed.index import _get_index_filename, _read_index
+
+
+class TestMSEEDIndex():
+    """
+    Test record level index files of Mini-SEED files.
+    """
+    @pytest.fixture
+    def mseed_file(self, tmp_path):
+        """
+        Mini-SEED file with interleaved records of several channels.
+        """
+        t0 = UTCDateTime(2020, 1, 1)
+        st = Stream()
+        for i in range(6):
+            for channel in ('HHZ', 'HHN', 'BHZ'):
+                sampling_rate = 20.0 if channel[0] == 'B' else 100.0
+                npts = int(600 * sampling_rate)
+                data = np.arange(npts, dtype=np.int32) + i * npts
+                st.append(Trace(data=data, header=dict(
+                    network='XX', station='ABC', channel=channel,
+                    sampling_rate=sampling_rate, starttime=t0 + i * 600)))
+        filename = str(tmp_path / 'XX.ABC.mseed')
+        st.write(filename, format='MSEED', reclen=512)
+        return filename
+
+    def test_build_index(self, mseed_file):
+        """
+        The index contains one entry per record.
+        """
+        index_filename = build_index(mseed_file)
+        assert index_filename == mseed_file + '.msidx'
+        index = _read_index(mseed_file)
+        assert len(index) == os.path.getsize(mseed_file) // 512
+        np.testing.assert_array_equal(index['offset'],
+                                      np.arange(len(index)) * 512)
+        assert set(index['id']) == {
+            b'XX.ABC..HHZ', b'XX.ABC..HHN', b'XX.ABC..BHZ'}
+        assert index['starttime'][0] == UTCDateTime(2020, 1, 1).ns
+        assert (index['endtime'] >= index['starttime']).all()
+        # no temporary files are left behind and the index file is readable
+        # like any other file
+        assert sorted(os.listdir(os.path.dirname(mseed_file))) == [
+            'XX.ABC.mseed', 'XX.ABC.mseed.msidx']
+        if os.name == 'posix':
+            assert os.stat(index_filename).st_mode & 0o777 == \
+                os.stat(mseed_file).st_mode & 0o777
+
+    def test_read_with_index(self, mseed_file):
+        """
+        Reading with an index gives the same result as reading without one.
+        """
+        t0 = UTCDateTime(2020, 1, 1)
+        selections = [
+            dict(starttime=t0 + 1000, endtime=t0 + 1300),
+            dict(starttime=t0 + 1000, endtime=t0 + 1300,
+                 sourcename='XX.ABC..HHZ'),
+            dict(starttime=t0 + 3000),
+            dict(endtime=t0 + 10),
+            dict(sourcename='*.?HZ'),
+            dict(starttime=t0 + 1000, endtime=t0 + 1000),
+            dict(starttime=t0 + 4000),
+            dict(sourcename='XX.ABC..LHZ'),
+            # prefixes match like in libmseed
+            dict(sourcename='XX.ABC'),
+            dict(sourcename='XX.ABC..B*'),
+            dict(sourcename='XX.ABC..HHZ.D'),
+        ]
+        expected = [_read_mseed(mseed_file, **kwargs)
+                    for kwargs in selections]
+        build_index(mseed_file)
+        assert len(expected[8]) == 3
+        assert [tr.stats.channel for tr in expected[9]] == ['BHZ']
+        for kwargs, st in zip(selections, expected):
+            st2 = _read_mseed(mseed_file, **kwargs)
+            assert len(st) == len(st2)
+            for tr, tr2 in zip(st, st2):
+                assert tr.stats == tr2.stats
+                np.testing.assert_array_equal(tr.data, tr2.data)
+        # records of other channels and outside the time window are not
+        # read at all
+        st = read(mseed_file, starttime=t0 + 1000, endtime=t0 + 1300,
+                  sourcename='XX.ABC..HHZ')
+        buf = _read_indexed_records(mseed_file, t0 + 1000, t0 + 1300,
+                                    'XX.ABC..HHZ')
+        assert len(buf) == st[0].stats.mseed.number_of_records * 512
+        assert len(buf) < os.path.getsize(mseed_file) / 10
+
+    def test_outdated_index(self, mseed_file, tmp_path):
+        """
+        Index files are ignored once the indexed file changes.
+        """
+        build_index(mseed_file)
+        assert _read_index(mseed_file) is not None
+        # changed modification time
+        stat = os.stat(mseed_file)
+        os.utime(mseed_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        assert _read_index(mseed_file) is None
+        # changed size, with the index of a different file
+        build_index(mseed_file)
+        other = str(tmp_path / 'other.mseed')
+        read().write(other, format='MSEED')
+        shutil.copy(_get_index_filename(mseed_file),
+                    _get_index_filename(other))
+        assert _read_index(other) is None
+        st = read(other, sourcename='BW.RJOB..EHZ')
+        assert len(st) == 1
+        # broken index file
+        with open(_get_index_filename(mseed_file), 'wb') as fh:
+            fh.write(b'OBSMSIDX')
+        assert _read_index(mseed_file) is None
+        st = read(mseed_file, sourcename='XX.ABC..BHZ')
+        assert len(st) == 1
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 import copy
+import gzip
 import io
 import re
 import os
@@ -10,12 +11,14 @@ from struct import unpack
 import numpy as np
 import pytest
 
-from obspy import Stream, Trace, UTCDateTime, read
+from obspy import Stream, Trace, UTCDateTime, iter_read, read
 from obspy.core import AttribDict
 from obspy.core.compatibility import from_buffer
+from obspy.core.trace import DeferredData
 from obspy.core.util import CatchOutput, NamedTemporaryFile
 from obspy.io.mseed import (util, InternalMSEEDWarning,
                             InternalMSEEDError, ObsPyMSEEDError)
+import obspy.io.mseed.core as mseed_core
 from obspy.io.mseed.core import _is_mseed, _read_mseed, _write_mseed
 from obspy.io.mseed.headers import ENCODINGS, clibmseed
 from obspy.io.mseed.msstruct import _MSStruct
@@ -437,6 +440,88 @@ class TestMSEEDReadingAndWriting():
         st6 = _read_mseed(testfile, sourcename='*.BLA')
         assert len(st6) == 0
 
+    def test_read_lazy(self, testdata):
+        """
+        Reading with lazy=True only decodes the data on first access and
+        gives the same result as reading everything.
+        """
+        for filename in ['gaps.mseed', 'two_channels.mseed',
+                         'BW.BGLD.__.EHE.D.2008.001.first_10_records']:
+            testfile = testdata[filename]
+            st = _read_mseed(testfile)
+            st_lazy = _read_mseed(testfile, lazy=True)
+            for tr in st_lazy:
+                assert isinstance(tr._deferred_data, DeferredData)
+                assert 'data' not in tr.__dict__
+            assert len(st_lazy) == len(st)
+            assert [tr.stats.npts for tr in st_lazy] == \
+                [tr.stats.npts for tr in st]
+            # slicing does not decode anything
+            t1 = st[0].stats.starttime + 1.2
+            t2 = st[0].stats.endtime - 0.7
+            sliced = st_lazy.slice(t1, t2)
+            assert 'data' not in sliced[0].__dict__
+            assert sliced == st.slice(t1, t2)
+            # the original traces are still untouched
+            assert 'data' not in st_lazy[0].__dict__
+            assert st_lazy == st
+        # start and end time are handled the same way
+        testfile = testdata['BW.BGLD.__.EHE.D.2008.001.first_10_records']
+        t = UTCDateTime('2008-01-01T00:00:05.123')
+        assert read(testfile, starttime=t, endtime=t + 3, lazy=True) == \
+            read(testfile, starttime=t, endtime=t + 3)
+
+    def test_read_lazy_compressed(self, testdata, tmp_path):
+        """
+        Compressed files are decoded right away when read with lazy=True as
+        the temporary decompressed file is removed after reading.
+        """
+        testfile = testdata['two_channels.mseed']
+        filename = str(tmp_path / 'two_channels.mseed.gz')
+        with open(testfile, 'rb') as fh, gzip.open(filename, 'wb') as fh2:
+            fh2.write(fh.read())
+        st = read(filename, lazy=True)
+        for tr in st:
+            assert 'data' in tr.__dict__
+        assert st == read(testfile)
+
+    def test_iter_read(self, testdata):
+        """
+        Reading chunk by chunk with iter_read() yields the records in order,
+        merging all chunks gives the same traces as reading everything.
+        """
+        for filename in ['gaps.mseed', 'two_channels.mseed',
+                         'BW.BGLD.__.EHE.D.2008.001.first_10_records']:
+            testfile = testdata[filename]
+            st = read(testfile)
+            st.merge(-1)
+            # the file wide values refer to the chunks
+            for tr in st:
+                tr.stats.pop('mseed')
+            for kwargs in [dict(chunk=1), dict(chunk=3),
+                           dict(chunk_length=10.0)]:
+                chunks = list(iter_read(testfile, **kwargs))
+                if kwargs.get('chunk') == 1:
+                    # a single record never contains more than one trace
+                    assert all(len(chunk) == 1 for chunk in chunks)
+                st_iter = Stream([tr for chunk in chunks for tr in chunk])
+                st_iter.merge(-1)
+                for tr in st_iter:
+                    assert tr.stats._format == 'MSEED'
+                    tr.stats.pop('mseed')
+                assert st_iter == st
+        # records outside of start and end time are skipped
+        testfile = testdata['BW.BGLD.__.EHE.D.2008.001.first_10_records']
+        t = UTCDateTime('2008-01-01T00:00:05.123')
+        chunks = list(iter_read(testfile, chunk=1, starttime=t,
+                                endtime=t + 3))
+        assert len(chunks) == 2
+        st = read(testfile, starttime=t, endtime=t + 3)
+        st_iter = Stream([tr for chunk in chunks for tr in chunk])
+        st_iter.merge(-1)
+        assert st_iter[0].stats.starttime == st[0].stats.starttime
+        np.testing.assert_array_equal(st_iter[0].data, st[0].data)
+
     def test_write_integers(self):
         """
         Write integer array via L{obspy.io.mseed.mseed._write_mseed}.
@@ -1099,6 +1184,40 @@ class TestMSEEDReadingAndWriting():
             with pytest.warns(UserWarning):
                 st.write(tempfile, format="MSEED")
 
+    @pytest.mark.parametrize('workers', [2, 4])
+    def test_write_with_workers(self, workers, monkeypatch):
+        """
+        Packing the traces in multiple threads gives exactly the same output
+        as writing them one after another.
+        """
+        st = read()
+        st += read()
+        st[3].data = st[3].data.astype(np.int32)
+        st[4].data = np.require(st[4].data, dtype='>f8')
+        st.append(Trace(data=np.array([], dtype=np.int32)))
+        for kwargs in [{}, dict(reclen=512), dict(byteorder='<')]:
+            buf = io.BytesIO()
+            with pytest.warns(UserWarning, match='empty'):
+                st.write(buf, format='MSEED', **kwargs)
+            buf2 = io.BytesIO()
+            with pytest.warns(UserWarning, match='empty'):
+                st.write(buf2, format='MSEED', workers=workers, **kwargs)
+            assert buf.getvalue() == buf2.getvalue()
+        # errors while packing a trace are raised from the worker threads
+        pack_trace = mseed_core._pack_trace
+
+        def _pack_trace(trace, *args):
+            if trace.stats.station == 'FAIL':
+                raise ValueError('packing failed')
+            return pack_trace(trace, *args)
+
+        monkeypatch.setattr(mseed_core, '_pack_trace', _pack_trace)
+        st = Stream([Trace(data=np.arange(10, dtype=np.int32))
+                     for _ in range(10)])
+        st[3].stats.station = 'FAIL'
+        with pytest.raises(ValueError, match='packing failed'):
+            st.write(io.BytesIO(), format='MSEED', workers=workers)
+
     def test_read_timing_qual(self, testdata):
         """
         Read timing quality via L{obspy.core.Stream}.
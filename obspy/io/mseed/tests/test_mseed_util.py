@@ -604,6 +604,81 @@ class TestMSEEDUtil():
         data_record = _read_mseed(steim2_file)[0].data
         np.testing.assert_array_equal(data, data_record)
 
+    def test_unpack_steim(self, testdata, datapath):
+        """
+        Test batch decompression of the Steim frames of many records
+        against libmseed.
+        """
+        def get_steim_frames(filename):
+            headers = util.get_record_headers(filename)
+            raw = np.fromfile(filename, dtype=np.uint8)
+            frames = []
+            for h in headers:
+                record = raw[h['offset']:h['offset'] + h['record_length']]
+                data_offset = record[44:46].view(h['byteorder'] + 'u2')[0]
+                frames.append(record[data_offset:])
+            return (np.concatenate(frames), headers['npts'],
+                    [len(f) // 64 for f in frames], headers['byteorder'][0])
+
+        # Steim1, Steim2 and Steim2 with little endian data
+        for filename, steim in [
+                (testdata['BW.BGLD.__.EHE.D.2008.001.first_10_records'], 1),
+                (testdata['steim2.mseed'], 2),
+                (datapath / 'bizarre' / 'endiantest.le-header.le-data.mseed',
+                 2)]:
+            filename = str(filename)
+            data, npts, frames, byteorder = get_steim_frames(filename)
+            got = util.unpack_steim(data, npts, frames=frames, steim=steim,
+                                    byteorder=byteorder)
+            np.testing.assert_array_equal(got, _read_mseed(filename)[0].data)
+
+        # All kinds of differences, up to the largest ones that can be
+        # encoded
+        for steim, bits in ((1, 30), (2, 28)):
+            data = np.concatenate([
+                np.random.randint(-2 ** i, 2 ** i, 500, dtype=np.int32)
+                for i in (bits, 14, 7, 4, 2)])
+            tr = Trace(data=data)
+            with NamedTemporaryFile() as tf:
+                tr.write(tf.name, format='MSEED', reclen=256,
+                         encoding='STEIM%d' % steim)
+                frames, npts, _, _ = get_steim_frames(tf.name)
+            assert len(npts) > 10
+            np.testing.assert_array_equal(
+                util.unpack_steim(frames, npts, steim=steim), tr.data)
+
+    def test_unpack_steim_errors(self, testdata):
+        """
+        Test errors and warnings of batch Steim decompression.
+        """
+        filename = testdata['BW.BGLD.__.EHE.D.2008.001.first_10_records']
+        raw = np.fromfile(filename, dtype=np.uint8).reshape(10, 512)
+        frames = raw[:, 64:].copy()
+        with pytest.raises(ValueError, match='Unsupported Steim'):
+            util.unpack_steim(frames, [412] * 10, steim=3)
+        with pytest.raises(ValueError, match='Can not split'):
+            util.unpack_steim(frames, [412] * 3)
+        with pytest.raises(ValueError, match='too small'):
+            util.unpack_steim(frames, [412] * 10, frames=8)
+        with pytest.raises(ValueError, match=r'decoded \(412\) does not '
+                           r'match .* \(413\) of record 9'):
+            util.unpack_steim(frames, [412] * 9 + [413])
+        # fewer samples than encoded are decoded, the last sample does not
+        # match the reverse integration constant then
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter('always')
+            data = util.unpack_steim(frames, [412] * 9 + [100])
+        assert len(data) == 3808
+        assert 'Steim1 failed in record 9' in str(w[0].message)
+        # wrong reverse integration constant of the fourth record
+        frames[3, 8:12] = 0
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter('always')
+            data = util.unpack_steim(frames, [412] * 10)
+        assert len(w) == 1
+        assert 'Steim1 failed in record 3, Last sample=' in str(w[0].message)
+        np.testing.assert_array_equal(data, _read_mseed(filename)[0].data)
+
     def test_time_shifting(self, testdata):
         """
         Tests the shift_time_of_file() function.
@@ -1307,3 +1382,93 @@ class TestMSEEDUtil():
         msg = "No MiniSEED data record found in file."
         with pytest.raises(ValueError, match=msg):
             _read_mseed(buf)
+
+    def test_get_record_headers(self, testdata):
+        """
+        Compares the vectorized header scan with reading every record with
+        libmseed.
+        """
+        from obspy.clients.filesystem.msriterator import _MSRIterator
+        from obspy.io.mseed.headers import HPTMODULUS, clibmseed
+        to_ns = 10 ** 9 // int(HPTMODULUS)
+        for name in ['BW.BGLD.__.EHE.D.2008.001.first_10_records',
+                     'test.mseed', 'timingquality.mseed',
+                     'RJOB.BW.EHZ.D.300806.0000.fullseed',
+                     'various_noise_records.mseed']:
+            filename = str(testdata[name])
+            headers = util.get_record_headers(filename)
+            expected = []
+            for msri in _MSRIterator(filename=filename):
+                msr = msri.msr.contents
+                expected.append((
+                    msri.offset, msr.reclen, msr.network.decode(),
+                    msr.station.decode(), msr.channel.decode(),
+                    msr.starttime * to_ns,
+                    clibmseed.msr_endtime(msri.msr) * to_ns,
+                    msr.samplecnt, msr.samprate))
+            got = [(h['offset'], h['record_length'], h['network'],
+                    h['station'], h['channel'], h['starttime'],
+                    h['endtime'], h['npts'], h['samp_rate'])
+                   for h in headers]
+            assert got == expected
+            # file-like objects give the same result
+            with open(filename, 'rb') as fh:
+                np.testing.assert_array_equal(
+                    util.get_record_headers(fh), headers)
+
+    def test_get_record_headers_different_record_lengths(self):
+        """
+        Files with different record lengths are scanned record by record.
+        """
+        st = Stream([Trace(data=np.arange(3000, dtype=np.int32)),
+                     Trace(data=np.arange(5000, dtype=np.int32))])
+        st[1].stats.station = 'B'
+        with io.BytesIO() as buf:
+            st[:1].write(buf, format='MSEED', reclen=512)
+            st[1:].write(buf, format='MSEED', reclen=4096)
+            buf.seek(0)
+            headers = util.get_record_headers(buf)
+            buf.seek(0)
+            st2 = _read_mseed(buf, details=True)
+        assert set(headers['record_length'][headers['station'] == '']) == \
+            {512}
+        assert set(headers['record_length'][headers['station'] == 'B']) == \
+            {4096}
+        assert headers['npts'].sum() == 8000
+        np.testing.assert_array_equal(
+            np.diff(headers['offset']), headers['record_length'][:-1])
+        assert [tr.stats.mseed.number_of_records for tr in st2] == \
+            [np.sum(headers['station'] == sta) for sta in ('', 'B')]
+
+    def test_get_record_headers_tail(self, testdata):
+        """
+        Only decoding the last records of a file.
+        """
+        for name in ['timingquality.mseed', 'various_noise_records.mseed']:
+            filename = str(testdata[name])
+            headers = util.get_record_headers(filename)
+            for tail in (0, 1, 5, len(headers), len(headers) + 10):
+                np.testing.assert_array_equal(
+                    util.get_record_headers(filename, tail=tail),
+                    headers[max(len(headers) - tail, 0):])
+
+    def test_get_record_headers_empty(self):
+        """
+        Empty files or files without data records give an empty array.
+        """
+        with NamedTemporaryFile() as tf:
+            assert len(util.get_record_headers(tf.name)) == 0
+            flags = util.get_flags(tf.name)
+        assert flags['record_count'] == 0
+        assert flags['number_of_records_used'] == 0
+        assert len(util.get_record_headers(io.BytesIO(b'\x00' * 4096))) == 0
+
+    def test_get_flags_no_record_in_time_window(self, testdata):
+        """
+        Selecting a time window without any records does not raise.
+        """
+        flags = util.get_flags(testdata['timingquality.mseed'],
+                               starttime=UTCDateTime(2020, 1, 1))
+        assert flags['record_count'] == 0
+        assert flags['number_of_records_used'] == 0
+        assert flags['timing_quality'] == {}
@@ -16,12 +16,13 @@ import numpy as np
 from obspy import UTCDateTime
 from obspy.core.compatibility import from_buffer
 from obspy.core.util.decorator import ObsPyDeprecationWarning
-from . import InternalMSEEDParseTimeError
+from . import (InternalMSEEDError, InternalMSEEDParseTimeError,
+               InternalMSEEDWarning)
 from .headers import (ENCODINGS, ENDIAN, FIXED_HEADER_ACTIVITY_FLAGS,
                       FIXED_HEADER_DATA_QUAL_FLAGS,
-                      FIXED_HEADER_IO_CLOCK_FLAGS, HPTMODULUS,
-                      SAMPLESIZES, UNSUPPORTED_ENCODINGS, MSRecord,
-                      MS_NOERROR, clibmseed)
+                      FIXED_HEADER_IO_CLOCK_FLAGS, HPTMODULUS, MAXRECLEN,
+                      MINRECLEN, SAMPLESIZES, UNSUPPORTED_ENCODINGS,
+                      clibmseed)
 
 
 def get_start_and_end_time(file_or_file_object):
@@ -93,6 +94,317 @@ def get_start_and_end_time(file_or_file_object):
     return starttime, endtime
 
 
+# Fields of the structured array returned by get_record_headers()
+_RECORD_HEADER_DTYPE = np.dtype([
+    ('offset', np.int64),
+    ('record_length', np.int32),
+    ('network', 'U2'),
+    ('station', 'U5'),
+    ('location', 'U2'),
+    ('channel', 'U3'),
+    ('dataquality', 'U1'),
+    ('byteorder', 'U1'),
+    ('starttime', np.int64),
+    ('endtime', np.int64),
+    ('npts', np.int32),
+    ('samp_rate', np.float64),
+    ('encoding', np.int16),
+    ('activity_flags', np.uint8),
+    ('io_and_clock_flags', np.uint8),
+    ('data_quality_flags', np.uint8),
+    ('time_correction', np.int32),
+    ('timing_quality', np.int16),
+])
+
+
+def get_record_headers(file_or_file_object, tail=None):
+    """
+    Returns the fixed header information of all data records of a MiniSEED
+    file as a structured NumPy array.
+
+    All record headers are decoded at once with NumPy instead of record by
+    record. Usually all records of a file have the same record length in
+    which case the records are located with a single pass, otherwise every
+    record is located with libmseed first. Leading SEED control headers and
+    noise records are skipped.
+
+    :type file_or_file_object: str, :class:`~pathlib.Path` or file
+    :param file_or_file_object: MiniSEED file name or open file-like object.
+        File-like objects are read from their current position.
+    :type tail: int
+    :param tail: Only return the headers of the last ``tail`` records. If
+        all records have the same length, only the first and the last
+        records of a file are accessed, e.g. to quickly determine the end of
+        the data in a file that is continuously appended to.
+    :rtype: :class:`numpy.ndarray`
+    :returns: Structured array with one entry per data record and the
+        following fields:
+
+        * ``offset``: Byte offset of the record.
+        * ``record_length``: Length of the record in bytes.
+        * ``network``, ``station``, ``location``, ``channel``: SEED codes.
+        * ``dataquality``: Data quality indicator (``D``, ``R``, ``Q`` or
+          ``M``).
+        * ``byteorder``: Byte order of the header, ``<`` or ``>``.
+        * ``starttime``: Time of the first sample in nanoseconds since
+          1970-01-01, with time correction and Blockette 1001 microseconds
+          applied the same way as libmseed does.
+        * ``endtime``: Time of the last sample in nanoseconds since
+          1970-01-01.
+        * ``npts``: Number of samples.
+        * ``samp_rate``: Sampling rate, from Blockette 100 if present.
+        * ``encoding``: Encoding from Blockette 1000 or ``-1``.
+        * ``activity_flags``, ``io_and_clock_flags``,
+          ``data_quality_flags``: Flag bytes of the fixed header.
+        * ``time_correction``: Time correction in units of 0.0001 seconds.
+        * ``timing_quality``: Timing quality from Blockette 1001 or ``-1``.
+
+    .. rubric:: Example
+
+    >>> from obspy.core import UTCDateTimeArray
+    >>> from obspy.core.util import get_example_file
+    >>> filename = get_example_file("timingquality.mseed")
+    >>> headers = get_record_headers(filename)
+    >>> print(len(headers))
+    101
+    >>> print(headers[0]['network'], headers[0]['station'],
+    ...       headers[0]['record_length'], headers[0]['timing_quality'])
+    BW BGLD 512 55
+    >>> print(UTCDateTimeArray(ns=headers['starttime'][:2]))
+    ['2007-12-31T23:59:59.765000Z' '2008-01-01T00:00:01.825000Z']
+    """
+    if isinstance(file_or_file_object, (str, Path)):
+        if not os.path.getsize(file_or_file_object):
+            return np.empty(0, dtype=_RECORD_HEADER_DTYPE)
+        bfr_np = np.memmap(file_or_file_object, dtype=np.int8, mode='r')
+    else:
+        bfr_np = from_buffer(file_or_file_object.read(), dtype=np.int8)
+
+    size = len(bfr_np)
+    bfr_u8 = bfr_np.view(np.uint8)
+    # Skip everything that is not a data record in steps of the smallest
+    # possible record length.
+    offset = 0
+    while offset + 48 <= size:
+        reclen = _detect_record_length(bfr_np, offset)
+        if reclen > 0:
+            break
+        offset += MINRECLEN
+    else:
+        return np.empty(0, dtype=_RECORD_HEADER_DTYPE)
+
+    # Usually all records have the same length so their offsets are known
+    # once the length of the first record is known. Check all of them at
+    # once.
+    if (size - offset) % reclen == 0:
+        offsets = np.arange(offset, size, reclen, dtype=np.int64)
+        if tail is not None:
+            offsets = offsets[max(len(offsets) - tail, 0):]
+        reclens = np.full(len(offsets), reclen, dtype=np.int64)
+        headers = _parse_record_headers(bfr_u8, offsets, reclens, check=True)
+        if headers is not None:
+            return headers
+
+    # Otherwise every record has to be located on its own.
+    offsets = []
+    reclens = []
+    while offset + 48 <= size:
+        reclen = _detect_record_length(bfr_np, offset)
+        if reclen > 0:
+            offsets.append(offset)
+            reclens.append(reclen)
+            offset += reclen
+        else:
+            offset += MINRECLEN
+    if tail is not None:
+        offsets = offsets[max(len(offsets) - tail, 0):]
+        reclens = reclens[max(len(reclens) - tail, 0):]
+    return _parse_record_headers(bfr_u8, np.array(offsets, dtype=np.int64),
+                                 np.array(reclens, dtype=np.int64))
+
+
+def _detect_record_length(bfr_np, offset):
+    """
+    Returns the length of the data record at the given offset of a buffer or
+    -1 if there is no complete data record.
+    """
+    record = bfr_np[offset:offset + MAXRECLEN]
+    try:
+        reclen = clibmseed.ms_detect(record, len(record))
+    except InternalMSEEDError:
+        # e.g. an invalid blockette chain
+        return -1
+    # The record length of the last record can not be detected without a
+    # Blockette 1000, it then covers the rest of the buffer.
+    if reclen == 0 and len(record) in [2 ** _i for _i in range(7, 21)]:
+        reclen = len(record)
+    if reclen <= 0 or offset + reclen > len(bfr_np):
+        return -1
+    return reclen
+
+
+def _get_header_values(raw, dtype, swap):
+    """
+    Decodes values from the rows of a 2D uint8 array of raw bytes, swapping
+    the byte order of the rows where ``swap`` is set.
+    """
+    raw = np.ascontiguousarray(raw)
+    dtype = np.dtype(dtype)
+    values = raw.view(dtype.newbyteorder('>')).ravel()
+    if dtype.itemsize > 1:
+        swapped = raw.view(dtype.newbyteorder('<')).ravel()
+        values = np.where(swap, swapped, values)
+    return values.astype(dtype.newbyteorder('='))
+
+
+def _get_header_codes(name, raw):
+    """
+    Decodes the SEED codes stored in the rows of a 2D uint8 array of raw
+    bytes.
+    """
+    width = raw.shape[1]
+    codes = np.ascontiguousarray(raw).view('S%d' % width).ravel()
+    unique, inverse = np.unique(codes, return_inverse=True)
+    decoded = [_decode_header_field(name, code.strip()) for code in unique]
+    return np.array(decoded, dtype='U%d' % width)[inverse.ravel()]
+
+
+def _parse_record_headers(bfr_np, offsets, reclens, check=False):
+    """
+    Decodes the fixed headers and the Blockettes 100, 1000 and 1001 of the
+    data records with the given offsets and lengths of an uint8 buffer at
+    once.
+
+    If ``check`` is ``True``, ``None`` is returned if not all of the offsets
+    point to valid data record headers with a matching record length.
+    """
+    headers = np.zeros(len(offsets), dtype=_RECORD_HEADER_DTYPE)
+    if not len(offsets):
+        return headers
+    raw = bfr_np[offsets[:, np.newaxis] + np.arange(48)]
+
+    if check:
+        # Same checks as libmseed's MS_ISVALIDHEADER macro.
+        seq = raw[:, :6]
+        valid = ((seq >= ord('0')) & (seq <= ord('9')) | (seq == ord(' ')) |
+                 (seq == 0)).all(axis=1)
+        valid &= np.isin(raw[:, 6], np.frombuffer(b'DRQM', dtype=np.uint8))
+        valid &= (raw[:, 7] == ord(' ')) | (raw[:, 7] == 0)
+        valid &= (raw[:, 24] <= 23) & (raw[:, 25] <= 59) & (raw[:, 26] <= 60)
+        if not valid.all():
+            return None
+
+    # Same byte order detection as libmseed, based on a sane year and day.
+    year = _get_header_values(raw[:, 20:22], np.uint16, False)
+    julday = _get_header_values(raw[:, 22:24], np.uint16, False)
+    swap = ~((year >= 1900) & (year <= 2100) & (julday >= 1) &
+             (julday <= 366))
+
+    def values(start, dtype):
+        return _get_header_values(
+            raw[:, start:start + np.dtype(dtype).itemsize], dtype, swap)
+
+    headers['offset'] = offsets
+    headers['station'] = _get_header_codes('station', raw[:, 8:13])
+    headers['location'] = _get_header_codes('location', raw[:, 13:15])
+    headers['channel'] = _get_header_codes('channel', raw[:, 15:18])
+    headers['network'] = _get_header_codes('network', raw[:, 18:20])
+    headers['dataquality'] = raw[:, 6].view('S1').astype('U1')
+    headers['byteorder'] = np.where(swap, '<', '>')
+    headers['npts'] = values(30, np.uint16)
+    headers['activity_flags'] = raw[:, 36]
+    headers['io_and_clock_flags'] = raw[:, 37]
+    headers['data_quality_flags'] = raw[:, 38]
+    headers['time_correction'] = values(40, np.int32)
+    headers['record_length'] = reclens
+    headers['encoding'] = -1
+    headers['timing_quality'] = -1
+
+    # Nominal sample rate, calculated like libmseed does.
+    factor = values(32, np.int16).astype(np.float64)
+    multiplier = values(34, np.int16).astype(np.float64)
+    with np.errstate(divide='ignore'):
+        samp_rate = np.where(factor > 0, factor,
+                             np.where(factor < 0, -1.0 / factor, 0.0))
+        samp_rate = np.where(
+            multiplier > 0, samp_rate * multiplier,
+            np.where(multiplier < 0, -1.0 * (samp_rate / multiplier),
+                     samp_rate))
+
+    # Follow the blockette chains of all records at once.
+    microseconds = np.zeros(len(offsets), dtype=np.int64)
+    blkt_count = np.zeros(len(offsets), dtype=np.int64)
+    blkt_offset = values(46, np.uint16).astype(np.int64)
+    active = np.nonzero(blkt_offset)[0]
+    while len(active):
+        position = offsets[active] + blkt_offset[active]
+        # blockette type and offset of the next blockette
+        in_buffer = position + 8 <= len(bfr_np)
+        active = active[in_buffer]
+        position = position[in_buffer]
+        blkt = bfr_np[position[:, np.newaxis] + np.arange(8)]
+        blkt_swap = swap[active]
+        blkt_count[active] += 1
+        blkt_type = _get_header_values(blkt[:, 0:2], np.uint16, blkt_swap)
+        next_blkt = _get_header_values(
+            blkt[:, 2:4], np.uint16, blkt_swap).astype(np.int64)
+
+        index = blkt_type == 1000
+        headers['encoding'][active[index]] = blkt[index, 4]
+        if check and (2 ** blkt[index, 6].astype(np.int64) !=
+                      reclens[active[index]]).any():
+            return None
+        index = blkt_type == 1001
+        headers['timing_quality'][active[index]] = blkt[index, 4]
+        microseconds[active[index]] = blkt[index, 5].view(np.int8)
+        index = blkt_type == 100
+        samp_rate[active[index]] = _get_header_values(
+            blkt[index, 4:8], np.float32, blkt_swap[index])
+
+        # Stop at the end of a chain or at invalid offsets.
+        valid = next_blkt - 4 > blkt_offset[active]
+        blkt_offset[active] = np.where(valid, next_blkt, 0)
+        active = active[valid]
+    headers['samp_rate'] = samp_rate
+
+    # Same sanity check as libmseed does when parsing a record.
+    msg = ("%s_%s_%s_%s_%s: Warning: Number of blockettes in fixed header "
+           "(%d) does not match the number parsed (%d)")
+    messages = []
+    for i in np.nonzero(raw[:, 39] != blkt_count)[0]:
+        h = headers[i]
+        message = msg % (h['network'], h['station'], h['location'],
+                         h['channel'], h['dataquality'], raw[i, 39],
+                         blkt_count[i])
+        if message not in messages:
+            messages.append(message)
+    for message in messages:
+        warnings.warn(message, InternalMSEEDWarning)
+
+    # Start time of the records in integer nanoseconds.
+    days = (values(20, np.uint16).astype(np.int64) - 1970).astype(
+        'datetime64[Y]').astype('datetime64[D]').astype(np.int64)
+    days += values(22, np.uint16) - 1
+    seconds = ((days * 24 + raw[:, 24]) * 60 + raw[:, 25]) * 60 + raw[:, 26]
+    starttime = seconds * 10 ** 9 + \
+        values(28, np.uint16).astype(np.int64) * 10 ** 5
+    time_correction = headers['time_correction'].astype(np.int64)
+    time_correction[headers['activity_flags'] & 2 != 0] = 0
+    starttime += time_correction * 10 ** 5 + microseconds * 10 ** 3
+    headers['starttime'] = starttime
+
+    # Time of the last sample, the span is rounded to microseconds like it is
+    # done by libmseed.
+    npts = headers['npts'].astype(np.int64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        span = ((npts - 1) / samp_rate * HPTMODULUS + 0.5).astype(np.int64)
+    span[(samp_rate <= 0) | (npts <= 0)] = 0
+    # positive leap second during the record
+    span[headers['activity_flags'] & 0x10 != 0] -= int(HPTMODULUS)
+    headers['endtime'] = starttime + span * 10 ** 3
+    return headers
+
+
 def get_flags(files, starttime=None, endtime=None,
               io_flags=True, activity_flags=True,
               data_quality_flags=True, timing_quality=True):
@@ -222,238 +534,107 @@ def get_flags(files, starttime=None, endtime=None,
     starttime = float(UTCDateTime(starttime)) if starttime else None
     endtime = float(UTCDateTime(endtime)) if endtime else None
 
-    records = []
-
-    # Use clibmseed to get header parameters for all files
-    for file in files:
-
-        # If it's a file name just read it.
-        if isinstance(file, (str, Path)):
-            # Read to NumPy array which is used as a buffer.
-            bfr_np = np.fromfile(file, dtype=np.int8)
-        elif hasattr(file, 'read'):
-            bfr_np = from_buffer(file.read(), dtype=np.int8)
-
-        offset = 0
-
-        msr = clibmseed.msr_init(C.POINTER(MSRecord)())
-
-        while True:
-            # Read up to max record length.
-            record = bfr_np[offset: offset + 8192]
-            if len(record) < 48:
-                break
-
-            retcode = clibmseed.msr_parse(record, len(record), C.pointer(msr),
-                                          -1, 0, 0)
-
-            if retcode != MS_NOERROR:
-                break
-
-            offset += msr.contents.reclen
-
-            # Check starttime and endtime of the record
-            # Read the sampling rate from the header (is this unsafe?)
-            # Tried using msr.msr_nomsamprate(msr) but the return is strange
-            r_start = clibmseed.msr_starttime(msr) / HPTMODULUS
-            r_delta = (1 / msr.contents.samprate)
-            r_end = (clibmseed.msr_endtime(msr) / HPTMODULUS) + r_delta
-
-            # Cut off records to start & endtime
-            if starttime is not None:
-                if r_end <= starttime:
-                    continue
-                if r_start < starttime:
-                    r_start = starttime
-
-            if endtime is not None:
-                if r_start >= endtime:
-                    continue
-                if r_end > endtime:
-                    r_end = endtime
-
-            # Get the timing quality in blockette1001 if it exists
-            if msr.contents.Blkt1001:
-                r_tq = msr.contents.Blkt1001.contents.timing_qual
-            else:
-                r_tq = None
-
-            # Collect all records and parameters in the range
-            records.append({
-                'start': r_start,
-                'delta': r_delta,
-                'end': r_end,
-                'tq': r_tq,
-                'tc': msr.contents.fsdh.contents.time_correct,
-                'io': msr.contents.fsdh.contents.io_flags,
-                'dq': msr.contents.fsdh.contents.dq_flags,
-                'ac': msr.contents.fsdh.contents.act_flags
-            })
-
-        # Free memory to be ready for next file.
-        clibmseed.msr_free(C.pointer(msr))
-
-    # It should be faster to sort by record endtime
-    # if we reverse the array first
-    records.reverse()
-    records.sort(key=lambda x: x["end"], reverse=True)
-
-    # Create collections for the flags
-    dq_flags_counts = collections.OrderedDict([
-        ("amplifier_saturation", 0),
-        ("digitizer_clipping", 0),
-        ("spikes", 0),
-        ("glitches", 0),
-        ("missing_padded_data", 0),
-        ("telemetry_sync_error", 0),
-        ("digital_filter_charging", 0),
-        ("suspect_time_tag", 0)
-    ])
-    dq_flags_seconds = collections.OrderedDict([
-        ("amplifier_saturation", 0),
-        ("digitizer_clipping", 0),
-        ("spikes", 0),
-        ("glitches", 0),
-        ("missing_padded_data", 0),
-        ("telemetry_sync_error", 0),
-        ("digital_filter_charging", 0),
-        ("suspect_time_tag", 0)
-    ])
-
-    io_flags_counts = collections.OrderedDict([
-        ("station_volume", 0),
-        ("long_record_read", 0),
-        ("short_record_read", 0),
-        ("start_time_series", 0),
-        ("end_time_series", 0),
-        ("clock_locked", 0)
-    ])
-    io_flags_seconds = collections.OrderedDict([
-        ("station_volume", 0),
-        ("long_record_read", 0),
-        ("short_record_read", 0),
-        ("start_time_series", 0),
-        ("end_time_series", 0),
-        ("clock_locked", 0)
-    ])
-
-    ac_flags_counts = collections.OrderedDict([
-        ("calibration_signal", 0),
-        ("time_correction_applied", 0),
-        ("event_begin", 0),
-        ("event_end", 0),
-        ("positive_leap", 0),
-        ("negative_leap", 0),
-        ("event_in_progress", 0)
-    ])
-    ac_flags_seconds = collections.OrderedDict([
-        ("calibration_signal", 0),
-        ("time_correction_applied", 0),
-        ("event_begin", 0),
-        ("event_end", 0),
-        ("positive_leap", 0),
-        ("negative_leap", 0),
-        ("event_in_progress", 0)
-    ])
-
-    coverage = None
-    used_record_count = 0
-    timing_correction = 0.0
-    timing_correction_count = 0
-    tq = []
-
-    # Go over all sorted records from back to front
-    for record in records:
-
-        # For counts we do not care about overlaps
-        # simply count contribution from all the records
-        if io_flags:
-            for _i, key in enumerate(io_flags_seconds.keys()):
-                if (record["io"] & (1 << _i)) != 0:
-                    io_flags_counts[key] += 1
-
-        if activity_flags:
-            for _i, key in enumerate(ac_flags_seconds.keys()):
-                if (record["ac"] & (1 << _i)) != 0:
-                    ac_flags_counts[key] += 1
-
-        if data_quality_flags:
-            for _i, key in enumerate(dq_flags_seconds.keys()):
-                if (record["dq"] & (1 << _i)) != 0:
-                    dq_flags_counts[key] += 1
-
-        # Coverage is the timewindow that is covered by the records
-        # so bits in overlapping records are not counted
-        # The first record starts a clean window
-        if coverage is None:
-            coverage = [record["start"], record["end"]]
-        else:
-
-            # Account for time tolerance
-            time_tolerance = 0.5 * record['delta']
-            tolerated_end = coverage[0] - time_tolerance
-
-            # Start is beyond coverage, skip the overlapping record
-            if record["start"] >= coverage[0]:
-                continue
-
-            # Fix end to the start of the coverage if it is overlaps
-            # with the coverage window. Or if it is within the allowed
-            # time tolerance
-            if record["end"] > coverage[0] or record["end"] > tolerated_end:
-                record["end"] = coverage[0]
-
-            # Extend the coverage
-            if record["start"] < coverage[0]:
-                coverage[0] = record["start"]
-
-        # Get the record length in seconds
-        record_length_seconds = (record["end"] - record["start"])
-
-        # Skip if the record length is 0 (or negative)
-        if record_length_seconds <= 0.0:
-            continue
-
-        # Overlapping records do not count ot the used_records
-        # used records tracks the amount of timing quality
-        # parameters we expect
-        used_record_count += 1
-
-        # Bitwise AND to count flags and store in orderedDicts
-        if io_flags:
-            for _i, key in enumerate(io_flags_seconds.keys()):
-                if (record["io"] & (1 << _i)) != 0:
-                    io_flags_seconds[key] += record_length_seconds
-
-        if activity_flags:
-            for _i, key in enumerate(ac_flags_seconds.keys()):
-                if (record["ac"] & (1 << _i)) != 0:
-                    ac_flags_seconds[key] += record_length_seconds
-
-        if data_quality_flags:
-            for _i, key in enumerate(dq_flags_seconds.keys()):
-                if (record["dq"] & (1 << _i)) != 0:
-                    dq_flags_seconds[key] += record_length_seconds
-
-        # Get the timing quality parameter and append to array
-        if timing_quality and record["tq"] is not None:
-            tq.append(float(record["tq"]))
-
-        # Check if a timing correction is specified
-        # (not whether it has been applied)
-        if record["tc"] != 0:
-            timing_correction += record_length_seconds
-            timing_correction_count += 1
+    # Scan the headers of all records
+    headers = [get_record_headers(file) for file in files]
+    headers = np.concatenate(headers) if headers else \
+        np.empty(0, dtype=_RECORD_HEADER_DTYPE)
+
+    # Start and end time of the records in seconds, the end time includes
+    # the time covered by the last sample
+    samp_rate = headers['samp_rate']
+    with np.errstate(divide='ignore'):
+        delta = np.where(samp_rate != 0, 1.0 / samp_rate, 0.0)
+    start = (headers['starttime'] // 10 ** 3) / HPTMODULUS
+    end = (headers['endtime'] // 10 ** 3) / HPTMODULUS + delta
+
+    # Cut off records to start & endtime
+    selected = np.ones(len(headers), dtype=bool)
+    if starttime is not None:
+        selected &= end > starttime
+        start = np.maximum(start, starttime)
+    if endtime is not None:
+        selected &= start < endtime
+        end = np.minimum(end, endtime)
+
+    # Sort by record end time, latest first. Records with the same end time
+    # are kept in reverse order.
+    headers, start, end, delta = [
+        x[selected][::-1] for x in (headers, start, end, delta)]
+    order = np.argsort(-end, kind='stable')
+    headers, start, end, delta = [
+        x[order] for x in (headers, start, end, delta)]
+    record_count = len(headers)
+
+    # Coverage is the time window that is covered by the records so far,
+    # going from the latest to the earliest record, so bits in overlapping
+    # records are not counted. The coverage always starts at the earliest
+    # start of all records before.
+    coverage_start = np.minimum.accumulate(start)[:-1]
+    # Records starting within the coverage are skipped
+    used = np.ones(record_count, dtype=bool)
+    used[1:] = start[1:] < coverage_start
+    # Fix end to the start of the coverage if it is overlaps with the
+    # coverage window. Or if it is within the allowed time tolerance
+    record_end = end.copy()
+    overlaps = (end[1:] > coverage_start) | \
+        (end[1:] > coverage_start - 0.5 * delta[1:])
+    record_end[1:][overlaps] = coverage_start[overlaps]
+    # Skip if the record length is 0 (or negative)
+    record_length_seconds = record_end - start
+    used &= record_length_seconds > 0.0
+
+    # Overlapping records do not count ot the used_records
+    # used records tracks the amount of timing quality
+    # parameters we expect
+    used_record_count = int(used.sum())
+
+    def _count_flags(flags, keys):
+        """
+        Counts set bits in all records and sums up the length of the used
+        records with set bits.
+        """
+        counts = collections.OrderedDict()
+        seconds = collections.OrderedDict()
+        for _i, key in enumerate(keys):
+            is_set = (flags & (1 << _i)) != 0
+            counts[key] = int(is_set.sum())
+            seconds[key] = float(record_length_seconds[used & is_set].sum())
+        return counts, seconds
+
+    # Create collections for the flags, for counts we do not care about
+    # overlaps, simply count contribution from all the records
+    dq_keys = ["amplifier_saturation", "digitizer_clipping", "spikes",
+               "glitches", "missing_padded_data", "telemetry_sync_error",
+               "digital_filter_charging", "suspect_time_tag"]
+    io_keys = ["station_volume", "long_record_read", "short_record_read",
+               "start_time_series", "end_time_series", "clock_locked"]
+    ac_keys = ["calibration_signal", "time_correction_applied",
+               "event_begin", "event_end", "positive_leap", "negative_leap",
+               "event_in_progress"]
+    no_flags = np.zeros(record_count, dtype=np.uint8)
+    io_flags_counts, io_flags_seconds = _count_flags(
+        headers['io_and_clock_flags'] if io_flags else no_flags, io_keys)
+    ac_flags_counts, ac_flags_seconds = _count_flags(
+        headers['activity_flags'] if activity_flags else no_flags, ac_keys)
+    dq_flags_counts, dq_flags_seconds = _count_flags(
+        headers['data_quality_flags'] if data_quality_flags else no_flags,
+        dq_keys)
+
+    # Check if a timing correction is specified
+    # (not whether it has been applied)
+    timing_corrected = used & (headers['time_correction'] != 0)
+    timing_correction = float(record_length_seconds[timing_corrected].sum())
+    timing_correction_count = int(timing_corrected.sum())
 
     # Get the total time analyzed
     if endtime is not None and starttime is not None:
         total_time_seconds = endtime - starttime
     # If zero records agree with the selections, zero seconds have been
     # analysed.
-    elif coverage is None:
+    elif not record_count:
         total_time_seconds = 0
     else:
-        total_time_seconds = coverage[1] - coverage[0]
+        total_time_seconds = end[0] - start.min()
 
     # Percentage of time of bit flags set
     if total_time_seconds:
@@ -470,9 +651,11 @@ def get_flags(files, starttime=None, endtime=None,
         timing_correction /= total_time_seconds * 1e-2
 
     # Add the timing quality if it is set for all used records
+    tq = []
     if timing_quality:
-        if len(tq) == used_record_count:
-            tq = np.array(tq, dtype=np.float64)
+        tq = headers['timing_quality'][used]
+        if used_record_count and (tq >= 0).all():
+            tq = tq.astype(np.float64)
             tq = {
                 "all_values": tq,
                 "min": tq.min(),
@@ -496,7 +679,7 @@ def get_flags(files, starttime=None, endtime=None,
         'activity_flags_percentages': ac_flags_seconds,
         'activity_flags_counts': ac_flags_counts,
         'timing_quality': tq,
-        'record_count': len(records),
+        'record_count': record_count,
         'number_of_records_used': used_record_count,
     }
 
@@ -920,6 +1103,208 @@ def _unpack_steim_2(data, npts, swapflag=0, verbose=0):
     return datasamples
 
 
+# Number of differences, offset of the first difference from the most
+# significant bit and bits per difference of a Steim2 data word for all
+# combinations of nibble and dnib (``nibble * 4 + dnib``), see SEED Manual
+# v2.4, Appendix B. Combinations without differences or invalid ones have
+# zero differences.
+_STEIM2_DECODING = [
+    # nibble 00: no differences
+    (0, 0, 32), (0, 0, 32), (0, 0, 32), (0, 0, 32),
+    # nibble 01: four 8 bit differences
+    (4, 0, 8), (4, 0, 8), (4, 0, 8), (4, 0, 8),
+    # nibble 10: dnib 00 is invalid, one 30, two 15 or three 10 bit
+    # differences
+    (0, 0, 32), (1, 2, 30), (2, 2, 15), (3, 2, 10),
+    # nibble 11: five 6, six 5 or seven 4 bit differences, dnib 11 is
+    # invalid
+    (5, 2, 6), (6, 2, 5), (7, 4, 4), (0, 0, 32),
+]
+
+# Number of Steim frames decoded at once, keeps the intermediate arrays small
+_STEIM_FRAMES_PER_CHUNK = 4096
+
+
+def unpack_steim(data, npts, frames=None, steim=1, byteorder='>'):
+    """
+    Unpack the Steim1 or Steim2 compressed data of one or many records at
+    once.
+
+    This is a pure NumPy implementation that decodes the data of any number
+    of records of one channel (e.g. all records of a MiniSEED file, SeedLink
+    packets or Reftek 130 data packets) in a single call, which is much
+    faster than calling libmseed once per record. ``data`` has to be the
+    concatenated Steim frames of all records, i.e. with the record headers
+    stripped, and the first frame of each record holds the integration
+    constants of the record.
+
+    The results are identical to libmseed: The first sample of each record
+    is its forward integration constant, differences after the last sample
+    of a record are ignored and a warning is shown for every record whose
+    last sample does not match its reverse integration constant.
+
+    :type data: bytes, bytearray or :class:`numpy.ndarray`
+    :param data: Steim frames of all records.
+    :type npts: int or list of int or :class:`numpy.ndarray`
+    :param npts: Number of samples of each record.
+    :type frames: int or list of int or :class:`numpy.ndarray`, optional
+    :param frames: Number of 64 byte Steim frames of each record. Defaults
+        to splitting ``data`` evenly into all records.
+    :type steim: int
+    :param steim: Steim compression level, ``1`` or ``2``.
+    :type byteorder: str
+    :param byteorder: Byte order of the data, ``'>'`` (the default and what
+        is used by nearly all MiniSEED files) or ``'<'``.
+    :rtype: :class:`numpy.ndarray` of dtype int32
+    :returns: Samples of all records.
+
+    .. rubric:: Example
+
+    >>> import numpy as np
+    >>> from obspy.core.util import get_example_file
+    >>> filename = get_example_file(
+    ...     "BW.BGLD.__.EHE.D.2008.001.first_10_records")
+    >>> raw = np.fromfile(filename, dtype=np.uint8).reshape(10, 512)
+    >>> data = unpack_steim(raw[:, 64:], npts=[412] * 10)
+    >>> print(len(data), data[:5])
+    4120 [-363 -382 -388 -420 -417]
+    """
+    if steim not in (1, 2):
+        msg = "Unsupported Steim compression level: %s" % steim
+        raise ValueError(msg)
+    if byteorder not in ('<', '>'):
+        msg = "Invalid byte order: %s" % byteorder
+        raise ValueError(msg)
+    if isinstance(data, np.ndarray):
+        data = np.ascontiguousarray(data).reshape(-1).view(np.uint8)
+    else:
+        data = np.frombuffer(data, dtype=np.uint8)
+    npts = np.atleast_1d(np.asarray(npts, dtype=np.int64))
+    if frames is None:
+        if len(npts) and len(data) // 64 % len(npts):
+            msg = ("Can not split %d Steim frames evenly into %d records." %
+                   (len(data) // 64, len(npts)))
+            raise ValueError(msg)
+        frames = len(data) // 64 // max(len(npts), 1)
+    frames = np.broadcast_to(np.asarray(frames, dtype=np.int64), npts.shape)
+    if (frames < 1).any() or frames.sum() * 64 > len(data):
+        msg = ("Buffer with %d bytes is too small for %d Steim frames." %
+               (len(data), frames.sum()))
+        raise ValueError(msg)
+    if (npts < 0).any():
+        msg = "Number of samples must not be negative."
+        raise ValueError(msg)
+
+    samples = np.empty(npts.sum(), dtype=np.int32)
+    # Decode chunks of whole records
+    frame_end = np.cumsum(frames)
+    chunk_end = np.searchsorted(
+        frame_end, np.arange(_STEIM_FRAMES_PER_CHUNK, frame_end[-1],
+                             _STEIM_FRAMES_PER_CHUNK) if len(npts) else [],
+        side='right')
+    chunk_end = np.unique(np.concatenate((chunk_end, [len(npts)])))
+    chunk_start = np.concatenate(([0], chunk_end[:-1]))
+    sample_end = np.cumsum(npts)
+    for i, j in zip(chunk_start.tolist(), chunk_end.tolist()):
+        if i == j:
+            continue
+        first_byte = (frame_end[i] - frames[i]) * 64
+        first_sample = sample_end[i] - npts[i]
+        samples[first_sample:sample_end[j - 1]] = _unpack_steim_chunk(
+            data[first_byte:frame_end[j - 1] * 64], npts[i:j], frames[i:j],
+            steim, byteorder, i)
+    return samples
+
+
+def _unpack_steim_chunk(data, npts, frames, steim, byteorder, first_record):
+    """
+    Unpack the Steim frames of some records, see :func:`unpack_steim`.
+
+    ``first_record`` is the index of the first record used in messages.
+    """
+    words = data.view(byteorder + 'u4').astype(np.uint32)
+    word_start = (np.cumsum(frames) - frames) * 16
+    # The first word of every frame holds the 2 bit nibbles of all 16 words
+    # of the frame. The nibble word itself and the integration constants in
+    # the first frame of each record are skipped.
+    nibbles = (words[::16, None] >> np.arange(30, -2, -2, dtype=np.uint32))
+    nibbles = (nibbles & 3).astype(np.int8)
+    nibbles[:, 0] = 0
+    nibbles = nibbles.reshape(-1)
+    nibbles[word_start + 1] = 0
+    nibbles[word_start + 2] = 0
+
+    # Decode all differences of every word into a 2D array with one row per
+    # word, only the first ``count`` columns of a row are valid.
+    bytes_ = data.view(np.int8).reshape(-1, 4)
+    if steim == 1:
+        count = np.array([0, 4, 2, 1], dtype=np.int32)[nibbles]
+        diffs = bytes_.astype(np.int32)
+        diffs[:, :2] = np.where((nibbles == 2)[:, None],
+                                data.view(byteorder + 'i2').reshape(-1, 2),
+                                diffs[:, :2])
+        diffs[:, 0] = np.where(nibbles == 3, words.view(np.int32),
+                               diffs[:, 0])
+        invalid = None
+    else:
+        decoding = np.array(_STEIM2_DECODING, dtype=np.int32)
+        column = np.arange(7, dtype=np.int32)
+        shifts = np.where(column < decoding[:, :1],
+                          decoding[:, 1:2] + decoding[:, 2:3] * column, 0)
+        word_type = (nibbles.astype(np.intp) << 2) + (words >> 30)
+        count = decoding[word_type, 0]
+        invalid = (count == 0) & (nibbles >= 2)
+        # Shift each difference to the most significant bits and shift it
+        # back arithmetically to sign extend it.
+        diffs = (words[:, None] << shifts.astype(np.uint32)[word_type])
+        diffs = diffs.view(np.int32) >> (32 - decoding[word_type, 2:3])
+        # 8 bit differences are single bytes that are not swapped
+        if byteorder == '<':
+            diffs[:, :4] = np.where((nibbles == 1)[:, None], bytes_,
+                                    diffs[:, :4])
+
+    # Number of differences of each word that are used, decoding of a record
+    # stops after its last sample.
+    position = np.cumsum(count, dtype=np.int32) - count
+    position -= np.repeat(position[word_start], frames * 16)
+    used = np.repeat(npts.astype(np.int32), frames * 16) - position
+    if invalid is not None and (invalid & (used > 0)).any():
+        i = np.nonzero(invalid & (used > 0))[0][0]
+        msg = ("Impossible Steim2 dnib=%d for nibble=%d in record %d." %
+               (words[i] >> 30, nibbles[i],
+                first_record + np.searchsorted(word_start, i, 'right') - 1))
+        raise ValueError(msg)
+    decoded = np.add.reduceat(count, word_start)
+    if (decoded < npts).any():
+        i = np.nonzero(decoded < npts)[0][0]
+        msg = ("Number of samples decoded (%d) does not match the expected "
+               "number of samples (%d) of record %d." %
+               (decoded[i], npts[i], first_record + i))
+        raise ValueError(msg)
+    np.clip(used, 0, count, out=used)
+    diffs = diffs[np.arange(diffs.shape[1], dtype=np.int32) < used[:, None]]
+
+    # Integrate the differences. The first difference of each record refers
+    # to the previous record and is replaced by the forward integration
+    # constant. Integer overflows wrap around just like in libmseed.
+    start = (np.cumsum(npts) - npts)[npts > 0]
+    x0 = words[word_start + 1].view(np.int32)[npts > 0]
+    xn = words[word_start + 2].view(np.int32)[npts > 0]
+    diffs[start] = 0
+    samples = np.cumsum(diffs, dtype=np.int32)
+    samples -= np.repeat(samples[start] - x0, npts[npts > 0])
+
+    # Check data integrity by comparing the last sample of each record to
+    # its reverse integration constant.
+    last = samples[start + npts[npts > 0] - 1]
+    record = first_record + np.nonzero(npts > 0)[0]
+    for i in np.nonzero(last != xn)[0]:
+        msg = ("Data integrity check for Steim%d failed in record %d, "
+               "Last sample=%d, Xn=%d" % (steim, record[i], last[i], xn[i]))
+        warnings.warn(msg, InternalMSEEDWarning)
+    return samples
+
+
 def set_flags_in_fixed_headers(filename, flags):
     """
     Updates a given MiniSEED file with some fixed header flags.
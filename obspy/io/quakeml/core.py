@@ -177,7 +177,9 @@ class Unpickler(object):
             return convert_to(text)
         except Exception:
             msg = "Could not convert %s to type %s. Returning None."
-            warnings.warn(msg % (text, convert_to))
+            # report the class for alternative constructors
+            warnings.warn(msg % (text, getattr(convert_to, '__self__',
+                                               convert_to)))
         return None
 
     def _set_enum(self, xpath, element, obj, key):
@@ -245,7 +247,7 @@ class Unpickler(object):
         obj.agency_id = self._xpath2obj('agencyID', element)
         obj.author = self._xpath2obj('author', element)
         obj.creation_time = self._xpath2obj(
-            'creationTime', element, UTCDateTime)
+            'creationTime', element, UTCDateTime.from_iso8601)
         obj.version = self._xpath2obj('version', element)
         self._extra(element, obj)
         return obj
@@ -343,7 +345,7 @@ class Unpickler(object):
         return self._value(element, name, int)
 
     def _time_value(self, element, name):
-        return self._value(element, name, UTCDateTime)
+        return self._value(element, name, UTCDateTime.from_iso8601)
 
     def _composite_times(self, parent):
         obj = []
@@ -501,7 +503,7 @@ class Unpickler(object):
         obj.begin = self._xpath2obj('begin', element, convert_to=float)
         obj.end = self._xpath2obj('end', element, convert_to=float)
         obj.reference = self._xpath2obj('reference', element,
-                                        convert_to=UTCDateTime)
+                                        convert_to=UTCDateTime.from_iso8601)
         self._extra(element, obj)
         return obj
 
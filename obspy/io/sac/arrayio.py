@@ -73,7 +73,8 @@ def init_header_arrays(arrays=('float', 'int', 'str'), byteorder='='):
     return out
 
 
-def read_sac(source, headonly=False, byteorder=None, checksize=False):
+def read_sac(source, headonly=False, byteorder=None, checksize=False,
+             mmap=False):
     """
     Read a SAC binary file.
 
@@ -90,6 +91,11 @@ def read_sac(source, headonly=False, byteorder=None, checksize=False):
     :param checksize: If True, check that the theoretical file size from the
         header matches the size on disk.
     :type checksize: bool
+    :param mmap: If True and source is a file name, the data array is a
+        copy-on-write :class:`numpy.memmap` of the file, so that samples are
+        only read from disk when they are accessed. Changes to the array are
+        never written back to the file.
+    :type mmap: bool
 
     :return: The float, integer, and string header arrays, and data array,
         in that order. Data array will be None if headonly is True.
@@ -176,6 +182,13 @@ def read_sac(source, headonly=False, byteorder=None, checksize=False):
     # --------------------------------------------------------------
     if headonly:
         data = None
+    elif mmap and is_file_name:
+        try:
+            data = np.memmap(source, dtype=endian_str + 'f4', mode='c',
+                             offset=632, shape=(int(npts),))
+        except ValueError:
+            # file is too short for the number of samples in the header
+            data = np.empty(0, dtype=endian_str + 'f4')
     else:
         data = from_buffer(f.read(int(npts) * 4),
                            dtype=endian_str + 'f4')
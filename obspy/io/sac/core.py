@@ -316,7 +316,8 @@ def _internal_write_sac_xy(trace, buf, **kwargs):  # @UnusedVariable
 
 
 def _read_sac(filename, headonly=False, debug_headers=False, fsize=True,
-              round_sampling_interval=True, **kwargs):  # @UnusedVariable
+              round_sampling_interval=True, lazy=False,
+              **kwargs):  # @UnusedVariable
     """
     Reads an SAC file and returns an ObsPy Stream object.
 
@@ -343,6 +344,11 @@ def _read_sac(filename, headonly=False, debug_headers=False, fsize=True,
         microseconds before calculating sampling rate to avoid floating point
         accuracy issues with some SAC files (see #3408)
     :type round_sampling_interval: bool
+    :param lazy: If set to True and a file name is given, the data is memory
+        mapped instead of read, so that only accessed samples are read from
+        disk. In-place changes to the data are not written back to the file.
+        Compressed files are always read completely.
+    :type lazy: bool
     :rtype: :class:`~obspy.core.stream.Stream`
     :return: A ObsPy Stream object.
 
@@ -351,6 +357,12 @@ def _read_sac(filename, headonly=False, debug_headers=False, fsize=True,
     >>> from obspy import read
     >>> st = read("/path/to/test.sac")
     """
+    if lazy and not headonly and isinstance(filename, (str, Path)):
+        return _internal_read_sac(
+            buf=str(filename), headonly=headonly,
+            debug_headers=debug_headers, fsize=fsize,
+            round_sampling_interval=round_sampling_interval, mmap=True,
+            **kwargs)
     # Only byte buffers for binary SAC.
     if isinstance(filename, io.BufferedIOBase):
         return _internal_read_sac(
@@ -369,7 +381,7 @@ def _read_sac(filename, headonly=False, debug_headers=False, fsize=True,
 
 def _internal_read_sac(buf, headonly=False, debug_headers=False, fsize=True,
                        byteorder=None, round_sampling_interval=True,
-                       **kwargs):  # @UnusedVariable
+                       mmap=False, **kwargs):  # @UnusedVariable
     """
     Reads an SAC file and returns an ObsPy Stream object.
 
@@ -378,7 +390,7 @@ def _internal_read_sac(buf, headonly=False, debug_headers=False, fsize=True,
         ObsPy :func:`~obspy.core.stream.read` function, call this instead.
 
     :param buf: SAC file to be read.
-    :type buf: file or file-like object
+    :type buf: str, file or file-like object
     :param headonly: If set to True, read only the head. This is most useful
         for scanning available data in huge (temporary) data sets.
     :type headonly: bool
@@ -402,6 +414,9 @@ def _internal_read_sac(buf, headonly=False, debug_headers=False, fsize=True,
         microseconds before calculating sampling rate to avoid floating point
         accuracy issues with some SAC files (see #3408)
     :type round_sampling_interval: bool
+    :param mmap: If set to True and ``buf`` is a file name, the data is
+        memory mapped instead of read.
+    :type mmap: bool
     :rtype: :class:`~obspy.core.stream.Stream`
     :return: A ObsPy Stream object.
     """
@@ -412,7 +427,7 @@ def _internal_read_sac(buf, headonly=False, debug_headers=False, fsize=True,
     # read SAC file
     sac = SACTrace.read(buf, headonly=headonly, ascii=False,
                         byteorder=byteorder, checksize=fsize,
-                        encoding=encoding_str)
+                        encoding=encoding_str, mmap=mmap)
     # assign all header entries to a new dictionary compatible with an ObsPy
     tr = sac.to_obspy_trace(debug_headers=debug_headers, encoding=encoding_str,
                             round_sampling_interval=round_sampling_interval)
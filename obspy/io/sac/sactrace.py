@@ -1029,7 +1029,8 @@ class SACTrace(object):
     # --------------------------- I/O METHODS ---------------------------------
     @classmethod
     def read(cls, source, headonly=False, ascii=False, byteorder=None,
-             checksize=False, debug_strings=False, encoding='ASCII'):
+             checksize=False, debug_strings=False, encoding='ASCII',
+             mmap=False):
         """
         Construct an instance from a binary or ASCII file on disk.
 
@@ -1058,6 +1059,10 @@ class SACTrace(object):
         :param encoding: Encoding string that passes the user specified
             encoding scheme.
         :type encoding: str
+        :param mmap: If True and source is a file name, memory-map the data
+            array of a binary file instead of reading it (see
+            :func:`obspy.io.sac.arrayio.read_sac`).
+        :type mmap: bool
 
         :raises: :class:`obspy.io.sac.util.SacIOError`: if checksize failed,
             byteorder was wrong, or header arrays are wrong size.
@@ -1088,7 +1093,7 @@ class SACTrace(object):
         else:
             hf, hi, hs, data = _io.read_sac(source, headonly=headonly,
                                             byteorder=byteorder,
-                                            checksize=checksize)
+                                            checksize=checksize, mmap=mmap)
         if not debug_strings:
             for i, val in enumerate(hs):
                 val = _ut._clean_str(val.decode(encoding, 'replace'),
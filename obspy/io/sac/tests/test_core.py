@@ -3,6 +3,7 @@
 The sac.core test suite.
 """
 import copy
+import gzip
 import io
 import warnings
 
@@ -159,6 +160,32 @@ class TestCore():
         assert tr.stats.sac.b == 10.0
         assert str(tr.data) == '[]'
 
+    def test_read_lazy_via_obspy(self):
+        """
+        Read files memory mapped via L{obspy.Stream}
+        """
+        for filename in (self.file, self.filebe):
+            tr = read(filename, format='SAC')[0]
+            tr_lazy = read(filename, format='SAC', lazy=True)[0]
+            assert isinstance(tr_lazy.data, np.memmap)
+            assert tr_lazy == tr
+            # in-place changes are not written to the file
+            tr_lazy.data *= 2
+            np.testing.assert_array_equal(tr_lazy.data, tr.data * 2)
+            assert read(filename, format='SAC')[0] == tr
+
+    def test_read_lazy_compressed(self, tmp_path):
+        """
+        Compressed files are not memory mapped when read with lazy=True as
+        the temporary decompressed file is removed after reading.
+        """
+        filename = str(tmp_path / 'test.sac.gz')
+        with open(self.file, 'rb') as fh, gzip.open(filename, 'wb') as fh2:
+            fh2.write(fh.read())
+        tr = read(filename, lazy=True)[0]
+        assert not isinstance(tr.data, np.memmap)
+        assert tr == read(self.file)[0]
+
     def test_write_via_obspy(self):
         """
         Writing artificial files via L{obspy.Stream}
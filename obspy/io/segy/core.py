@@ -23,7 +23,7 @@ from .segy import _read_segy as _read_segyrev1
 from .segy import _read_su as _read_su_file
 from .segy import (SEGYBinaryFileHeader, SEGYError, SEGYFile, SEGYTrace,
                    SEGYTraceHeader, SUFile,
-                   autodetect_endian_and_sanity_check_su)
+                   autodetect_endian_and_sanity_check_su, iread_segy, iread_su)
 from .util import unpack_header_value
 
 
@@ -208,6 +208,49 @@ def _read_segy(filename, headonly=False, byteorder=None,
     return stream
 
 
+def _iter_read_segy(filename, chunk=1000, chunk_length=None, headonly=False,
+                    byteorder=None, textual_header_encoding=None,
+                    unpack_trace_headers=False, **kwargs):  # @UnusedVariable
+    """
+    Reads a SEG Y file chunk by chunk and yields ObsPy Stream objects.
+
+    .. warning::
+        This function should NOT be called directly, it registers via the
+        ObsPy :func:`~obspy.core.stream.iter_read` function, call this
+        instead.
+
+    The traces are read one by one with
+    :func:`~obspy.io.segy.segy.iread_segy`. The file wide headers are stored
+    in ``Stream.stats`` of every yielded Stream, see :func:`_read_segy` for
+    the other parameters.
+
+    :type chunk: int
+    :param chunk: Maximum number of traces per yielded Stream.
+    :type chunk_length: float
+    :param chunk_length: Maximum difference in seconds between the start
+        times of the first and of the last trace of a yielded Stream.
+    """
+    from obspy.core.stream import _iter_trace_chunks
+    traces = iread_segy(filename, endian=byteorder,
+                        textual_header_encoding=textual_header_encoding,
+                        unpack_headers=unpack_trace_headers,
+                        headonly=headonly)
+    for stream in _iter_trace_chunks(traces, chunk, chunk_length):
+        # move the file wide headers from the traces to the stream
+        stream.stats = AttribDict()
+        for tr in stream:
+            segy = tr.stats.segy
+            for key in ('textual_file_header', 'binary_file_header',
+                        'textual_file_header_encoding', 'data_encoding',
+                        'endian'):
+                stream.stats[key] = segy.pop(key)
+        binary_file_header = AttribDict()
+        for key, value in stream.stats.binary_file_header.__dict__.items():
+            setattr(binary_file_header, key, value)
+        stream.stats.binary_file_header = binary_file_header
+        yield stream
+
+
 def _write_segy(stream, filename, data_encoding=None, byteorder=None,
                 textual_header_encoding=None, **kwargs):  # @UnusedVariable
     """
@@ -528,6 +571,37 @@ def _read_su(filename, headonly=False, byteorder=None,
     return stream
 
 
+def _iter_read_su(filename, chunk=1000, chunk_length=None, headonly=False,
+                  byteorder=None, unpack_trace_headers=False,
+                  **kwargs):  # @UnusedVariable
+    """
+    Reads a Seismic Unix (SU) file chunk by chunk and yields ObsPy Stream
+    objects.
+
+    .. warning::
+        This function should NOT be called directly, it registers via the
+        ObsPy :func:`~obspy.core.stream.iter_read` function, call this
+        instead.
+
+    The traces are read one by one with
+    :func:`~obspy.io.segy.segy.iread_su`, see :func:`_read_su` for the other
+    parameters.
+
+    :type chunk: int
+    :param chunk: Maximum number of traces per yielded Stream.
+    :type chunk_length: float
+    :param chunk_length: Maximum difference in seconds between the start
+        times of the first and of the last trace of a yielded Stream.
+    """
+    from obspy.core.stream import _iter_trace_chunks
+    traces = iread_su(filename, endian=byteorder,
+                      unpack_headers=unpack_trace_headers, headonly=headonly)
+    for stream in _iter_trace_chunks(traces, chunk, chunk_length):
+        for tr in stream:
+            tr.stats.su.pop('data_encoding', None)
+        yield stream
+
+
 def _write_su(stream, filename, byteorder=None, **kwargs):  # @UnusedVariable
     """
     Writes a Seismic Unix (SU) file from given ObsPy Stream object.
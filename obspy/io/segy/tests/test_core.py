@@ -10,7 +10,7 @@ import warnings
 import numpy as np
 import pytest
 
-from obspy import UTCDateTime, read, Trace, Stream
+from obspy import UTCDateTime, iter_read, read, Trace, Stream
 from obspy.core.util import NamedTemporaryFile, AttribDict
 from obspy.core.util.base import CatchAndAssertWarnings
 from obspy.io.segy.core import (SEGYCoreWritingError, SEGYSampleIntervalError,
@@ -669,3 +669,31 @@ class TestSEGYCore():
             "1970-01-01T00:05:27.670000Z | 100.0 Hz, 32768 samples"
         with pytest.raises(ValueError, match=msg):
             _write_segy(st, bio, data_encoding=2)
+
+    def test_iter_read(self):
+        """
+        Reading SEG Y and SU files chunk by chunk with iter_read() gives the
+        same traces as reading them at once.
+        """
+        st = Stream()
+        for i in range(5):
+            tr = Trace(np.arange(100, dtype=np.float32) * (i + 1))
+            tr.stats.sampling_rate = 100
+            st.append(tr)
+        for format in ('SEGY', 'SU'):
+            with NamedTemporaryFile() as tf:
+                with warnings.catch_warnings():
+                    warnings.simplefilter('ignore')
+                    st.write(tf.name, format=format)
+                expected = read(tf.name, format=format)
+                chunks = list(iter_read(tf.name, format=format, chunk=2))
+            assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+            assert Stream([tr for chunk in chunks for tr in chunk]) == \
+                expected
+            for chunk in chunks:
+                assert all(tr.stats._format == format for tr in chunk)
+                if format == 'SEGY':
+                    assert chunk.stats.textual_file_header == \
+                        expected.stats.textual_file_header
+                    assert chunk.stats.binary_file_header == \
+                        expected.stats.binary_file_header
@@ -108,7 +108,8 @@ def _read_sc3ml(path_or_file_object, **kwargs):
     if journal is not None:
         entry = journal.find(_ns("entry"))
         if entry is not None:
-            created = _tag2obj(entry, _ns("created"), obspy.UTCDateTime)
+            created = _tag2obj(
+                entry, _ns("created"), obspy.UTCDateTime.from_iso8601)
             sender = _tag2obj(entry, _ns("sender"), str)
     else:
         created = None
@@ -216,8 +217,10 @@ def _read_network(instrumentation_register, net_element, _ns):
 
     # There is no further information in the attributes of <network>
     # Start and end date are included as tags
-    network.start_date = _tag2obj(net_element, _ns("start"), obspy.UTCDateTime)
-    network.end_date = _tag2obj(net_element, _ns("end"), obspy.UTCDateTime)
+    network.start_date = _tag2obj(
+        net_element, _ns("start"), obspy.UTCDateTime.from_iso8601)
+    network.end_date = _tag2obj(
+        net_element, _ns("end"), obspy.UTCDateTime.from_iso8601)
     network.description = _tag2obj(net_element, _ns("description"), str)
 
     # get the restricted_status (boolean)
@@ -276,12 +279,14 @@ def _read_station(instrumentation_register, sta_element, _ns):
     # There is no relevant info in the base node
     # Read the start and end date (creation, termination) from tags
     # "Vault" and "Geology" are not defined in scxml ?
-    station.start_date = _tag2obj(sta_element, _ns("start"), obspy.UTCDateTime)
-    station.end_date = _tag2obj(sta_element, _ns("end"), obspy.UTCDateTime)
-    station.creation_date = _tag2obj(sta_element, _ns("start"),
-                                     obspy.UTCDateTime)
-    station.termination_date = _tag2obj(sta_element, _ns("end"),
-                                        obspy.UTCDateTime)
+    station.start_date = _tag2obj(
+        sta_element, _ns("start"), obspy.UTCDateTime.from_iso8601)
+    station.end_date = _tag2obj(
+        sta_element, _ns("end"), obspy.UTCDateTime.from_iso8601)
+    station.creation_date = _tag2obj(
+        sta_element, _ns("start"), obspy.UTCDateTime.from_iso8601)
+    station.termination_date = _tag2obj(
+        sta_element, _ns("end"), obspy.UTCDateTime.from_iso8601)
 
     # get the restricted_status (boolean)
     # true is evaluated to 'open'; false to 'closed'
@@ -480,8 +485,10 @@ def _read_channel(instrumentation_register, cha_element, _ns):
 
     # There is no further information in the attributes of <stream>
     # Start and end date are included as tags instead
-    channel.start_date = _tag2obj(cha_element, _ns("start"), obspy.UTCDateTime)
-    channel.end_date = _tag2obj(cha_element, _ns("end"), obspy.UTCDateTime)
+    channel.start_date = _tag2obj(
+        cha_element, _ns("start"), obspy.UTCDateTime.from_iso8601)
+    channel.end_date = _tag2obj(
+        cha_element, _ns("end"), obspy.UTCDateTime.from_iso8601)
 
     # Determine sample rate (given is a numerator, denominator)
     # Assuming numerator is # samples and denominator is # seconds
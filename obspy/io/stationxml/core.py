@@ -162,7 +162,8 @@ def _read_stationxml(path_or_file_object, level='response'):
 
     # Source and Created field must exist in a StationXML.
     source = root.find(_ns("Source")).text
-    created = obspy.UTCDateTime(root.find(_ns("Created")).text)
+    created = obspy.UTCDateTime.from_iso8601(
+        root.find(_ns("Created")).text)
 
     # These are optional
     sender = _tag2obj(root, _ns("Sender"), str)
@@ -194,9 +195,9 @@ def _read_base_node(element, object_to_write_to, _ns):
     Reads everything except the 'code' attribute.
     """
     object_to_write_to.start_date = \
-        _attr2obj(element, "startDate", obspy.UTCDateTime)
+        _attr2obj(element, "startDate", obspy.UTCDateTime.from_iso8601)
     object_to_write_to.end_date = \
-        _attr2obj(element, "endDate", obspy.UTCDateTime)
+        _attr2obj(element, "endDate", obspy.UTCDateTime.from_iso8601)
     object_to_write_to.restricted_status = \
         _attr2obj(element, "restrictedStatus", str)
     object_to_write_to.alternate_code = \
@@ -267,10 +268,10 @@ def _read_station(sta_element, _ns, level):
         station.equipments.append(_read_equipment(equipment, _ns))
     for operator in sta_element.findall(_ns("Operator")):
         station.operators.append(_read_operator(operator, _ns))
-    station.creation_date = \
-        _tag2obj(sta_element, _ns("CreationDate"), obspy.UTCDateTime)
-    station.termination_date = \
-        _tag2obj(sta_element, _ns("TerminationDate"), obspy.UTCDateTime)
+    station.creation_date = _tag2obj(
+        sta_element, _ns("CreationDate"), obspy.UTCDateTime.from_iso8601)
+    station.termination_date = _tag2obj(
+        sta_element, _ns("TerminationDate"), obspy.UTCDateTime.from_iso8601)
     station.selected_number_of_channels = \
         _tag2obj(sta_element, _ns("SelectedNumberChannels"), int)
     station.total_number_of_channels = \
@@ -780,10 +781,10 @@ def _read_data_availability(avail_element, _ns):
 def _read_data_availability_span(element, _ns):
     start = element.attrib['start']
     if start is not None:
-        start = obspy.UTCDateTime(start)
+        start = obspy.UTCDateTime.from_iso8601(start)
     end = element.attrib['end']
     if end is not None:
-        end = obspy.UTCDateTime(end)
+        end = obspy.UTCDateTime.from_iso8601(end)
     number_of_segments = element.attrib['numberSegments']
     if number_of_segments is not None:
         number_of_segments = int(number_of_segments)
@@ -805,12 +806,12 @@ def _read_equipment(equip_element, _ns):
     vendor = _tag2obj(equip_element, _ns("Vendor"), str)
     model = _tag2obj(equip_element, _ns("Model"), str)
     serial_number = _tag2obj(equip_element, _ns("SerialNumber"), str)
-    installation_date = \
-        _tag2obj(equip_element, _ns("InstallationDate"), obspy.UTCDateTime)
-    removal_date = \
-        _tag2obj(equip_element, _ns("RemovalDate"), obspy.UTCDateTime)
+    installation_date = _tag2obj(
+        equip_element, _ns("InstallationDate"), obspy.UTCDateTime.from_iso8601)
+    removal_date = _tag2obj(
+        equip_element, _ns("RemovalDate"), obspy.UTCDateTime.from_iso8601)
     calibration_dates = \
-        [obspy.core.UTCDateTime(_i.text)
+        [obspy.core.UTCDateTime.from_iso8601(_i.text)
          for _i in equip_element.findall(_ns("CalibrationDate"))]
     obj = obspy.core.inventory.Equipment(
         resource_id=resource_id, type=type, description=description,
@@ -837,10 +838,12 @@ def _read_site(site_element, _ns):
 
 def _read_comment(comment_element, _ns):
     value = _tag2obj(comment_element, _ns("Value"), str)
-    begin_effective_time = \
-        _tag2obj(comment_element, _ns("BeginEffectiveTime"), obspy.UTCDateTime)
-    end_effective_time = \
-        _tag2obj(comment_element, _ns("EndEffectiveTime"), obspy.UTCDateTime)
+    begin_effective_time = _tag2obj(
+        comment_element, _ns("BeginEffectiveTime"),
+        obspy.UTCDateTime.from_iso8601)
+    end_effective_time = _tag2obj(
+        comment_element, _ns("EndEffectiveTime"),
+        obspy.UTCDateTime.from_iso8601)
     authors = []
     id = _attr2obj(comment_element, "id", int)
     subject = _attr2obj(comment_element, "subject", str)
@@ -86,7 +86,7 @@ def bandpass(data, freqmin, freqmax, df, corners=4, zerophase=False,
             freqmax, fe)
         warnings.warn(msg)
         return highpass(data, freq=freqmin, df=df, corners=corners,
-                        ftype=ftype, zerophase=zerophase)
+                        ftype=ftype, zerophase=zerophase, axis=axis)
     if low > 1:
         msg = "Selected low corner frequency is above Nyquist."
         raise ValueError(msg)
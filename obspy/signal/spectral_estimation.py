@@ -487,6 +487,27 @@ class PPSD(object):
         self._current_times_used = []
         self._current_times_all_details = []
 
+    def __reduce_ex__(self, protocol):
+        """
+        With pickle protocol 5 or higher, the processed psds are pickled as
+        one two-dimensional array (which can be handed over as an out-of-band
+        buffer) instead of as a list of many small arrays.
+        """
+        reduced = super(PPSD, self).__reduce_ex__(protocol)
+        psds = self._binned_psds
+        if protocol < 5 or not psds or \
+                len(set((psd.shape, psd.dtype) for psd in psds)) != 1:
+            return reduced
+        state = dict(reduced[2])
+        state['_binned_psds'] = np.vstack(psds)
+        return reduced[:2] + (state,) + reduced[3:]
+
+    def __setstate__(self, state):
+        if isinstance(state.get('_binned_psds'), np.ndarray):
+            state = state.copy()
+            state['_binned_psds'] = list(state['_binned_psds'])
+        self.__dict__.update(state)
+
     @property
     def network(self):
         return self.id.split(".")[0]
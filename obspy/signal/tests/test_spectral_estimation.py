@@ -5,6 +5,7 @@ The psd test suite.
 """
 import gzip
 import io
+import pickle
 import re
 import warnings
 from copy import deepcopy
@@ -378,6 +379,28 @@ class TestPsd:
                     continue
                 assert getattr(ppsd, key) == getattr(results_full, key)
 
+    def test_ppsd_pickle_protocol_5(self, _ppsd):
+        """
+        With pickle protocol 5 the processed psds are handed over as one
+        out-of-band buffer.
+        """
+        ppsd = _ppsd
+        buffers = []
+        msg = pickle.dumps(ppsd, protocol=5, buffer_callback=buffers.append)
+        ppsd2 = pickle.loads(msg, buffers=buffers)
+        for ppsd_ in (ppsd2, pickle.loads(pickle.dumps(ppsd, protocol=5)),
+                      pickle.loads(pickle.dumps(ppsd, protocol=2))):
+            assert isinstance(ppsd_._binned_psds, list)
+            assert len(ppsd_._binned_psds) == len(ppsd._binned_psds)
+            np.testing.assert_array_equal(ppsd_._binned_psds,
+                                          ppsd._binned_psds)
+            assert ppsd_._binned_psds[0].dtype == ppsd._binned_psds[0].dtype
+            assert ppsd_.times_processed == ppsd.times_processed
+        ppsd2.calculate_histogram()
+        ppsd.calculate_histogram()
+        np.testing.assert_array_equal(ppsd2.current_histogram,
+                                      ppsd.current_histogram)
+
     def test_ppsd_save_and_load_npz(self, _sample_data, _ppsd):
         """
         Test PPSD.load_npz() and PPSD.save_npz()
@@ -225,6 +225,7 @@ ENTRY_POINTS = {
     'obspy.plugin.waveform.MSEED': [
         'isFormat = obspy.io.mseed.core:_is_mseed',
         'readFormat = obspy.io.mseed.core:_read_mseed',
+        'iterReadFormat = obspy.io.mseed.core:_iter_read_mseed',
         'writeFormat = obspy.io.mseed.core:_write_mseed',
         ],
     'obspy.plugin.waveform.PDAS': [
@@ -248,11 +249,13 @@ ENTRY_POINTS = {
     'obspy.plugin.waveform.SEGY': [
         'isFormat = obspy.io.segy.core:_is_segy',
         'readFormat = obspy.io.segy.core:_read_segy',
+        'iterReadFormat = obspy.io.segy.core:_iter_read_segy',
         'writeFormat = obspy.io.segy.core:_write_segy',
         ],
     'obspy.plugin.waveform.SU': [
         'isFormat = obspy.io.segy.core:_is_su',
         'readFormat = obspy.io.segy.core:_read_su',
+        'iterReadFormat = obspy.io.segy.core:_iter_read_su',
         'writeFormat = obspy.io.segy.core:_write_su',
         ],
     'obspy.plugin.waveform.SEISAN': [